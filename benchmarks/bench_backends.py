@@ -0,0 +1,130 @@
+# الملف: benchmarks/bench_backends.py
+
+"""
+مقارنة محركات تحليل HTML (parser_backends) على نفس الصفحات لكل مستخرج.
+
+يشغل كل مستخرج (Hikvision و Dahua) على صفحاته بكل محرك متوفر، ويعرض عدد الصفحات
+في الثانية وما إذا كانت المخرجات مطابقة لمحرك bs4 المرجعي.
+
+مصادر الصفحات: أرشيف HtmlArchive (--archive-dir) حيث تحدد الشركة من الرابط، أو ملفات
+HTML (--hikvision و --dahua)، وإلا صفحات اصطناعية.
+
+الاستخدام:
+    python benchmarks/bench_backends.py --archive-dir .html_archive --repeat 5
+    python benchmarks/bench_backends.py --dahua page.html --backends bs4 lxml selectolax
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from security_cameras_scraper.scrapers.hikvision_scraper import HikvisionScraper
+from security_cameras_scraper.scrapers.dahua_scraper import DahuaScraper
+from security_cameras_scraper.scrapers.registry import ManufacturerRegistry
+from security_cameras_scraper.utils.archive_utils import HtmlArchive
+from security_cameras_scraper.utils.parser_backends import available_backends
+
+from bench_dahua_tables import synthetic_page as synthetic_dahua_page
+
+SCRAPERS = {
+    "hikvision": HikvisionScraper,
+    "dahua": DahuaScraper,
+}
+
+
+def synthetic_hikvision_page(sections=10, rows_per_section=30):
+    """بناء صفحة Hikvision اصطناعية بقوائم مواصفات وعناوين فرعية."""
+    parts = [
+        '<html><body><nav>' + "".join(f'<a href="/p{i}">Item {i}</a>' for i in range(200)) + '</nav>'
+        '<div class="product_description_title_tag_container"><div class="product_description_title">'
+        '<h2>DS-2CD2043G2-I</h2></div></div>'
+        '<div><div class="product-description-container"><div><h1>Network Camera</h1></div></div></div>'
+    ]
+
+    for s in range(sections):
+        parts.append(f'<ul class="tech-specs-items-description" data-target="Section {s}">')
+        for r in range(rows_per_section):
+            if r % 10 == 0:
+                parts.append('<li class="tech-specs-items-description-list">'
+                             f'<span class="tech-specs-items-description__title--heading">Group {r}</span></li>')
+            parts.append('<li class="tech-specs-items-description-list">'
+                         f'<span class="tech-specs-items-description__title">Key {s}.{r}</span>'
+                         f'<span class="tech-specs-items-description__title-details"> Value <b>{r}</b> </span></li>')
+        parts.append("</ul>")
+
+    parts.append("</body></html>")
+    return "".join(parts).encode("utf-8")
+
+
+def load_pages(args):
+    """تحميل الصفحات: قائمة (الشركة، الرابط، المحتوى، الترميز)."""
+    pages = []
+
+    if args.archive_dir:
+        registry = ManufacturerRegistry(builtins=True)
+        with HtmlArchive(args.archive_dir) as archive:
+            for url in archive.urls():
+                vendor = registry.lookup(url)
+                result = archive.read(url) if vendor in SCRAPERS else None
+                if result is not None:
+                    pages.append((vendor, url, result[0], result[1]))
+
+    for vendor in SCRAPERS:
+        for path in getattr(args, vendor) or []:
+            with open(path, "rb") as f:
+                pages.append((vendor, path, f.read(), None))
+
+    if not pages:
+        print("لا توجد صفحات مسجلة، سيتم استخدام صفحات اصطناعية")
+        pages.append(("hikvision", "synthetic", synthetic_hikvision_page(), "utf-8"))
+        pages.extend(("dahua", url, content, encoding) for url, content, encoding in synthetic_dahua_page())
+
+    return pages
+
+
+def run(scraper, pages, repeat):
+    """تشغيل المستخرج على الصفحات وإرجاع الزمن الكلي والنتائج."""
+    results = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = [scraper.extract(content, url, encoding) for url, content, encoding in pages]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="مقارنة محركات تحليل HTML")
+    parser.add_argument("--archive-dir", help="مجلد أرشيف HtmlArchive")
+    parser.add_argument("--hikvision", nargs="*", help="ملفات HTML لصفحات Hikvision")
+    parser.add_argument("--dahua", nargs="*", help="ملفات HTML لصفحات Dahua")
+    parser.add_argument("--backends", nargs="*", help="المحركات المراد مقارنتها (الافتراضي: جميع المتوفرة)")
+    parser.add_argument("--repeat", type=int, default=5, help="عدد مرات تكرار كل صفحة")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    backends = args.backends or available_backends()
+    pages = load_pages(args)
+
+    for vendor, scraper_class in SCRAPERS.items():
+        vendor_pages = [(url, content, encoding) for v, url, content, encoding in pages if v == vendor]
+        if not vendor_pages:
+            continue
+
+        print(f"\n{vendor}: {len(vendor_pages)} صفحة × {args.repeat}")
+        reference = None
+        for backend in backends:
+            elapsed, results = run(scraper_class(backend=backend), vendor_pages, args.repeat)
+            if reference is None:
+                reference = results
+            mismatches = sum(1 for a, b in zip(results, reference) if a != b)
+            status = "مطابق" if not mismatches else f"{mismatches} صفحة غير مطابقة"
+            rate = len(vendor_pages) * args.repeat / elapsed
+            print(f"  {backend:<11} {rate:9.1f} صفحة/ثانية  {elapsed * 1000:9.1f} ms  {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+# الملف: benchmarks/bench_dahua_tables.py
+
+"""
+قياس سرعة تحليل جداول مواصفات Dahua (صف/ثانية) قبل إعادة كتابة المحلل وبعدها.
+
+يقارن ثلاثة تنفيذات ويتحقق من تطابق مخرجاتها:
+    legacy: التنفيذ السابق (استخراج نص الخلية عدة مرات داخل list comprehensions).
+    bs4:    المحلل الخطي الحالي على BeautifulSoup.
+    lxml:   المحلل الخطي الحالي على lxml مباشرة.
+
+مصادر الصفحات بالترتيب: أرشيف HtmlArchive (--archive-dir)، ملفات HTML (--html)،
+وإلا صفحة اصطناعية تحاكي صفحة Dahua بجداول DORI.
+
+الاستخدام:
+    python benchmarks/bench_dahua_tables.py --archive-dir .html_archive
+    python benchmarks/bench_dahua_tables.py --html page1.html page2.html --repeat 20
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+from typing import Any, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from security_cameras_scraper.scrapers.dahua_scraper import DahuaScraper
+from security_cameras_scraper.utils.archive_utils import HtmlArchive
+from security_cameras_scraper.utils.html_utils import extract_text
+from security_cameras_scraper.utils.data_utils import clean_text
+from security_cameras_scraper.utils import lxml_utils
+
+logger = logging.getLogger(__name__)
+
+
+class LegacyDahuaScraper(DahuaScraper):
+    """نسخة مرجعية من محلل الجداول قبل إعادة كتابته (للمقارنة فقط)."""
+
+    def _extract_technical_specifications(self, soup: BeautifulSoup, data: Dict[str, Any]) -> None:
+        """
+        استخراج المواصفات التقنية للمنتج.
+        
+        المعاملات:
+            soup (BeautifulSoup): كائن BeautifulSoup.
+            data (Dict[str, Any]): قاموس البيانات للتحديث.
+        """
+        # البحث عن جميع الجداول في الصفحة
+        tables = soup.find_all("table")
+        
+        if not tables:
+            logger.warning("لم يتم العثور على جداول للمواصفات")
+            return
+            
+        logger.info(f"تم العثور على {len(tables)} جدول في صفحة Dahua")
+        
+        current_section = None
+        current_key = None
+        table_headers = {}  # قاموس لتخزين رؤوس الأعمدة لكل مفتاح
+        
+        for table in tables:
+            rows = table.find_all("tr")
+            
+            for row in rows:
+                cells = row.find_all("td")
+                
+                # تجاهل الصفوف الفارغة
+                if not cells:
+                    continue
+                
+                # إذا كان هناك عمود واحد فقط
+                if len(cells) == 1:
+                    cell_text = extract_text(cells[0])
+                    
+                    # تحقق ما إذا كان النص هو اسم قسم أو فقرة شرحية
+                    if "DORI" in cell_text and any(keyword in cell_text.lower() for keyword in ["standard system", "ability", "distinguish", "en-62676-4"]):
+                        # تجاهل الفقرات الشرحية
+                        continue
+                    elif len(cell_text) > 100:  # فقرة طويلة غالباً تكون شرحية
+                        # تجاهل الفقرات الشرحية الطويلة
+                        continue
+                    else:
+                        # هذا قسم رئيسي جديد
+                        current_section = clean_text(cell_text)
+                        if current_section not in data:
+                            data[current_section] = {}
+                        current_key = None
+                
+                # إذا كان أول `<td>` يحتوي على `rowspan`، فهو مفتاح جديد
+                elif len(cells) > 1 and cells[0].has_attr("rowspan"):
+                    current_key = clean_text(extract_text(cells[0]))
+                    
+                    # استخراج رؤوس الأعمدة من الصف الأول
+                    headers = [
+                        clean_text(extract_text(cell)) 
+                        for cell in cells 
+                        if not cell.has_attr("rowspan") and not extract_text(cell).startswith("DORI")
+                    ]
+                    
+                    # تخزين رؤوس الأعمدة في قاموس منفصل للاستخدام لاحقاً
+                    if current_section and current_key:
+                        table_headers[f"{current_section}_{current_key}"] = headers
+                        
+                        # إنشاء قائمة فارغة لتخزين صفوف البيانات
+                        data[current_section][current_key] = []
+                
+                # إذا كان هناك `colspan` في الصف، فهذا يعني أنه تابع للمفتاح `rowspan` الحالي
+                elif any(cell.has_attr("colspan") for cell in cells) and current_section and current_key:
+                    header_key = f"{current_section}_{current_key}"
+                    
+                    if header_key in table_headers:
+                        values = [
+                            clean_text(extract_text(cell)) 
+                            for cell in cells 
+                            if cell.has_attr("colspan") and not extract_text(cell).startswith("DORI")
+                        ]
+                        
+                        # استرجاع رؤوس الأعمدة للمفتاح الحالي
+                        headers = table_headers[header_key]
+                        row_dict = {}
+                        
+                        # دمج رؤوس الأعمدة مع القيم المقابلة لها
+                        for i, value in enumerate(values):
+                            if i < len(headers):
+                                row_dict[headers[i]] = value
+                            else:
+                                row_dict[f"column_{i}"] = value
+                        
+                        # إضافة الصف المنسق إلى قائمة صفوف البيانات
+                        if row_dict:
+                            data[current_section][current_key].append(row_dict)
+                
+                # إذا لم يكن هناك `rowspan` أو `colspan`، فهو مفتاح عادي مع قيمة
+                elif len(cells) == 2 and current_section:
+                    key = clean_text(extract_text(cells[0]))
+                    value = clean_text(extract_text(cells[1]))
+                    
+                    if key and current_section in data:
+                        data[current_section][key] = value
+        
+        # تنظيف البيانات بعد الاستخراج
+        self._clean_data_structure(data)
+
+
+def load_archive_pages(archive_dir):
+    """تحميل صفحات Dahua المؤرشفة."""
+    pages = []
+    with HtmlArchive(archive_dir) as archive:
+        for url in archive.urls():
+            if "dahua" not in url:
+                continue
+            result = archive.read(url)
+            if result is not None:
+                pages.append((url, result[0], result[1]))
+    return pages
+
+
+def load_html_files(paths):
+    """تحميل صفحات من ملفات HTML."""
+    pages = []
+    for path in paths:
+        with open(path, "rb") as f:
+            pages.append((path, f.read(), None))
+    return pages
+
+
+def synthetic_page(sections=12, rows_per_section=25, dori_tables=4):
+    """بناء صفحة اصطناعية بجداول مواصفات وجداول DORI."""
+    parts = ['<html><body><div class="el-row"><h3 class="title">HAC-HFW1200TH</h3>'
+             '<p class="text">HDCVI Camera</p></div>']
+
+    for s in range(sections):
+        parts.append(f"<table><tr><td>Section {s}</td></tr>")
+        for r in range(rows_per_section):
+            parts.append(f"<tr><td>Key {s}.{r}</td><td> Value  {r} <b>unit</b> </td></tr>")
+        parts.append("</table>")
+
+    for d in range(dori_tables):
+        parts.append("<table><tr><td>DORI Distance</td></tr>")
+        parts.append('<tr><td>DORI Distance (EN-62676-4): the ability to distinguish objects...</td></tr>')
+        parts.append(f'<tr><td rowspan="5">Lens {d}</td><td>Detect</td><td>Observe</td>'
+                     '<td>Recognize</td><td>Identify</td></tr>')
+        for r in range(4):
+            parts.append("".join(f'<td colspan="1">{(c + 1) * (r + 1)} m</td>' for c in range(4)).join(("<tr>", "</tr>")))
+        parts.append("</table>")
+
+    parts.append("</body></html>")
+    return [("synthetic", "".join(parts).encode("utf-8"), "utf-8")]
+
+
+def count_rows(content, encoding):
+    """عدد صفوف الجداول في الصفحة (كما يمر عليها المحلل)."""
+    root = lxml_utils.parse_html(content, encoding)
+    return sum(1 for table in root.iter("table") for _ in table.iterdescendants("tr"))
+
+
+def bench(scraper, pages, repeat):
+    """تشغيل الاستخراج على الصفحات وإرجاع الزمن الكلي والنتائج."""
+    results = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = [scraper.extract(content, url, encoding) for url, content, encoding in pages]
+    return time.perf_counter() - start, results
+
+
+def bench_tables_only(scraper, soups, repeat):
+    """قياس مرحلة الجداول فقط على صفحات محللة مسبقًا (دون زمن التحليل)."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for soup in soups:
+            scraper._extract_technical_specifications(soup, {})
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="قياس سرعة تحليل جداول Dahua")
+    parser.add_argument("--archive-dir", help="مجلد أرشيف HtmlArchive يحتوي صفحات Dahua")
+    parser.add_argument("--html", nargs="*", default=[], help="ملفات HTML لصفحات Dahua")
+    parser.add_argument("--repeat", type=int, default=10, help="عدد مرات تكرار كل صفحة")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    pages = []
+    if args.archive_dir:
+        pages.extend(load_archive_pages(args.archive_dir))
+    pages.extend(load_html_files(args.html))
+    if not pages:
+        print("لا توجد صفحات مسجلة، سيتم استخدام صفحة اصطناعية")
+        pages = synthetic_page()
+
+    rows = sum(count_rows(content, encoding) for _, content, encoding in pages) * args.repeat
+    print(f"الصفحات: {len(pages)}، الصفوف في كل تكرار: {rows // args.repeat}، التكرارات: {args.repeat}")
+
+    scrapers = {
+        "legacy": LegacyDahuaScraper(),
+        "bs4": DahuaScraper(),
+        "lxml": DahuaScraper(engine="lxml"),
+    }
+
+    reference = None
+    for name, scraper in scrapers.items():
+        elapsed, results = bench(scraper, pages, args.repeat)
+        if reference is None:
+            reference = results
+        status = "مطابق" if results == reference else "غير مطابق!"
+        print(f"{name:<7} {rows / elapsed:12,.0f} صف/ثانية  {elapsed * 1000:9.1f} ms  {status}")
+
+    # مرحلة الجداول وحدها على نفس شجرة BeautifulSoup
+    soups = [BeautifulSoup(content, "lxml", from_encoding=encoding) for _, content, encoding in pages]
+    print("\nمرحلة الجداول فقط (BeautifulSoup محللة مسبقًا):")
+    for name in ("legacy", "bs4"):
+        elapsed = bench_tables_only(scrapers[name], soups, args.repeat)
+        print(f"{name:<7} {rows / elapsed:12,.0f} صف/ثانية  {elapsed * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
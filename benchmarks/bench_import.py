@@ -0,0 +1,104 @@
+# الملف: benchmarks/bench_import.py
+
+"""
+قياس زمن استيراد المكتبة وإنشاء المستخرج في عملية Python جديدة.
+
+يستخدم الخيار -X importtime لعرض أبطأ الوحدات المستوردة، ويتحقق من المكتبات
+الثقيلة التي تم تحميلها قبل الحاجة إليها: ينتهي السكربت برمز 1 إذا حمل الاستيراد أو
+إنشاء المستخرج أيًا منها، فيمكن تشغيله في CI لحماية التحميل الكسول.
+
+الاستخدام:
+    python benchmarks/bench_import.py [--runs 5] [--top 10]
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# المكتبات التي لا يجب تحميلها عند الاستيراد
+HEAVY_MODULES = ('bs4', 'lxml', 'pandas', 'requests', 'aiohttp')
+
+SNIPPETS = {
+    'import': "import security_cameras_scraper",
+    'construct': "import security_cameras_scraper as s; s.CameraScraper()",
+    'detect': (
+        "import security_cameras_scraper as s; "
+        "s.CameraScraper().detect_manufacturer('https://www.hikvision.com/en/products/x')"
+    ),
+}
+
+
+def run_snippet(code: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    """تشغيل مقطع كود في عملية جديدة."""
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", code]
+    return subprocess.run(
+        command,
+        cwd=ROOT_DIR,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True
+    )
+
+
+def time_snippet(code: str, runs: int) -> float:
+    """متوسط زمن تشغيل المقطع بالمللي ثانية (شاملاً بدء المفسر)."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        run_snippet(code)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def slowest_imports(code: str, top: int):
+    """أبطأ الوحدات المستوردة (الزمن التراكمي بالمللي ثانية)."""
+    stderr = run_snippet(code, importtime=True).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative) / 1000, name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="قياس زمن استيراد المكتبة")
+    parser.add_argument("--runs", type=int, default=5, help="عدد مرات التشغيل لكل مقطع")
+    parser.add_argument("--top", type=int, default=10, help="عدد الوحدات الأبطأ المعروضة")
+    args = parser.parse_args()
+
+    baseline = time_snippet("pass", args.runs)
+    print(f"بدء المفسر فقط: {baseline:.1f} ms")
+
+    for name, code in SNIPPETS.items():
+        elapsed = time_snippet(code, args.runs)
+        print(f"{name:<10} {elapsed:8.1f} ms  (+{elapsed - baseline:.1f} ms)")
+
+    loaded = run_snippet(
+        SNIPPETS['detect'] + "; import sys; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    ).stdout.strip()
+    print(f"المكتبات الثقيلة المحملة: {loaded or 'لا شيء'}")
+
+    print(f"\nأبطأ {args.top} وحدات عند الاستيراد:")
+    for cumulative, name in slowest_imports(SNIPPETS['construct'], args.top):
+        print(f"{cumulative:8.1f} ms  {name}")
+
+    if loaded:
+        print(f"\nخطأ: تم تحميل مكتبات ثقيلة قبل الحاجة إليها: {loaded}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
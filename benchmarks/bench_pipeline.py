@@ -0,0 +1,87 @@
+# الملف: benchmarks/bench_pipeline.py
+
+"""
+مقارنة الاستخراج في الخيوط (scrape_multiple) بخط الاسترجاع/التحليل (scrape_pipelined).
+
+يبني أرشيف HtmlArchive مؤقتًا بصفحات Hikvision و Dahua اصطناعية بروابط مختلفة ثم
+يستخرجها في وضع الإعادة (دون شبكة)، بحيث يقيس الفرق في مرحلة التحليل فقط. تظهر
+الفائدة بقدر عدد أنوية المعالج المتاحة لعمليات التحليل.
+
+الاستخدام:
+    python benchmarks/bench_pipeline.py --pages 400 --parse-workers 4
+    python benchmarks/bench_pipeline.py --pages 400 --max-pages-per-worker 50
+"""
+
+import os
+import sys
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from security_cameras_scraper import CameraScraper
+from security_cameras_scraper.utils.archive_utils import HtmlArchive
+
+from bench_backends import synthetic_hikvision_page
+from bench_dahua_tables import synthetic_page as synthetic_dahua_page
+
+
+def build_archive(archive_dir, count):
+    """تخزين count صفحة اصطناعية في الأرشيف وإرجاع روابطها."""
+    hikvision = synthetic_hikvision_page()
+    dahua = synthetic_dahua_page()[0][1]
+    urls = []
+
+    with HtmlArchive(archive_dir) as archive:
+        for i in range(count):
+            if i % 2:
+                url = f"https://www.dahuasecurity.com/bench/{i}"
+                archive.store(url, dahua, encoding="utf-8")
+            else:
+                url = f"https://www.hikvision.com/bench/{i}"
+                archive.store(url, hikvision, encoding="utf-8")
+            urls.append(url)
+
+    return urls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="مقارنة الاستخراج في الخيوط بخط الاسترجاع/التحليل")
+    parser.add_argument("--pages", type=int, default=200, help="عدد الصفحات")
+    parser.add_argument("--fetch-workers", type=int, default=4, help="عدد خيوط الاسترجاع")
+    parser.add_argument("--parse-workers", type=int, default=None, help="عدد عمليات التحليل")
+    parser.add_argument("--max-pages-per-worker", type=int, default=None, help="إعادة تدوير العمليات بعد عدد صفحات")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    archive_dir = tempfile.mkdtemp()
+
+    try:
+        urls = build_archive(archive_dir, args.pages)
+        print(f"{len(urls)} صفحة، {os.cpu_count()} نواة")
+
+        with CameraScraper(archive_dir=archive_dir, replay=True) as scraper:
+            start = time.perf_counter()
+            threaded = scraper.scrape_multiple(urls, max_workers=args.fetch_workers)
+            elapsed = time.perf_counter() - start
+            print(f"  threads     {len(urls) / elapsed:9.1f} صفحة/ثانية  {elapsed * 1000:9.1f} ms")
+
+            start = time.perf_counter()
+            pipelined = dict(scraper.scrape_pipelined(
+                urls,
+                fetch_workers=args.fetch_workers,
+                parse_workers=args.parse_workers,
+                max_pages_per_worker=args.max_pages_per_worker
+            ))
+            elapsed = time.perf_counter() - start
+            status = "مطابق" if pipelined == threaded else "غير مطابق"
+            print(f"  pipelined   {len(urls) / elapsed:9.1f} صفحة/ثانية  {elapsed * 1000:9.1f} ms  {status}")
+    finally:
+        shutil.rmtree(archive_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -27,6 +27,56 @@ def setup_argparse():
     parser.add_argument('--output', type=str, default='output', help='مجلد الإخراج (الافتراضي: output)')
     parser.add_argument('--format', type=str, choices=['json', 'csv', 'excel', 'all'], default='json',
                        help='تنسيق الإخراج (الافتراضي: json)')
+    parser.add_argument('--cache-dir', type=str, default=None,
+                       help='مجلد ذاكرة التخزين المؤقت لصفحات HTTP لتجنب إعادة تنزيلها (اختياري)')
+    parser.add_argument('--cache-ttl', type=float, default=86400,
+                       help='مدة صلاحية الصفحات المخزنة بالثواني قبل إعادة التحقق منها (الافتراضي: 86400)')
+    parser.add_argument('--archive-dir', type=str, default=None,
+                       help='مجلد أرشيف الصفحات الخام المضغوطة (اختياري)')
+    parser.add_argument('--replay', action='store_true',
+                       help='قراءة الصفحات من الأرشيف بدلاً من الشبكة (يتطلب --archive-dir)')
+    parser.add_argument('--job-db', type=str, default=None,
+                       help='ملف SQLite لحفظ حالة كل رابط بحيث يمكن استئناف التشغيل بعد توقفه (اختياري)')
+    parser.add_argument('--resume', action='store_true',
+                       help='استئناف الروابط غير المكتملة في --job-db دون الحاجة إلى --file')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='عدد الروابط التي تتم معالجتها بالتوازي (الافتراضي: 1)')
+    parser.add_argument('--shard-dir', type=str, default=None,
+                       help='وضع التوزيع: كتابة نتائج هذا العامل إلى ملف خاص به في هذا المجلد المشترك (مع --job-db)')
+    parser.add_argument('--shared-db', action='store_true',
+                       help='ملف --job-db على تخزين مشترك بين عدة أجهزة (يعطل وضع WAL)')
+    parser.add_argument('--per-host-limit', type=int, default=None,
+                       help='الحد الأقصى للطلبات المتزامنة لكل شركة مصنعة من هذا الجهاز (اختياري)')
+    parser.add_argument('--rate-limit', type=float, default=None,
+                       help='الحد الأقصى لعدد الطلبات في الثانية لكل شركة مصنعة (اختياري)')
+    parser.add_argument('--respect-crawl-delay', action='store_true',
+                       help='احترام Crawl-delay في robots.txt لكل موقع')
+    parser.add_argument('--adaptive', action='store_true',
+                       help='تعديل عدد الطلبات المتزامنة لكل شركة تلقائيًا حسب زمن الاستجابة والازدحام')
+    parser.add_argument('--max-retries', type=int, default=2,
+                       help='عدد مرات إعادة المحاولة للأخطاء المؤقتة (الافتراضي: 2)')
+    parser.add_argument('--hedge', action='store_true',
+                       help='إرسال طلب احتياطي للصفحات التي تتجاوز p95 زمن استجابة موقعها')
+    parser.add_argument('--deadline', type=float, default=None,
+                       help='المدة القصوى للتشغيل بالثواني؛ تتوقف الروابط التي لم تكتمل بعدها (اختياري)')
+    parser.add_argument('--locales', type=str, default='en',
+                       help='اللغات المفضلة مفصولة بفواصل لاختيار رابط واحد لكل طراز (الافتراضي: en)')
+    parser.add_argument('--fetch-locales', type=str, default='',
+                       help='لغات تطلب صفحاتها بشكل منفصل عن اللغة المفضلة، مفصولة بفواصل (اختياري)')
+    parser.add_argument('--all-locales', action='store_true',
+                       help='طلب صفحة كل لغة بدلاً من رابط واحد لكل طراز')
+    parser.add_argument('--discover', nargs='*', default=None, metavar='SEED',
+                       help='اكتشاف روابط المنتجات من ملفات sitemap وصفحات الفئات ثم استخراجها '
+                            '(نقاط البداية الافتراضية: مواقع الشركات المدعومة)')
+    parser.add_argument('--max-depth', type=int, default=3,
+                       help='أقصى عمق لصفحات الفئات أثناء الاكتشاف (الافتراضي: 3)')
+    parser.add_argument('--recrawl', type=str, default=None, metavar='STATE_DB',
+                       help='إعادة زحف تزايدية: طلب المنتجات الجديدة أو المتغيرة فقط حسب lastmod في ملفات sitemap، '
+                            'مع حفظ الحالة في ملف SQLite (ملفات sitemap من --discover أو الافتراضية)')
+    parser.add_argument('--recrawl-ttl', type=float, default=7 * 86400,
+                       help='مدة إعادة زيارة الروابط التي ليس لها lastmod بالثواني (الافتراضي: أسبوع)')
+    parser.add_argument('--merge-shards', type=str, default=None, metavar='OUTPUT',
+                       help='دمج ملفات نتائج العمال في --shard-dir في ملف JSON واحد ثم الخروج')
     
     return parser.parse_args()
 
@@ -36,17 +86,8 @@ def ensure_output_dir(output_dir):
         os.makedirs(output_dir)
         logger.info(f"تم إنشاء مجلد الإخراج: {output_dir}")
 
-def process_url(url, scraper, output_dir, output_format):
-    """معالجة رابط منتج واحد."""
-    logger.info(f"جاري استخراج بيانات المنتج من: {url}")
-    
-    # استخراج البيانات
-    data = scraper.scrape(url)
-    
-    if not data:
-        logger.warning(f"لم يتم استخراج أي بيانات من: {url}")
-        return
-    
+def export_result(url, data, scraper, output_dir, output_format):
+    """تصدير نتيجة رابط واحد بالتنسيق المطلوب."""
     # استخراج اسم ملف الإخراج من الرابط
     filename = url.split('/')[-2] if url.endswith('/') else url.split('/')[-1]
     filename = filename.replace('=', '_')  # استبدال الأحرف غير الصالحة لاسم الملف
@@ -67,24 +108,43 @@ def process_url(url, scraper, output_dir, output_format):
         if scraper.export_to_excel(data, output_file):
             logger.info(f"تم تصدير البيانات إلى: {output_file}")
 
-def process_file(file_path, scraper, output_dir, output_format):
-    """معالجة ملف يحتوي على قائمة روابط."""
+def process_url(url, scraper, output_dir, output_format):
+    """معالجة رابط منتج واحد."""
+    logger.info(f"جاري استخراج بيانات المنتج من: {url}")
+    
+    # استخراج البيانات
+    data = scraper.scrape(url)
+    
+    if not data:
+        logger.warning(f"لم يتم استخراج أي بيانات من: {url}")
+        return
+    
+    export_result(url, data, scraper, output_dir, output_format)
+
+def read_urls(file_path):
+    """قراءة الروابط من ملف نصي (رابط واحد في كل سطر)."""
     if not os.path.exists(file_path):
         logger.error(f"الملف غير موجود: {file_path}")
-        return
+        return []
     
-    # قراءة الروابط من الملف
     with open(file_path, 'r', encoding='utf-8') as f:
         urls = [line.strip() for line in f if line.strip()]
     
     if not urls:
         logger.warning(f"لا توجد روابط في الملف: {file_path}")
-        return
+    else:
+        logger.info(f"تم العثور على {len(urls)} رابط في الملف")
     
-    logger.info(f"تم العثور على {len(urls)} رابط في الملف")
+    return urls
+
+def process_file(file_path, scraper, output_dir, output_format, workers=1, deadline=None):
+    """معالجة ملف يحتوي على قائمة روابط."""
+    urls = read_urls(file_path)
+    if not urls:
+        return
     
     # استخراج البيانات من جميع الروابط
-    results = scraper.scrape_multiple(urls)
+    results = scraper.scrape_multiple(urls, max_workers=workers, deadline=deadline)
     
     # تصدير نتيجة كل منتج إلى ملف منفصل
     for url, data in results.items():
@@ -92,25 +152,7 @@ def process_file(file_path, scraper, output_dir, output_format):
             logger.warning(f"خطأ في استخراج البيانات من {url}: {data['error']}")
             continue
         
-        # استخراج اسم ملف الإخراج من الرابط
-        filename = url.split('/')[-2] if url.endswith('/') else url.split('/')[-1]
-        filename = filename.replace('=', '_')  # استبدال الأحرف غير الصالحة لاسم الملف
-        
-        # تصدير البيانات بالتنسيق المطلوب
-        if output_format in ['json', 'all']:
-            output_file = os.path.join(output_dir, f"{filename}.json")
-            if scraper.export_to_json(data, output_file):
-                logger.info(f"تم تصدير البيانات إلى: {output_file}")
-        
-        if output_format in ['csv', 'all']:
-            output_file = os.path.join(output_dir, f"{filename}.csv")
-            if scraper.export_to_csv(data, output_file):
-                logger.info(f"تم تصدير البيانات إلى: {output_file}")
-        
-        if output_format in ['excel', 'all']:
-            output_file = os.path.join(output_dir, f"{filename}.xlsx")
-            if scraper.export_to_excel(data, output_file):
-                logger.info(f"تم تصدير البيانات إلى: {output_file}")
+        export_result(url, data, scraper, output_dir, output_format)
     
     # تصدير جميع البيانات إلى ملف واحد متعدد الأوراق
     if output_format in ['excel', 'all']:
@@ -119,23 +161,137 @@ def process_file(file_path, scraper, output_dir, output_format):
         if export_multi_sheet_excel(results, output_file):
             logger.info(f"تم تصدير جميع البيانات إلى: {output_file}")
 
+def process_discovery(seeds, scraper, output_dir, output_format, workers=1, max_depth=3,
+                      per_host_limit=None, deadline=None):
+    """اكتشاف روابط المنتجات واستخراج كل منتج فور اكتشافه."""
+    from security_cameras_scraper.discovery import CatalogCrawler, DEFAULT_SEEDS
+    
+    crawler = CatalogCrawler(scraper, max_depth=max_depth, max_workers=max(workers, 4))
+    for url, data in crawler.crawl(seeds or DEFAULT_SEEDS, max_workers=workers,
+                                   per_host_limit=per_host_limit, deadline=deadline):
+        if 'error' in data:
+            logger.warning(f"خطأ في استخراج البيانات من {url}: {data['error']}")
+            continue
+        export_result(url, data, scraper, output_dir, output_format)
+    
+    report = crawler.report()
+    logger.info(f"الاكتشاف: {report['products']} منتج، {report['sitemaps']} ملف sitemap، "
+                f"{report['listings']} صفحة فئة، {report['duplicates']} رابط مكرر، {report['failed']} صفحة فاشلة")
+
+def process_recrawl(state_db, sitemaps, scraper, output_dir, output_format, workers=1, ttl=None,
+                    per_host_limit=None, deadline=None):
+    """تحديث الكتالوج بطلب المنتجات الجديدة أو المتغيرة فقط وتصدير ما تغير منها."""
+    from security_cameras_scraper.discovery import DEFAULT_SEEDS, IncrementalRecrawler, RecrawlState, is_sitemap_url
+    
+    sitemaps = sitemaps or [seed for seed in DEFAULT_SEEDS if is_sitemap_url(seed)]
+    with RecrawlState(state_db) as state:
+        recrawler = IncrementalRecrawler(scraper, state, ttl=ttl, max_workers=max(workers, 4))
+        for url, data in recrawler.run(sitemaps, max_workers=workers, per_host_limit=per_host_limit,
+                                       deadline=deadline):
+            export_result(url, data, scraper, output_dir, output_format)
+    
+    report = recrawler.report()
+    logger.info(f"إعادة الزحف: {report['due']} طلب من {report['listed']} منتج معلن؛ "
+                f"{report['new']} جديد، {report['changed']} متغير، {report['unchanged']} دون تغيير، "
+                f"{report['failed']} فاشل")
+
+def process_job(job_db, file_path, scraper, output_dir, output_format, workers=1,
+                shard_dir=None, shared_db=False, per_host_limit=None, deadline=None):
+    """
+    معالجة الروابط عبر مخزن مهام دائم بحيث يمكن استئنافها بعد أي توقف.
+    
+    تصدر كل نتيجة فور اكتمالها، ولا يتم إنشاء ملف Excel المجمع لأنه يحتاج جميع النتائج معًا.
+    مع shard_dir يعمل البرنامج كعامل في وضع التوزيع ويكتب نتائجه في ملف خاص به.
+    """
+    from security_cameras_scraper.jobs import JobStore, run_jobs, run_worker
+    
+    with JobStore(job_db, journal_mode="DELETE" if shared_db else "WAL") as store:
+        if file_path:
+            store.add(read_urls(file_path))
+        
+        if shard_dir:
+            summary = run_worker(scraper, store, shard_dir, max_workers=workers, per_host_limit=per_host_limit,
+                                 deadline=deadline)
+        else:
+            summary = run_jobs(
+                scraper,
+                store,
+                on_result=lambda url, data: export_result(url, data, scraper, output_dir, output_format),
+                max_workers=workers,
+                per_host_limit=per_host_limit,
+                deadline=deadline
+            )
+        counts = store.counts()
+    
+    logger.info(
+        f"هذا التشغيل: {summary['done']} مكتمل، {summary['failed']} محاولة فاشلة. "
+        f"الإجمالي: {counts['done']} مكتمل، {counts['pending'] + counts['in_flight']} متبق، "
+        f"{counts['failed']} فاشل"
+    )
+
 def main():
     """الدالة الرئيسية."""
     args = setup_argparse()
     
+    # دمج نتائج العمال فقط
+    if args.merge_shards:
+        if not args.shard_dir:
+            logger.error("الدمج (--merge-shards) يتطلب تحديد مجلد النتائج (--shard-dir)")
+            return
+        from security_cameras_scraper.jobs import merge_shards
+        count = merge_shards(args.shard_dir, args.merge_shards)
+        logger.info(f"تم دمج {count} نتيجة في: {args.merge_shards}")
+        return
+    
     # التأكد من وجود مجلد الإخراج
     ensure_output_dir(args.output)
     
     # إنشاء كائن CameraScraper
-    scraper = CameraScraper()
+    scraper = CameraScraper(
+        cache_dir=args.cache_dir,
+        cache_ttl=args.cache_ttl,
+        archive_dir=args.archive_dir,
+        replay=args.replay,
+        rate_limit=args.rate_limit,
+        respect_crawl_delay=args.respect_crawl_delay,
+        adaptive_concurrency=args.adaptive,
+        max_retries=args.max_retries,
+        hedge_requests=args.hedge,
+        preferred_locales=[locale for locale in args.locales.split(',') if locale],
+        dedupe_locales=not args.all_locales,
+        fetch_locales=[locale for locale in args.fetch_locales.split(',') if locale]
+    )
     
-    # معالجة الرابط أو الملف
+    # معالجة الرابط أو الملف أو مخزن المهام
     if args.url:
         process_url(args.url, scraper, args.output, args.format)
+    elif args.recrawl:
+        process_recrawl(args.recrawl, args.discover, scraper, args.output, args.format, args.workers,
+                        args.recrawl_ttl, args.per_host_limit, args.deadline)
+    elif args.discover is not None:
+        process_discovery(args.discover, scraper, args.output, args.format, args.workers, args.max_depth,
+                          args.per_host_limit, args.deadline)
+    elif args.job_db and (args.file or args.resume):
+        process_job(args.job_db, args.file, scraper, args.output, args.format, args.workers,
+                    args.shard_dir, args.shared_db, args.per_host_limit, args.deadline)
+    elif args.resume:
+        logger.error("الاستئناف (--resume) يتطلب تحديد مخزن المهام (--job-db)")
     elif args.file:
-        process_file(args.file, scraper, args.output, args.format)
+        process_file(args.file, scraper, args.output, args.format, args.workers, args.deadline)
     else:
-        logger.error("يرجى تحديد رابط منتج (--url) أو ملف يحتوي على روابط (--file)")
+        logger.error("يرجى تحديد رابط منتج (--url) أو ملف يحتوي على روابط (--file) أو الاكتشاف (--discover)")
+    
+    # الحدود التي وصل إليها التزامن المتكيف لكل موقع
+    for host, metrics in scraper.concurrency_metrics().items():
+        logger.info(f"التزامن على {host}: الحد {metrics['limit']}، الطلبات {metrics['requests']}، "
+                    f"الازدحام {metrics['throttled']}، p95 {metrics['p95']}")
+    
+    # أثر الطلبات الاحتياطية على زمن الاستجابة الطرفي
+    report = scraper.hedge_report()
+    if report.get("requests"):
+        logger.info(f"الطلبات الاحتياطية: {report['hedged']} من {report['requests']} طلب، "
+                    f"فاز منها {report['hedge_wins']}. p99 {report['p99']} "
+                    f"(دونها تقديريًا {report['unhedged_p99']})، الوقت الموفر {report['saved_seconds']} ثانية")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -6,17 +6,17 @@
 """
 
 from security_cameras_scraper import CameraScraper
+from security_cameras_scraper.export.json_exporter import JsonStreamWriter, load_json
 import os
 import time
-import json
 from datetime import datetime
 
 def main():
     """الدالة الرئيسية."""
     
-    # إنشاء كائن CameraScraper
+    # إنشاء كائن CameraScraper مع ذاكرة تخزين مؤقت لتجنب إعادة تنزيل الصفحات عند كل تشغيل
     print("إنشاء مستخرج الكاميرا...")
-    scraper = CameraScraper()
+    scraper = CameraScraper(cache_dir=".http_cache")
     
     # قائمة روابط المنتجات
     urls = [
@@ -32,62 +32,59 @@ def main():
         os.makedirs(output_dir)
         print(f"\nتم إنشاء مجلد الإخراج: {output_dir}")
     
-    # استخراج البيانات من كل رابط
+    # استخراج البيانات من الروابط بالتوازي، مع معالجة نتيجة كل رابط فور اكتماله
     print(f"\nبدء استخراج البيانات من {len(urls)} رابط...")
     
-    all_data = {}
+    # تكتب النتائج إلى ملف واحد تدريجيًا بدلاً من جمعها في الذاكرة
+    all_data_path = os.path.join(output_dir, "all_cameras.json")
+    start_time = time.time()
     
-    for i, url in enumerate(urls, 1):
-        print(f"\n[{i}/{len(urls)}] جاري استخراج البيانات من: {url}")
-        
-        try:
-            # استخراج البيانات
-            start_time = time.time()
-            data = scraper.scrape(url)
-            elapsed_time = time.time() - start_time
-            
-            # حفظ البيانات في القاموس الكلي
-            all_data[url] = data
-            
-            # طباعة ملخص البيانات المستخرجة
-            if "General information" in data:
-                print(f"✓ عنوان المنتج: {data['General information'].get('Product Title', 'غير متوفر')}")
-                print(f"✓ نوع المنتج: {data['General information'].get('Product Type', 'غير متوفر')}")
-            
-            # استخراج اسم الملف من نهاية الرابط
-            filename = url.split('/')[-2] if url.endswith('/') else url.split('/')[-1]
-            filename = filename.replace('=', '_')  # استبدال الأحرف غير الصالحة لاسم الملف
+    with scraper, JsonStreamWriter(all_data_path) as writer:
+        for i, (url, data) in enumerate(scraper.iter_scrape(urls, max_workers=4), 1):
+            print(f"\n[{i}/{len(urls)}] اكتمل استخراج البيانات من: {url}")
             
-            # تصدير البيانات بتنسيق JSON
-            json_path = os.path.join(output_dir, f"{filename}.json")
-            if scraper.export_to_json(data, json_path):
-                print(f"✓ تم تصدير البيانات إلى JSON: {json_path}")
+            if "error" in data:
+                print(f"✗ خطأ في استخراج البيانات من {url}: {data['error']}")
+                continue
             
-            # تصدير البيانات بتنسيق CSV
-            csv_path = os.path.join(output_dir, f"{filename}.csv")
-            if scraper.export_to_csv(data, csv_path):
-                print(f"✓ تم تصدير البيانات إلى CSV: {csv_path}")
+            writer.write(url, data)
             
-            # تصدير البيانات بتنسيق Excel
-            excel_path = os.path.join(output_dir, f"{filename}.xlsx")
-            if scraper.export_to_excel(data, excel_path):
-                print(f"✓ تم تصدير البيانات إلى Excel: {excel_path}")
-            
-            print(f"✓ اكتمل الاستخراج في {elapsed_time:.2f} ثانية")
-            
-        except Exception as e:
-            print(f"✗ خطأ في استخراج البيانات من {url}: {str(e)}")
+            try:
+                # طباعة ملخص البيانات المستخرجة
+                if "General information" in data:
+                    print(f"✓ عنوان المنتج: {data['General information'].get('Product Title', 'غير متوفر')}")
+                    print(f"✓ نوع المنتج: {data['General information'].get('Product Type', 'غير متوفر')}")
+                
+                # استخراج اسم الملف من نهاية الرابط
+                filename = url.split('/')[-2] if url.endswith('/') else url.split('/')[-1]
+                filename = filename.replace('=', '_')  # استبدال الأحرف غير الصالحة لاسم الملف
+                
+                # تصدير البيانات بتنسيق JSON
+                json_path = os.path.join(output_dir, f"{filename}.json")
+                if scraper.export_to_json(data, json_path):
+                    print(f"✓ تم تصدير البيانات إلى JSON: {json_path}")
+                
+                # تصدير البيانات بتنسيق CSV
+                csv_path = os.path.join(output_dir, f"{filename}.csv")
+                if scraper.export_to_csv(data, csv_path):
+                    print(f"✓ تم تصدير البيانات إلى CSV: {csv_path}")
+                
+                # تصدير البيانات بتنسيق Excel
+                excel_path = os.path.join(output_dir, f"{filename}.xlsx")
+                if scraper.export_to_excel(data, excel_path):
+                    print(f"✓ تم تصدير البيانات إلى Excel: {excel_path}")
+                
+            except Exception as e:
+                print(f"✗ خطأ في تصدير البيانات من {url}: {str(e)}")
     
-    # تصدير جميع البيانات إلى ملف واحد
-    all_data_path = os.path.join(output_dir, "all_cameras.json")
-    with open(all_data_path, 'w', encoding='utf-8') as f:
-        json.dump(all_data, f, ensure_ascii=False, indent=2)
-    print(f"\n✓ تم تصدير جميع البيانات إلى ملف واحد: {all_data_path}")
+    print(f"\n✓ اكتمل الاستخراج في {time.time() - start_time:.2f} ثانية")
+    print(f"✓ تم تصدير جميع البيانات إلى ملف واحد: {all_data_path}")
     
-    # تصدير جميع البيانات إلى ملف Excel واحد متعدد الأوراق
+    # ملف Excel متعدد الأوراق يحتاج جميع البيانات معًا، لذلك يبنى من الملف المجمع في النهاية
     from security_cameras_scraper.export.excel_exporter import export_multi_sheet_excel
+    all_data = load_json(all_data_path)
     excel_all_path = os.path.join(output_dir, "all_cameras.xlsx")
-    if export_multi_sheet_excel(all_data, excel_all_path):
+    if all_data and export_multi_sheet_excel(all_data, excel_all_path):
         print(f"✓ تم تصدير جميع البيانات إلى ملف Excel متعدد الأوراق: {excel_all_path}")
     
     print("\nتم الانتهاء من استخراج وتصدير البيانات بنجاح!")
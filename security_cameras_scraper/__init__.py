@@ -1,6 +1,24 @@
-from .scraper import CameraScraper
-from .scrapers.hikvision_scraper import HikvisionScraper
-from .scrapers.dahua_scraper import DahuaScraper
+# الملف: security_cameras_scraper/__init__.py
+
+"""
+مكتبة استخراج مواصفات كاميرات المراقبة من مواقع الشركات المصنعة.
+
+يتم استيراد الكلاسات عند أول وصول إليها فقط (PEP 562) حتى يبقى استيراد الحزمة
+سريعًا ولا يحمل BeautifulSoup أو lxml أو pandas أو aiohttp قبل الحاجة إليها.
+"""
+
+from .utils.lazy_utils import lazy_attributes
 
 __version__ = '0.1.0'
-__all__ = ['CameraScraper', 'HikvisionScraper', 'DahuaScraper'] 
+
+# اسم الكائن -> الوحدة التي تعرفه
+_LAZY_ATTRIBUTES = {
+    'CameraScraper': '.scraper',
+    'AsyncCameraScraper': '.async_scraper',
+    'HikvisionScraper': '.scrapers.hikvision_scraper',
+    'DahuaScraper': '.scrapers.dahua_scraper',
+}
+
+__all__ = ['CameraScraper', 'AsyncCameraScraper', 'HikvisionScraper', 'DahuaScraper']
+
+__getattr__, __dir__ = lazy_attributes(globals(), _LAZY_ATTRIBUTES)
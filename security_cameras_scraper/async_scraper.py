@@ -0,0 +1,316 @@
+# الملف: security_cameras_scraper/async_scraper.py
+
+"""
+نسخة غير متزامنة (asyncio) من المستخرج الرئيسي للاستخدام داخل خدمات asyncio.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import Executor
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+
+from .scraper import CameraScraper
+from .utils.async_http_utils import create_client_session, fetch_page_raw_async
+from .utils.rate_limit_utils import HostRateLimiter, interleave_hosts
+from .utils.session_utils import get_host
+from .utils.url_utils import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncCameraScraper:
+    """
+    مستخرج غير متزامن لبيانات كاميرات المراقبة.
+
+    يستخدم نفس مستخرجات الشركات ونفس منطق التعرف على الشركة المصنعة في CameraScraper،
+    لكنه يسترجع الصفحات عبر جلسة aiohttp مشتركة ويحيل تحليل HTML (عملية تستهلك المعالج)
+    إلى منفذ (executor) حتى لا تتوقف حلقة الأحداث.
+
+    مثال:
+        async with AsyncCameraScraper(per_host_limit=8) as scraper:
+            results = await scraper.scrape_many(urls)
+    """
+
+    def __init__(self,
+                 use_default_headers: bool = True,
+                 pool_size: int = 10,
+                 per_host_limit: Optional[int] = None,
+                 executor: Optional[Executor] = None,
+                 timeout: int = 30,
+                 rate_limit: Optional[float] = None,
+                 rate_burst: int = 1):
+        """
+        تهيئة المستخرج غير المتزامن.
+
+        المعاملات:
+            use_default_headers (bool): ما إذا كان سيتم استخدام الرؤوس الافتراضية لطلبات HTTP.
+            pool_size (int): الحد الأقصى لعدد الاتصالات المفتوحة لكل مضيف.
+            per_host_limit (Optional[int]): الحد الأقصى للطلبات المتزامنة لكل مضيف
+                (الافتراضي: نفس قيمة pool_size).
+            executor (Optional[Executor]): منفذ لتشغيل عمليات التحليل (الافتراضي: منفذ حلقة الأحداث).
+            timeout (int): مهلة كل طلب بالثواني.
+            rate_limit (Optional[float]): الحد الأقصى لعدد الطلبات في الثانية لكل مضيف (اختياري).
+            rate_burst (int): عدد الطلبات المسموح بها دفعة واحدة لكل مضيف.
+        """
+        # سجل المستخرجات والرؤوس ومحدد المعدل وتحليل الصفحات مشتركة مع CameraScraper، أما
+        # الاسترجاع فيتم عبر aiohttp فلا ينشئ المستخرج المتزامن أي جلسة requests
+        self._scraper = CameraScraper(
+            use_default_headers=use_default_headers,
+            pool_size=pool_size,
+            rate_limit=rate_limit,
+            rate_burst=rate_burst
+        )
+        self.pool_size = pool_size
+        self.per_host_limit = per_host_limit or pool_size
+        self.executor = executor
+        self.timeout = timeout
+        self._session = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        # الرابط الموحد -> مهمة استخراجه الجارية التي تشاركها الروابط المكافئة
+        self._in_flight: Dict[str, List[Any]] = {}
+
+    @property
+    def scrapers(self) -> Dict[str, Any]:
+        """مستخرجات الشركات المسجلة (مشتركة مع CameraScraper)."""
+        return self._scraper.scrapers
+
+    @property
+    def rate_limiter(self) -> HostRateLimiter:
+        """محدد معدل الطلبات لكل مضيف (مشترك مع CameraScraper)."""
+        return self._scraper.rate_limiter
+
+    @property
+    def default_headers(self) -> Dict[str, str]:
+        """رؤوس HTTP الافتراضية."""
+        return self._scraper.default_headers
+
+    def detect_manufacturer(self, url: str) -> Optional[str]:
+        """
+        التعرف على الشركة المصنعة بناءً على عنوان URL.
+
+        المعاملات:
+            url (str): رابط صفحة المنتج.
+
+        العوائد:
+            Optional[str]: اسم الشركة المصنعة أو None إذا لم يتم التعرف عليها.
+        """
+        return self._scraper.detect_manufacturer(url)
+
+    def add_manufacturer_scraper(self,
+                                 manufacturer_name: str,
+                                 scraper_instance: Any,
+                                 domains: Optional[List[str]] = None,
+                                 path_prefixes: Optional[List[str]] = None) -> None:
+        """
+        إضافة مستخرج لشركة مصنعة جديدة.
+
+        المعاملات:
+            manufacturer_name (str): اسم الشركة المصنعة.
+            scraper_instance (Any): كائن المستخرج المخصص للشركة.
+            domains (Optional[List[str]]): نطاقات موقع الشركة (اختياري).
+            path_prefixes (Optional[List[str]]): بادئات مسار تقصر التطابق على أجزاء من الموقع (اختياري).
+        """
+        self._scraper.add_manufacturer_scraper(manufacturer_name, scraper_instance, domains, path_prefixes)
+
+    def _get_session(self):
+        """إرجاع جلسة aiohttp المشتركة وإنشاؤها عند أول استخدام."""
+        if self._session is None or self._session.closed:
+            self._session = create_client_session(
+                pool_size=self.pool_size,
+                headers=self.default_headers or None
+            )
+        return self._session
+
+    def _get_host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """إرجاع إشارة تقييد الطلبات المتزامنة لمضيف الرابط."""
+        host = get_host(url)
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_limit)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    async def scrape(self, url: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        استخراج بيانات منتج من الرابط المحدد بشكل غير متزامن.
+
+        إذا كان رابط مكافئ (نفس canonicalize_url) قيد الاستخراج، تنتظر الدالة نتيجته
+        بدلاً من طلب الصفحة مرة أخرى.
+
+        المعاملات:
+            url (str): رابط صفحة المنتج.
+            headers (Optional[Dict[str, str]]): رؤوس HTTP مخصصة (اختياري).
+
+        العوائد:
+            Dict[str, Any]: البيانات المستخرجة.
+
+        الاستثناءات:
+            ValueError: إذا لم يتم التعرف على الشركة المصنعة.
+        """
+        key = canonicalize_url(url)
+        entry = self._in_flight.get(key)
+        shared = entry is not None
+        if not shared:
+            # [المهمة المشتركة، عدد المنتظرين]
+            entry = [asyncio.ensure_future(self._scrape_url(url, headers)), 0]
+            self._in_flight[key] = entry
+            entry[0].add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        task = entry[0]
+        entry[1] += 1
+        try:
+            # لا يلغي إلغاء أحد المنتظرين المهمة ما دام غيره ينتظرها
+            data = await asyncio.shield(task)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and not task.done():
+                task.cancel()
+
+        return self._scraper.fan_out(data, url) if shared else data
+
+    async def _scrape_url(self, url: str, headers: Optional[Dict[str, str]]) -> Dict[str, Any]:
+        """استرجاع صفحة رابط وتحليلها."""
+        manufacturer = self.detect_manufacturer(url)
+
+        if not manufacturer:
+            raise ValueError(f"الشركة المصنعة غير مدعومة أو غير معروفة للرابط: {url}")
+
+        async with self._get_host_semaphore(url):
+            page = await fetch_page_raw_async(
+                self._get_session(),
+                url,
+                headers=headers,
+                timeout=self.timeout,
+                rate_limiter=self.rate_limiter
+            )
+
+        if not page or not page[0]:
+            logger.error(f"فشل في استرجاع محتوى الصفحة: {url}")
+            return {}
+
+        # تشغيل التحليل خارج حلقة الأحداث
+        content, encoding = page
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            self._scraper.process_page,
+            url,
+            manufacturer,
+            content,
+            encoding
+        )
+
+    async def scrape_many(self,
+                          urls: List[str],
+                          headers: Optional[Dict[str, str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        استخراج بيانات من عدة روابط بالتوازي.
+
+        المعاملات:
+            urls (List[str]): قائمة روابط المنتجات.
+            headers (Optional[Dict[str, str]]): رؤوس HTTP مخصصة (اختياري).
+
+        العوائد:
+            Dict[str, Dict[str, Any]]: قاموس بالبيانات المستخرجة لكل رابط بنفس ترتيب الروابط المدخلة.
+        """
+        unique_urls = list(dict.fromkeys(urls))
+        # تشترك الروابط المكافئة في طلب واحد عبر scrape
+        results = await asyncio.gather(*(self._scrape_safely(url, headers) for url in unique_urls))
+        by_url = dict(zip(unique_urls, results))
+        return {url: by_url[url] for url in urls}
+
+    async def iter_scrape(self,
+                          urls: Union[Iterable[str], AsyncIterable[str]],
+                          headers: Optional[Dict[str, str]] = None,
+                          max_in_flight: Optional[int] = None) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        استخراج بيانات من عدة روابط مع إعادة نتيجة كل رابط فور اكتماله.
+
+        مثل CameraScraper.iter_scrape: تقرأ الروابط تدريجيًا (من مصدر عادي أو غير متزامن)
+        ولا يتجاوز عدد الروابط قيد التنفيذ max_in_flight، ولا تبدأ روابط جديدة إلا بعد
+        أن يستهلك المستدعي النتائج الجاهزة.
+
+        مثال:
+            async for url, data in scraper.iter_scrape(urls):
+                writer.write(url, data)
+
+        المعاملات:
+            urls (Union[Iterable[str], AsyncIterable[str]]): الروابط.
+            headers (Optional[Dict[str, str]]): رؤوس HTTP مخصصة (اختياري).
+            max_in_flight (Optional[int]): الحد الأقصى للروابط قيد التنفيذ
+                (الافتراضي: ضعف pool_size).
+
+        العوائد:
+            AsyncIterator[Tuple[str, Dict[str, Any]]]: أزواج (الرابط، البيانات المستخرجة أو {"error": ...})
+            بترتيب اكتمالها.
+        """
+        max_in_flight = max(max_in_flight or 2 * self.pool_size, 1)
+        if self.rate_limiter.has_limits and not hasattr(urls, "__aiter__"):
+            # التناوب بين المضيفين حتى لا تنتظر كل المهام دلو مضيف واحد
+            urls = interleave_hosts(urls, self.rate_limiter)
+        next_url = self._url_reader(urls)
+        tasks: Dict[asyncio.Future, str] = {}
+        exhausted = False
+
+        try:
+            while True:
+                # ملء العمل الجاري حتى الحد المسموح
+                while not exhausted and len(tasks) < max_in_flight:
+                    url = await next_url()
+                    if url is None:
+                        exhausted = True
+                        break
+                    tasks[asyncio.ensure_future(self._scrape_safely(url, headers))] = url
+
+                if not tasks:
+                    return
+
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield tasks.pop(task), task.result()
+        finally:
+            # إلغاء الطلبات الجارية عند توقف المستدعي عن القراءة مبكرًا
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    def _url_reader(urls: Union[Iterable[str], AsyncIterable[str]]):
+        """إرجاع دالة غير متزامنة تقرأ الرابط التالي من المصدر (None عند انتهائه)."""
+        if hasattr(urls, "__aiter__"):
+            iterator = urls.__aiter__()
+
+            async def next_url() -> Optional[str]:
+                try:
+                    return await iterator.__anext__()
+                except StopAsyncIteration:
+                    return None
+        else:
+            iterator = iter(urls)
+
+            async def next_url() -> Optional[str]:
+                return next(iterator, None)
+
+        return next_url
+
+    async def _scrape_safely(self, url: str, headers: Optional[Dict[str, str]]) -> Dict[str, Any]:
+        """استخراج بيانات رابط واحد مع تحويل الاستثناءات إلى قاموس خطأ."""
+        try:
+            return await self.scrape(url, headers)
+        except Exception as e:
+            logger.error(f"خطأ أثناء استخراج البيانات من {url}: {str(e)}")
+            return {"error": str(e)}
+
+    async def close(self) -> None:
+        """إغلاق جلسة HTTP المفتوحة."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._scraper.close()
+
+    async def __aenter__(self) -> "AsyncCameraScraper":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
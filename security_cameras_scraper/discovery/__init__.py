@@ -0,0 +1,44 @@
+# الملف: security_cameras_scraper/discovery/__init__.py
+
+"""
+حزمة اكتشاف روابط المنتجات من ملفات sitemap وصفحات الفئات لبناء الكتالوج كاملاً، وتحديثه
+تزايديًا حسب lastmod.
+
+يتم استيراد الوحدات عند أول وصول إليها فقط.
+"""
+
+from ..utils.lazy_utils import lazy_attributes
+
+_LAZY_ATTRIBUTES = {
+    'CatalogCrawler': '.crawler',
+    'DEFAULT_SEEDS': '.crawler',
+    'extract_links': '.crawler',
+    'Frontier': '.frontier',
+    'FrontierEntry': '.frontier',
+    'BloomFilter': '.frontier',
+    'HashedSet': '.frontier',
+    'IncrementalRecrawler': '.recrawl',
+    'RecrawlState': '.recrawl',
+    'PageState': '.recrawl',
+    'SitemapEntry': '.sitemaps',
+    'parse_sitemap': '.sitemaps',
+    'is_sitemap_url': '.sitemaps',
+}
+
+__all__ = [
+    'CatalogCrawler',
+    'DEFAULT_SEEDS',
+    'extract_links',
+    'Frontier',
+    'FrontierEntry',
+    'BloomFilter',
+    'HashedSet',
+    'IncrementalRecrawler',
+    'RecrawlState',
+    'PageState',
+    'SitemapEntry',
+    'parse_sitemap',
+    'is_sitemap_url',
+]
+
+__getattr__, __dir__ = lazy_attributes(globals(), _LAZY_ATTRIBUTES)
@@ -0,0 +1,287 @@
+# الملف: security_cameras_scraper/discovery/crawler.py
+
+"""
+اكتشاف روابط المنتجات من ملفات sitemap وصفحات الفئات والسلاسل بدلاً من كتابتها يدويًا.
+
+يزحف CatalogCrawler من نقاط البداية عبر Frontier، ويجلب الصفحات بالتوازي عبر CameraScraper
+(بنفس حدود المضيف ومعدل الطلبات وذاكرة التخزين المؤقت)، ويعيد كل رابط منتج جديد فور اكتشافه
+بحيث يمكن تمريره مباشرة إلى iter_scrape.
+
+يقرأ الزاحف الروابط الموجودة في HTML فقط؛ الصفحات التي تحمل قوائمها بـ JavaScript تحتاج
+إلى ملف sitemap كنقطة بداية.
+"""
+
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urldefrag, urljoin, urlsplit
+
+from bs4 import SoupStrainer
+
+from .frontier import BloomFilter, Frontier, FrontierEntry, SeenSet
+from .sitemaps import SitemapEntry, is_sitemap_url, parse_sitemap
+from ..utils.html_utils import make_soup
+from ..utils.model_utils import parse_product_url
+from ..utils.url_utils import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+# نقاط البداية الافتراضية لمواقع الشركات المدعومة
+DEFAULT_SEEDS = (
+    "https://www.hikvision.com/sitemap.xml",
+    "https://www.hikvision.com/en/products/",
+    "https://www.dahuasecurity.com/sitemap.xml",
+    "https://www.dahuasecurity.com/products/",
+)
+
+# أولوية ملفات sitemap: قبل صفحات الفئات لأنها تعطي روابط كثيرة بطلب واحد
+SITEMAP_PRIORITY = -1
+
+# مصدر الرابط المكتشف: ملف sitemap داخل فهرس، أو رابط في sitemap، أو رابط في صفحة HTML
+SITEMAP_CHILD = "sitemap"
+SITEMAP_ENTRY = "entry"
+PAGE_LINK = "link"
+
+# دالة تحدد نوع رابط
+UrlPredicate = Callable[[str], bool]
+
+_LINK_STRAINER = SoupStrainer("a", href=True)
+
+
+def extract_links(content: bytes, encoding: Optional[str], base_url: str) -> List[str]:
+    """
+    روابط HTTP المطلقة في صفحة HTML بترتيب ظهورها ودون تكرار.
+
+    المعاملات:
+        content (bytes): المحتوى الخام.
+        encoding (Optional[str]): ترميز المحتوى.
+        base_url (str): رابط الصفحة لتحويل الروابط النسبية.
+
+    العوائد:
+        List[str]: الروابط دون الجزء بعد #.
+    """
+    # بناء عناصر <a> فقط بدلاً من شجرة الصفحة كاملة
+    soup = make_soup(content, encoding, parse_only=_LINK_STRAINER)
+    links = {}
+    for anchor in soup.find_all("a", href=True):
+        url = urldefrag(urljoin(base_url, anchor["href"].strip()))[0]
+        if urlsplit(url).scheme in ("http", "https"):
+            links.setdefault(url, None)
+    return list(links)
+
+
+class CatalogCrawler:
+    """
+    زاحف يكتشف روابط المنتجات من ملفات sitemap وصفحات الفئات ويمررها إلى CameraScraper.
+
+    أنواع الروابط:
+        - ملفات sitemap (ومنها الفهارس) تقرأ كاملة ولا تزيد العمق.
+        - روابط المنتجات (is_product) لا يتم جلبها أثناء الاكتشاف بل تعاد للاستخراج، مرة واحدة
+          لكل منتج (ولكل طراز بين اللغات إذا كان dedupe_locales مفعلاً في المستخرج).
+        - صفحات الفئات والسلاسل (is_listing) يتم جلبها واستخراج روابطها حتى max_depth.
+        - أي رابط آخر يتم تجاهله.
+    """
+
+    def __init__(self,
+                 scraper: Any,
+                 max_depth: Optional[int] = 3,
+                 max_workers: int = 8,
+                 max_pages: Optional[int] = None,
+                 seen: Optional[SeenSet] = None,
+                 expected_urls: int = 1000000,
+                 false_positive_rate: float = 0.001,
+                 is_product: Optional[UrlPredicate] = None,
+                 is_listing: Optional[UrlPredicate] = None):
+        """
+        تهيئة الزاحف.
+
+        المعاملات:
+            scraper (CameraScraper): المستخرج المستخدم لجلب الصفحات واستخراج المنتجات.
+            max_depth (Optional[int]): أقصى عمق لصفحات الفئات من نقاط البداية (None بدون حد).
+            max_workers (int): عدد صفحات الاكتشاف التي يتم جلبها بالتوازي.
+            max_pages (Optional[int]): أقصى عدد لصفحات الاكتشاف (sitemap والفئات) في كل تشغيل.
+            seen (Optional[SeenSet]): مجموعة ما تمت رؤيته؛ الافتراضي BloomFilter جديد لكل تشغيل
+                بالسعة واحتمال الخطأ المحددين (HashedSet لتجنب أي تخطٍ خاطئ).
+            expected_urls (int): عدد الروابط المتوقع لحساب حجم BloomFilter.
+            false_positive_rate (float): احتمال تخطي رابط جديد خطأً في BloomFilter.
+            is_product (Optional[UrlPredicate]): هل الرابط صفحة منتج (الافتراضي: parse_product_url).
+            is_listing (Optional[UrlPredicate]): هل الرابط صفحة فئة أو سلسلة (الافتراضي: رابط على
+                مضيف إحدى نقاط البداية يحتوي مساره على /products/).
+        """
+        self.scraper = scraper
+        self.max_depth = max_depth
+        self.max_workers = max(1, max_workers)
+        self.max_pages = max_pages
+        self._seen = seen
+        self.expected_urls = expected_urls
+        self.false_positive_rate = false_positive_rate
+        self.is_product = is_product or (lambda url: parse_product_url(url) is not None)
+        self.is_listing = is_listing or self._is_listing
+        self._hosts = set()
+        self.frontier: Optional[Frontier] = None
+        self.stats = self._empty_stats()
+        self._stats_lock = threading.Lock()
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, int]:
+        return {"sitemaps": 0, "listings": 0, "failed": 0, "products": 0}
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _is_listing(self, url: str) -> bool:
+        parts = urlsplit(url)
+        segments = [segment.lower() for segment in parts.path.split("/") if segment]
+        return (parts.hostname or "").lower() in self._hosts and "products" in segments
+
+    def _product_key(self, url: str) -> str:
+        # منتج واحد لكل طراز بين اللغات إذا كان المستخرج يوحدها، وإلا لكل رابط موحد
+        if getattr(self.scraper, "dedupe_locales", False):
+            return "model:" + self.scraper.model_index.key(url, self.scraper.fetch_locales)
+        return canonicalize_url(url)
+
+    def report(self) -> Dict[str, int]:
+        """
+        إحصائيات آخر تشغيل.
+
+        العوائد:
+            Dict[str, int]: عدد ملفات sitemap وصفحات الفئات التي تم جلبها والصفحات الفاشلة
+            والمنتجات المكتشفة والروابط المكررة والروابط المتجاوزة للعمق والمتبقي في الطابور.
+        """
+        with self._stats_lock:
+            report = dict(self.stats)
+        if self.frontier is not None:
+            report.update(self.frontier.stats)
+            report["pending"] = len(self.frontier)
+        return report
+
+    def discover(self, seeds: Iterable[str] = DEFAULT_SEEDS) -> Iterator[str]:
+        """
+        اكتشاف روابط المنتجات.
+
+        يتم جلب صفحات الاكتشاف في الخلفية، ويعاد كل رابط منتج جديد فور العثور عليه. يتوقف
+        إرسال طلبات جديدة عند التوقف عن القراءة من المولد.
+
+        المعاملات:
+            seeds (Iterable[str]): نقاط البداية (ملفات sitemap أو صفحات فئات أو روابط منتجات).
+
+        العوائد:
+            Iterator[str]: روابط المنتجات بترتيب اكتشافها.
+        """
+        seeds = list(seeds)
+        self._hosts = {(urlsplit(seed).hostname or "").lower() for seed in seeds}
+        seen = self._seen if self._seen is not None else BloomFilter(self.expected_urls, self.false_positive_rate)
+        self.frontier = frontier = Frontier(self.max_depth, seen)
+        self.stats = self._empty_stats()
+
+        for seed in seeds:
+            if self.is_product(seed):
+                if frontier.mark_seen(seed, self._product_key(seed)):
+                    self._count("products")
+                    yield seed
+            elif is_sitemap_url(seed):
+                frontier.add(seed, "sitemap", 0, SITEMAP_PRIORITY)
+            else:
+                frontier.add(seed, "listing", 0)
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        pending: Dict[Any, FrontierEntry] = {}
+        fetched = 0
+        try:
+            while True:
+                while len(pending) < self.max_workers and (self.max_pages is None or fetched < self.max_pages):
+                    entry = frontier.pop()
+                    if entry is None:
+                        break
+                    pending[executor.submit(self._visit, entry)] = entry
+                    fetched += 1
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    entry = pending.pop(future)
+                    for source, link in future.result():
+                        if self._follow(entry, source, link):
+                            self._count("products")
+                            yield link.url
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+        logger.info(
+            f"اكتمل الاكتشاف: {self.stats['products']} منتج من {self.stats['sitemaps']} ملف sitemap "
+            f"و {self.stats['listings']} صفحة فئة"
+        )
+
+    def _follow(self, entry: FrontierEntry, source: str, link: SitemapEntry) -> bool:
+        """
+        تصنيف رابط مكتشف وإضافته إلى الطابور.
+
+        المعاملات:
+            entry (FrontierEntry): الصفحة التي وجد فيها الرابط.
+            source (str): مصدر الرابط (SITEMAP_CHILD أو SITEMAP_ENTRY أو PAGE_LINK).
+            link (SitemapEntry): الرابط.
+
+        العوائد:
+            bool: True إذا كان الرابط منتجًا جديدًا يجب استخراجه.
+        """
+        url = link.url
+        if source == SITEMAP_CHILD:
+            self.frontier.add(url, "sitemap", entry.depth, SITEMAP_PRIORITY)
+        elif self.is_product(url):
+            return self.frontier.mark_seen(url, self._product_key(url))
+        elif source == PAGE_LINK and is_sitemap_url(url):
+            return False
+        elif self.is_listing(url):
+            self.frontier.add(url, "listing", entry.depth + 1)
+        return False
+
+    def _visit(self, entry: FrontierEntry) -> List[Tuple[str, SitemapEntry]]:
+        """
+        جلب صفحة اكتشاف واستخراج روابطها (في خيط عامل).
+
+        المعاملات:
+            entry (FrontierEntry): الصفحة.
+
+        العوائد:
+            List[Tuple[str, SitemapEntry]]: (مصدر الرابط، الرابط) لكل رابط في الصفحة.
+        """
+        page = self.scraper.fetch_raw(entry.url)
+        if not page or not page[0]:
+            logger.warning(f"فشل في جلب صفحة الاكتشاف: {entry.url}")
+            self._count("failed")
+            return []
+
+        content, encoding = page
+        if entry.kind == "sitemap":
+            self._count("sitemaps")
+            try:
+                is_index, entries = parse_sitemap(content)
+            except ValueError as e:
+                logger.warning(f"تعذر تحليل {entry.url}: {e}")
+                self._count("failed")
+                return []
+            source = SITEMAP_CHILD if is_index else SITEMAP_ENTRY
+            return [(source, link) for link in entries]
+
+        self._count("listings")
+        return [(PAGE_LINK, SitemapEntry(url, None)) for url in extract_links(content, encoding, entry.url)]
+
+    def crawl(self, seeds: Iterable[str] = DEFAULT_SEEDS, **scrape_options: Any) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        اكتشاف المنتجات واستخراج بياناتها في تشغيل واحد.
+
+        تمرر الروابط إلى iter_scrape فور اكتشافها، فيبدأ الاستخراج قبل اكتمال الاكتشاف.
+
+        المعاملات:
+            seeds (Iterable[str]): نقاط البداية.
+            **scrape_options: معاملات iter_scrape (مثل max_workers و per_host_limit و deadline).
+
+        العوائد:
+            Iterator[Tuple[str, Dict[str, Any]]]: (رابط المنتج، البيانات) لكل منتج.
+        """
+        return self.scraper.iter_scrape(self.discover(seeds), **scrape_options)
@@ -0,0 +1,221 @@
+# الملف: security_cameras_scraper/discovery/frontier.py
+
+"""
+واجهة الزحف (frontier): طابور أولويات للصفحات التي لم تزر بعد مع مجموعة مضغوطة لما تمت رؤيته.
+
+تحفظ الروابط التي تمت رؤيتها كبصمات وليس كنصوص، إما في مرشح Bloom (حجم ثابت صغير مع
+احتمال خطأ إيجابي محدد، فقد يتم تخطي رابط جديد نادرًا) أو في HashedSet (8 بايت لكل رابط
+دون أخطاء عمليًا). المفتاح هو الصيغة الموحدة للرابط canonicalize_url.
+"""
+
+import math
+import heapq
+import hashlib
+import itertools
+import threading
+from typing import List, NamedTuple, Optional, Set, Tuple, Union
+
+from ..utils.url_utils import canonicalize_url
+
+
+def _digest(key: str) -> bytes:
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+
+
+class BloomFilter:
+    """
+    مرشح Bloom لمجموعة كبيرة من المفاتيح بذاكرة ثابتة.
+
+    يعيد "موجود" أحيانًا لمفتاح جديد (باحتمال false_positive_rate عند capacity مفتاح)،
+    ولا يعيد "غير موجود" لمفتاح تمت إضافته أبدًا.
+    """
+
+    def __init__(self, capacity: int = 1000000, false_positive_rate: float = 0.001):
+        """
+        تهيئة المرشح.
+
+        المعاملات:
+            capacity (int): عدد المفاتيح المتوقع.
+            false_positive_rate (float): احتمال الخطأ الإيجابي المطلوب عند capacity مفتاح.
+
+        الاستثناءات:
+            ValueError: إذا كانت السعة أو الاحتمال خارج النطاق.
+        """
+        if capacity < 1 or not 0 < false_positive_rate < 1:
+            raise ValueError("يجب أن تكون السعة موجبة واحتمال الخطأ بين 0 و 1")
+
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        # الحجم الأمثل بالبت وعدد دوال التجزئة
+        self.size = max(8, int(math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self._bits = bytearray((self.size + 7) // 8)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    @property
+    def memory_bytes(self) -> int:
+        """حجم مصفوفة البتات بالبايت."""
+        return len(self._bits)
+
+    def _positions(self, key: str) -> List[int]:
+        # تجزئة مزدوجة (Kirsch-Mitzenmacher): موقع i هو h1 + i*h2
+        digest = _digest(key)
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + index * second) % self.size for index in range(self.hash_count)]
+
+    def add(self, key: str) -> bool:
+        """
+        إضافة مفتاح.
+
+        المعاملات:
+            key (str): المفتاح.
+
+        العوائد:
+            bool: True إذا كان المفتاح جديدًا (لم تكن كل بتاته معينة من قبل).
+        """
+        added = False
+        for position in self._positions(key):
+            mask = 1 << (position & 7)
+            if not self._bits[position >> 3] & mask:
+                self._bits[position >> 3] |= mask
+                added = True
+        if added:
+            self._count += 1
+        return added
+
+
+class HashedSet:
+    """مجموعة بصمات 64 بت للمفاتيح بدلاً من النصوص الكاملة (بنفس واجهة BloomFilter)."""
+
+    def __init__(self):
+        self._hashes: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def __contains__(self, key: str) -> bool:
+        return self._hash(key) in self._hashes
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(_digest(key)[:8], "little")
+
+    def add(self, key: str) -> bool:
+        """
+        إضافة مفتاح.
+
+        المعاملات:
+            key (str): المفتاح.
+
+        العوائد:
+            bool: True إذا كان المفتاح جديدًا.
+        """
+        value = self._hash(key)
+        if value in self._hashes:
+            return False
+        self._hashes.add(value)
+        return True
+
+
+SeenSet = Union[BloomFilter, HashedSet]
+
+
+class FrontierEntry(NamedTuple):
+    """صفحة في طابور الزحف."""
+    url: str
+    # نوع الصفحة: "sitemap" أو "listing"
+    kind: str
+    # عمق الصفحة بالروابط من نقاط البداية
+    depth: int
+    priority: float
+
+
+class Frontier:
+    """
+    طابور أولويات آمن للخيوط للصفحات التي يجب زيارتها، مع حذف المكرر والتحكم بالعمق.
+
+    تخرج الصفحات حسب الأولوية (الأقل أولاً) ثم حسب ترتيب الإضافة، وتكون الأولوية الافتراضية
+    هي العمق فيكون الزحف بالعرض أولاً.
+    """
+
+    def __init__(self, max_depth: Optional[int] = 3, seen: Optional[SeenSet] = None):
+        """
+        تهيئة الطابور.
+
+        المعاملات:
+            max_depth (Optional[int]): أقصى عمق للصفحات المضافة (None بدون حد).
+            seen (Optional[SeenSet]): مجموعة ما تمت رؤيته (الافتراضي: BloomFilter).
+        """
+        self.max_depth = max_depth
+        self.seen = seen if seen is not None else BloomFilter()
+        self._heap: List[Tuple[float, int, FrontierEntry]] = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self.stats = {"queued": 0, "duplicates": 0, "too_deep": 0}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._heap)
+
+    def mark_seen(self, url: str, key: Optional[str] = None) -> bool:
+        """
+        تسجيل رابط كمرئي دون إضافته إلى الطابور (مثل روابط المنتجات).
+
+        المعاملات:
+            url (str): الرابط.
+            key (Optional[str]): مفتاح حذف المكرر (الافتراضي: الرابط الموحد).
+
+        العوائد:
+            bool: True إذا كان الرابط جديدًا.
+        """
+        with self._lock:
+            return self._mark_seen(url, key)
+
+    def _mark_seen(self, url: str, key: Optional[str] = None) -> bool:
+        if self.seen.add(key or canonicalize_url(url)):
+            return True
+        self.stats["duplicates"] += 1
+        return False
+
+    def add(self, url: str, kind: str, depth: int = 0, priority: Optional[float] = None) -> bool:
+        """
+        إضافة صفحة إلى الطابور إذا لم تتم رؤيتها ولم تتجاوز أقصى عمق.
+
+        المعاملات:
+            url (str): الرابط.
+            kind (str): نوع الصفحة.
+            depth (int): العمق.
+            priority (Optional[float]): الأولوية (الافتراضي: العمق).
+
+        العوائد:
+            bool: True إذا تمت إضافة الصفحة.
+        """
+        with self._lock:
+            if self.max_depth is not None and depth > self.max_depth:
+                self.stats["too_deep"] += 1
+                return False
+            if not self._mark_seen(url):
+                return False
+            priority = depth if priority is None else priority
+            heapq.heappush(self._heap, (priority, next(self._counter), FrontierEntry(url, kind, depth, priority)))
+            self.stats["queued"] += 1
+            return True
+
+    def pop(self) -> Optional[FrontierEntry]:
+        """
+        أخذ الصفحة التالية.
+
+        العوائد:
+            Optional[FrontierEntry]: الصفحة أو None إذا كان الطابور فارغًا.
+        """
+        with self._lock:
+            if not self._heap:
+                return None
+            return heapq.heappop(self._heap)[2]
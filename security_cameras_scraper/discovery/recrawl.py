@@ -0,0 +1,405 @@
+# الملف: security_cameras_scraper/discovery/recrawl.py
+
+"""
+إعادة زحف تزايدية: طلب صفحات المنتجات الجديدة أو المتغيرة فقط حسب <lastmod> في ملفات sitemap.
+
+تحفظ RecrawlState (SQLite) لكل رابط منتج آخر lastmod معلن في sitemap، وlastmod الذي تم طلب
+الصفحة عنده، وبصمة البيانات المستخرجة (result_hash) ووقت آخر طلب ناجح. يطلب الرابط إذا كان
+جديدًا أو تغير lastmod المعلن له، أو إذا لم يكن له lastmod ومرت عليه مدة ttl منذ آخر طلب.
+
+ملفات sitemap الفرعية في الفهارس التي لم يتغير lastmod الخاص بها لا يعاد تحميلها، وتستخدم
+الروابط المحفوظة منها في آخر تحميل.
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .sitemaps import SitemapEntry, is_sitemap_url, parse_sitemap
+from ..jobs.job_store import result_hash
+from ..utils.model_utils import parse_product_url
+from ..utils.sqlite_utils import write_transaction
+
+logger = logging.getLogger(__name__)
+
+# مدة إعادة زيارة الروابط التي ليس لها lastmod (أسبوع)
+DEFAULT_TTL = 7 * 86400
+
+# عدد الروابط في كل عبارة كتابة
+_WRITE_CHUNK = 500
+
+
+class PageState(NamedTuple):
+    """حالة رابط منتج في مخزن إعادة الزحف."""
+    url: str
+    # آخر lastmod معلن في sitemap
+    listed_lastmod: Optional[str]
+    # lastmod المعلن عند آخر طلب ناجح
+    lastmod: Optional[str]
+    content_hash: Optional[str]
+    fetched_at: Optional[float]
+    # ملف sitemap الذي ورد فيه الرابط
+    sitemap: Optional[str]
+
+
+class RecrawlState:
+    """
+    مخزن SQLite لحالة روابط المنتجات وملفات sitemap بين التشغيلات.
+
+    مثال:
+        with RecrawlState("recrawl.sqlite") as state:
+            crawler = IncrementalRecrawler(scraper, state)
+            for url, data in crawler.run(sitemaps):
+                ...
+    """
+
+    def __init__(self, path: str, timeout: float = 30):
+        """
+        فتح المخزن وإنشاء جداوله عند الحاجة.
+
+        المعاملات:
+            path (str): مسار ملف SQLite.
+            timeout (float): مدة انتظار قفل قاعدة البيانات بالثواني.
+        """
+        parent_dir = os.path.dirname(path)
+        if parent_dir and not os.path.exists(parent_dir):
+            os.makedirs(parent_dir)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "url TEXT PRIMARY KEY, listed_lastmod TEXT, lastmod TEXT, content_hash TEXT, "
+            "fetched_at REAL, seen_at REAL NOT NULL, sitemap TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS pages_sitemap ON pages (sitemap)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sitemaps (url TEXT PRIMARY KEY, lastmod TEXT, fetched_at REAL NOT NULL)"
+        )
+
+    def _write(self, statements: Callable[[sqlite3.Connection], Any]) -> Any:
+        """تنفيذ دالة كتابة داخل معاملة BEGIN IMMEDIATE."""
+        return write_transaction(self._conn, self._lock, statements)
+
+    def get(self, url: str) -> Optional[PageState]:
+        """
+        حالة رابط.
+
+        المعاملات:
+            url (str): الرابط.
+
+        العوائد:
+            Optional[PageState]: الحالة أو None إذا لم يسجل الرابط.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, listed_lastmod, lastmod, content_hash, fetched_at, sitemap FROM pages WHERE url = ?",
+                (url,)
+            ).fetchone()
+        return PageState(*row) if row else None
+
+    def sitemap_lastmod(self, url: str) -> Tuple[bool, Optional[str]]:
+        """
+        lastmod ملف sitemap عند آخر تحميل ناجح له.
+
+        المعاملات:
+            url (str): رابط ملف sitemap.
+
+        العوائد:
+            Tuple[bool, Optional[str]]: هل تم تحميل الملف من قبل، وlastmod المعلن له حينها.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT lastmod FROM sitemaps WHERE url = ?", (url,)).fetchone()
+        return (True, row[0]) if row else (False, None)
+
+    def record_sitemap(self, url: str, lastmod: Optional[str], entries: List[SitemapEntry],
+                       seen_at: Optional[float] = None) -> None:
+        """
+        تسجيل تحميل ملف sitemap والروابط الواردة فيه مع lastmod المعلن لكل منها.
+
+        المعاملات:
+            url (str): رابط ملف sitemap.
+            lastmod (Optional[str]): lastmod الملف في الفهرس (None للملفات خارج الفهارس).
+            entries (List[SitemapEntry]): روابط المنتجات في الملف.
+            seen_at (Optional[float]): وقت التشغيل الحالي (الافتراضي: الآن).
+        """
+        seen_at = time.time() if seen_at is None else seen_at
+
+        def write(conn: sqlite3.Connection) -> None:
+            for start in range(0, len(entries), _WRITE_CHUNK):
+                rows = [(entry.lastmod, seen_at, url, entry.url) for entry in entries[start:start + _WRITE_CHUNK]]
+                conn.executemany(
+                    "INSERT OR IGNORE INTO pages (listed_lastmod, seen_at, sitemap, url) VALUES (?, ?, ?, ?)", rows
+                )
+                conn.executemany(
+                    "UPDATE pages SET listed_lastmod = ?, seen_at = ?, sitemap = ? WHERE url = ?", rows
+                )
+            conn.execute(
+                "INSERT OR REPLACE INTO sitemaps (url, lastmod, fetched_at) VALUES (?, ?, ?)",
+                (url, lastmod, seen_at)
+            )
+
+        self._write(write)
+
+    def touch_sitemap(self, url: str, seen_at: Optional[float] = None) -> int:
+        """
+        اعتبار روابط ملف sitemap لم يتغير موجودة في التشغيل الحالي دون إعادة تحميله.
+
+        المعاملات:
+            url (str): رابط ملف sitemap.
+            seen_at (Optional[float]): وقت التشغيل الحالي (الافتراضي: الآن).
+
+        العوائد:
+            int: عدد الروابط المحفوظة من الملف.
+        """
+        seen_at = time.time() if seen_at is None else seen_at
+        return self._write(
+            lambda conn: conn.execute("UPDATE pages SET seen_at = ? WHERE sitemap = ?", (seen_at, url)).rowcount
+        )
+
+    def due(self, seen_since: float, ttl: Optional[float], now: Optional[float] = None) -> List[PageState]:
+        """
+        الروابط التي يجب طلبها من الروابط الواردة في ملفات sitemap منذ seen_since.
+
+        يكون الرابط مستحقًا إذا لم يطلب بنجاح من قبل، أو تغير lastmod المعلن له عن lastmod
+        آخر طلب، أو لم يكن له lastmod ومرت ttl ثانية على آخر طلب.
+
+        المعاملات:
+            seen_since (float): بداية التشغيل الحالي.
+            ttl (Optional[float]): مدة إعادة الزيارة للروابط دون lastmod (None لعدم إعادتها).
+            now (Optional[float]): الوقت الحالي (الافتراضي: الآن).
+
+        العوائد:
+            List[PageState]: الروابط المستحقة بترتيب إدراجها.
+        """
+        now = time.time() if now is None else now
+        stale_before = now - ttl if ttl is not None else float("-inf")
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, listed_lastmod, lastmod, content_hash, fetched_at, sitemap FROM pages "
+                "WHERE seen_at >= ? AND (fetched_at IS NULL "
+                "OR (listed_lastmod IS NOT NULL AND lastmod IS NOT listed_lastmod) "
+                "OR (listed_lastmod IS NULL AND fetched_at <= ?)) ORDER BY rowid",
+                (seen_since, stale_before)
+            ).fetchall()
+        return [PageState(*row) for row in rows]
+
+    def record_fetch(self, url: str, lastmod: Optional[str], content_hash: str,
+                     fetched_at: Optional[float] = None) -> bool:
+        """
+        تسجيل طلب ناجح لرابط.
+
+        المعاملات:
+            url (str): الرابط.
+            lastmod (Optional[str]): lastmod المعلن عند الطلب.
+            content_hash (str): بصمة البيانات المستخرجة.
+            fetched_at (Optional[float]): وقت الطلب (الافتراضي: الآن).
+
+        العوائد:
+            bool: True إذا كان الرابط جديدًا أو تغيرت بصمة بياناته.
+        """
+        fetched_at = time.time() if fetched_at is None else fetched_at
+
+        def write(conn: sqlite3.Connection) -> bool:
+            row = conn.execute("SELECT content_hash FROM pages WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                conn.execute(
+                    "INSERT INTO pages (url, listed_lastmod, lastmod, content_hash, fetched_at, seen_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (url, lastmod, lastmod, content_hash, fetched_at, fetched_at)
+                )
+                return True
+            conn.execute(
+                "UPDATE pages SET lastmod = ?, content_hash = ?, fetched_at = ? WHERE url = ?",
+                (lastmod, content_hash, fetched_at, url)
+            )
+            return row[0] != content_hash
+
+        return self._write(write)
+
+    def counts(self) -> Dict[str, int]:
+        """
+        عدد الروابط وملفات sitemap المحفوظة.
+
+        العوائد:
+            Dict[str, int]: {"pages": ..., "fetched": ..., "sitemaps": ...}.
+        """
+        with self._lock:
+            pages, fetched = self._conn.execute("SELECT COUNT(*), COUNT(fetched_at) FROM pages").fetchone()
+            sitemaps = self._conn.execute("SELECT COUNT(*) FROM sitemaps").fetchone()[0]
+        return {"pages": pages, "fetched": fetched, "sitemaps": sitemaps}
+
+    def close(self) -> None:
+        """إغلاق الاتصال بقاعدة البيانات."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "RecrawlState":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class IncrementalRecrawler:
+    """
+    تحديث الكتالوج من ملفات sitemap بطلب الصفحات الجديدة أو المتغيرة فقط.
+
+    تقرأ ملفات sitemap بالتوازي عبر CameraScraper.fetch_raw (مع ذاكرة التخزين المؤقت وطلباتها
+    الشرطية إذا كانت مفعلة)، ثم تمرر الروابط المستحقة إلى iter_scrape، وتسجل بصمة كل نتيجة
+    ناجحة. الروابط الفاشلة تبقى مستحقة للتشغيل التالي.
+    """
+
+    def __init__(self,
+                 scraper: Any,
+                 state: RecrawlState,
+                 ttl: Optional[float] = DEFAULT_TTL,
+                 max_workers: int = 8,
+                 is_product: Optional[Callable[[str], bool]] = None):
+        """
+        تهيئة إعادة الزحف.
+
+        المعاملات:
+            scraper (CameraScraper): المستخرج.
+            state (RecrawlState): مخزن الحالة.
+            ttl (Optional[float]): مدة إعادة زيارة الروابط التي ليس لها lastmod بالثواني
+                (None لعدم إعادتها بعد أول طلب ناجح).
+            max_workers (int): عدد ملفات sitemap التي يتم تحميلها بالتوازي.
+            is_product (Optional[Callable[[str], bool]]): هل الرابط صفحة منتج (الافتراضي: parse_product_url).
+        """
+        self.scraper = scraper
+        self.state = state
+        self.ttl = ttl
+        self.max_workers = max(1, max_workers)
+        self.is_product = is_product or (lambda url: parse_product_url(url) is not None)
+        self.stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, int]:
+        return {"sitemaps": 0, "sitemaps_skipped": 0, "listed": 0, "due": 0,
+                "new": 0, "changed": 0, "unchanged": 0, "failed": 0}
+
+    def report(self) -> Dict[str, int]:
+        """
+        إحصائيات آخر تشغيل.
+
+        العوائد:
+            Dict[str, int]: ملفات sitemap المحملة والمتخطاة، والروابط المعلنة والمستحقة،
+            ونتائج الطلبات (جديدة أو متغيرة أو دون تغيير أو فاشلة).
+        """
+        return dict(self.stats)
+
+    def _load(self, url: str) -> Optional[Tuple[bool, List[SitemapEntry]]]:
+        page = self.scraper.fetch_raw(url)
+        if not page or not page[0]:
+            logger.warning(f"فشل في تحميل ملف sitemap: {url}")
+            return None
+        try:
+            return parse_sitemap(page[0])
+        except ValueError as e:
+            logger.warning(f"تعذر تحليل {url}: {e}")
+            return None
+
+    def refresh_sitemaps(self, sitemaps: Iterable[str], seen_at: Optional[float] = None) -> None:
+        """
+        قراءة ملفات sitemap وتحديث lastmod المعلن لكل رابط منتج في المخزن.
+
+        المعاملات:
+            sitemaps (Iterable[str]): ملفات sitemap أو فهارسها.
+            seen_at (Optional[float]): وقت التشغيل الحالي (الافتراضي: الآن).
+        """
+        seen_at = time.time() if seen_at is None else seen_at
+        # (رابط الملف، lastmod المعلن له في الفهرس)
+        level: List[Tuple[str, Optional[str]]] = [(url, None) for url in dict.fromkeys(sitemaps)]
+        visited = set()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while level:
+                to_load = []
+                for url, lastmod in level:
+                    if url in visited:
+                        continue
+                    visited.add(url)
+                    loaded, stored_lastmod = self.state.sitemap_lastmod(url)
+                    if lastmod is not None and loaded and stored_lastmod == lastmod:
+                        self.stats["sitemaps_skipped"] += 1
+                        self.stats["listed"] += self.state.touch_sitemap(url, seen_at)
+                    else:
+                        to_load.append((url, lastmod))
+
+                level = []
+                for (url, lastmod), parsed in zip(to_load, executor.map(lambda item: self._load(item[0]), to_load)):
+                    if parsed is None:
+                        continue
+                    self.stats["sitemaps"] += 1
+                    is_index, entries = parsed
+                    if is_index:
+                        level.extend((entry.url, entry.lastmod) for entry in entries if is_sitemap_url(entry.url))
+                        continue
+                    products = [entry for entry in entries if self.is_product(entry.url)]
+                    self.state.record_sitemap(url, lastmod, products, seen_at)
+                    self.stats["listed"] += len(products)
+
+    def plan(self, sitemaps: Iterable[str]) -> List[PageState]:
+        """
+        الروابط التي يجب طلبها في هذا التشغيل.
+
+        المعاملات:
+            sitemaps (Iterable[str]): ملفات sitemap أو فهارسها.
+
+        العوائد:
+            List[PageState]: الروابط المستحقة مع lastmod المعلن لكل منها.
+        """
+        self.stats = self._empty_stats()
+        started = time.time()
+        self.refresh_sitemaps(sitemaps, started)
+        due = self.state.due(started, self.ttl)
+        self.stats["due"] = len(due)
+        logger.info(
+            f"إعادة الزحف: {len(due)} رابط مستحق من {self.stats['listed']} رابط معلن "
+            f"({self.stats['sitemaps']} ملف sitemap محمل، {self.stats['sitemaps_skipped']} دون تغيير)"
+        )
+        return due
+
+    def run(self, sitemaps: Iterable[str], changed_only: bool = True,
+            **scrape_options: Any) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        طلب الروابط المستحقة وتسجيل نتائجها.
+
+        المعاملات:
+            sitemaps (Iterable[str]): ملفات sitemap أو فهارسها.
+            changed_only (bool): إعادة النتائج الجديدة أو المتغيرة بياناتها فقط.
+            **scrape_options: معاملات iter_scrape (مثل max_workers و per_host_limit و deadline).
+
+        العوائد:
+            Iterator[Tuple[str, Dict[str, Any]]]: (الرابط، البيانات) لكل نتيجة.
+        """
+        due = {page.url: page for page in self.plan(sitemaps)}
+        for url, data in self.scraper.iter_scrape(list(due), **scrape_options):
+            if not data or "error" in data:
+                self.stats["failed"] += 1
+                if changed_only:
+                    continue
+                yield url, data
+                continue
+
+            page = due[url]
+            changed = self.state.record_fetch(url, page.listed_lastmod, result_hash(data))
+            if page.content_hash is None:
+                self.stats["new"] += 1
+            else:
+                self.stats["changed" if changed else "unchanged"] += 1
+            if changed or not changed_only:
+                yield url, data
+
+        logger.info(
+            f"اكتملت إعادة الزحف: {self.stats['new']} جديد، {self.stats['changed']} متغير، "
+            f"{self.stats['unchanged']} دون تغيير، {self.stats['failed']} فاشل"
+        )
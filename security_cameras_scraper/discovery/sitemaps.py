@@ -0,0 +1,110 @@
+# الملف: security_cameras_scraper/discovery/sitemaps.py
+
+"""
+قراءة ملفات sitemap (قائمة روابط urlset أو فهرس sitemapindex)، المضغوطة بـ gzip أو غير المضغوطة.
+"""
+
+import io
+import gzip
+import logging
+from typing import List, NamedTuple, Optional, Tuple
+from xml.etree import ElementTree
+
+logger = logging.getLogger(__name__)
+
+# بداية محتوى gzip (ملفات .xml.gz تصل مضغوطة دون Content-Encoding)
+_GZIP_MAGIC = b"\x1f\x8b"
+
+# أقصى حجم بعد فك الضغط (حد البروتوكول 50MB لكل ملف)
+MAX_SITEMAP_SIZE = 50 * 1024 * 1024
+
+
+class SitemapEntry(NamedTuple):
+    """رابط في ملف sitemap."""
+    url: str
+    # قيمة <lastmod> كما وردت أو None
+    lastmod: Optional[str]
+
+
+def is_sitemap_url(url: str) -> bool:
+    """
+    هل يبدو الرابط ملف sitemap.
+
+    المعاملات:
+        url (str): الرابط.
+
+    العوائد:
+        bool: True لروابط .xml و .xml.gz وما يحتوي مساره على sitemap.
+    """
+    path = url.split("?", 1)[0].split("#", 1)[0].lower()
+    return path.endswith((".xml", ".xml.gz")) or "sitemap" in path.rsplit("/", 1)[-1]
+
+
+def decompress_sitemap(content: bytes) -> bytes:
+    """
+    فك ضغط محتوى sitemap إذا كان مضغوطًا بـ gzip.
+
+    المعاملات:
+        content (bytes): المحتوى الخام.
+
+    العوائد:
+        bytes: المحتوى غير المضغوط (بحد أقصى MAX_SITEMAP_SIZE).
+
+    الاستثناءات:
+        ValueError: إذا كان المحتوى المضغوط تالفًا أو تجاوز الحد الأقصى.
+    """
+    if not content.startswith(_GZIP_MAGIC):
+        return content
+    try:
+        with gzip.GzipFile(fileobj=io.BytesIO(content)) as stream:
+            data = stream.read(MAX_SITEMAP_SIZE + 1)
+    except (OSError, EOFError) as e:
+        raise ValueError(f"ملف sitemap مضغوط تالف: {e}") from e
+    if len(data) > MAX_SITEMAP_SIZE:
+        raise ValueError("ملف sitemap أكبر من الحد الأقصى بعد فك الضغط")
+    return data
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1].lower()
+
+
+def parse_sitemap(content: bytes) -> Tuple[bool, List[SitemapEntry]]:
+    """
+    تحليل ملف sitemap.
+
+    المعاملات:
+        content (bytes): المحتوى الخام (مضغوطًا أو غير مضغوط).
+
+    العوائد:
+        Tuple[bool, List[SitemapEntry]]: هل الملف فهرس sitemapindex (فتكون روابطه ملفات sitemap)،
+        والروابط بترتيبها في الملف.
+
+    الاستثناءات:
+        ValueError: إذا لم يكن المحتوى XML صالحًا.
+    """
+    data = decompress_sitemap(content)
+    is_index = False
+    entries = []
+    url = lastmod = None
+    try:
+        # تحليل تدريجي مع حذف كل عنصر بعد قراءته حتى لا تبقى الشجرة كاملة في الذاكرة
+        for event, element in ElementTree.iterparse(io.BytesIO(data), events=("start", "end")):
+            name = _local_name(element.tag)
+            if event == "start":
+                if name == "sitemapindex":
+                    is_index = True
+                elif name in ("url", "sitemap"):
+                    url = lastmod = None
+                continue
+            if name == "loc":
+                url = (element.text or "").strip()
+            elif name == "lastmod":
+                lastmod = (element.text or "").strip() or None
+            elif name in ("url", "sitemap"):
+                if url:
+                    entries.append(SitemapEntry(url, lastmod))
+                element.clear()
+    except ElementTree.ParseError as e:
+        raise ValueError(f"ملف sitemap غير صالح: {e}") from e
+    return is_index, entries
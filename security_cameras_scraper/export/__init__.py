@@ -2,10 +2,20 @@
 
 """
 حزمة أدوات تصدير البيانات المستخرجة بتنسيقات مختلفة.
+
+يتم استيراد وحدات التصدير عند أول وصول إليها فقط (pandas لا يحمل إلا مع Excel).
 """
 
-from .json_exporter import export_json
-from .csv_exporter import export_csv
-from .excel_exporter import export_excel
+from ..utils.lazy_utils import lazy_attributes
+
+_LAZY_ATTRIBUTES = {
+    'export_json': '.json_exporter',
+    'export_json_stream': '.json_exporter',
+    'JsonStreamWriter': '.json_exporter',
+    'export_csv': '.csv_exporter',
+    'export_excel': '.excel_exporter',
+}
+
+__all__ = ['export_json', 'export_json_stream', 'JsonStreamWriter', 'export_csv', 'export_excel']
 
-__all__ = ['export_json', 'export_csv', 'export_excel'] 
+__getattr__, __dir__ = lazy_attributes(globals(), _LAZY_ATTRIBUTES)
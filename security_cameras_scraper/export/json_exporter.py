@@ -7,7 +7,7 @@
 import os
 import json
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +48,119 @@ def export_json(data: Dict[str, Any],
         logger.error(f"خطأ أثناء تصدير البيانات إلى JSON: {str(e)}")
         return False
 
+class JsonStreamWriter:
+    """
+    كاتب JSON تدريجي يكتب نتيجة كل رابط فور وصولها دون الاحتفاظ بالنتائج في الذاكرة.
+    
+    ينتج نفس شكل الملف الذي يكتبه export_json لقاموس النتائج ({الرابط: البيانات})،
+    أو ملف JSON Lines بسطر لكل رابط ({"url": ..., "data": ...}) عند تفعيل lines.
+    
+    مثال:
+        with JsonStreamWriter("all_cameras.json") as writer:
+            for url, data in scraper.iter_scrape(urls):
+                writer.write(url, data)
+    """
+    
+    def __init__(self, 
+                 file_path: str, 
+                 indent: Optional[int] = 2, 
+                 ensure_ascii: bool = False,
+                 lines: bool = False):
+        """
+        فتح ملف الإخراج.
+        
+        المعاملات:
+            file_path (str): مسار الملف للتصدير.
+            indent (Optional[int]): عدد المسافات للتنسيق (يتم تجاهله مع lines).
+            ensure_ascii (bool): ما إذا كان سيتم ضمان استخدام ASCII فقط.
+            lines (bool): الكتابة بتنسيق JSON Lines بدلاً من كائن JSON واحد.
+        """
+        # قد يفتح عدة عمال ملفاتهم في نفس المجلد في الوقت نفسه
+        parent_dir = os.path.dirname(file_path)
+        if parent_dir:
+            os.makedirs(parent_dir, exist_ok=True)
+        
+        self.file_path = file_path
+        self.indent = None if lines else indent
+        self.ensure_ascii = ensure_ascii
+        self.lines = lines
+        self.count = 0
+        self._file = open(file_path, 'w', encoding='utf-8')
+        
+        if not lines:
+            self._file.write("{")
+    
+    def write(self, url: str, data: Dict[str, Any]) -> None:
+        """
+        كتابة نتيجة رابط واحد.
+        
+        المعاملات:
+            url (str): الرابط.
+            data (Dict[str, Any]): البيانات المستخرجة للرابط.
+        
+        الاستثناءات:
+            ValueError: إذا كان الملف مغلقًا.
+        """
+        if self._file is None:
+            raise ValueError(f"ملف JSON مغلق: {self.file_path}")
+        
+        if self.lines:
+            record = {"url": url, "data": data}
+            self._file.write(json.dumps(record, ensure_ascii=self.ensure_ascii) + "\n")
+        else:
+            value = json.dumps(data, ensure_ascii=self.ensure_ascii, indent=self.indent)
+            key = json.dumps(url, ensure_ascii=self.ensure_ascii)
+            if self.indent:
+                padding = " " * self.indent
+                value = value.replace("\n", "\n" + padding)
+                self._file.write(f"{',' if self.count else ''}\n{padding}{key}: {value}")
+            else:
+                self._file.write(f"{', ' if self.count else ''}{key}: {value}")
+        
+        # الكتابة إلى القرص فورًا حتى تبقى النتائج السابقة محفوظة عند توقف التشغيل
+        self._file.flush()
+        self.count += 1
+    
+    def close(self) -> None:
+        """إكمال الملف وإغلاقه."""
+        if self._file is None:
+            return
+        
+        if not self.lines:
+            self._file.write("\n}\n" if self.indent and self.count else "}\n")
+        self._file.close()
+        self._file = None
+        logger.info(f"تم تصدير {self.count} نتيجة إلى {self.file_path}")
+    
+    def __enter__(self) -> "JsonStreamWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+def export_json_stream(records: Iterable[Tuple[str, Dict[str, Any]]], 
+                       file_path: str, 
+                       indent: Optional[int] = 2, 
+                       ensure_ascii: bool = False,
+                       lines: bool = False) -> int:
+    """
+    تصدير نتائج تصل تدريجيًا (مثل iter_scrape) إلى ملف JSON دون جمعها في الذاكرة.
+    
+    المعاملات:
+        records (Iterable[Tuple[str, Dict[str, Any]]]): أزواج (الرابط، البيانات).
+        file_path (str): مسار الملف للتصدير.
+        indent (Optional[int]): عدد المسافات للتنسيق.
+        ensure_ascii (bool): ما إذا كان سيتم ضمان استخدام ASCII فقط.
+        lines (bool): الكتابة بتنسيق JSON Lines.
+        
+    العوائد:
+        int: عدد النتائج المكتوبة.
+    """
+    with JsonStreamWriter(file_path, indent=indent, ensure_ascii=ensure_ascii, lines=lines) as writer:
+        for url, data in records:
+            writer.write(url, data)
+        return writer.count
+
 def load_json(file_path: str) -> Optional[Dict[str, Any]]:
     """
     تحميل بيانات من ملف JSON.
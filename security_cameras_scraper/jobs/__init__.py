@@ -0,0 +1,41 @@
+# الملف: security_cameras_scraper/jobs/__init__.py
+
+"""
+حزمة عمليات الاستخراج الطويلة القابلة للاستئناف والقابلة للتوزيع على عدة أجهزة.
+
+يتم استيراد الوحدات عند أول وصول إليها فقط.
+"""
+
+from ..utils.lazy_utils import lazy_attributes
+
+_LAZY_ATTRIBUTES = {
+    'LeaseQueue': '.lease_queue',
+    'MemoryLeaseQueue': '.lease_queue',
+    'JOB_STATES': '.lease_queue',
+    'JobStore': '.job_store',
+    'JobRecord': '.job_store',
+    'default_worker_id': '.job_store',
+    'result_hash': '.job_store',
+    'run_jobs': '.runner',
+    'run_worker': '.runner',
+    'Heartbeat': '.runner',
+    'merge_shards': '.shards',
+    'iter_shard_records': '.shards',
+}
+
+__all__ = [
+    'LeaseQueue',
+    'MemoryLeaseQueue',
+    'JOB_STATES',
+    'JobStore',
+    'JobRecord',
+    'default_worker_id',
+    'result_hash',
+    'run_jobs',
+    'run_worker',
+    'Heartbeat',
+    'merge_shards',
+    'iter_shard_records',
+]
+
+__getattr__, __dir__ = lazy_attributes(globals(), _LAZY_ATTRIBUTES)
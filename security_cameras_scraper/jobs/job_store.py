@@ -0,0 +1,431 @@
+# الملف: security_cameras_scraper/jobs/job_store.py
+
+"""
+مخزن مهام دائم (SQLite) لعمليات الاستخراج الطويلة القابلة للاستئناف.
+
+يسجل المخزن حالة كل رابط (pending أو in_flight أو done أو failed) مع عدد المحاولات وآخر
+خطأ وبصمة النتيجة. يحجز العمال الروابط بعقود إيجار (leases) لها مدة صلاحية داخل
+معاملات BEGIN IMMEDIATE، لذلك يمكن لعدة عمليات على نفس الجهاز العمل على نفس الملف
+بأمان (وضع WAL يسمح بالقراءة أثناء الكتابة). عند توقف عملية يعود ما حجزته إلى الانتظار
+بعد انتهاء العقد، أو فورًا إذا كانت العملية على نفس الجهاز ولم تعد موجودة.
+
+لتوزيع العمل على عدة أجهزة يمكن وضع الملف على تخزين مشترك مع journal_mode="DELETE"،
+وتجديد العقود دوريًا (heartbeat) أثناء العمل.
+"""
+
+import os
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from .lease_queue import LeaseQueue, PENDING, IN_FLIGHT, DONE, FAILED, JOB_STATES, LEASE_LOST
+from ..utils.sqlite_utils import write_transaction
+
+logger = logging.getLogger(__name__)
+
+# أوضاع سجل المعاملات المدعومة: WAL لملف على نفس الجهاز، وDELETE لملف على تخزين
+# مشترك بين عدة أجهزة (مثل NFS) لأن WAL يعتمد على ذاكرة مشتركة داخل جهاز واحد
+JOURNAL_MODES = ("WAL", "DELETE")
+
+# عدد الروابط في كل عبارة إدراج
+_INSERT_CHUNK = 500
+
+
+class JobRecord(NamedTuple):
+    """حالة رابط واحد في مخزن المهام."""
+    url: str
+    state: str
+    attempts: int
+    last_error: Optional[str]
+    content_hash: Optional[str]
+    lease_owner: Optional[str]
+    lease_expires: Optional[float]
+    updated_at: float
+
+
+def default_worker_id() -> str:
+    """
+    معرف فريد للعامل بالصيغة "المضيف:رقم العملية:لاحقة عشوائية".
+
+    العوائد:
+        str: معرف العامل.
+    """
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def result_hash(data: Dict[str, Any]) -> str:
+    """
+    حساب بصمة نتيجة مستخرجة (SHA-256 لتمثيل JSON مرتب المفاتيح).
+
+    المعاملات:
+        data (Dict[str, Any]): البيانات المستخرجة.
+
+    العوائد:
+        str: البصمة بالنظام الست عشري.
+    """
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _local_owner_is_dead(owner: Optional[str], hostname: str) -> bool:
+    """ما إذا كان صاحب العقد عملية على هذا الجهاز لم تعد موجودة."""
+    if not owner or os.name != "posix":
+        return False
+
+    parts = owner.split(":")
+    if len(parts) < 2 or parts[0] != hostname or not parts[1].isdigit():
+        return False
+
+    pid = int(parts[1])
+    if pid == os.getpid():
+        return False
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        return False
+    return False
+
+
+class JobStore(LeaseQueue):
+    """
+    مخزن حالة الروابط لعملية استخراج قابلة للاستئناف.
+
+    مثال:
+        with JobStore("jobs.sqlite") as store:
+            store.add(urls)
+            for url in store.lease(worker_id, limit=10):
+                ...
+                store.complete(url, result_hash(data), worker_id)
+    """
+
+    def __init__(self,
+                 path: str,
+                 lease_seconds: float = 600,
+                 max_attempts: int = 3,
+                 timeout: float = 30,
+                 journal_mode: str = "WAL"):
+        """
+        فتح مخزن المهام وإنشاء جداوله عند الحاجة.
+
+        المعاملات:
+            path (str): مسار ملف SQLite.
+            lease_seconds (float): مدة عقد الحجز الافتراضية بالثواني.
+            max_attempts (int): عدد المحاولات قبل اعتبار الرابط فاشلاً نهائيًا.
+            timeout (float): مدة انتظار قفل قاعدة البيانات بالثواني عند تزاحم العمال.
+            journal_mode (str): 'WAL' لملف محلي، أو 'DELETE' لملف على تخزين مشترك بين الأجهزة.
+
+        الاستثناءات:
+            ValueError: إذا كانت مدة العقد أو عدد المحاولات غير موجب، أو وضع السجل غير مدعوم.
+        """
+        if lease_seconds <= 0:
+            raise ValueError("يجب أن تكون مدة عقد الحجز موجبة")
+        if max_attempts < 1:
+            raise ValueError("يجب أن يكون عدد المحاولات 1 على الأقل")
+        journal_mode = journal_mode.upper()
+        if journal_mode not in JOURNAL_MODES:
+            raise ValueError(f"وضع سجل معاملات غير مدعوم: {journal_mode}")
+
+        parent_dir = os.path.dirname(path)
+        if parent_dir and not os.path.exists(parent_dir):
+            os.makedirs(parent_dir)
+
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._hostname = socket.gethostname()
+        self._lock = threading.Lock()
+
+        # المعاملات تدار يدويًا (BEGIN IMMEDIATE) لضمان حجز كل رابط لعامل واحد فقط
+        self._conn = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._conn.execute(f"PRAGMA journal_mode={journal_mode}")
+        # NORMAL آمن مع WAL فقط، أما مع DELETE فتلزم المزامنة الكاملة لتجنب تلف الملف
+        self._conn.execute(f"PRAGMA synchronous={'NORMAL' if journal_mode == 'WAL' else 'FULL'}")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "url TEXT PRIMARY KEY, state TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, "
+            "last_error TEXT, content_hash TEXT, lease_owner TEXT, lease_expires REAL, "
+            "updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, lease_expires)")
+
+    def _write(self, statements: Any) -> Any:
+        """تنفيذ دالة كتابة داخل معاملة BEGIN IMMEDIATE."""
+        return write_transaction(self._conn, self._lock, statements)
+
+    def add(self, urls: Iterable[str]) -> int:
+        """
+        إضافة روابط جديدة بحالة pending (يتم تجاهل الروابط الموجودة مسبقًا).
+
+        المعاملات:
+            urls (Iterable[str]): الروابط.
+
+        العوائد:
+            int: عدد الروابط الجديدة.
+        """
+        now = time.time()
+        added = 0
+        chunk = []
+
+        def insert(conn: sqlite3.Connection) -> int:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs (url, state, updated_at) VALUES (?, ?, ?)",
+                [(url, PENDING, now) for url in chunk]
+            )
+            return conn.total_changes - before
+
+        for url in urls:
+            chunk.append(url)
+            if len(chunk) >= _INSERT_CHUNK:
+                added += self._write(insert)
+                chunk = []
+        if chunk:
+            added += self._write(insert)
+
+        if added:
+            logger.info(f"تمت إضافة {added} رابط إلى مخزن المهام")
+        return added
+
+    def lease(self, worker_id: str, limit: int = 1, lease_seconds: Optional[float] = None) -> List[str]:
+        """
+        حجز روابط للعامل بترتيب إضافتها.
+
+        تشمل الروابط المتاحة: المنتظرة، والمحجوزة التي انتهى عقدها. الرابط الذي انتهى عقده
+        بعد max_attempts محاولة يصبح failed بدلاً من حجزه من جديد، حتى لا يتكرر إلى ما لا نهاية
+        رابط يوقف العامل أو يعلقه في كل مرة.
+
+        المعاملات:
+            worker_id (str): معرف العامل.
+            limit (int): الحد الأقصى لعدد الروابط.
+            lease_seconds (Optional[float]): مدة العقد (الافتراضي: lease_seconds للمخزن).
+
+        العوائد:
+            List[str]: الروابط المحجوزة (قائمة فارغة إذا لم يبق شيء متاح).
+        """
+        now = time.time()
+        expires = now + (lease_seconds or self.lease_seconds)
+
+        def claim(conn: sqlite3.Connection) -> List[str]:
+            conn.execute(
+                "UPDATE jobs SET state = ?, last_error = ?, lease_owner = NULL, lease_expires = NULL, "
+                "updated_at = ? WHERE state = ? AND lease_expires < ? AND attempts >= ?",
+                (FAILED, LEASE_LOST, now, IN_FLIGHT, now, self.max_attempts)
+            )
+            rows = conn.execute(
+                "SELECT url FROM jobs WHERE state = ? OR (state = ? AND lease_expires < ?) "
+                "ORDER BY rowid LIMIT ?",
+                (PENDING, IN_FLIGHT, now, limit)
+            ).fetchall()
+            urls = [row[0] for row in rows]
+            conn.executemany(
+                "UPDATE jobs SET state = ?, attempts = attempts + 1, lease_owner = ?, "
+                "lease_expires = ?, updated_at = ? WHERE url = ?",
+                [(IN_FLIGHT, worker_id, expires, now, url) for url in urls]
+            )
+            return urls
+
+        return self._write(claim)
+
+    def heartbeat(self, worker_id: str, lease_seconds: Optional[float] = None) -> int:
+        """
+        تمديد عقود جميع الروابط التي يحجزها العامل.
+
+        المعاملات:
+            worker_id (str): معرف العامل.
+            lease_seconds (Optional[float]): مدة العقد الجديدة من الآن (الافتراضي: lease_seconds للمخزن).
+
+        العوائد:
+            int: عدد العقود الممددة.
+        """
+        expires = time.time() + (lease_seconds or self.lease_seconds)
+
+        def update(conn: sqlite3.Connection) -> int:
+            return conn.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE state = ? AND lease_owner = ?",
+                (expires, IN_FLIGHT, worker_id)
+            ).rowcount
+
+        return self._write(update)
+
+    def complete(self, url: str, content_hash: Optional[str] = None, worker_id: Optional[str] = None) -> bool:
+        """
+        تسجيل اكتمال رابط.
+
+        المعاملات:
+            url (str): الرابط.
+            content_hash (Optional[str]): بصمة النتيجة (اختياري).
+            worker_id (Optional[str]): معرف العامل؛ عند تحديده لا يتم التحديث إلا إذا كان
+                العقد ما زال له (حتى لا يكتب عامل انتهى عقده فوق عامل آخر).
+
+        العوائد:
+            bool: True إذا تم تحديث حالة الرابط.
+        """
+        return self._finish(url, DONE, None, content_hash, worker_id)
+
+    def fail(self, url: str, error: str, worker_id: Optional[str] = None) -> bool:
+        """
+        تسجيل فشل محاولة لرابط.
+
+        يعود الرابط إلى الانتظار لمحاولة أخرى ما لم يبلغ max_attempts، وعندها يصبح failed.
+
+        المعاملات:
+            url (str): الرابط.
+            error (str): رسالة الخطأ.
+            worker_id (Optional[str]): معرف العامل (انظر complete).
+
+        العوائد:
+            bool: True إذا تم تحديث حالة الرابط.
+        """
+        return self._finish(url, None, error, None, worker_id)
+
+    def _finish(self,
+                url: str,
+                state: Optional[str],
+                error: Optional[str],
+                content_hash: Optional[str],
+                worker_id: Optional[str]) -> bool:
+        """تحديث حالة رابط محجوز بعد معالجته (state=None تعني فشل المحاولة)."""
+        now = time.time()
+
+        def update(conn: sqlite3.Connection) -> bool:
+            query = "SELECT attempts, lease_owner FROM jobs WHERE url = ?"
+            row = conn.execute(query, (url,)).fetchone()
+            if row is None or (worker_id is not None and row[1] != worker_id):
+                return False
+
+            new_state = state or (FAILED if row[0] >= self.max_attempts else PENDING)
+            conn.execute(
+                "UPDATE jobs SET state = ?, last_error = ?, "
+                "content_hash = COALESCE(?, content_hash), lease_owner = NULL, "
+                "lease_expires = NULL, updated_at = ? WHERE url = ?",
+                (new_state, error, content_hash, now, url)
+            )
+            return True
+
+        updated = self._write(update)
+        if not updated:
+            logger.warning(f"لم يعد الرابط محجوزًا لهذا العامل، تم تجاهل النتيجة: {url}")
+        return updated
+
+    def release(self, worker_id: str) -> int:
+        """
+        إعادة جميع روابط العامل المحجوزة إلى الانتظار دون احتساب المحاولة (عند إنهاء العامل
+        تشغيله طوعًا قبل معالجتها).
+
+        المعاملات:
+            worker_id (str): معرف العامل.
+
+        العوائد:
+            int: عدد الروابط المعادة.
+        """
+        def update(conn: sqlite3.Connection) -> int:
+            return conn.execute(
+                "UPDATE jobs SET state = ?, attempts = MAX(attempts - 1, 0), lease_owner = NULL, "
+                "lease_expires = NULL, updated_at = ? WHERE state = ? AND lease_owner = ?",
+                (PENDING, time.time(), IN_FLIGHT, worker_id)
+            ).rowcount
+
+        return self._write(update)
+
+    def recover(self) -> int:
+        """
+        إعادة الروابط التي حجزتها عمليات متوقفة على هذا الجهاز إلى الانتظار فورًا.
+
+        تحتسب المحاولة لأن العملية قد تكون توقفت بسبب الرابط نفسه، فيصبح الرابط failed عند
+        بلوغ max_attempts. تعود حجوزات العمال على الأجهزة الأخرى بعد انتهاء عقودها فقط.
+
+        العوائد:
+            int: عدد الروابط المعادة.
+        """
+        with self._lock:
+            owners = [row[0] for row in self._conn.execute(
+                "SELECT DISTINCT lease_owner FROM jobs WHERE state = ?", (IN_FLIGHT,)
+            )]
+
+        count = 0
+        for owner in owners:
+            if _local_owner_is_dead(owner, self._hostname):
+                count += self._reclaim(owner)
+
+        if count:
+            logger.info(f"تمت استعادة {count} رابط من عمليات متوقفة")
+        return count
+
+    def retry_failed(self) -> int:
+        """
+        إعادة الروابط الفاشلة نهائيًا إلى الانتظار مع تصفير محاولاتها.
+
+        العوائد:
+            int: عدد الروابط المعادة.
+        """
+        def update(conn: sqlite3.Connection) -> int:
+            return conn.execute(
+                "UPDATE jobs SET state = ?, attempts = 0, updated_at = ? WHERE state = ?",
+                (PENDING, time.time(), FAILED)
+            ).rowcount
+
+        return self._write(update)
+
+    def get(self, url: str) -> Optional[JobRecord]:
+        """
+        إرجاع حالة رابط.
+
+        المعاملات:
+            url (str): الرابط.
+
+        العوائد:
+            Optional[JobRecord]: السجل أو None إذا لم يكن الرابط في المخزن.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, state, attempts, last_error, content_hash, lease_owner, "
+                "lease_expires, updated_at FROM jobs WHERE url = ?",
+                (url,)
+            ).fetchone()
+
+        return JobRecord(*row) if row else None
+
+    def counts(self) -> Dict[str, int]:
+        """
+        عدد الروابط في كل حالة.
+
+        العوائد:
+            Dict[str, int]: الحالة -> العدد (لجميع الحالات حتى الفارغة).
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+
+        counts = dict.fromkeys(JOB_STATES, 0)
+        counts.update(rows)
+        return counts
+
+    def close(self) -> None:
+        """إغلاق قاعدة البيانات."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "JobStore":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _reclaim(self, worker_id: str) -> int:
+        """إعادة روابط عامل متوقف إلى الانتظار مع احتساب المحاولة (أو failed عند بلوغ الحد)."""
+        def update(conn: sqlite3.Connection) -> int:
+            return conn.execute(
+                "UPDATE jobs SET state = CASE WHEN attempts >= ? THEN ? ELSE ? END, last_error = ?, "
+                "lease_owner = NULL, lease_expires = NULL, updated_at = ? WHERE state = ? AND lease_owner = ?",
+                (self.max_attempts, FAILED, PENDING, LEASE_LOST, time.time(), IN_FLIGHT, worker_id)
+            ).rowcount
+
+        return self._write(update)
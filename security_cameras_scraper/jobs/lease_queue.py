@@ -0,0 +1,178 @@
+# الملف: security_cameras_scraper/jobs/lease_queue.py
+
+"""
+واجهة طابور الروابط بعقود حجز مؤقتة التي يعمل عليها العمال (run_jobs و run_worker).
+
+يكفي تنفيذ هذه الواجهة لتوزيع العمل عبر أي مخزن مشترك. تتوفر تنفيذات:
+
+    JobStore:          SQLite (ملف محلي بوضع WAL، أو على تخزين مشترك بين الأجهزة بوضع DELETE).
+    MemoryLeaseQueue:  طابور في الذاكرة لعمال داخل نفس العملية (للاختبارات والتجارب المحلية).
+"""
+
+import abc
+import time
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+# حالات الروابط
+PENDING = "pending"
+IN_FLIGHT = "in_flight"
+DONE = "done"
+FAILED = "failed"
+
+JOB_STATES = (PENDING, IN_FLIGHT, DONE, FAILED)
+
+# خطأ الرابط الذي انتهى عقده أو توقف عامله دون تسجيل نتيجة
+LEASE_LOST = "انتهى عقد الحجز دون نتيجة (توقف العامل أو تعلق)"
+
+
+class LeaseQueue(abc.ABC):
+    """
+    الواجهة المشتركة لطوابير الروابط.
+
+    يحجز العامل الروابط بعقد له مدة صلاحية، ويجدده دوريًا (heartbeat) أثناء العمل، ثم
+    يسجل النتيجة. تعود روابط العامل الذي يتوقف عن التجديد إلى الانتظار بعد انتهاء عقده.
+    """
+
+    @abc.abstractmethod
+    def add(self, urls: Iterable[str]) -> int:
+        """إضافة روابط جديدة (يتم تجاهل الموجودة) وإرجاع عدد الجديدة منها."""
+
+    @abc.abstractmethod
+    def lease(self, worker_id: str, limit: int = 1, lease_seconds: Optional[float] = None) -> List[str]:
+        """حجز روابط متاحة للعامل (المنتظرة أو التي انتهى عقدها)."""
+
+    @abc.abstractmethod
+    def heartbeat(self, worker_id: str, lease_seconds: Optional[float] = None) -> int:
+        """تمديد عقود جميع روابط العامل المحجوزة وإرجاع عددها."""
+
+    @abc.abstractmethod
+    def complete(self, url: str, content_hash: Optional[str] = None, worker_id: Optional[str] = None) -> bool:
+        """تسجيل اكتمال رابط (يرفض إذا لم يعد العقد للعامل)."""
+
+    @abc.abstractmethod
+    def fail(self, url: str, error: str, worker_id: Optional[str] = None) -> bool:
+        """تسجيل فشل محاولة (يعود الرابط للانتظار حتى بلوغ الحد الأقصى للمحاولات)."""
+
+    @abc.abstractmethod
+    def release(self, worker_id: str) -> int:
+        """إعادة روابط العامل المحجوزة إلى الانتظار دون احتساب المحاولة."""
+
+    @abc.abstractmethod
+    def counts(self) -> Dict[str, int]:
+        """عدد الروابط في كل حالة."""
+
+    def recover(self) -> int:
+        """استعادة حجوزات العمال المتوقفة المعروفة فورًا (اختياري حسب المخزن)."""
+        return 0
+
+    def is_finished(self) -> bool:
+        """ما إذا لم يبق أي رابط منتظر أو محجوز."""
+        counts = self.counts()
+        return counts[PENDING] == 0 and counts[IN_FLIGHT] == 0
+
+
+class MemoryLeaseQueue(LeaseQueue):
+    """
+    طابور روابط في الذاكرة بنفس دلالات JobStore.
+
+    مناسب لعدة عمال (خيوط) داخل عملية واحدة، أو كبديل محلي للمخزن المشترك في الاختبارات.
+    """
+
+    def __init__(self, lease_seconds: float = 600, max_attempts: int = 3):
+        """
+        تهيئة الطابور.
+
+        المعاملات:
+            lease_seconds (float): مدة عقد الحجز الافتراضية بالثواني.
+            max_attempts (int): عدد المحاولات قبل اعتبار الرابط فاشلاً نهائيًا.
+        """
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        # الرابط -> الحالة (بترتيب الإضافة)
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, urls: Iterable[str]) -> int:
+        added = 0
+        with self._lock:
+            for url in urls:
+                if url not in self._jobs:
+                    self._jobs[url] = {"state": PENDING, "attempts": 0, "last_error": None,
+                                       "content_hash": None, "owner": None, "expires": None}
+                    added += 1
+        return added
+
+    def lease(self, worker_id: str, limit: int = 1, lease_seconds: Optional[float] = None) -> List[str]:
+        now = time.time()
+        expires = now + (lease_seconds or self.lease_seconds)
+        leased = []
+
+        with self._lock:
+            for url, job in self._jobs.items():
+                if len(leased) >= limit:
+                    break
+                expired = job["state"] == IN_FLIGHT and job["expires"] < now
+                if expired and job["attempts"] >= self.max_attempts:
+                    # لا يعاد حجز رابط أوقف العامل أو علقه في كل محاولاته
+                    job.update(state=FAILED, last_error=LEASE_LOST, owner=None, expires=None)
+                    continue
+                if job["state"] == PENDING or expired:
+                    job.update(state=IN_FLIGHT, owner=worker_id, expires=expires, attempts=job["attempts"] + 1)
+                    leased.append(url)
+
+        return leased
+
+    def heartbeat(self, worker_id: str, lease_seconds: Optional[float] = None) -> int:
+        expires = time.time() + (lease_seconds or self.lease_seconds)
+        count = 0
+
+        with self._lock:
+            for job in self._jobs.values():
+                if job["state"] == IN_FLIGHT and job["owner"] == worker_id:
+                    job["expires"] = expires
+                    count += 1
+
+        return count
+
+    def _finish(self,
+                url: str,
+                state: Optional[str],
+                error: Optional[str],
+                content_hash: Optional[str],
+                worker_id: Optional[str]) -> bool:
+        with self._lock:
+            job = self._jobs.get(url)
+            if job is None or (worker_id is not None and job["owner"] != worker_id):
+                return False
+
+            job.update(
+                state=state or (FAILED if job["attempts"] >= self.max_attempts else PENDING),
+                last_error=error,
+                content_hash=content_hash or job["content_hash"],
+                owner=None,
+                expires=None
+            )
+            return True
+
+    def complete(self, url: str, content_hash: Optional[str] = None, worker_id: Optional[str] = None) -> bool:
+        return self._finish(url, DONE, None, content_hash, worker_id)
+
+    def fail(self, url: str, error: str, worker_id: Optional[str] = None) -> bool:
+        return self._finish(url, None, error, None, worker_id)
+
+    def release(self, worker_id: str) -> int:
+        count = 0
+        with self._lock:
+            for job in self._jobs.values():
+                if job["state"] == IN_FLIGHT and job["owner"] == worker_id:
+                    job.update(state=PENDING, owner=None, expires=None, attempts=max(job["attempts"] - 1, 0))
+                    count += 1
+        return count
+
+    def counts(self) -> Dict[str, int]:
+        counts = dict.fromkeys(JOB_STATES, 0)
+        with self._lock:
+            for job in self._jobs.values():
+                counts[job["state"]] += 1
+        return counts
@@ -0,0 +1,211 @@
+# الملف: security_cameras_scraper/jobs/runner.py
+
+"""
+تشغيل عملية استخراج من مخزن المهام مع حفظ حالة كل رابط فور اكتماله.
+
+run_jobs تعمل على أي طابور LeaseQueue، و run_worker تضيف إليها ملف نتائج خاصًا بالعامل
+بحيث يمكن تشغيل عدة أجهزة على نفس الطابور المشترك ثم دمج نتائجها عبر merge_shards.
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from .lease_queue import LeaseQueue
+from .job_store import default_worker_id, result_hash
+from .shards import open_shard
+from ..utils.hedge_utils import DEADLINE_EXCEEDED
+
+logger = logging.getLogger(__name__)
+
+# دالة تستقبل (الرابط، البيانات) لكل رابط ناجح، مثل كتابة النتيجة إلى ملف
+ResultCallback = Callable[[str, Dict[str, Any]], None]
+
+
+class Heartbeat:
+    """
+    خيط يجدد عقود روابط العامل دوريًا طالما العامل يعمل.
+
+    يسمح ذلك باستخدام عقود قصيرة بحيث تعود روابط العامل المتوقف (أو الجهاز المنقطع)
+    إلى الطابور بسرعة، دون أن تنتهي عقود الروابط البطيئة لعامل ما زال يعمل عليها.
+    """
+
+    def __init__(self, queue: LeaseQueue, worker_id: str, lease_seconds: Optional[float] = None,
+                 interval: Optional[float] = None):
+        """
+        تهيئة الخيط.
+
+        المعاملات:
+            queue (LeaseQueue): طابور الروابط.
+            worker_id (str): معرف العامل.
+            lease_seconds (Optional[float]): مدة العقد بعد كل تجديد (الافتراضي: مدة الطابور).
+            interval (Optional[float]): الفاصل بين التجديدات بالثواني (الافتراضي: ثلث مدة العقد).
+        """
+        self.queue = queue
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.interval = interval or (lease_seconds or getattr(queue, "lease_seconds", 60)) / 3
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.queue.heartbeat(self.worker_id, self.lease_seconds)
+            except Exception as e:
+                logger.warning(f"فشل تجديد عقود العامل {self.worker_id}: {str(e)}")
+
+    def start(self) -> "Heartbeat":
+        """بدء التجديد الدوري."""
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """إيقاف التجديد الدوري."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def __enter__(self) -> "Heartbeat":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+
+def _leased_urls(store: LeaseQueue, worker_id: str, batch_size: int,
+                 lease_seconds: Optional[float]) -> Iterator[str]:
+    """حجز الروابط على دفعات صغيرة كلما احتاج المستخرج روابط جديدة."""
+    while True:
+        urls = store.lease(worker_id, batch_size, lease_seconds)
+        if not urls:
+            return
+        yield from urls
+
+
+def run_jobs(scraper: Any,
+             store: LeaseQueue,
+             on_result: Optional[ResultCallback] = None,
+             max_workers: int = 4,
+             batch_size: Optional[int] = None,
+             worker_id: Optional[str] = None,
+             headers: Optional[Dict[str, str]] = None,
+             per_host_limit: Optional[int] = None,
+             lease_seconds: Optional[float] = None,
+             heartbeat_interval: Optional[float] = None,
+             deadline: Optional[float] = None) -> Dict[str, int]:
+    """
+    استخراج جميع الروابط المتاحة في مخزن المهام.
+
+    يحجز العامل الروابط تدريجيًا حسب تقدم الاستخراج (iter_scrape)، ويسجل حالة كل رابط
+    فور اكتماله، لذلك يكفي إعادة تشغيل الدالة على نفس المخزن بعد أي توقف لتكمل من حيث
+    توقفت. يمكن تشغيل عدة عمليات على نفس المخزن في الوقت نفسه.
+
+    المعاملات:
+        scraper (Any): كائن CameraScraper.
+        store (LeaseQueue): مخزن المهام (JobStore أو أي طابور LeaseQueue).
+        on_result (Optional[ResultCallback]): دالة تستدعى لكل رابط ناجح قبل تسجيله كمكتمل (اختياري).
+        max_workers (int): عدد العمال المتوازيين داخل هذه العملية.
+        batch_size (Optional[int]): عدد الروابط في كل حجز (الافتراضي: max_workers).
+        worker_id (Optional[str]): معرف العامل (الافتراضي: معرف فريد لهذه العملية).
+        headers (Optional[Dict[str, str]]): رؤوس HTTP مخصصة (اختياري).
+        per_host_limit (Optional[int]): الحد الأقصى للطلبات المتزامنة لكل شركة مصنعة من هذا العامل (اختياري).
+        lease_seconds (Optional[float]): مدة عقد الحجز (الافتراضي: مدة الطابور).
+        heartbeat_interval (Optional[float]): تجديد العقود دوريًا بهذا الفاصل بالثواني أثناء العمل
+            (None يعني دون تجديد، فيجب أن تكفي مدة العقد لمعالجة كل دفعة).
+        deadline (Optional[float]): مدة التشغيل القصوى بالثواني؛ الروابط التي لم تكتمل قبلها
+            تعود للانتظار دون احتساب محاولة فاشلة (None يعني دون مهلة).
+
+    العوائد:
+        Dict[str, int]: عدد الروابط المكتملة والفاشلة في هذا التشغيل ({"done": ..., "failed": ...}).
+    """
+    worker_id = worker_id or default_worker_id()
+    batch_size = batch_size or max(max_workers, 1)
+    summary = {"done": 0, "failed": 0}
+
+    # استعادة الروابط التي حجزتها عمليات سابقة توقفت على هذا الجهاز
+    store.recover()
+
+    urls = _leased_urls(store, worker_id, batch_size, lease_seconds)
+    results = scraper.iter_scrape(urls, headers, max_workers, max_in_flight=batch_size,
+                                  per_host_limit=per_host_limit, deadline=deadline)
+    heartbeat = None
+    if heartbeat_interval:
+        heartbeat = Heartbeat(store, worker_id, lease_seconds, heartbeat_interval).start()
+
+    try:
+        for url, data in results:
+            error = data.get("error") if data else "لم يتم استخراج أي بيانات"
+            if error == DEADLINE_EXCEEDED:
+                # يبقى الرابط محجوزًا ويعاد للانتظار عند الانتهاء
+                continue
+            if error:
+                store.fail(url, error, worker_id)
+                summary["failed"] += 1
+                continue
+
+            try:
+                if on_result is not None:
+                    on_result(url, data)
+            except Exception as e:
+                logger.error(f"خطأ أثناء حفظ نتيجة {url}: {str(e)}")
+                store.fail(url, str(e), worker_id)
+                summary["failed"] += 1
+                continue
+
+            # يرفض الطابور النتيجة إذا انتهى العقد وحجز عامل آخر الرابط (يزيلها merge_shards)
+            if store.complete(url, result_hash(data), worker_id):
+                summary["done"] += 1
+    finally:
+        results.close()
+        if heartbeat is not None:
+            heartbeat.stop()
+        # الروابط المحجوزة التي لم تكتمل (مثل التوقف بـ Ctrl+C) تعود للانتظار فورًا
+        released = store.release(worker_id)
+        if released:
+            logger.info(f"تمت إعادة {released} رابط غير مكتمل إلى الانتظار")
+
+    logger.info(f"انتهى العامل {worker_id}: {summary['done']} مكتمل، {summary['failed']} فاشل")
+    return summary
+
+
+def run_worker(scraper: Any,
+               queue: LeaseQueue,
+               shard_dir: str,
+               worker_id: Optional[str] = None,
+               lease_seconds: Optional[float] = 60,
+               heartbeat_interval: Optional[float] = None,
+               **kwargs: Any) -> Dict[str, int]:
+    """
+    تشغيل عامل في وضع التوزيع: يحجز الروابط من طابور مشترك ويكتب نتائجه في ملف خاص به.
+
+    يمكن تشغيل هذه الدالة على عدة أجهزة في الوقت نفسه مع نفس الطابور (مثل JobStore على
+    تخزين مشترك بـ journal_mode="DELETE") ونفس shard_dir، ثم دمج النتائج بـ merge_shards.
+    يحترم كل عامل حد الطلبات لكل شركة (per_host_limit) على جهازه.
+
+    المعاملات:
+        scraper (Any): كائن CameraScraper.
+        queue (LeaseQueue): الطابور المشترك.
+        shard_dir (str): مجلد ملفات النتائج.
+        worker_id (Optional[str]): معرف العامل (الافتراضي: معرف فريد لهذه العملية).
+        lease_seconds (Optional[float]): مدة عقد الحجز (قصيرة لأن العامل يجددها دوريًا).
+        heartbeat_interval (Optional[float]): الفاصل بين تجديدات العقود (الافتراضي: ثلث مدة العقد).
+        **kwargs: معاملات إضافية لـ run_jobs (max_workers و batch_size و headers و per_host_limit
+            و deadline).
+
+    العوائد:
+        Dict[str, int]: عدد الروابط المكتملة والفاشلة لهذا العامل.
+    """
+    worker_id = worker_id or default_worker_id()
+    heartbeat_interval = heartbeat_interval or (lease_seconds or getattr(queue, "lease_seconds", 60)) / 3
+
+    with open_shard(shard_dir, worker_id) as shard:
+        return run_jobs(
+            scraper,
+            queue,
+            on_result=shard.write,
+            worker_id=worker_id,
+            lease_seconds=lease_seconds,
+            heartbeat_interval=heartbeat_interval,
+            **kwargs
+        )
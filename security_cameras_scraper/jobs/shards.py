@@ -0,0 +1,115 @@
+# الملف: security_cameras_scraper/jobs/shards.py
+
+"""
+ملفات نتائج منفصلة لكل عامل (shards) ودمجها في ملف واحد.
+
+يكتب كل عامل نتائجه إلى ملف JSON Lines خاص به داخل مجلد مشترك، فلا يتنافس العمال على
+ملف واحد ولا يتلف ملف عامل توقف إلا سطره الأخير. تجمع merge_shards الملفات بعد انتهاء
+التشغيل في ملف JSON واحد دون تحميل جميع النتائج في الذاكرة.
+"""
+
+import os
+import re
+import json
+import logging
+from typing import Any, Dict, Iterator, Tuple
+
+from ..export.json_exporter import JsonStreamWriter
+
+logger = logging.getLogger(__name__)
+
+# امتداد ملفات النتائج
+SHARD_EXTENSION = ".jsonl"
+
+# الأحرف غير المسموح بها في اسم ملف العامل
+_UNSAFE_CHARS_RE = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def shard_path(shard_dir: str, worker_id: str) -> str:
+    """
+    مسار ملف نتائج العامل.
+
+    المعاملات:
+        shard_dir (str): مجلد الملفات.
+        worker_id (str): معرف العامل.
+
+    العوائد:
+        str: مسار الملف.
+    """
+    return os.path.join(shard_dir, _UNSAFE_CHARS_RE.sub("_", worker_id) + SHARD_EXTENSION)
+
+
+def open_shard(shard_dir: str, worker_id: str) -> JsonStreamWriter:
+    """
+    فتح ملف نتائج العامل للكتابة (سطر JSON لكل رابط).
+
+    المعاملات:
+        shard_dir (str): مجلد الملفات.
+        worker_id (str): معرف العامل.
+
+    العوائد:
+        JsonStreamWriter: كاتب الملف.
+    """
+    return JsonStreamWriter(shard_path(shard_dir, worker_id), lines=True)
+
+
+def iter_shard_records(shard_dir: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    المرور على نتائج جميع ملفات العمال.
+
+    يتم تجاهل الأسطر غير المكتملة (مثل السطر الأخير لعامل توقف أثناء الكتابة).
+
+    المعاملات:
+        shard_dir (str): مجلد الملفات.
+
+    العوائد:
+        Iterator[Tuple[str, Dict[str, Any]]]: أزواج (الرابط، البيانات).
+    """
+    if not os.path.isdir(shard_dir):
+        return
+
+    for name in sorted(os.listdir(shard_dir)):
+        if not name.endswith(SHARD_EXTENSION):
+            continue
+
+        path = os.path.join(shard_dir, name)
+        with open(path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    yield record["url"], record["data"]
+                except (ValueError, KeyError, TypeError):
+                    logger.warning(f"تم تجاهل سطر غير صالح في {path}:{line_number}")
+
+
+def merge_shards(shard_dir: str, output_path: str, lines: bool = False) -> int:
+    """
+    دمج ملفات نتائج العمال في ملف واحد.
+
+    إذا ظهر رابط في أكثر من ملف (مثل رابط أعيد حجزه بعد انتهاء عقد عامل بطيء) يتم
+    الاحتفاظ بأول نتيجة له فقط.
+
+    المعاملات:
+        shard_dir (str): مجلد الملفات.
+        output_path (str): مسار ملف الإخراج.
+        lines (bool): الكتابة بتنسيق JSON Lines بدلاً من كائن JSON واحد ({الرابط: البيانات}).
+
+    العوائد:
+        int: عدد الروابط في الملف المدمج.
+    """
+    seen = set()
+    duplicates = 0
+
+    with JsonStreamWriter(output_path, lines=lines) as writer:
+        for url, data in iter_shard_records(shard_dir):
+            if url in seen:
+                duplicates += 1
+                continue
+            seen.add(url)
+            writer.write(url, data)
+
+    if duplicates:
+        logger.info(f"تم تجاهل {duplicates} نتيجة مكررة أثناء الدمج")
+    return len(seen)
@@ -6,15 +6,28 @@
 """
 
 import re
+import copy
+import time
+import queue
 import logging
-from typing import Dict, Any, Optional, List, Type
+import sqlite3
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Any, Iterable, Iterator, Optional, List, Tuple, Type, Union
+from urllib.parse import urlsplit
 
-from .scrapers.hikvision_scraper import HikvisionScraper
-from .scrapers.dahua_scraper import DahuaScraper
-from .utils.http_utils import fetch_page
-from .export.json_exporter import export_json
-from .export.csv_exporter import export_csv
-from .export.excel_exporter import export_excel
+from .scrapers.registry import ManufacturerRegistry
+from .utils.http_utils import FetchResult, fetch_page_raw
+from .utils.parse_pool import ParseWorkerPool, extract_page
+from .utils.session_utils import SessionManager
+from .utils.concurrency_utils import AdaptiveHostLimiter, HostLimiter, SingleFlight
+from .utils.url_utils import canonicalize_url, group_urls
+from .utils.model_utils import ModelIndex
+from .utils.rate_limit_utils import HostRateLimiter, interleave_hosts, parse_crawl_delay
+from .utils.retry_utils import CircuitBreaker, RetryPolicy, RetryScheduler
+from .utils.hedge_utils import DEADLINE_EXCEEDED, Deadline, RequestHedger
+from .utils.cache_utils import HttpCache
+from .utils.archive_utils import HtmlArchive
 
 # إعداد تسجيل الأحداث
 logging.basicConfig(
@@ -31,19 +44,75 @@ class CameraScraper:
     
     يوفر هذا الكلاس واجهة موحدة للتعامل مع مختلف مواقع الشركات المصنعة 
     ويتعرف تلقائيًا على الشركة المناسبة بناءً على الرابط.
+    
+    يحتفظ المستخرج بجلسة HTTP واحدة لكل مضيف لإعادة استخدام الاتصالات، لذلك
+    يفضل إغلاقه بعد الانتهاء عبر close() أو استخدامه داخل عبارة with.
     """
     
-    def __init__(self, use_default_headers: bool = True):
+    def __init__(self, 
+                 use_default_headers: bool = True, 
+                 pool_size: int = 10,
+                 cache_dir: Optional[str] = None,
+                 cache_ttl: Optional[float] = 86400,
+                 cache_max_size: Optional[int] = None,
+                 archive_dir: Optional[str] = None,
+                 archive_compression: str = "gzip",
+                 replay: bool = False,
+                 rate_limit: Optional[float] = None,
+                 rate_burst: int = 1,
+                 respect_crawl_delay: bool = False,
+                 adaptive_concurrency: bool = False,
+                 max_retries: int = 2,
+                 retry_delay: float = 1.0,
+                 breaker_threshold: Optional[int] = 5,
+                 breaker_recovery: float = 30.0,
+                 request_timeout: float = 30,
+                 hedge_requests: bool = False,
+                 hedge_budget: float = 0.1,
+                 preferred_locales: Iterable[str] = ("en",),
+                 dedupe_locales: bool = True,
+                 fetch_locales: Iterable[str] = ()):
         """
         تهيئة المستخرج.
         
         المعاملات:
             use_default_headers (bool): ما إذا كان سيتم استخدام الرؤوس الافتراضية لطلبات HTTP.
+            pool_size (int): الحد الأقصى لعدد الاتصالات المفتوحة لكل مضيف.
+            cache_dir (Optional[str]): مجلد ذاكرة التخزين المؤقت لصفحات HTTP (None لتعطيلها).
+            cache_ttl (Optional[float]): مدة صلاحية الصفحات المخزنة بالثواني قبل إعادة التحقق منها.
+            cache_max_size (Optional[int]): الحد الأقصى لحجم ذاكرة التخزين المؤقت بالبايت.
+            archive_dir (Optional[str]): مجلد أرشيف الصفحات الخام (None لتعطيله).
+            archive_compression (str): طريقة ضغط الأرشيف ('gzip' أو 'zstd').
+            replay (bool): قراءة الصفحات من الأرشيف بدلاً من الشبكة (يتطلب archive_dir).
+            rate_limit (Optional[float]): الحد الأقصى لعدد الطلبات في الثانية لكل مضيف
+                (None يعني بدون حد، مع احترام Retry-After دائمًا).
+            rate_burst (int): عدد الطلبات المسموح بها دفعة واحدة لكل مضيف.
+            respect_crawl_delay (bool): قراءة Crawl-delay من robots.txt لكل مضيف قبل أول طلب له.
+            adaptive_concurrency (bool): تعديل عدد الطلبات المتزامنة لكل مضيف أثناء التشغيل حسب
+                زمن الاستجابة وإشارات الازدحام (بين 1 و pool_size) بدلاً من per_host_limit الثابت.
+            max_retries (int): عدد مرات إعادة المحاولة للأخطاء المؤقتة (0 لتعطيلها).
+            retry_delay (float): التأخير الأساسي بالثواني قبل إعادة المحاولة (يتضاعف مع كل محاولة).
+            breaker_threshold (Optional[int]): عدد الأخطاء المتتالية لمضيف قبل إيقاف الطلبات إليه
+                (None لتعطيل قاطع الدائرة).
+            breaker_recovery (float): مدة إيقاف الطلبات إلى المضيف المتعطل بالثواني.
+            request_timeout (float): مهلة كل طلب بالثواني (تقل عنها عند اقتراب مهلة الدفعة).
+            hedge_requests (bool): إرسال طلب احتياطي عندما يتجاوز الطلب p95 زمن استجابة مضيفه،
+                واعتماد أول استجابة وإلغاء الأخرى (انظر hedge_report).
+            hedge_budget (float): أعلى نسبة من الطلبات يسمح بإرسال طلب احتياطي لها.
+            preferred_locales (Iterable[str]): اللغات المفضلة بالترتيب عند اختيار رابط واحد لكل طراز.
+            dedupe_locales (bool): طلب رابط واحد لكل (شركة، طراز) بين روابط اللغات المختلفة في
+                scrape_multiple و scrape_pipelined و iter_scrape (False لطلب كل اللغات).
+            fetch_locales (Iterable[str]): لغات تطلب صفحاتها بشكل منفصل عن اللغة المفضلة.
+            
+        الاستثناءات:
+            ValueError: إذا تم تفعيل replay دون تحديد archive_dir.
         """
-        self.scrapers = {
-            'hikvision': HikvisionScraper(),
-            'dahua': DahuaScraper()
-        }
+        if replay and not archive_dir:
+            raise ValueError("وضع الإعادة (replay) يتطلب تحديد مجلد الأرشيف archive_dir")
+        
+        # سجل المستخرجات مفهرسًا بنطاق المضيف، ويتم تحميل كل مستخرج عند أول صفحة له فقط
+        self.registry = ManufacturerRegistry(builtins=True, plugins=True)
+        self.scrapers = self.registry.scrapers
         
         self.default_headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
@@ -52,6 +121,101 @@ class CameraScraper:
             "Connection": "keep-alive",
             "Upgrade-Insecure-Requests": "1"
         } if use_default_headers else {}
+        
+        # جلسة مشتركة لكل مضيف لإعادة استخدام الاتصالات بين الصفحات (تنشأ عند أول طلب)
+        self.pool_size = pool_size
+        self._session_manager: Optional[SessionManager] = None
+        self._session_lock = threading.Lock()
+        self._closed = False
+        
+        # ذاكرة تخزين مؤقت دائمة للصفحات (اختيارية)
+        self.cache = HttpCache(cache_dir, ttl=cache_ttl, max_size=cache_max_size) if cache_dir else None
+        
+        # أرشيف الصفحات الخام (اختياري) ووضع الإعادة منه دون شبكة
+        self.archive = HtmlArchive(archive_dir, compression=archive_compression) if archive_dir else None
+        self.replay = replay
+        
+        # دلو طلبات مستقل لكل مضيف؛ يمكن تحديد معدلات خاصة عبر rate_limiter.set_rate
+        self.rate_limiter = HostRateLimiter(
+            rate_limit,
+            rate_burst,
+            crawl_delay_loader=self._load_crawl_delay if respect_crawl_delay else None
+        )
+        
+        # محدد تزامن متكيف مشترك بين جميع عمليات الاستخراج، فيحتفظ بما تعلمه عن كل مضيف
+        self.adaptive_limiter = AdaptiveHostLimiter(max_limit=pool_size) if adaptive_concurrency else None
+        
+        # إعادة محاولة الأخطاء المؤقتة، وقاطع دائرة يوقف الطلبات إلى موقع متعطل
+        self.retry_policy = RetryPolicy(max_retries, base_delay=retry_delay)
+        self.circuit_breaker = (
+            CircuitBreaker(breaker_threshold, breaker_recovery) if breaker_threshold else None
+        )
+        
+        # ميزانية كل طلب، وطلبات احتياطية للطلبات البطيئة لتقليل زمن الاستجابة الطرفي
+        self.request_timeout = request_timeout
+        self.hedger = RequestHedger(hedge_budget) if hedge_requests else None
+        
+        # طلب واحد مشترك لاستدعاءات scrape المتزامنة لنفس الرابط الموحد
+        self._single_flight = SingleFlight()
+        
+        # فهرس الطرازات عبر اللغات: رابط مفضل واحد لكل طراز والبقية أسماء بديلة
+        self.model_index = ModelIndex(preferred_locales)
+        self.dedupe_locales = dedupe_locales
+        self.fetch_locales = tuple(fetch_locales)
+    
+    @property
+    def session_manager(self) -> SessionManager:
+        """
+        مدير جلسات HTTP المشترك، وينشأ عند أول استخدام فقط.
+        
+        لا ينشئ المستخدمون الذين يسترجعون الصفحات بطريقتهم (مثل AsyncCameraScraper) أي جلسة.
+        
+        العوائد:
+            SessionManager: مدير الجلسات (مغلق إذا تم إغلاق المستخرج).
+        """
+        with self._session_lock:
+            if self._session_manager is None:
+                self._session_manager = SessionManager(pool_size=self.pool_size)
+                if self._closed:
+                    self._session_manager.close()
+            return self._session_manager
+    
+    def _load_crawl_delay(self, url: str) -> Optional[float]:
+        """
+        قراءة Crawl-delay من robots.txt لمضيف الرابط.
+        
+        المعاملات:
+            url (str): أول رابط للمضيف.
+            
+        العوائد:
+            Optional[float]: المدة الدنيا بين طلبين بالثواني أو None.
+        """
+        parts = urlsplit(url)
+        robots_url = f"{parts.scheme}://{parts.netloc}/robots.txt"
+        
+        # يتم الطلب مباشرة دون محدد المعدل لأنه يستدعي هذه الدالة
+        response = self.session_manager.get(robots_url, headers=self.default_headers or None, timeout=10)
+        if response.status_code != 200:
+            return None
+        
+        return parse_crawl_delay(response.text, self.default_headers.get("User-Agent", "*"))
+    
+    def close(self) -> None:
+        """إغلاق جلسات HTTP المفتوحة والأرشيف."""
+        if self.hedger is not None:
+            self.hedger.shutdown()
+        with self._session_lock:
+            self._closed = True
+            if self._session_manager is not None:
+                self._session_manager.close()
+        if self.archive is not None:
+            self.archive.close()
+    
+    def __enter__(self) -> "CameraScraper":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
     
     def detect_manufacturer(self, url: str) -> Optional[str]:
         """
@@ -63,31 +227,41 @@ class CameraScraper:
         العوائد:
             Optional[str]: اسم الشركة المصنعة أو None إذا لم يتم التعرف عليها.
         """
-        url_lower = url.lower()
+        manufacturer = self.registry.lookup(url)
         
-        for manufacturer in self.scrapers.keys():
-            if manufacturer in url_lower:
-                logger.info(f"تم التعرف على الشركة المصنعة: {manufacturer}")
-                return manufacturer
+        if manufacturer:
+            logger.info(f"تم التعرف على الشركة المصنعة: {manufacturer}")
+            return manufacturer
         
         logger.warning(f"لم يتم التعرف على الشركة المصنعة للرابط: {url}")
         return None
     
-    def add_manufacturer_scraper(self, manufacturer_name: str, scraper_instance: Any) -> None:
+    def add_manufacturer_scraper(self, 
+                                 manufacturer_name: str, 
+                                 scraper_instance: Any,
+                                 domains: Optional[List[str]] = None,
+                                 path_prefixes: Optional[List[str]] = None) -> None:
         """
         إضافة مستخرج لشركة مصنعة جديدة.
         
         المعاملات:
             manufacturer_name (str): اسم الشركة المصنعة.
             scraper_instance (Any): كائن المستخرج المخصص للشركة.
+            domains (Optional[List[str]]): نطاقات موقع الشركة مثل "example.com" (اختياري،
+                الافتراضي: سمة domains في المستخرج إن وجدت، وإلا مطابقة الاسم داخل اسم المضيف).
+            path_prefixes (Optional[List[str]]): بادئات مسار تقصر التطابق على أجزاء من الموقع (اختياري).
         """
-        self.scrapers[manufacturer_name.lower()] = scraper_instance
+        domains = domains or getattr(scraper_instance, 'domains', None)
+        self.registry.register(manufacturer_name, scraper_instance, domains, path_prefixes)
         logger.info(f"تمت إضافة مستخرج جديد للشركة: {manufacturer_name}")
     
     def scrape(self, url: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """
         استخراج بيانات منتج من الرابط المحدد.
         
+        إذا كان رابط مكافئ (نفس الصيغة الموحدة canonicalize_url) قيد الاستخراج من خيط آخر،
+        تنتظر الدالة نتيجته بدلاً من طلب الصفحة مرة أخرى.
+        
         المعاملات:
             url (str): رابط صفحة المنتج.
             headers (Optional[Dict[str, str]]): رؤوس HTTP مخصصة (اختياري).
@@ -95,6 +269,80 @@ class CameraScraper:
         العوائد:
             Dict[str, Any]: البيانات المستخرجة.
             
+        الاستثناءات:
+            ValueError: إذا لم يتم التعرف على الشركة المصنعة.
+        """
+        data, shared = self._single_flight.do(canonicalize_url(url), lambda: self._scrape_url(url, headers))
+        return self.fan_out(data, url) if shared else data
+    
+    @staticmethod
+    def fan_out(data: Dict[str, Any], url: str, fetched_url: Optional[str] = None) -> Dict[str, Any]:
+        """
+        نسخة من نتيجة رابط لرابط مكافئ.
+        
+        يصبح رابط المصدر هو الرابط المكافئ إذا كانت الصفحة نفسها (نفس الصيغة الموحدة)، ويبقى
+        الرابط الذي تم طلبه إذا كان الرابط نسخة بلغة أخرى من نفس الطراز.
+        
+        المعاملات:
+            data (Dict[str, Any]): نتيجة الرابط الذي تم استخراجه.
+            url (str): الرابط المكافئ.
+            fetched_url (Optional[str]): الرابط الذي تم طلبه (None يعني نفس الصفحة).
+            
+        العوائد:
+            Dict[str, Any]: نسخة مستقلة من النتيجة.
+        """
+        data = copy.deepcopy(data)
+        same_page = fetched_url is None or canonicalize_url(url) == canonicalize_url(fetched_url)
+        if same_page and 'General information' in data:
+            data['General information']['Source URL'] = url
+        return data
+    
+    def _scrape_url(self, 
+                    url: str, 
+                    headers: Optional[Dict[str, str]] = None,
+                    host_limiter: Optional[HostLimiter] = None) -> Dict[str, Any]:
+        """
+        تنفيذ استخراج بيانات رابط واحد مع إعادة محاولة الأخطاء المؤقتة.
+        
+        تنتظر هذه الدالة بين المحاولات لأنها تعالج رابطًا واحدًا، أما iter_scrape فتؤجل
+        المحاولات في طابور مؤقت وتنتقل إلى روابط أخرى.
+        
+        المعاملات:
+            url (str): رابط صفحة المنتج.
+            headers (Optional[Dict[str, str]]): رؤوس HTTP مخصصة (اختياري).
+            host_limiter (Optional[HostLimiter]): محدد الطلبات المتزامنة لكل مضيف (اختياري).
+            
+        العوائد:
+            Dict[str, Any]: البيانات المستخرجة.
+        """
+        attempt = 0
+        while True:
+            data, retry_delay = self._scrape_attempt(url, headers, host_limiter, attempt)
+            if retry_delay is None:
+                return data
+            time.sleep(retry_delay)
+            attempt += 1
+    
+    def _scrape_attempt(self,
+                        url: str,
+                        headers: Optional[Dict[str, str]],
+                        host_limiter: Optional[HostLimiter],
+                        attempt: int,
+                        deadline: Optional[Deadline] = None) -> Tuple[Dict[str, Any], Optional[float]]:
+        """
+        محاولة واحدة لاستخراج بيانات رابط.
+        
+        المعاملات:
+            url (str): رابط صفحة المنتج.
+            headers (Optional[Dict[str, str]]): رؤوس HTTP مخصصة (اختياري).
+            host_limiter (Optional[HostLimiter]): محدد الطلبات المتزامنة لكل مضيف (اختياري).
+            attempt (int): رقم المحاولة (تبدأ من 0).
+            deadline (Optional[Deadline]): مهلة الدفعة (اختياري).
+            
+        العوائد:
+            Tuple[Dict[str, Any], Optional[float]]: البيانات المستخرجة، والتأخير قبل إعادة
+            المحاولة بالثواني (None إذا كانت النتيجة نهائية).
+            
         الاستثناءات:
             ValueError: إذا لم يتم التعرف على الشركة المصنعة.
         """
@@ -106,16 +354,198 @@ class CameraScraper:
         # استخدام الرؤوس المخصصة أو الافتراضية
         request_headers = headers or self.default_headers
         
-        # استخراج HTML
-        html_content = fetch_page(url, request_headers)
+        # استخراج HTML الخام مع ترميزه
+        page, fetch_result = self._fetch_content(url, request_headers, host_limiter, deadline)
         
-        if not html_content:
-            logger.error(f"فشل في استرجاع محتوى الصفحة: {url}")
-            return {}
+        if not page or not page[0]:
+            if deadline is not None and deadline.expired:
+                return {"error": DEADLINE_EXCEEDED}, None
+            retry_delay = self._retry_delay(url, fetch_result, attempt, deadline)
+            if retry_delay is None:
+                logger.error(f"فشل في استرجاع محتوى الصفحة: {url}")
+            return {}, retry_delay
+        
+        content, encoding = page
+        return self.process_page(url, manufacturer, content, encoding), None
+    
+    def _retry_delay(self,
+                     url: str,
+                     fetch_result: Optional[FetchResult],
+                     attempt: int,
+                     deadline: Optional[Deadline] = None) -> Optional[float]:
+        """
+        التأخير قبل إعادة محاولة طلب فاشل حسب سياسة إعادة المحاولة.
+        
+        المعاملات:
+            url (str): الرابط.
+            fetch_result (Optional[FetchResult]): نتيجة آخر طلب (None إذا لم يرسل طلب).
+            attempt (int): رقم المحاولة التي فشلت (تبدأ من 0).
+            deadline (Optional[Deadline]): مهلة الدفعة (اختياري).
+            
+        العوائد:
+            Optional[float]: التأخير بالثواني أو None إذا كان الخطأ دائمًا أو استنفدت المحاولات
+            أو لن يبقى وقت في مهلة الدفعة.
+        """
+        if fetch_result is None or not self.retry_policy.should_retry(fetch_result, attempt):
+            return None
+        
+        delay = self.retry_policy.delay(attempt, fetch_result.retry_after)
+        if deadline is not None and delay >= deadline.remaining():
+            logger.warning(f"لا يكفي الوقت المتبقي من مهلة الدفعة لإعادة محاولة {url}")
+            return None
+        logger.info(
+            f"إعادة محاولة {url} بعد {delay:.1f} ثانية "
+            f"(المحاولة {attempt + 2}/{self.retry_policy.max_retries + 1})"
+        )
+        return delay
+    
+    def fetch_raw(self,
+                  url: str,
+                  headers: Optional[Dict[str, str]] = None,
+                  deadline: Optional[Deadline] = None) -> Optional[Tuple[bytes, Optional[str]]]:
+        """
+        استرجاع المحتوى الخام لأي صفحة (مثل صفحات الفئات وملفات sitemap) دون تحليلها.
+        
+        يمر الطلب بنفس حدود المضيف ومعدل الطلبات وذاكرة التخزين المؤقت والأرشيف وسياسة
+        إعادة المحاولة التي تستخدمها صفحات المنتجات.
+        
+        المعاملات:
+            url (str): رابط الصفحة.
+            headers (Optional[Dict[str, str]]): رؤوس HTTP مخصصة (اختياري).
+            deadline (Optional[Deadline]): مهلة الطلب مع إعادة المحاولات (اختياري).
         
+        العوائد:
+            Optional[Tuple[bytes, Optional[str]]]: المحتوى الخام وترميزه، أو None في حالة الفشل.
+        """
+        request_headers = headers or self.default_headers
+        attempt = 0
+        while True:
+            page, fetch_result = self._fetch_content(url, request_headers, deadline=deadline)
+            if page and page[0]:
+                return page
+            retry_delay = self._retry_delay(url, fetch_result, attempt, deadline)
+            if retry_delay is None:
+                return None
+            time.sleep(retry_delay)
+            attempt += 1
+        
+    def _fetch_content(self,
+                       url: str, 
+                       request_headers: Dict[str, str],
+                       host_limiter: Optional[HostLimiter] = None,
+                       deadline: Optional[Deadline] = None
+                       ) -> Tuple[Optional[Tuple[bytes, Optional[str]]], Optional[FetchResult]]:
+        """
+        استرجاع المحتوى الخام للصفحة من الشبكة أو من الأرشيف في وضع الإعادة.
+        
+        المعاملات:
+            url (str): رابط صفحة المنتج.
+            request_headers (Dict[str, str]): رؤوس HTTP للطلب.
+            host_limiter (Optional[HostLimiter]): محدد الطلبات المتزامنة لكل مضيف (اختياري).
+            deadline (Optional[Deadline]): مهلة الدفعة؛ لا تتجاوز مهلة الطلب الوقت المتبقي منها (اختياري).
+            
+        العوائد:
+            Tuple[Optional[Tuple[bytes, Optional[str]]], Optional[FetchResult]]: المحتوى الخام
+            وترميزه (أو None في حالة الفشل)، ونتيجة طلب الشبكة (None إذا لم يرسل طلب).
+        """
+        if self.replay:
+            page = self.archive.read(url)
+            if page is None:
+                logger.error(f"الرابط غير موجود في الأرشيف: {url}")
+            return page, None
+        
+        # عدم إرسال طلبات إلى مضيف دائرته مفتوحة، وإعادة المحاولة بعد انتهاء مدة الإيقاف
+        if self.circuit_breaker is not None:
+            blocked_for = self.circuit_breaker.before_request(url)
+            if blocked_for is not None:
+                logger.warning(f"الدائرة مفتوحة للمضيف، لم يتم إرسال الطلب: {url}")
+                return None, FetchResult(url, None, 0.0, "circuit_open", blocked_for)
+        
+        # ميزانية الطلب: مهلته أو ما تبقى من مهلة الدفعة
+        timeout = self.request_timeout if deadline is None else deadline.budget(self.request_timeout)
+        if timeout <= 0:
+            logger.warning(f"انتهت مهلة الدفعة، لم يتم إرسال الطلب: {url}")
+            return None, None
+        
+        host_limiter = host_limiter or self._host_limiter()
+        observed = []
+        
+        def observe(fetch_result: FetchResult) -> None:
+            observed.append(fetch_result)
+            host_limiter.observe(fetch_result)
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record(fetch_result)
+            if self.hedger is not None:
+                self.hedger.observe(fetch_result)
+        
+        def attempt(cancel_event: Optional[threading.Event] = None) -> Optional[Tuple[bytes, Optional[str]]]:
+            return fetch_page_raw(
+                url, 
+                request_headers, 
+                timeout,
+                session_manager=self.session_manager, 
+                cache=self.cache,
+                rate_limiter=self.rate_limiter,
+                observer=observe,
+                cancel_event=cancel_event
+            )
+        
+        # يحجز مكانًا على المضيف أثناء الطلب فقط وليس أثناء التحليل (الطلب الاحتياطي ضمنه)
+        with host_limiter.slot(url):
+            if self.hedger is None:
+                page = attempt()
+            else:
+                page = self.hedger.fetch(url, attempt, timeout)
+                if page is None and not observed:
+                    # تجاوز الطلب ميزانيته وتم إلغاؤه قبل أي استجابة
+                    observe(FetchResult(url, None, timeout, "timeout"))
+        
+        if page and self.archive is not None:
+            try:
+                self.archive.store(url, page[0], encoding=page[1])
+            except (OSError, sqlite3.Error) as e:
+                # فشل الأرشفة لا يلغي صفحة تم استرجاعها بنجاح
+                logger.error(f"خطأ أثناء أرشفة الصفحة {url}: {str(e)}")
+        
+        return page, observed[-1] if observed else None
+    
+    def process_page(self, 
+                     url: str, 
+                     manufacturer: str, 
+                     content: Union[str, bytes], 
+                     encoding: Optional[str] = None) -> Dict[str, Any]:
+        """
+        تحليل محتوى صفحة تم استرجاعها وإضافة المعلومات المرجعية إليها.
+        
+        يمرر المحتوى الخام مباشرة إلى المستخرجات التي تدعم ذلك (accepts_bytes)، ويفك
+        ترميزه إلى نص للمستخرجات المخصصة الأخرى.
+        
+        المعاملات:
+            url (str): رابط صفحة المنتج.
+            manufacturer (str): اسم الشركة المصنعة.
+            content (Union[str, bytes]): محتوى HTML للصفحة.
+            encoding (Optional[str]): ترميز المحتوى الخام (اختياري).
+            
+        العوائد:
+            Dict[str, Any]: البيانات المستخرجة.
+        """
         # استدعاء المستخرج المناسب
-        data = self.scrapers[manufacturer].extract(html_content, url)
+        data = extract_page(self.scrapers[manufacturer], url, content, encoding)
+        
+        return self._finalize_data(url, manufacturer, data)
+    
+    def _finalize_data(self, url: str, manufacturer: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        إضافة المعلومات المرجعية (الرابط والشركة المصنعة) إلى البيانات المستخرجة.
         
+        المعاملات:
+            url (str): رابط صفحة المنتج.
+            manufacturer (str): اسم الشركة المصنعة.
+            data (Dict[str, Any]): البيانات كما أعادها المستخرج.
+            
+        العوائد:
+            Dict[str, Any]: البيانات بعد الإكمال أو قاموس فارغ إذا لم توجد بيانات.
+        """
         # ضمان وجود بيانات أساسية
         if not data:
             logger.warning(f"لم يتم استخراج أي بيانات من الرابط: {url}")
@@ -130,28 +560,566 @@ class CameraScraper:
         
         return data
     
-    def scrape_multiple(self, urls: List[str], headers: Optional[Dict[str, str]] = None) -> Dict[str, Dict[str, Any]]:
+    def scrape_multiple(self, 
+                        urls: List[str], 
+                        headers: Optional[Dict[str, str]] = None,
+                        max_workers: int = 1,
+                        per_host_limit: Optional[int] = None,
+                        deadline: Optional[float] = None,
+                        record_aliases: bool = False) -> Dict[str, Dict[str, Any]]:
         """
         استخراج بيانات من عدة روابط.
         
+        عند تحديد max_workers أكبر من 1 يتم توزيع الروابط على مجمع خيوط (threads)
+        بحيث يتم استرجاع الصفحات وتحليلها بالتوازي.
+        
+        تحتفظ هذه الدالة بجميع النتائج في الذاكرة، لذلك يفضل استخدام iter_scrape
+        لقوائم الروابط الكبيرة.
+        
+        الروابط المكافئة (نفس الصيغة الموحدة canonicalize_url، مثل اختلاف الشرطة المائلة في
+        النهاية أو معاملات التتبع) تطلب وتحلل مرة واحدة، وتنسخ النتيجة لكل منها. كذلك يطلب
+        رابط واحد بلغة مفضلة لكل طراز (انظر dedupe_locales)، وتنسخ نتيجته لروابط اللغات الأخرى
+        مع بقاء رابط المصدر هو الرابط الذي تم طلبه.
+        
         المعاملات:
             urls (List[str]): قائمة روابط المنتجات.
             headers (Optional[Dict[str, str]]): رؤوس HTTP مخصصة (اختياري).
+            max_workers (int): عدد العمال المتوازيين (1 يعني تنفيذ تسلسلي).
+            per_host_limit (Optional[int]): الحد الأقصى للطلبات المتزامنة لكل شركة مصنعة (اختياري).
+            deadline (Optional[float]): مهلة الدفعة بالثواني (اختياري، انظر iter_scrape).
+            record_aliases (bool): تسجيل روابط الطرازات في model_index لقراءة أسمائها البديلة لاحقًا.
             
         العوائد:
-            Dict[str, Dict[str, Any]]: قاموس بالبيانات المستخرجة لكل رابط.
+            Dict[str, Dict[str, Any]]: قاموس بالبيانات المستخرجة لكل رابط بنفس ترتيب الروابط المدخلة
+            (الروابط التي لم تكتمل قبل انتهاء المهلة تحتوي على {"error": ...}).
         """
-        results = {}
+        groups = self._group_duplicates(urls, record_aliases)
+        results = dict(self.iter_scrape((members[0] for members in groups), headers, max_workers,
+                                        per_host_limit=per_host_limit, deadline=deadline))
         
-        for url in urls:
-            try:
-                results[url] = self.scrape(url, headers)
-            except Exception as e:
-                logger.error(f"خطأ أثناء استخراج البيانات من {url}: {str(e)}")
-                results[url] = {"error": str(e)}
+        by_url = {}
+        for first, *duplicates in groups:
+            data = results.get(first, {"error": DEADLINE_EXCEEDED})
+            by_url[first] = data
+            for url in duplicates:
+                by_url[url] = self.fan_out(data, url, first)
+        return {url: by_url[url] for url in urls}
+    
+    def _group_duplicates(self, urls: Iterable[str], record_aliases: bool = False) -> List[List[str]]:
+        """
+        تجميع الروابط المكافئة بحيث يطلب أول رابط من كل مجموعة فقط.
+        
+        المعاملات:
+            urls (Iterable[str]): الروابط.
+            record_aliases (bool): تسجيل روابط الطرازات في model_index.
+            
+        العوائد:
+            List[List[str]]: مجموعات الروابط الأصلية المختلفة بترتيب أول ظهور، وأول رابط في
+            كل مجموعة هو الرابط المفضل للطلب.
+        """
+        if self.dedupe_locales:
+            groups = self.model_index.plan(urls, self.fetch_locales, record=record_aliases)
+        else:
+            groups = list(group_urls(urls).values())
+        duplicates = sum(len(members) - 1 for members in groups)
+        if duplicates:
+            logger.info(f"تم دمج {duplicates} رابط مكافئ لروابط أخرى، سيتم طلب {len(groups)} رابط")
+        return groups
+    
+    def _dedupe_key(self, url: str) -> str:
+        """
+        مفتاح الروابط التي تشترك في طلب واحد.
+        
+        المعاملات:
+            url (str): الرابط.
+            
+        العوائد:
+            str: مفتاح الطراز عند تفعيل dedupe_locales، وإلا الرابط الموحد.
+        """
+        if self.dedupe_locales:
+            return self.model_index.key(url, self.fetch_locales)
+        return canonicalize_url(url)
+    
+    def iter_scrape(self,
+                    urls: Iterable[str],
+                    headers: Optional[Dict[str, str]] = None,
+                    max_workers: int = 1,
+                    max_in_flight: Optional[int] = None,
+                    per_host_limit: Optional[int] = None,
+                    deadline: Optional[float] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        استخراج بيانات من عدة روابط مع إعادة نتيجة كل رابط فور اكتماله.
+        
+        تقرأ الروابط من المصدر تدريجيًا ولا يتجاوز عدد الروابط قيد التنفيذ max_in_flight،
+        ولا يتم إرسال روابط جديدة إلا بعد أن يستهلك المستدعي النتائج الجاهزة. بذلك تبقى
+        الذاكرة ثابتة تقريبًا مهما كان عدد الروابط، ويمكن كتابة كل نتيجة إلى الملف مباشرة.
+        لا يتم حذف الروابط المكررة (تعاد نتيجة لكل ظهور)، لكن عند التنفيذ المتوازي يشارك
+        الرابط المكافئ لرابط قيد الاستخراج (نفس canonicalize_url، أو نفس الطراز بلغة أخرى عند
+        تفعيل dedupe_locales) نتيجته دون طلب جديد. لأن الروابط تقرأ تدريجيًا يطلب البث لغة
+        أول رابط يظهر من كل طراز وليس اللغة المفضلة في preferred_locales، ولاختيار اللغة
+        المفضلة دائمًا استخدم scrape_multiple أو scrape_pipelined.
+        
+        عند تحديد deadline لا تتجاوز مهلة أي طلب الوقت المتبقي من الدفعة، وعند انتهائها
+        يتوقف إرسال روابط جديدة وتلغى الروابط التي لم تبدأ (تعاد لها {"error": ...})، ولا
+        تتم قراءة بقية الروابط من المصدر.
+        
+        مثال:
+            with JsonStreamWriter("results.json") as writer:
+                lines = (line.strip() for line in open("urls.txt"))
+                for url, data in scraper.iter_scrape(filter(None, lines), max_workers=16):
+                    writer.write(url, data)
+        
+        المعاملات:
+            urls (Iterable[str]): الروابط (قائمة أو أي مصدر يقرأ تدريجيًا مثل ملف).
+            headers (Optional[Dict[str, str]]): رؤوس HTTP مخصصة (اختياري).
+            max_workers (int): عدد العمال المتوازيين (1 يعني تنفيذ تسلسلي).
+            max_in_flight (Optional[int]): الحد الأقصى للروابط قيد التنفيذ أو المنتظرة للقراءة
+                (الافتراضي: ضعف max_workers).
+            per_host_limit (Optional[int]): الحد الأقصى للطلبات المتزامنة لكل شركة مصنعة (اختياري).
+            deadline (Optional[float]): مهلة الدفعة بالثواني (None يعني دون مهلة).
+            
+        العوائد:
+            Iterator[Tuple[str, Dict[str, Any]]]: أزواج (الرابط، البيانات المستخرجة أو {"error": ...})
+            بترتيب اكتمالها (عند تقييد المعدل تتناوب الطلبات بين المضيفين).
+        """
+        host_limiter = self._host_limiter(per_host_limit)
+        pending_urls = self._schedule_urls(urls)
+        # المحاولات المؤجلة للأخطاء المؤقتة: (الرابط، رقم المحاولة) حسب موعدها
+        retries = RetryScheduler()
+        budget = Deadline(deadline) if deadline is not None else None
+        
+        def wait_time() -> Optional[float]:
+            # الاستيقاظ عند موعد أقرب إعادة محاولة أو عند انتهاء المهلة
+            delay = retries.next_delay()
+            if budget is None or budget.expired:
+                return delay
+            return budget.remaining() if delay is None else min(delay, budget.remaining())
         
-        return results
+        if max_workers <= 1:
+            while True:
+                if budget is not None and budget.expired:
+                    logger.warning("انتهت مهلة الدفعة، تم إيقاف إرسال روابط جديدة")
+                    for url, _ in retries.drain():
+                        yield url, {"error": DEADLINE_EXCEEDED}
+                    return
+                
+                job = retries.pop_due()
+                if job is None:
+                    url = next(pending_urls, None)
+                    if url is None:
+                        if not retries:
+                            return
+                        # لم يبق إلا روابط تنتظر إعادة المحاولة
+                        time.sleep(wait_time())
+                        continue
+                    job = (url, 0)
+                
+                url, attempt = job
+                data, retry_delay = self._scrape_safely(url, headers, host_limiter, attempt, budget)
+                if retry_delay is not None:
+                    retries.schedule((url, attempt + 1), retry_delay)
+                    continue
+                yield url, data
+        
+        if per_host_limit and per_host_limit > self.pool_size:
+            logger.warning(
+                f"الحد لكل مضيف ({per_host_limit}) أكبر من حجم مجمع الاتصالات "
+                f"({self.pool_size})، لن يتم الاحتفاظ ببعض الاتصالات"
+            )
+        
+        max_in_flight = max(max_in_flight or 2 * max_workers, 1)
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        # المهمة -> (الرابط، رقم المحاولة)
+        in_flight = {}
+        # الرابط الموحد قيد الاستخراج -> الروابط المكافئة التي تنتظر نتيجته
+        waiting: Dict[str, List[str]] = {}
+        
+        def submit(url: str, attempt: int) -> None:
+            future = executor.submit(self._scrape_safely, url, headers, host_limiter, attempt, budget)
+            in_flight[future] = (url, attempt)
+        
+        def finish(url: str, data: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+            duplicates = waiting.pop(self._dedupe_key(url), [])
+            yield url, data
+            for duplicate in duplicates:
+                yield duplicate, self.fan_out(data, duplicate, url)
+        
+        expired = False
+        try:
+            while True:
+                if budget is not None and budget.expired and not expired:
+                    # إلغاء ما لم يبدأ بعد، وتنتهي الطلبات الجارية خلال ميزانيتها
+                    expired = True
+                    logger.warning("انتهت مهلة الدفعة، تم إيقاف إرسال روابط جديدة")
+                    for future in list(in_flight):
+                        if future.cancel():
+                            url, _ = in_flight.pop(future)
+                            yield from finish(url, {"error": DEADLINE_EXCEEDED})
+                    for url, _ in retries.drain():
+                        yield from finish(url, {"error": DEADLINE_EXCEEDED})
+                
+                if not expired:
+                    # إعادة إرسال المحاولات التي حان موعدها أولاً
+                    for url, attempt in retries.pop_all_due():
+                        submit(url, attempt)
+                    
+                    # ملء العمل الجاري حتى الحد المسموح (تحتسب المحاولات المؤجلة والروابط المنتظرة ضمنه)
+                    while len(in_flight) + len(retries) + sum(map(len, waiting.values())) < max_in_flight:
+                        url = next(pending_urls, None)
+                        if url is None:
+                            break
+                        key = self._dedupe_key(url)
+                        if key in waiting:
+                            # رابط مكافئ قيد الاستخراج: مشاركة نتيجته بدلاً من طلبه مرة أخرى
+                            waiting[key].append(url)
+                            continue
+                        waiting[key] = []
+                        submit(url, 0)
+                
+                if not in_flight:
+                    if not retries:
+                        return
+                    time.sleep(wait_time())
+                    continue
+                
+                # الاستيقاظ عند اكتمال أي رابط أو عند حلول موعد إعادة محاولة أو انتهاء المهلة
+                done, _ = wait(in_flight, timeout=wait_time(), return_when=FIRST_COMPLETED)
+                for future in done:
+                    url, attempt = in_flight.pop(future)
+                    data, retry_delay = future.result()
+                    if retry_delay is not None:
+                        retries.schedule((url, attempt + 1), retry_delay)
+                        continue
+                    yield from finish(url, data)
+        finally:
+            # إلغاء ما لم يبدأ بعد عند توقف المستدعي عن القراءة مبكرًا
+            for future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=True)
+    
+    def _host_limiter(self, per_host_limit: Optional[int] = None) -> HostLimiter:
+        """
+        محدد الطلبات المتزامنة لكل مضيف لعملية استخراج.
+        
+        المعاملات:
+            per_host_limit (Optional[int]): الحد الثابت لكل مضيف (يتم تجاهله عند تفعيل
+                adaptive_concurrency).
+            
+        العوائد:
+            HostLimiter: المحدد المتكيف المشترك أو محدد ثابت جديد.
+        """
+        if self.adaptive_limiter is not None:
+            return self.adaptive_limiter
+        return HostLimiter(per_host_limit)
+    
+    def concurrency_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        حالة التزامن لكل مضيف عند تفعيل adaptive_concurrency.
+        
+        العوائد:
+            Dict[str, Dict[str, Any]]: {المضيف: {"limit", "in_flight", "requests", "throttled",
+            "error_rate", "p95"}} أو قاموس فارغ.
+        """
+        if self.adaptive_limiter is None:
+            return {}
+        return self.adaptive_limiter.metrics()
+    
+    def hedge_report(self) -> Dict[str, Any]:
+        """
+        تقرير الطلبات الاحتياطية عند تفعيل hedge_requests.
+        
+        العوائد:
+            Dict[str, Any]: عدد الطلبات الاحتياطية ومرات فوزها، والنسب المئوية لزمن الاستجابة،
+            والوقت التقديري الذي تم توفيره (انظر RequestHedger.report) أو قاموس فارغ.
+        """
+        if self.hedger is None:
+            return {}
+        return self.hedger.report()
+    
+    def _schedule_urls(self, urls: Iterable[str]) -> Iterator[str]:
+        """
+        ترتيب الروابط قبل إرسالها للعمال.
+        
+        عند تقييد معدل الطلبات تتم إعادة ترتيب الروابط بالتناوب بين المضيفين حتى لا ينتظر
+        جميع العمال دلو مضيف واحد (مثل قائمة تبدأ بآلاف روابط hikvision ثم dahua).
+        
+        المعاملات:
+            urls (Iterable[str]): الروابط.
+            
+        العوائد:
+            Iterator[str]: الروابط بالترتيب المناسب.
+        """
+        if self.rate_limiter.has_limits:
+            return interleave_hosts(urls, self.rate_limiter)
+        return iter(urls)
     
+    def _scrape_safely(self, 
+                       url: str, 
+                       headers: Optional[Dict[str, str]], 
+                       host_limiter: HostLimiter,
+                       attempt: int = 0,
+                       deadline: Optional[Deadline] = None) -> Tuple[Dict[str, Any], Optional[float]]:
+        """
+        محاولة واحدة لاستخراج بيانات رابط مع تحويل الاستثناءات إلى قاموس خطأ.
+        
+        المعاملات:
+            url (str): رابط صفحة المنتج.
+            headers (Optional[Dict[str, str]]): رؤوس HTTP مخصصة (اختياري).
+            host_limiter (HostLimiter): محدد الطلبات المتزامنة لكل مضيف.
+            attempt (int): رقم المحاولة (تبدأ من 0).
+            deadline (Optional[Deadline]): مهلة الدفعة (اختياري).
+            
+        العوائد:
+            Tuple[Dict[str, Any], Optional[float]]: البيانات المستخرجة أو {"error": ...}، والتأخير
+            قبل إعادة المحاولة بالثواني (None إذا كانت النتيجة نهائية).
+        """
+        try:
+            return self._scrape_attempt(url, headers, host_limiter, attempt, deadline)
+        except Exception as e:
+            logger.error(f"خطأ أثناء استخراج البيانات من {url}: {str(e)}")
+            return {"error": str(e)}, None
+
+    def scrape_pipelined(self,
+                         urls: List[str],
+                         headers: Optional[Dict[str, str]] = None,
+                         fetch_workers: int = 4,
+                         parse_workers: Optional[int] = None,
+                         queue_size: Optional[int] = None,
+                         max_pages_per_worker: Optional[int] = None,
+                         per_host_limit: Optional[int] = None,
+                         mp_context: Any = None,
+                         deadline: Optional[float] = None,
+                         record_aliases: bool = False) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        استخراج بيانات من عدة روابط عبر مرحلتين: استرجاع في خيوط وتحليل في عمليات.
+
+        تسترجع خيوط الشبكة المحتوى الخام وتضعه في طابور محدود الحجم، ويرسله موزع إلى
+        مجمع عمليات التحليل (ParseWorkerPool) بحيث لا يتجاوز عدد الصفحات قيد التحليل
+        queue_size. عند امتلاء الطابور تتوقف خيوط الشبكة حتى يتقدم التحليل، لذلك تبقى
+        الذاكرة محدودة مهما كان عدد الروابط. تعاد النتائج بترتيب اكتمالها.
+
+        يجب أن تكون المستخرجات المضافة عبر add_manufacturer_scraper قابلة للتسلسل (pickle)
+        عند استخدام سياق عمليات غير fork.
+
+        المعاملات:
+            urls (List[str]): قائمة روابط المنتجات (يتم تجاهل الروابط المكررة، ويطلب ويحلل
+                الرابط المكافئ لرابط آخر مرة واحدة وتعاد النتيجة لكل منهما).
+            headers (Optional[Dict[str, str]]): رؤوس HTTP مخصصة (اختياري).
+            fetch_workers (int): عدد خيوط استرجاع الصفحات.
+            parse_workers (Optional[int]): عدد عمليات التحليل (الافتراضي: عدد أنوية المعالج).
+            queue_size (Optional[int]): الحد الأقصى للصفحات المنتظرة وللصفحات قيد التحليل
+                (الافتراضي: ضعف عدد عمليات التحليل).
+            max_pages_per_worker (Optional[int]): عدد الصفحات التقريبي لكل عملية تحليل قبل
+                إعادة إنشائها للحد من تضخم الذاكرة (None يعني دون إعادة تدوير).
+            per_host_limit (Optional[int]): الحد الأقصى للطلبات المتزامنة لكل شركة مصنعة (اختياري).
+            mp_context (Any): سياق multiprocessing لإنشاء عمليات التحليل (اختياري).
+            deadline (Optional[float]): مهلة الاسترجاع بالثواني؛ بعدها تعاد {"error": ...} للروابط
+                التي لم تسترجع (None يعني دون مهلة).
+            record_aliases (bool): تسجيل روابط الطرازات في model_index لقراءة أسمائها البديلة لاحقًا.
+
+        العوائد:
+            Iterator[Tuple[str, Dict[str, Any]]]: أزواج (الرابط، البيانات المستخرجة أو {"error": ...}).
+
+        الاستثناءات:
+            ValueError: إذا كان عدد خيوط الاسترجاع أقل من 1.
+        """
+        if fetch_workers < 1:
+            raise ValueError("يجب أن يكون عدد خيوط الاسترجاع 1 على الأقل")
+
+        # أول رابط من كل مجموعة مكافئة -> بقية روابط المجموعة
+        duplicates = {members[0]: members[1:] for members in self._group_duplicates(urls, record_aliases)}
+        unique_urls = list(duplicates)
+        if not unique_urls:
+            return
+
+        host_limiter = self._host_limiter(per_host_limit)
+        pool = ParseWorkerPool(self.scrapers.snapshot(), parse_workers, max_pages_per_worker, mp_context)
+        queue_size = queue_size or 2 * pool.workers
+
+        # الصفحات المسترجعة التي تنتظر التحليل، والنتائج الجاهزة بترتيب اكتمالها
+        pages = queue.Queue(maxsize=queue_size)
+        results = queue.Queue()
+        parse_slots = threading.BoundedSemaphore(queue_size)
+        stop = threading.Event()
+
+        pending_urls = self._schedule_urls(unique_urls)
+        fetch_workers = min(fetch_workers, len(unique_urls))
+        # المحاولات المؤجلة للأخطاء المؤقتة، وعدد المحاولات الجارية التي قد تؤجل روابط جديدة
+        retries = RetryScheduler()
+        state = {"fetchers": fetch_workers, "active": 0}
+        lock = threading.Lock()
+        budget = Deadline(deadline) if deadline is not None else None
+
+        def put_page(item: Any) -> None:
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def next_job() -> Any:
+            # المحاولات المؤجلة أولاً ثم الروابط الجديدة، و None عند انتهاء كل العمل
+            with lock:
+                if budget is not None and budget.expired:
+                    # الروابط التي لم ترسل بعد تنتهي بخطأ المهلة
+                    skipped = [url for url, _ in retries.drain()] + list(pending_urls)
+                    for url in skipped:
+                        results.put((url, {"error": DEADLINE_EXCEEDED}))
+                    if skipped:
+                        logger.warning("انتهت مهلة الدفعة، تم إيقاف إرسال روابط جديدة")
+                    return None if state["active"] == 0 else ()
+                job = retries.pop_due()
+                if job is None:
+                    url = next(pending_urls, None)
+                    if url is not None:
+                        job = (url, 0)
+                    elif not retries and state["active"] == 0:
+                        return None
+                    else:
+                        return ()
+                state["active"] += 1
+                return job
+
+        def fetch_loop() -> None:
+            while not stop.is_set():
+                job = next_job()
+                if job is None:
+                    break
+                if not job:
+                    # انتظار موعد إعادة محاولة أو انتهاء المحاولات الجارية
+                    stop.wait(min(retries.next_delay() or 0.05, 0.05))
+                    continue
+
+                url, attempt = job
+                item, retry_delay = self._fetch_for_parsing(url, headers, host_limiter, attempt, budget)
+                with lock:
+                    if retry_delay is not None:
+                        retries.schedule((url, attempt + 1), retry_delay)
+                    state["active"] -= 1
+                if retry_delay is not None:
+                    continue
+                if len(item) == 2:
+                    results.put(item)
+                else:
+                    put_page(item)
+
+            # آخر خيط ينهي عمله يبلغ الموزع بانتهاء الصفحات
+            with lock:
+                state["fetchers"] -= 1
+                finished = state["fetchers"] == 0
+            if finished:
+                put_page(None)
+
+        def on_parsed(url: str, manufacturer: str, future: Any) -> None:
+            parse_slots.release()
+            results.put((url, manufacturer, future))
+
+        def dispatch_loop() -> None:
+            while not stop.is_set():
+                try:
+                    item = pages.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if item is None:
+                    return
+
+                while not parse_slots.acquire(timeout=0.1):
+                    if stop.is_set():
+                        return
+
+                url, manufacturer, content, encoding = item
+                try:
+                    future = pool.submit(manufacturer, url, content, encoding)
+                except Exception as e:
+                    parse_slots.release()
+                    logger.error(f"خطأ أثناء إرسال الصفحة للتحليل {url}: {str(e)}")
+                    results.put((url, {"error": str(e)}))
+                    continue
+                future.add_done_callback(lambda f, u=url, m=manufacturer: on_parsed(u, m, f))
+
+        threads = [threading.Thread(target=fetch_loop, daemon=True) for _ in range(fetch_workers)]
+        threads.append(threading.Thread(target=dispatch_loop, daemon=True))
+        for thread in threads:
+            thread.start()
+
+        try:
+            for _ in range(len(unique_urls)):
+                entry = results.get()
+                if len(entry) == 2:
+                    url, data = entry
+                else:
+                    url, manufacturer, future = entry
+                    data = self._parsed_result(url, manufacturer, future)
+                yield url, data
+                for duplicate in duplicates[url]:
+                    yield duplicate, self.fan_out(data, duplicate, url)
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            pool.shutdown()
+
+    def _fetch_for_parsing(self,
+                           url: str,
+                           headers: Optional[Dict[str, str]],
+                           host_limiter: HostLimiter,
+                           attempt: int = 0,
+                           deadline: Optional[Deadline] = None) -> Tuple[Tuple[Any, ...], Optional[float]]:
+        """
+        استرجاع صفحة لمرحلة التحليل مع تحويل الأخطاء إلى نتيجة نهائية.
+
+        المعاملات:
+            url (str): رابط صفحة المنتج.
+            headers (Optional[Dict[str, str]]): رؤوس HTTP مخصصة (اختياري).
+            host_limiter (HostLimiter): محدد الطلبات المتزامنة لكل مضيف.
+            attempt (int): رقم المحاولة (تبدأ من 0).
+            deadline (Optional[Deadline]): مهلة الدفعة (اختياري).
+
+        العوائد:
+            Tuple[Tuple[Any, ...], Optional[float]]: (الرابط، الشركة، المحتوى، الترميز) للتحليل،
+            أو (الرابط، النتيجة) إذا لم تكن هناك صفحة لتحليلها، مع التأخير قبل إعادة المحاولة
+            بالثواني (None إذا كانت النتيجة نهائية).
+        """
+        try:
+            manufacturer = self.detect_manufacturer(url)
+            if not manufacturer:
+                raise ValueError(f"الشركة المصنعة غير مدعومة أو غير معروفة للرابط: {url}")
+            page, fetch_result = self._fetch_content(url, headers or self.default_headers, host_limiter, deadline)
+        except Exception as e:
+            logger.error(f"خطأ أثناء استخراج البيانات من {url}: {str(e)}")
+            return (url, {"error": str(e)}), None
+
+        if not page or not page[0]:
+            if deadline is not None and deadline.expired:
+                return (url, {"error": DEADLINE_EXCEEDED}), None
+            retry_delay = self._retry_delay(url, fetch_result, attempt, deadline)
+            if retry_delay is None:
+                logger.error(f"فشل في استرجاع محتوى الصفحة: {url}")
+            return (url, {}), retry_delay
+
+        return (url, manufacturer, page[0], page[1]), None
+
+    def _parsed_result(self, url: str, manufacturer: str, future: Any) -> Dict[str, Any]:
+        """
+        قراءة نتيجة التحليل من عملية التحليل وإكمالها بالمعلومات المرجعية.
+
+        المعاملات:
+            url (str): رابط صفحة المنتج.
+            manufacturer (str): اسم الشركة المصنعة.
+            future (Any): نتيجة ParseWorkerPool.submit المكتملة.
+
+        العوائد:
+            Dict[str, Any]: البيانات المستخرجة أو {"error": ...} في حالة الفشل.
+        """
+        try:
+            data = future.result()
+        except Exception as e:
+            logger.error(f"خطأ أثناء تحليل الصفحة {url}: {str(e)}")
+            return {"error": str(e)}
+
+        return self._finalize_data(url, manufacturer, data)
+
     def export_to_json(self, data: Dict[str, Any], file_path: str) -> bool:
         """
         تصدير البيانات إلى ملف JSON.
@@ -163,6 +1131,7 @@ class CameraScraper:
         العوائد:
             bool: True إذا نجحت عملية التصدير، False في حالة الفشل.
         """
+        from .export.json_exporter import export_json
         return export_json(data, file_path)
     
     def export_to_csv(self, data: Dict[str, Any], file_path: str) -> bool:
@@ -176,6 +1145,7 @@ class CameraScraper:
         العوائد:
             bool: True إذا نجحت عملية التصدير، False في حالة الفشل.
         """
+        from .export.csv_exporter import export_csv
         return export_csv(data, file_path)
     
     def export_to_excel(self, data: Dict[str, Any], file_path: str) -> bool:
@@ -189,4 +1159,5 @@ class CameraScraper:
         العوائد:
             bool: True إذا نجحت عملية التصدير، False في حالة الفشل.
         """
+        from .export.excel_exporter import export_excel
         return export_excel(data, file_path)
\ No newline at end of file
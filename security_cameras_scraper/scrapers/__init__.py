@@ -2,9 +2,18 @@
 
 """
 حزمة المستخرجات المخصصة للشركات المصنعة المختلفة.
+
+يتم استيراد وحدات المستخرجات عند أول وصول إليها فقط.
 """
 
-from .hikvision_scraper import HikvisionScraper
-from .dahua_scraper import DahuaScraper
+from ..utils.lazy_utils import lazy_attributes
+
+_LAZY_ATTRIBUTES = {
+    'HikvisionScraper': '.hikvision_scraper',
+    'DahuaScraper': '.dahua_scraper',
+    'ManufacturerRegistry': '.registry',
+}
+
+__all__ = ['HikvisionScraper', 'DahuaScraper', 'ManufacturerRegistry']
 
-__all__ = ['HikvisionScraper', 'DahuaScraper']
+__getattr__, __dir__ = lazy_attributes(globals(), _LAZY_ATTRIBUTES)
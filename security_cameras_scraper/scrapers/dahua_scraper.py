@@ -5,41 +5,105 @@
 """
 
 import logging
-from typing import Dict, Any, Optional, List
-from bs4 import BeautifulSoup, Tag
+from typing import Dict, Any, Optional, List, Union, Iterable, NamedTuple
+from bs4 import BeautifulSoup, Tag, SoupStrainer
 
 from ..utils.html_utils import (
+    class_pattern,
+    any_of_strainers,
     extract_text, 
     get_element_by_selector, 
     get_elements_by_selector
 )
 from ..utils.data_utils import clean_text, organize_data
+from ..utils import lxml_utils
+from ..utils.parser_backends import parse_document, DEFAULT_BACKEND, BACKENDS
 
 logger = logging.getLogger(__name__)
 
+# محركات الاستخراج المدعومة
+ENGINES = ("bs4", "lxml")
+
+# كلمات تميز الفقرات الشرحية لمعيار DORI عن أسماء الأقسام
+DORI_NOTE_KEYWORDS = ("standard system", "ability", "distinguish", "en-62676-4")
+
+EL_ROW_XPATH = "//div" + lxml_utils.class_xpath("el-row")
+TITLE_XPATH = ".//h3" + lxml_utils.class_xpath("title")
+TEXT_XPATH = ".//p" + lxml_utils.class_xpath("text")
+
+# الأشجار الفرعية التي يحتاجها المستخرج: كتل العنوان (div.el-row) وجداول المواصفات
+PARTIAL_PARSE_STRAINER = any_of_strainers(
+    SoupStrainer("div", class_=class_pattern("el-row")),
+    SoupStrainer("table")
+)
+
+
+class SpecCell(NamedTuple):
+    """خلية في جدول المواصفات بعد استخراج نصها مرة واحدة."""
+    text: str
+    rowspan: bool
+    colspan: bool
+
 
 class DahuaScraper:
     """
     مستخرج مخصص لاستخراج بيانات منتجات Dahua.
     """
     
-    def __init__(self):
-        """تهيئة مستخرج Dahua."""
+    # يقبل المحتوى الخام (bytes) مع ترميزه مباشرة دون فك ترميزه مسبقًا
+    accepts_bytes = True
+    
+    def __init__(self, engine: str = "bs4", partial_parse: bool = False, backend: str = DEFAULT_BACKEND):
+        """
+        تهيئة مستخرج Dahua.
+        
+        المعاملات:
+            engine (str): محرك الاستخراج: 'bs4' (BeautifulSoup) أو 'lxml' الذي يقرأ
+                الجداول مباشرة من شجرة lxml ويعطي نفس النتائج بسرعة أكبر.
+            partial_parse (bool): بناء شجرة BeautifulSoup لكتل العنوان والجداول فقط
+                بدلاً من الصفحة كاملة (محرك bs4 فقط).
+            backend (str): محلل HTML الذي يعمل عليه محرك bs4: 'bs4' أو 'html5lib' أو 'lxml'
+                أو 'selectolax' (انظر utils.parser_backends).
+                
+        الاستثناءات:
+            ValueError: إذا كان المحرك أو المحلل غير مدعوم.
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"محرك استخراج غير مدعوم: {engine}")
+        if backend not in BACKENDS:
+            raise ValueError(f"محرك تحليل غير معروف: {backend}")
+        
         self.name = "Dahua"
+        self.engine = engine
+        self.partial_parse = partial_parse
+        self.backend = backend
     
-    def extract(self, html_content: str, url: str) -> Dict[str, Any]:
+    def extract(self, 
+                html_content: Union[str, bytes], 
+                url: str, 
+                encoding: Optional[str] = None) -> Dict[str, Any]:
         """
         استخراج بيانات منتج Dahua من HTML.
         
         المعاملات:
-            html_content (str): محتوى HTML للصفحة.
+            html_content (Union[str, bytes]): محتوى HTML للصفحة، نصًا أو محتوى خامًا.
             url (str): رابط الصفحة (للرجوع).
+            encoding (Optional[str]): ترميز المحتوى الخام (اختياري).
             
         العوائد:
             Dict[str, Any]: البيانات المستخرجة منظمة.
         """
         try:
-            soup = BeautifulSoup(html_content, 'lxml')
+            if self.engine == "lxml":
+                root = lxml_utils.parse_html(html_content, encoding)
+                structured_data = {}
+                self._extract_general_information_lxml(root, structured_data)
+                self._extract_technical_specifications_lxml(root, structured_data)
+                return structured_data
+            
+            # التحليل الجزئي متاح فقط مع محلل bs4
+            parse_only = PARTIAL_PARSE_STRAINER if self.partial_parse and self.backend == "bs4" else None
+            soup = parse_document(html_content, encoding, self.backend, parse_only)
             structured_data = {}
             
             # استخراج المعلومات العامة
@@ -94,6 +158,40 @@ class DahuaScraper:
         else:
             logger.warning("لم يتم العثور على نوع المنتج")
     
+    def _extract_general_information_lxml(self, root: Any, data: Dict[str, Any]) -> None:
+        """
+        استخراج المعلومات العامة للمنتج بمحرك lxml.
+        
+        المعاملات:
+            root (Any): العنصر الجذر لشجرة lxml.
+            data (Dict[str, Any]): قاموس البيانات للتحديث.
+        """
+        data["General information"] = {}
+        
+        product_title = None
+        product_type = None
+        
+        for div in root.xpath(EL_ROW_XPATH):
+            titles = div.xpath(TITLE_XPATH)
+            types = div.xpath(TEXT_XPATH)
+            
+            if titles:
+                product_title = lxml_utils.get_text(titles[0])
+            if types:
+                product_type = lxml_utils.get_text(types[0])
+        
+        if product_title:
+            data["General information"]["Product Title"] = product_title
+            logger.debug(f"تم استخراج عنوان المنتج: {product_title}")
+        else:
+            logger.warning("لم يتم العثور على عنوان المنتج")
+        
+        if product_type:
+            data["General information"]["Product Type"] = product_type
+            logger.debug(f"تم استخراج نوع المنتج: {product_type}")
+        else:
+            logger.warning("لم يتم العثور على نوع المنتج")
+    
     def _extract_technical_specifications(self, soup: BeautifulSoup, data: Dict[str, Any]) -> None:
         """
         استخراج المواصفات التقنية للمنتج.
@@ -111,89 +209,124 @@ class DahuaScraper:
             
         logger.info(f"تم العثور على {len(tables)} جدول في صفحة Dahua")
         
+        # المرور على الأحفاد مباشرة بدلاً من find_all لتجنب بناء مرشح بحث لكل صف
+        rows = (
+            [
+                SpecCell(extract_text(cell), "rowspan" in cell.attrs, "colspan" in cell.attrs)
+                for cell in row.descendants
+                if cell.name == "td"
+            ]
+            for table in tables
+            for row in table.descendants
+            if row.name == "tr"
+        )
+        self._extract_spec_rows(rows, data)
+    
+    def _extract_technical_specifications_lxml(self, root: Any, data: Dict[str, Any]) -> None:
+        """
+        استخراج المواصفات التقنية للمنتج بمحرك lxml.
+        
+        المعاملات:
+            root (Any): العنصر الجذر لشجرة lxml.
+            data (Dict[str, Any]): قاموس البيانات للتحديث.
+        """
+        tables = list(root.iter("table"))
+        
+        if not tables:
+            logger.warning("لم يتم العثور على جداول للمواصفات")
+            return
+            
+        logger.info(f"تم العثور على {len(tables)} جدول في صفحة Dahua")
+        
+        rows = (
+            [
+                SpecCell(lxml_utils.get_text(cell), cell.get("rowspan") is not None, cell.get("colspan") is not None)
+                for cell in row.iterdescendants("td")
+            ]
+            for table in tables
+            for row in table.iterdescendants("tr")
+        )
+        self._extract_spec_rows(rows, data)
+    
+    def _extract_spec_rows(self, rows: Iterable[List[SpecCell]], data: Dict[str, Any]) -> None:
+        """
+        تحويل صفوف جداول المواصفات إلى أقسام ومفاتيح في مرور واحد.
+        
+        يتم استخراج نص كل خلية مرة واحدة مسبقًا، ويتم تنظيف النص فقط للخلايا التي
+        تدخل في النتيجة. تعالج جداول DORI (rowspan للمفتاح و colspan للقيم) في نفس المرور.
+        
+        المعاملات:
+            rows (Iterable[List[SpecCell]]): خلايا كل صف بترتيب الصفحة.
+            data (Dict[str, Any]): قاموس البيانات للتحديث.
+        """
         current_section = None
         current_key = None
         table_headers = {}  # قاموس لتخزين رؤوس الأعمدة لكل مفتاح
         
-        for table in tables:
-            rows = table.find_all("tr")
+        for cells in rows:
+            # تجاهل الصفوف الفارغة
+            if not cells:
+                continue
             
-            for row in rows:
-                cells = row.find_all("td")
+            # إذا كان هناك عمود واحد فقط
+            if len(cells) == 1:
+                cell_text = cells[0].text
                 
-                # تجاهل الصفوف الفارغة
-                if not cells:
+                # تحقق ما إذا كان النص هو اسم قسم أو فقرة شرحية
+                if "DORI" in cell_text and any(keyword in cell_text.lower() for keyword in DORI_NOTE_KEYWORDS):
+                    # تجاهل الفقرات الشرحية
+                    continue
+                elif len(cell_text) > 100:  # فقرة طويلة غالباً تكون شرحية
                     continue
                 
-                # إذا كان هناك عمود واحد فقط
-                if len(cells) == 1:
-                    cell_text = extract_text(cells[0])
-                    
-                    # تحقق ما إذا كان النص هو اسم قسم أو فقرة شرحية
-                    if "DORI" in cell_text and any(keyword in cell_text.lower() for keyword in ["standard system", "ability", "distinguish", "en-62676-4"]):
-                        # تجاهل الفقرات الشرحية
-                        continue
-                    elif len(cell_text) > 100:  # فقرة طويلة غالباً تكون شرحية
-                        # تجاهل الفقرات الشرحية الطويلة
-                        continue
-                    else:
-                        # هذا قسم رئيسي جديد
-                        current_section = clean_text(cell_text)
-                        if current_section not in data:
-                            data[current_section] = {}
-                        current_key = None
+                # هذا قسم رئيسي جديد
+                current_section = clean_text(cell_text)
+                if current_section not in data:
+                    data[current_section] = {}
+                current_key = None
+            
+            # إذا كان أول `<td>` يحتوي على `rowspan`، فهو مفتاح جديد
+            elif cells[0].rowspan:
+                current_key = clean_text(cells[0].text)
                 
-                # إذا كان أول `<td>` يحتوي على `rowspan`، فهو مفتاح جديد
-                elif len(cells) > 1 and cells[0].has_attr("rowspan"):
-                    current_key = clean_text(extract_text(cells[0]))
-                    
-                    # استخراج رؤوس الأعمدة من الصف الأول
-                    headers = [
-                        clean_text(extract_text(cell)) 
+                # استخراج رؤوس الأعمدة من الصف الأول
+                headers = [
+                    clean_text(cell.text) 
+                    for cell in cells 
+                    if not cell.rowspan and not cell.text.startswith("DORI")
+                ]
+                
+                # تخزين رؤوس الأعمدة للاستخدام في صفوف القيم التالية
+                if current_section and current_key:
+                    table_headers[f"{current_section}_{current_key}"] = headers
+                    data[current_section][current_key] = []
+            
+            # إذا كان هناك `colspan` في الصف، فهذا يعني أنه تابع للمفتاح `rowspan` الحالي
+            elif current_section and current_key and any(cell.colspan for cell in cells):
+                headers = table_headers.get(f"{current_section}_{current_key}")
+                
+                if headers is not None:
+                    values = [
+                        clean_text(cell.text) 
                         for cell in cells 
-                        if not cell.has_attr("rowspan") and not extract_text(cell).startswith("DORI")
+                        if cell.colspan and not cell.text.startswith("DORI")
                     ]
                     
-                    # تخزين رؤوس الأعمدة في قاموس منفصل للاستخدام لاحقاً
-                    if current_section and current_key:
-                        table_headers[f"{current_section}_{current_key}"] = headers
-                        
-                        # إنشاء قائمة فارغة لتخزين صفوف البيانات
-                        data[current_section][current_key] = []
-                
-                # إذا كان هناك `colspan` في الصف، فهذا يعني أنه تابع للمفتاح `rowspan` الحالي
-                elif any(cell.has_attr("colspan") for cell in cells) and current_section and current_key:
-                    header_key = f"{current_section}_{current_key}"
+                    # دمج رؤوس الأعمدة مع القيم المقابلة لها
+                    row_dict = {
+                        headers[i] if i < len(headers) else f"column_{i}": value
+                        for i, value in enumerate(values)
+                    }
                     
-                    if header_key in table_headers:
-                        values = [
-                            clean_text(extract_text(cell)) 
-                            for cell in cells 
-                            if cell.has_attr("colspan") and not extract_text(cell).startswith("DORI")
-                        ]
-                        
-                        # استرجاع رؤوس الأعمدة للمفتاح الحالي
-                        headers = table_headers[header_key]
-                        row_dict = {}
-                        
-                        # دمج رؤوس الأعمدة مع القيم المقابلة لها
-                        for i, value in enumerate(values):
-                            if i < len(headers):
-                                row_dict[headers[i]] = value
-                            else:
-                                row_dict[f"column_{i}"] = value
-                        
-                        # إضافة الصف المنسق إلى قائمة صفوف البيانات
-                        if row_dict:
-                            data[current_section][current_key].append(row_dict)
+                    if row_dict:
+                        data[current_section][current_key].append(row_dict)
+            
+            # إذا لم يكن هناك `rowspan` أو `colspan`، فهو مفتاح عادي مع قيمة
+            elif len(cells) == 2 and current_section:
+                key = clean_text(cells[0].text)
                 
-                # إذا لم يكن هناك `rowspan` أو `colspan`، فهو مفتاح عادي مع قيمة
-                elif len(cells) == 2 and current_section:
-                    key = clean_text(extract_text(cells[0]))
-                    value = clean_text(extract_text(cells[1]))
-                    
-                    if key and current_section in data:
-                        data[current_section][key] = value
+                if key and current_section in data:
+                    data[current_section][key] = clean_text(cells[1].text)
         
         # تنظيف البيانات بعد الاستخراج
         self._clean_data_structure(data)
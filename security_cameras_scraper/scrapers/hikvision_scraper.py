@@ -6,45 +6,113 @@
 """
 
 import logging
-from typing import Dict, Any, Optional, List
-from bs4 import BeautifulSoup
+from typing import Dict, Any, Optional, List, Union
+from bs4 import BeautifulSoup, SoupStrainer
 
 from ..utils.html_utils import (
+    make_soup,
+    class_pattern,
     extract_text, 
     get_element_by_selector, 
     get_elements_by_selector
 )
 from ..utils.data_utils import clean_text, organize_data
+from ..utils import lxml_utils
+from ..utils.parser_backends import parse_document, DEFAULT_BACKEND, BACKENDS
 
 logger = logging.getLogger(__name__)
 
+# محركات الاستخراج المدعومة
+ENGINES = ("bs4", "lxml")
+
+# أصناف عناصر المواصفات التقنية
+SECTION_CLASS = "tech-specs-items-description"
+ITEM_CLASS = "tech-specs-items-description-list"
+HEADING_CLASS = "tech-specs-items-description__title--heading"
+KEY_CLASS = "tech-specs-items-description__title"
+VALUE_CLASS = "tech-specs-items-description__title-details"
+
+# مكافئات XPath لمحددات CSS الخاصة بالمعلومات العامة
+PRODUCT_TITLE_XPATH = (
+    "//div" + lxml_utils.class_xpath("product_description_title_tag_container")
+    + "/div" + lxml_utils.class_xpath("product_description_title") + "/h2"
+)
+PRODUCT_TYPE_XPATH = "//div/div" + lxml_utils.class_xpath("product-description-container") + "/div/h1"
+SECTION_XPATH = "//ul" + lxml_utils.class_xpath(SECTION_CLASS) + "[@data-target]"
+
+# محددات CSS للمعلومات العامة
+PRODUCT_TITLE_SELECTOR = "div.product_description_title_tag_container > div.product_description_title > h2"
+PRODUCT_TYPE_SELECTOR = "div > div.product-description-container > div > h1"
+# في التحليل الجزئي يفقد الحاوي عنصره الأب، فيطابق المحدد من الحاوي نفسه
+PARTIAL_PRODUCT_TYPE_SELECTOR = "div.product-description-container > div > h1"
+
+# الأشجار الفرعية التي يحتاجها المستخرج: كتلة العنوان وحاوي النوع وقوائم المواصفات
+PARTIAL_PARSE_STRAINER = SoupStrainer(class_=class_pattern(
+    "product_description_title_tag_container",
+    "product-description-container",
+    SECTION_CLASS
+))
+
 
 class HikvisionScraper:
     """
     مستخرج مخصص لاستخراج بيانات منتجات Hikvision.
     """
     
-    def __init__(self):
-        """تهيئة مستخرج Hikvision."""
+    # يقبل المحتوى الخام (bytes) مع ترميزه مباشرة دون فك ترميزه مسبقًا
+    accepts_bytes = True
+    
+    def __init__(self, engine: str = "bs4", partial_parse: bool = False, backend: str = DEFAULT_BACKEND):
+        """
+        تهيئة مستخرج Hikvision.
+        
+        المعاملات:
+            engine (str): محرك الاستخراج: 'bs4' (BeautifulSoup) أو 'lxml' الذي يمر على
+                قوائم المواصفات مرة واحدة ويعطي نفس النتائج بسرعة أكبر.
+            partial_parse (bool): بناء شجرة BeautifulSoup لكتلة العنوان وقوائم المواصفات فقط
+                بدلاً من الصفحة كاملة (محرك bs4 فقط).
+            backend (str): محلل HTML الذي يعمل عليه محرك bs4: 'bs4' أو 'html5lib' أو 'lxml'
+                أو 'selectolax' (انظر utils.parser_backends).
+                
+        الاستثناءات:
+            ValueError: إذا كان المحرك أو المحلل غير مدعوم.
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"محرك استخراج غير مدعوم: {engine}")
+        if backend not in BACKENDS:
+            raise ValueError(f"محرك تحليل غير معروف: {backend}")
+        
         self.name = "Hikvision"
+        self.engine = engine
+        self.partial_parse = partial_parse
+        self.backend = backend
     
-    def extract(self, html_content: str, url: str) -> Dict[str, Any]:
+    def extract(self, 
+                html_content: Union[str, bytes], 
+                url: str, 
+                encoding: Optional[str] = None) -> Dict[str, Any]:
         """
         استخراج بيانات منتج Hikvision من HTML.
         
         المعاملات:
-            html_content (str): محتوى HTML للصفحة.
+            html_content (Union[str, bytes]): محتوى HTML للصفحة، نصًا أو محتوى خامًا.
             url (str): رابط الصفحة (للرجوع).
+            encoding (Optional[str]): ترميز المحتوى الخام (اختياري).
             
         العوائد:
             Dict[str, Any]: البيانات المستخرجة منظمة.
         """
         try:
-            soup = BeautifulSoup(html_content, 'lxml')
+            if self.engine == "lxml":
+                return self._extract_lxml(html_content, encoding)
+            
+            # التحليل الجزئي متاح فقط مع محلل bs4
+            parse_only = PARTIAL_PARSE_STRAINER if self.partial_parse and self.backend == "bs4" else None
+            soup = parse_document(html_content, encoding, self.backend, parse_only)
             structured_data = {}
             
             # استخراج المعلومات العامة
-            self._extract_general_information(soup, structured_data)
+            self._extract_general_information(soup, structured_data, partial=parse_only is not None)
             
             # استخراج المواصفات التقنية
             sections_extracted = self._extract_technical_specifications(soup, structured_data)
@@ -52,6 +120,9 @@ class HikvisionScraper:
             # إذا لم يتم استخراج أي مواصفات، جرب الطريقة البديلة
             if not sections_extracted:
                 logger.info("استخدام طريقة بديلة لاستخراج المواصفات التقنية")
+                if parse_only is not None:
+                    # الطريقة البديلة تبحث في الصفحة كاملة
+                    soup = make_soup(html_content, encoding)
                 self._extract_technical_specifications_alternative(soup, structured_data)
             
             return structured_data
@@ -60,22 +131,149 @@ class HikvisionScraper:
             logger.error(f"خطأ أثناء استخراج بيانات Hikvision: {str(e)}")
             return {"error": str(e)}
     
-    def _extract_general_information(self, soup: BeautifulSoup, data: Dict[str, Any]) -> None:
+    def _extract_lxml(self, html_content: Union[str, bytes], encoding: Optional[str] = None) -> Dict[str, Any]:
+        """
+        استخراج البيانات بمحرك lxml.
+        
+        المعاملات:
+            html_content (Union[str, bytes]): محتوى HTML للصفحة.
+            encoding (Optional[str]): ترميز المحتوى الخام (اختياري).
+            
+        العوائد:
+            Dict[str, Any]: البيانات المستخرجة (مطابقة لمحرك bs4).
+        """
+        root = lxml_utils.parse_html(html_content, encoding)
+        structured_data = {}
+        
+        self._extract_general_information_lxml(root, structured_data)
+        sections_extracted = self._extract_technical_specifications_lxml(root, structured_data)
+        
+        # الطريقة البديلة نادرة الاستخدام فتبقى على BeautifulSoup
+        if not sections_extracted:
+            logger.info("استخدام طريقة بديلة لاستخراج المواصفات التقنية")
+            self._extract_technical_specifications_alternative(make_soup(html_content, encoding), structured_data)
+        
+        return structured_data
+    
+    def _extract_general_information_lxml(self, root: Any, data: Dict[str, Any]) -> None:
+        """
+        استخراج المعلومات العامة للمنتج بمحرك lxml.
+        
+        المعاملات:
+            root (Any): العنصر الجذر لشجرة lxml.
+            data (Dict[str, Any]): قاموس البيانات للتحديث.
+        """
+        data["General information"] = {}
+        
+        titles = root.xpath(PRODUCT_TITLE_XPATH)
+        if titles:
+            product_title = lxml_utils.get_text(titles[0])
+            data["General information"]["Product Title"] = product_title
+            logger.debug(f"تم استخراج عنوان المنتج: {product_title}")
+        else:
+            logger.warning("لم يتم العثور على عنوان المنتج")
+        
+        types = root.xpath(PRODUCT_TYPE_XPATH)
+        if types:
+            product_type = lxml_utils.get_text(types[0])
+            data["General information"]["Product Type"] = product_type
+            logger.debug(f"تم استخراج نوع المنتج: {product_type}")
+        else:
+            logger.warning("لم يتم العثور على نوع المنتج")
+    
+    def _extract_technical_specifications_lxml(self, root: Any, data: Dict[str, Any]) -> bool:
+        """
+        استخراج المواصفات التقنية بمحرك lxml في مرور واحد على كل قسم.
+        
+        يصنف كل عنصر li حسب أصناف عناصر span داخله (عنوان فرعي أو مفتاح وقيمة)
+        بدلاً من تشغيل عدة محددات CSS لكل عنصر.
+        
+        المعاملات:
+            root (Any): العنصر الجذر لشجرة lxml.
+            data (Dict[str, Any]): قاموس البيانات للتحديث.
+            
+        العوائد:
+            bool: True إذا تم استخراج أي أقسام، False خلاف ذلك.
+        """
+        section_uls = root.xpath(SECTION_XPATH)
+        
+        if not section_uls:
+            logger.warning("لم يتم العثور على أقسام المواصفات التقنية")
+            return False
+        
+        logger.info(f"تم العثور على {len(section_uls)} قسم رئيسي")
+        
+        sections_count = 0
+        
+        for section_ul in section_uls:
+            section_name = section_ul.get("data-target")
+            if not section_name:
+                continue
+            
+            logger.debug(f"استخراج البيانات من قسم: {section_name}")
+            
+            section = data[section_name] = {}
+            current_subsection = None
+            items_count = 0
+            
+            for item in section_ul.iterdescendants("li"):
+                if not lxml_utils.has_class(item, ITEM_CLASS):
+                    continue
+                items_count += 1
+                
+                # أول span من كل نوع داخل العنصر (مثل select_one)
+                heading_elem = key_elem = value_elem = None
+                for span in item.iterdescendants("span"):
+                    classes = span.get("class")
+                    if not classes:
+                        continue
+                    classes = classes.split()
+                    if heading_elem is None and HEADING_CLASS in classes:
+                        heading_elem = span
+                        break
+                    if key_elem is None and KEY_CLASS in classes:
+                        key_elem = span
+                    if value_elem is None and VALUE_CLASS in classes:
+                        value_elem = span
+                
+                if heading_elem is not None:
+                    current_subsection = lxml_utils.get_text(heading_elem)
+                    if current_subsection and current_subsection != section_name:
+                        section[current_subsection] = {}
+                    continue
+                
+                if key_elem is not None and value_elem is not None:
+                    key = clean_text(lxml_utils.get_text(key_elem))
+                    value = clean_text(lxml_utils.get_text(value_elem))
+                    
+                    if current_subsection and current_subsection != section_name and current_subsection in section:
+                        section[current_subsection][key] = value
+                    else:
+                        section[key] = value
+            
+            if not items_count:
+                logger.warning(f"لم يتم العثور على مواصفات في قسم: {section_name}")
+                continue
+            
+            logger.debug(f"تم العثور على {items_count} مواصفة في قسم {section_name}")
+            sections_count += 1
+        
+        return sections_count > 0
+    
+    def _extract_general_information(self, soup: BeautifulSoup, data: Dict[str, Any], partial: bool = False) -> None:
         """
         استخراج المعلومات العامة للمنتج.
         
         المعاملات:
             soup (BeautifulSoup): كائن BeautifulSoup.
             data (Dict[str, Any]): قاموس البيانات للتحديث.
+            partial (bool): ما إذا كانت الشجرة مبنية بالتحليل الجزئي (PARTIAL_PARSE_STRAINER).
         """
         # إضافة قسم "General information"
         data["General information"] = {}
         
         # استخراج عنوان المنتج
-        product_title_elem = get_element_by_selector(
-            soup, 
-            "div.product_description_title_tag_container > div.product_description_title > h2"
-        )
+        product_title_elem = get_element_by_selector(soup, PRODUCT_TITLE_SELECTOR)
         
         if product_title_elem:
             product_title = extract_text(product_title_elem)
@@ -87,7 +285,7 @@ class HikvisionScraper:
         # استخراج نوع المنتج
         product_type_elem = get_element_by_selector(
             soup, 
-            "div > div.product-description-container > div > h1"
+            PARTIAL_PRODUCT_TYPE_SELECTOR if partial else PRODUCT_TYPE_SELECTOR
         )
         
         if product_type_elem:
@@ -0,0 +1,369 @@
+# الملف: security_cameras_scraper/scrapers/registry.py
+
+"""
+سجل المستخرجات المفهرس حسب اسم المضيف للتعرف السريع على الشركة المصنعة.
+
+يتم تحميل وحدات المستخرجات (ومعها BeautifulSoup و lxml) عند أول استخدام فقط،
+ويمكن للحزم الخارجية تسجيل مستخرجات إضافية عبر نقطة الدخول (entry point)
+"security_cameras_scraper.scrapers" بالصيغة: name = "package.module:ScraperClass".
+"""
+
+import logging
+import importlib
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+
+logger = logging.getLogger(__name__)
+
+# مجموعة نقاط الدخول لمستخرجات الإضافات الخارجية
+ENTRY_POINT_GROUP = "security_cameras_scraper.scrapers"
+
+# المستخرجات المضمنة: الاسم -> (مسار الكلاس، نطاقات الموقع)
+BUILTIN_SCRAPERS = {
+    'hikvision': (
+        'security_cameras_scraper.scrapers.hikvision_scraper:HikvisionScraper',
+        ['hikvision.com']
+    ),
+    'dahua': (
+        'security_cameras_scraper.scrapers.dahua_scraper:DahuaScraper',
+        ['dahuasecurity.com', 'dahuatech.com']
+    ),
+}
+
+# مصنع المستخرج: مسار "module:Class" أو دالة بدون معاملات تعيد كائن المستخرج
+ScraperFactory = Union[str, Callable[[], Any]]
+
+
+def load_object(spec: str) -> Any:
+    """
+    استيراد كائن من مسار بالصيغة "package.module:attribute".
+
+    المعاملات:
+        spec (str): مسار الكائن.
+
+    العوائد:
+        Any: الكائن المستورد.
+    """
+    module_name, _, attribute = spec.partition(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, attribute) if attribute else module
+
+
+def iter_entry_points(group: str = ENTRY_POINT_GROUP) -> List[Any]:
+    """
+    إرجاع نقاط الدخول المثبتة لمجموعة معينة.
+
+    المعاملات:
+        group (str): اسم مجموعة نقاط الدخول.
+
+    العوائد:
+        List[Any]: نقاط الدخول (قائمة فارغة إذا لم تتوفر importlib.metadata).
+    """
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        return []
+
+    try:
+        eps = entry_points()
+        if hasattr(eps, "select"):
+            return list(eps.select(group=group))
+        return list(eps.get(group, []))
+    except Exception as e:
+        logger.warning(f"خطأ أثناء قراءة نقاط الدخول {group}: {str(e)}")
+        return []
+
+
+class _LazyScraper:
+    """عنصر نائب لمستخرج لم يتم تحميله بعد."""
+
+    __slots__ = ("factory",)
+
+    def __init__(self, factory: ScraperFactory):
+        self.factory = factory
+
+    def load(self) -> Any:
+        """تحميل وحدة المستخرج وإنشاء كائنه."""
+        if isinstance(self.factory, str):
+            return load_object(self.factory)()
+        return self.factory()
+
+
+class ScraperMapping(MutableMapping):
+    """
+    قاموس المستخرجات (الاسم -> كائن المستخرج) مع تحميل كسول.
+
+    يتصرف كقاموس عادي، لكن المستخرجات المسجلة بمصنع لا يتم استيرادها وإنشاؤها
+    إلا عند أول وصول إليها.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def add_lazy(self, name: str, factory: ScraperFactory) -> None:
+        """
+        تسجيل مستخرج يتم تحميله عند أول استخدام.
+
+        المعاملات:
+            name (str): اسم الشركة المصنعة.
+            factory (ScraperFactory): مسار الكلاس أو دالة تنشئ المستخرج.
+        """
+        with self._lock:
+            self._entries[name] = _LazyScraper(factory)
+
+    def is_loaded(self, name: str) -> bool:
+        """ما إذا كان مستخرج الشركة قد تم تحميله."""
+        return not isinstance(self._entries.get(name), _LazyScraper)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        نسخة من المدخلات قابلة للنقل إلى عمليات أخرى (مثل عمال التحليل).
+
+        تبقى المستخرجات المسجلة بمسار "module:Class" كسولة، بينما يتم تحميل
+        المستخرجات ذات المصانع الأخرى (الدوال) لأنها قد لا تقبل التسلسل.
+
+        العوائد:
+            Dict[str, Any]: الاسم -> كائن المستخرج أو عنصره النائب.
+        """
+        entries = {}
+        for name, entry in list(self._entries.items()):
+            if isinstance(entry, _LazyScraper) and isinstance(entry.factory, str):
+                entries[name] = entry
+            else:
+                entries[name] = self[name]
+        return entries
+
+    @classmethod
+    def from_snapshot(cls, entries: Dict[str, Any]) -> "ScraperMapping":
+        """
+        إعادة بناء القاموس من نسخة snapshot().
+
+        المعاملات:
+            entries (Dict[str, Any]): المدخلات كما أعادتها snapshot().
+
+        العوائد:
+            ScraperMapping: قاموس جديد بنفس المستخرجات.
+        """
+        mapping = cls()
+        mapping._entries.update(entries)
+        return mapping
+
+    def __getitem__(self, name: str) -> Any:
+        entry = self._entries[name]
+        if not isinstance(entry, _LazyScraper):
+            return entry
+
+        with self._lock:
+            entry = self._entries[name]
+            if isinstance(entry, _LazyScraper):
+                logger.debug(f"تحميل مستخرج الشركة: {name}")
+                entry = entry.load()
+                self._entries[name] = entry
+            return entry
+
+    def __setitem__(self, name: str, scraper: Any) -> None:
+        with self._lock:
+            self._entries[name] = scraper
+
+    def __delitem__(self, name: str) -> None:
+        with self._lock:
+            del self._entries[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._entries
+
+    def __repr__(self) -> str:
+        return f"ScraperMapping({list(self._entries)})"
+
+
+class ManufacturerRegistry:
+    """
+    سجل المستخرجات المتاحة مفهرسًا بلاحقة النطاق (مثل hikvision.com).
+
+    يتم التعرف على الشركة من اسم المضيف المحلل فقط (وليس من نص الرابط كاملًا)،
+    بالبحث عن أطول لاحقة نطاق مسجلة، مع قواعد اختيارية لبادئة المسار.
+    تحفظ نتيجة كل مضيف في ذاكرة بحيث تكلف الروابط المتكررة لنفس المضيف بحثًا واحدًا.
+
+    الشركات المسجلة دون نطاقات تطابق بالاسم داخل اسم المضيف للتوافق مع السلوك السابق.
+    """
+
+    def __init__(self, builtins: bool = False, plugins: bool = False):
+        """
+        تهيئة السجل.
+
+        المعاملات:
+            builtins (bool): تسجيل المستخرجات المضمنة (Hikvision و Dahua) بتحميل كسول.
+            plugins (bool): البحث عن مستخرجات الإضافات عبر نقاط الدخول عند أول رابط غير معروف.
+        """
+        # اسم الشركة -> كائن المستخرج
+        self.scrapers = ScraperMapping()
+        # لاحقة النطاق -> قائمة (بادئة المسار، اسم الشركة)
+        self._domains: Dict[str, List[Tuple[Optional[str], str]]] = {}
+        # الشركات التي لها قواعد نطاق صريحة
+        self._ruled_names = set()
+        # اسم المضيف -> القواعد المرشحة لهذا المضيف
+        self._memo: Dict[str, List[Tuple[Optional[str], str]]] = {}
+        self._lock = threading.RLock()
+        self._plugins_pending = plugins
+
+        if builtins:
+            for name, (spec, domains) in BUILTIN_SCRAPERS.items():
+                self.register(name, factory=spec, domains=domains)
+
+    def register(self,
+                 name: str,
+                 scraper: Any = None,
+                 domains: Optional[Iterable[str]] = None,
+                 path_prefixes: Optional[Iterable[str]] = None,
+                 factory: Optional[ScraperFactory] = None) -> None:
+        """
+        تسجيل مستخرج لشركة مصنعة.
+
+        المعاملات:
+            name (str): اسم الشركة المصنعة.
+            scraper (Any): كائن المستخرج (أو None مع تحديد factory).
+            domains (Optional[Iterable[str]]): لواحق النطاقات الخاصة بالشركة، مثل "hikvision.com"
+                (اختياري، عند عدم تحديدها يطابق الاسم داخل اسم المضيف).
+            path_prefixes (Optional[Iterable[str]]): بادئات مسار تقصر التطابق على أجزاء من الموقع (اختياري).
+            factory (Optional[ScraperFactory]): مسار "module:Class" أو دالة لإنشاء المستخرج
+                عند أول استخدام بدلاً من تمرير كائن جاهز (اختياري).
+
+        الاستثناءات:
+            ValueError: إذا لم يتم تحديد scraper ولا factory.
+        """
+        if scraper is None and factory is None:
+            raise ValueError("يجب تحديد كائن المستخرج أو مصنع لإنشائه")
+
+        name = name.lower()
+        prefixes = [prefix.lower() for prefix in path_prefixes] if path_prefixes else [None]
+
+        with self._lock:
+            if scraper is not None:
+                self.scrapers[name] = scraper
+            else:
+                self.scrapers.add_lazy(name, factory)
+
+            for domain in domains or []:
+                domain = domain.lower().strip(".")
+                rules = self._domains.setdefault(domain, [])
+                for prefix in prefixes:
+                    if (prefix, name) not in rules:
+                        rules.append((prefix, name))
+                # القواعد ذات البادئة الأطول أولاً، والقواعد دون بادئة أخيرًا
+                rules.sort(key=lambda rule: -len(rule[0] or ""))
+                self._ruled_names.add(name)
+
+            self._memo.clear()
+
+    def load_plugins(self, group: str = ENTRY_POINT_GROUP) -> int:
+        """
+        تسجيل مستخرجات الإضافات المعلنة عبر نقاط الدخول دون استيرادها.
+
+        المعاملات:
+            group (str): اسم مجموعة نقاط الدخول.
+
+        العوائد:
+            int: عدد المستخرجات الجديدة المسجلة.
+        """
+        count = 0
+
+        for entry_point in iter_entry_points(group):
+            name = entry_point.name.lower()
+            if name in self.scrapers:
+                continue
+            self.register(name, factory=lambda ep=entry_point: ep.load()())
+            count += 1
+
+        if count:
+            logger.info(f"تم تسجيل {count} مستخرج من الإضافات")
+        return count
+
+    def _candidates(self, host: str) -> List[Tuple[Optional[str], str]]:
+        """
+        حساب القواعد المرشحة لمضيف مع حفظ النتيجة.
+
+        المعاملات:
+            host (str): اسم المضيف.
+
+        العوائد:
+            List[Tuple[Optional[str], str]]: قائمة (بادئة المسار، اسم الشركة).
+        """
+        with self._lock:
+            candidates = self._memo.get(host)
+            if candidates is not None:
+                return candidates
+
+            candidates = []
+
+            # أطول لاحقة نطاق مسجلة أولاً: www.hikvision.com ثم hikvision.com ثم com
+            labels = host.split(".")
+            for i in range(len(labels)):
+                rules = self._domains.get(".".join(labels[i:]))
+                if rules:
+                    candidates.extend(rules)
+                    break
+
+            # التوافق مع الشركات المسجلة دون نطاقات: مطابقة الاسم داخل اسم المضيف
+            if not candidates:
+                for name in self.scrapers:
+                    if name not in self._ruled_names and name in host:
+                        candidates.append((None, name))
+                        break
+
+            # البحث عن الإضافات مرة واحدة عند أول مضيف غير معروف
+            if not candidates and self._plugins_pending:
+                self._plugins_pending = False
+                if self.load_plugins():
+                    return self._candidates(host)
+
+            self._memo[host] = candidates
+            return candidates
+
+    def lookup(self, url: str) -> Optional[str]:
+        """
+        التعرف على الشركة المصنعة للرابط.
+
+        المعاملات:
+            url (str): الرابط.
+
+        العوائد:
+            Optional[str]: اسم الشركة المصنعة أو None إذا لم يتم التعرف عليها.
+        """
+        try:
+            parts = urlsplit(url.strip())
+        except ValueError:
+            return None
+
+        host = (parts.hostname or "").lower()
+        if not host:
+            return None
+
+        path = None
+        for prefix, name in self._candidates(host):
+            if prefix is None:
+                return name
+            if path is None:
+                path = (parts.path or "/").lower()
+            if path.startswith(prefix):
+                return name
+
+        return None
+
+    def __contains__(self, name: str) -> bool:
+        return name.lower() in self.scrapers
+
+    def __getitem__(self, name: str) -> Any:
+        return self.scrapers[name.lower()]
@@ -2,20 +2,82 @@
 
 """
 حزمة الأدوات المساعدة للمكتبة.
+
+يتم استيراد الوحدات عند أول وصول إليها فقط حتى لا تحمل requests أو BeautifulSoup دون حاجة.
 """
 
-from .http_utils import fetch_page, fetch_with_retry, save_html_sample
-from .html_utils import extract_text, get_element_by_selector, get_elements_by_selector
-from .data_utils import clean_text, organize_data, merge_section_data
+from .lazy_utils import lazy_attributes
+
+_LAZY_ATTRIBUTES = {
+    'fetch_page': '.http_utils',
+    'fetch_page_raw': '.http_utils',
+    'fetch_with_retry': '.http_utils',
+    'save_html_sample': '.http_utils',
+    'FetchResult': '.http_utils',
+    'SessionManager': '.session_utils',
+    'get_host': '.session_utils',
+    'HostLimiter': '.concurrency_utils',
+    'AdaptiveHostLimiter': '.concurrency_utils',
+    'SingleFlight': '.concurrency_utils',
+    'canonicalize_url': '.url_utils',
+    'group_urls': '.url_utils',
+    'ModelIndex': '.model_utils',
+    'ProductRef': '.model_utils',
+    'parse_product_url': '.model_utils',
+    'HostRateLimiter': '.rate_limit_utils',
+    'TokenBucket': '.rate_limit_utils',
+    'interleave_hosts': '.rate_limit_utils',
+    'RetryPolicy': '.retry_utils',
+    'RetryScheduler': '.retry_utils',
+    'CircuitBreaker': '.retry_utils',
+    'Deadline': '.hedge_utils',
+    'RequestHedger': '.hedge_utils',
+    'HttpCache': '.cache_utils',
+    'HtmlArchive': '.archive_utils',
+    'extract_text': '.html_utils',
+    'get_element_by_selector': '.html_utils',
+    'get_elements_by_selector': '.html_utils',
+    'compile_selector': '.html_utils',
+    'selector_cache_info': '.html_utils',
+    'clean_text': '.data_utils',
+    'organize_data': '.data_utils',
+    'merge_section_data': '.data_utils',
+}
 
 __all__ = [
     'fetch_page', 
+    'fetch_page_raw',
     'fetch_with_retry', 
     'save_html_sample',
+    'FetchResult',
+    'SessionManager',
+    'get_host',
+    'HostLimiter',
+    'AdaptiveHostLimiter',
+    'SingleFlight',
+    'canonicalize_url',
+    'group_urls',
+    'ModelIndex',
+    'ProductRef',
+    'parse_product_url',
+    'HostRateLimiter',
+    'TokenBucket',
+    'interleave_hosts',
+    'RetryPolicy',
+    'RetryScheduler',
+    'CircuitBreaker',
+    'Deadline',
+    'RequestHedger',
+    'HttpCache',
+    'HtmlArchive',
     'extract_text', 
     'get_element_by_selector', 
     'get_elements_by_selector',
+    'compile_selector',
+    'selector_cache_info',
     'clean_text', 
     'organize_data', 
     'merge_section_data'
-] 
+]
+
+__getattr__, __dir__ = lazy_attributes(globals(), _LAZY_ATTRIBUTES)
@@ -0,0 +1,298 @@
+# الملف: security_cameras_scraper/utils/archive_utils.py
+
+"""
+أرشيف مضغوط لصفحات HTML الخام معنون بمحتواه (content-addressed) مع فهرس للروابط.
+"""
+
+import os
+import gzip
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import List, Optional, Tuple, Union, NamedTuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from .encoding_utils import decode_content
+from .file_utils import write_atomic
+
+logger = logging.getLogger(__name__)
+
+# امتداد ملف الكائن لكل طريقة ضغط
+COMPRESSION_EXTENSIONS = {
+    "gzip": ".gz",
+    "zstd": ".zst",
+}
+
+
+class ArchiveRecord(NamedTuple):
+    """سجل في فهرس الأرشيف يربط الرابط بمحتواه ووقت استرجاعه."""
+    url: str
+    content_hash: str
+    fetched_at: float
+    encoding: Optional[str]
+
+
+class HtmlArchive:
+    """
+    أرشيف لجميع الصفحات المسترجعة.
+
+    يخزن كل محتوى مرة واحدة فقط باسم بصمته (SHA-256) مضغوطًا بـ gzip أو zstd،
+    ويحتفظ بفهرس SQLite يسجل لكل رابط البصمة ووقت الاسترجاع. يمكن استخدامه لإعادة
+    تشغيل المستخرجات على عملية استخراج سابقة كاملة دون أي طلبات شبكة.
+    """
+
+    def __init__(self, root_dir: str, compression: str = "gzip"):
+        """
+        تهيئة الأرشيف.
+
+        المعاملات:
+            root_dir (str): المجلد الجذر للأرشيف.
+            compression (str): طريقة ضغط المحتوى الجديد ('gzip' أو 'zstd').
+
+        الاستثناءات:
+            ValueError: إذا كانت طريقة الضغط غير مدعومة.
+            ImportError: إذا تم اختيار zstd ومكتبة zstandard غير مثبتة.
+        """
+        if compression not in COMPRESSION_EXTENSIONS:
+            raise ValueError(f"طريقة ضغط غير مدعومة: {compression}")
+        if compression == "zstd" and zstandard is None:
+            raise ImportError("مكتبة zstandard غير متوفرة. يرجى تثبيتها باستخدام: pip install zstandard")
+
+        self.root_dir = root_dir
+        self.compression = compression
+        self.objects_dir = os.path.join(root_dir, "objects")
+
+        if not os.path.exists(self.objects_dir):
+            os.makedirs(self.objects_dir)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(root_dir, "index.sqlite"), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "url TEXT NOT NULL, content_hash TEXT NOT NULL, "
+            "fetched_at REAL NOT NULL, encoding TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS pages_url ON pages (url, fetched_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def content_hash(content: bytes) -> str:
+        """
+        حساب بصمة المحتوى.
+
+        المعاملات:
+            content (bytes): المحتوى.
+
+        العوائد:
+            str: بصمة SHA-256 بالنظام الست عشري.
+        """
+        return hashlib.sha256(content).hexdigest()
+
+    def _object_path(self, content_hash: str, compression: str) -> str:
+        """مسار ملف الكائن المضغوط للبصمة."""
+        return os.path.join(
+            self.objects_dir,
+            content_hash[:2],
+            content_hash + COMPRESSION_EXTENSIONS[compression]
+        )
+
+    def _find_object(self, content_hash: str) -> Optional[str]:
+        """البحث عن ملف الكائن بأي طريقة ضغط."""
+        for compression in COMPRESSION_EXTENSIONS:
+            path = self._object_path(content_hash, compression)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _compress(self, content: bytes) -> bytes:
+        """ضغط المحتوى بالطريقة المحددة."""
+        if self.compression == "zstd":
+            return zstandard.ZstdCompressor().compress(content)
+        return gzip.compress(content)
+
+    @staticmethod
+    def _decompress(path: str, data: bytes) -> bytes:
+        """فك ضغط المحتوى حسب امتداد الملف."""
+        if path.endswith(COMPRESSION_EXTENSIONS["zstd"]):
+            if zstandard is None:
+                raise ImportError("مكتبة zstandard غير متوفرة. يرجى تثبيتها باستخدام: pip install zstandard")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
+
+    def store(self,
+              url: str,
+              content: Union[str, bytes],
+              encoding: Optional[str] = None,
+              fetched_at: Optional[float] = None) -> str:
+        """
+        أرشفة محتوى صفحة.
+
+        المعاملات:
+            url (str): رابط الصفحة.
+            content (Union[str, bytes]): محتوى الصفحة (النصوص تخزن بترميز UTF-8).
+            encoding (Optional[str]): ترميز المحتوى إذا كان bytes.
+            fetched_at (Optional[float]): وقت الاسترجاع (الافتراضي: الآن).
+
+        العوائد:
+            str: بصمة المحتوى.
+
+        الاستثناءات:
+            OSError: إذا فشلت كتابة ملف المحتوى (مثل امتلاء القرص).
+            sqlite3.Error: إذا فشل تسجيل الرابط في الفهرس.
+        """
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+            encoding = "utf-8"
+
+        content_hash = self.content_hash(content)
+
+        # تخزين المحتوى مرة واحدة فقط حتى لو تكرر لعدة روابط أو عدة مرات
+        if self._find_object(content_hash) is None:
+            path = self._object_path(content_hash, self.compression)
+            parent_dir = os.path.dirname(path)
+            if not os.path.exists(parent_dir):
+                os.makedirs(parent_dir, exist_ok=True)
+
+            write_atomic(path, self._compress(content))
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO pages (url, content_hash, fetched_at, encoding) VALUES (?, ?, ?, ?)",
+                (url, content_hash, fetched_at or time.time(), encoding)
+            )
+            self._conn.commit()
+
+        return content_hash
+
+    def load(self, content_hash: str) -> Optional[bytes]:
+        """
+        تحميل محتوى من الأرشيف بواسطة بصمته.
+
+        المعاملات:
+            content_hash (str): بصمة المحتوى.
+
+        العوائد:
+            Optional[bytes]: المحتوى أو None إذا لم يوجد.
+        """
+        path = self._find_object(content_hash)
+        if path is None:
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                return self._decompress(path, f.read())
+        except (OSError, ValueError) as e:
+            logger.error(f"خطأ أثناء قراءة الكائن {content_hash} من الأرشيف: {str(e)}")
+            return None
+
+    def latest(self, url: str, before: Optional[float] = None) -> Optional[ArchiveRecord]:
+        """
+        إرجاع أحدث سجل أرشفة للرابط.
+
+        المعاملات:
+            url (str): رابط الصفحة.
+            before (Optional[float]): إرجاع أحدث سجل قبل هذا الوقت فقط (اختياري).
+
+        العوائد:
+            Optional[ArchiveRecord]: السجل أو None إذا لم يؤرشف الرابط.
+        """
+        query = "SELECT url, content_hash, fetched_at, encoding FROM pages WHERE url = ?"
+        params = [url]
+        if before is not None:
+            query += " AND fetched_at <= ?"
+            params.append(before)
+        query += " ORDER BY fetched_at DESC LIMIT 1"
+
+        with self._lock:
+            row = self._conn.execute(query, params).fetchone()
+
+        return ArchiveRecord(*row) if row else None
+
+    def history(self, url: str) -> List[ArchiveRecord]:
+        """
+        إرجاع جميع سجلات أرشفة الرابط من الأقدم إلى الأحدث.
+
+        المعاملات:
+            url (str): رابط الصفحة.
+
+        العوائد:
+            List[ArchiveRecord]: السجلات.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, content_hash, fetched_at, encoding FROM pages "
+                "WHERE url = ? ORDER BY fetched_at",
+                (url,)
+            ).fetchall()
+
+        return [ArchiveRecord(*row) for row in rows]
+
+    def urls(self) -> List[str]:
+        """
+        إرجاع جميع الروابط المؤرشفة.
+
+        العوائد:
+            List[str]: الروابط بترتيب أول أرشفة لها.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url FROM pages GROUP BY url ORDER BY MIN(fetched_at)"
+            ).fetchall()
+
+        return [row[0] for row in rows]
+
+    def read(self, url: str, before: Optional[float] = None) -> Optional[Tuple[bytes, Optional[str]]]:
+        """
+        قراءة أحدث محتوى خام مؤرشف للرابط مع ترميزه.
+
+        المعاملات:
+            url (str): رابط الصفحة.
+            before (Optional[float]): قراءة النسخة المؤرشفة قبل هذا الوقت فقط (اختياري).
+
+        العوائد:
+            Optional[Tuple[bytes, Optional[str]]]: المحتوى والترميز أو None إذا لم يؤرشف الرابط.
+        """
+        record = self.latest(url, before)
+        if record is None:
+            return None
+
+        content = self.load(record.content_hash)
+        if content is None:
+            return None
+
+        return content, record.encoding
+
+    def read_text(self, url: str, before: Optional[float] = None) -> Optional[str]:
+        """
+        قراءة أحدث محتوى مؤرشف للرابط كنص.
+
+        المعاملات:
+            url (str): رابط الصفحة.
+            before (Optional[float]): قراءة النسخة المؤرشفة قبل هذا الوقت فقط (اختياري).
+
+        العوائد:
+            Optional[str]: محتوى الصفحة أو None إذا لم يؤرشف الرابط.
+        """
+        result = self.read(url, before)
+        if result is None:
+            return None
+
+        content, encoding = result
+        return decode_content(content, encoding)
+
+    def close(self) -> None:
+        """إغلاق فهرس الأرشيف."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "HtmlArchive":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -0,0 +1,136 @@
+# الملف: security_cameras_scraper/utils/async_http_utils.py
+
+"""
+أدوات غير متزامنة (asyncio) للتعامل مع طلبات HTTP.
+"""
+
+import asyncio
+import logging
+from typing import Dict, Optional, Tuple
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from .encoding_utils import sniff_encoding, decode_content
+from .rate_limit_utils import HostRateLimiter, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+
+def create_client_session(pool_size: int = 10,
+                          total_connections: int = 100,
+                          headers: Optional[Dict[str, str]] = None) -> "aiohttp.ClientSession":
+    """
+    إنشاء جلسة aiohttp بمجمع اتصالات مشترك.
+
+    يجب استدعاء هذه الدالة من داخل حلقة أحداث (event loop) قيد التشغيل.
+
+    المعاملات:
+        pool_size (int): الحد الأقصى لعدد الاتصالات المفتوحة لكل مضيف.
+        total_connections (int): الحد الأقصى لإجمالي الاتصالات المفتوحة.
+        headers (Optional[Dict[str, str]]): رؤوس HTTP افتراضية للجلسة (اختياري).
+
+    العوائد:
+        aiohttp.ClientSession: الجلسة الجديدة.
+
+    الاستثناءات:
+        ImportError: إذا لم تكن مكتبة aiohttp مثبتة.
+    """
+    if aiohttp is None:
+        raise ImportError("مكتبة aiohttp غير متوفرة. يرجى تثبيتها باستخدام: pip install aiohttp")
+
+    connector = aiohttp.TCPConnector(limit=total_connections, limit_per_host=pool_size)
+    return aiohttp.ClientSession(connector=connector, headers=headers)
+
+
+async def fetch_page_async(session: "aiohttp.ClientSession",
+                           url: str,
+                           headers: Optional[Dict[str, str]] = None,
+                           timeout: int = 30,
+                           verify_ssl: bool = True,
+                           rate_limiter: Optional[HostRateLimiter] = None) -> Optional[str]:
+    """
+    استرجاع محتوى صفحة ويب بشكل غير متزامن.
+
+    المعاملات:
+        session (aiohttp.ClientSession): جلسة aiohttp المشتركة.
+        url (str): رابط الصفحة المراد استرجاعها.
+        headers (Optional[Dict[str, str]]): رؤوس HTTP (اختياري).
+        timeout (int): مهلة الطلب بالثواني.
+        verify_ssl (bool): التحقق من شهادة SSL.
+        rate_limiter (Optional[HostRateLimiter]): محدد معدل الطلبات لكل مضيف (اختياري).
+
+    العوائد:
+        Optional[str]: محتوى الصفحة أو None في حالة الفشل.
+    """
+    result = await fetch_page_raw_async(session, url, headers, timeout, verify_ssl, rate_limiter)
+
+    if result is None:
+        return None
+
+    content, encoding = result
+    return decode_content(content, encoding)
+
+
+async def fetch_page_raw_async(session: "aiohttp.ClientSession",
+                               url: str,
+                               headers: Optional[Dict[str, str]] = None,
+                               timeout: int = 30,
+                               verify_ssl: bool = True,
+                               rate_limiter: Optional[HostRateLimiter] = None) -> Optional[Tuple[bytes, Optional[str]]]:
+    """
+    استرجاع المحتوى الخام لصفحة ويب مع ترميزها المعلن بشكل غير متزامن.
+
+    المعاملات:
+        session (aiohttp.ClientSession): جلسة aiohttp المشتركة.
+        url (str): رابط الصفحة المراد استرجاعها.
+        headers (Optional[Dict[str, str]]): رؤوس HTTP (اختياري).
+        timeout (int): مهلة الطلب بالثواني.
+        verify_ssl (bool): التحقق من شهادة SSL.
+        rate_limiter (Optional[HostRateLimiter]): محدد معدل الطلبات لكل مضيف (اختياري). يتم
+            انتظار موعد الطلب دون إيقاف حلقة الأحداث.
+
+    العوائد:
+        Optional[Tuple[bytes, Optional[str]]]: المحتوى الخام والترميز أو None في حالة الفشل.
+    """
+    if rate_limiter is not None:
+        delay = rate_limiter.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    try:
+        logger.info(f"جاري استرجاع الصفحة: {url}")
+        async with session.get(
+            url,
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+            ssl=None if verify_ssl else False
+        ) as response:
+            if response.status != 200:
+                logger.error(f"فشل في استرجاع الصفحة. رمز الحالة: {response.status}")
+                # إيقاف المضيف المدة التي يطلبها الخادم عند تجاوز الحد
+                if rate_limiter is not None and response.status in (429, 503):
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    if retry_after is not None:
+                        rate_limiter.defer(url, retry_after)
+                return None
+
+            content = await response.read()
+
+            # التحقق من وجود محتوى
+            if not content or len(content) < 100:
+                logger.warning(f"محتوى الصفحة فارغ أو قصير جداً (الحجم: {len(content)} بايت)")
+
+            return content, sniff_encoding(content, response.headers.get("Content-Type"))
+
+    except asyncio.TimeoutError:
+        logger.error(f"انتهت مهلة الاتصال للرابط: {url}")
+        return None
+    except aiohttp.ClientConnectionError:
+        logger.error(f"خطأ في الاتصال بالرابط: {url}")
+        return None
+    except aiohttp.ClientError as e:
+        logger.error(f"خطأ عام في طلب HTTP: {str(e)}")
+        return None
@@ -0,0 +1,296 @@
+# الملف: security_cameras_scraper/utils/cache_utils.py
+
+"""
+ذاكرة تخزين مؤقت دائمة (على القرص) لاستجابات HTTP مع دعم إعادة التحقق الشرطية.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, NamedTuple
+
+from .encoding_utils import decode_content
+from .file_utils import write_atomic
+
+logger = logging.getLogger(__name__)
+
+
+class CacheEntry(NamedTuple):
+    """مدخل مخزن في ذاكرة التخزين المؤقت."""
+    url: str
+    body: bytes
+    encoding: Optional[str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+    def text(self) -> str:
+        """فك ترميز المحتوى المخزن إلى نص."""
+        return decode_content(self.body, self.encoding)
+
+
+class HttpCache:
+    """
+    ذاكرة تخزين مؤقت لصفحات HTTP على القرص.
+
+    تحفظ كل صفحة مع محددات التحقق (ETag و Last-Modified) بحيث يمكن إعادة التحقق منها
+    بطلب شرطي (If-None-Match / If-Modified-Since) وتقديمها من القرص عند استجابة 304.
+    تقدم الصفحات مباشرة دون أي طلب ما دام عمرها أقل من ttl، ويتم حذف الأقل استخدامًا
+    مؤخرًا (LRU) عندما يتجاوز الحجم الكلي max_size.
+    """
+
+    def __init__(self,
+                 cache_dir: str,
+                 ttl: Optional[float] = 86400,
+                 max_size: Optional[int] = None):
+        """
+        تهيئة ذاكرة التخزين المؤقت.
+
+        المعاملات:
+            cache_dir (str): مجلد التخزين.
+            ttl (Optional[float]): المدة بالثواني التي تعتبر فيها الصفحة حديثة دون إعادة تحقق
+                (0 يعني إعادة التحقق دائمًا، None يعني عدم انتهاء الصلاحية أبدًا).
+            max_size (Optional[int]): الحد الأقصى لحجم المحتوى المخزن بالبايت (None يعني بدون حد).
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        # خريطة المفتاح -> الحجم مرتبة من الأقدم استخدامًا إلى الأحدث
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+
+        self._load_index()
+
+    @staticmethod
+    def _key(url: str) -> str:
+        """حساب مفتاح التخزين للرابط."""
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str):
+        """مسارات ملف المحتوى وملف البيانات الوصفية للمفتاح."""
+        base = os.path.join(self.cache_dir, key)
+        return base + ".body", base + ".json"
+
+    def _load_index(self) -> None:
+        """تحميل فهرس المدخلات الموجودة مرتبة حسب آخر استخدام."""
+        entries = []
+
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                # get يسجل آخر استخدام في وقت تعديل الملف دون إعادة كتابته
+                accessed_at = max(meta.get("accessed_at", 0), os.path.getmtime(path))
+                entries.append((accessed_at, name[:-5], meta.get("size", 0)))
+            except (OSError, ValueError) as e:
+                logger.debug(f"تجاهل مدخل تالف في ذاكرة التخزين المؤقت {name}: {str(e)}")
+
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+
+    @property
+    def size(self) -> int:
+        """الحجم الكلي للمحتوى المخزن بالبايت."""
+        with self._lock:
+            return sum(self._index.values())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._index)
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """
+        استرجاع مدخل الرابط من ذاكرة التخزين المؤقت.
+
+        المعاملات:
+            url (str): الرابط.
+
+        العوائد:
+            Optional[CacheEntry]: المدخل المخزن أو None إذا لم يوجد.
+        """
+        key = self._key(url)
+        body_path, meta_path = self._paths(key)
+
+        with self._lock:
+            if key not in self._index:
+                return None
+
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                with open(body_path, "rb") as f:
+                    body = f.read()
+            except (OSError, ValueError) as e:
+                logger.debug(f"تعذرت قراءة مدخل ذاكرة التخزين المؤقت للرابط {url}: {str(e)}")
+                self._index.pop(key, None)
+                return None
+
+            self._index.move_to_end(key)
+
+        # ترتيب الاستخدام محفوظ في الفهرس، ويكفي تحديث وقت تعديل الملف لإعادة تحميله لاحقًا
+        try:
+            os.utime(meta_path)
+        except OSError as e:
+            logger.debug(f"تعذر تحديث وقت استخدام مدخل ذاكرة التخزين المؤقت للرابط {url}: {str(e)}")
+
+        return CacheEntry(
+            url=meta.get("url", url),
+            body=body,
+            encoding=meta.get("encoding"),
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified"),
+            stored_at=meta.get("stored_at", 0)
+        )
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """
+        التحقق مما إذا كان المدخل حديثًا ويمكن تقديمه دون طلب.
+
+        المعاملات:
+            entry (CacheEntry): المدخل المخزن.
+
+        العوائد:
+            bool: True إذا كان عمر المدخل أقل من ttl.
+        """
+        if self.ttl is None:
+            return True
+        return (time.time() - entry.stored_at) < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CacheEntry]) -> Dict[str, str]:
+        """
+        بناء رؤوس الطلب الشرطي لإعادة التحقق من المدخل.
+
+        المعاملات:
+            entry (Optional[CacheEntry]): المدخل المخزن.
+
+        العوائد:
+            Dict[str, str]: رؤوس If-None-Match و/أو If-Modified-Since.
+        """
+        headers = {}
+        if entry is None:
+            return headers
+
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+        return headers
+
+    def store(self,
+              url: str,
+              body: bytes,
+              encoding: Optional[str] = None,
+              etag: Optional[str] = None,
+              last_modified: Optional[str] = None) -> None:
+        """
+        تخزين محتوى صفحة مع محددات التحقق الخاصة بها.
+
+        المعاملات:
+            url (str): الرابط.
+            body (bytes): محتوى الاستجابة.
+            encoding (Optional[str]): ترميز المحتوى.
+            etag (Optional[str]): قيمة رأس ETag.
+            last_modified (Optional[str]): قيمة رأس Last-Modified.
+        """
+        key = self._key(url)
+        body_path, meta_path = self._paths(key)
+        now = time.time()
+
+        meta = {
+            "url": url,
+            "encoding": encoding,
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": now,
+            "accessed_at": now,
+            "size": len(body)
+        }
+
+        with self._lock:
+            try:
+                write_atomic(body_path, body)
+                self._write_json(meta_path, meta)
+            except OSError as e:
+                logger.error(f"خطأ أثناء التخزين المؤقت للرابط {url}: {str(e)}")
+                return
+
+            self._index[key] = len(body)
+            self._index.move_to_end(key)
+            self._evict()
+
+    def touch(self,
+              url: str,
+              etag: Optional[str] = None,
+              last_modified: Optional[str] = None) -> None:
+        """
+        تحديث وقت تخزين المدخل بعد إعادة التحقق منه (استجابة 304).
+
+        المعاملات:
+            url (str): الرابط.
+            etag (Optional[str]): قيمة ETag الجديدة إن أرسلها الخادم مع 304.
+            last_modified (Optional[str]): قيمة Last-Modified الجديدة إن أرسلها الخادم مع 304.
+        """
+        key = self._key(url)
+        _, meta_path = self._paths(key)
+
+        with self._lock:
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                return
+
+            meta["stored_at"] = meta["accessed_at"] = time.time()
+            # قد يحدّث الخادم محددات التحقق في استجابة 304 فتستخدم في الطلب الشرطي التالي
+            if etag:
+                meta["etag"] = etag
+            if last_modified:
+                meta["last_modified"] = last_modified
+            try:
+                self._write_json(meta_path, meta)
+            except OSError as e:
+                logger.error(f"خطأ أثناء تحديث ذاكرة التخزين المؤقت للرابط {url}: {str(e)}")
+
+    def clear(self) -> None:
+        """حذف جميع المدخلات."""
+        with self._lock:
+            for key in list(self._index):
+                self._remove(key)
+
+    def _evict(self) -> None:
+        """حذف المدخلات الأقل استخدامًا مؤخرًا حتى يصبح الحجم ضمن الحد المسموح."""
+        if self.max_size is None:
+            return
+
+        total = sum(self._index.values())
+        while total > self.max_size and len(self._index) > 1:
+            key = next(iter(self._index))
+            total -= self._index[key]
+            self._remove(key)
+            logger.debug(f"تم حذف مدخل من ذاكرة التخزين المؤقت: {key}")
+
+    def _remove(self, key: str) -> None:
+        """حذف ملفات المدخل من القرص ومن الفهرس."""
+        self._index.pop(key, None)
+        for path in self._paths(key):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _write_json(path: str, data: dict) -> None:
+        """كتابة ملف JSON بشكل ذري."""
+        write_atomic(path, json.dumps(data).encode("utf-8"))
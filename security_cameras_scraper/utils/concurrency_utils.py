@@ -0,0 +1,409 @@
+# الملف: security_cameras_scraper/utils/concurrency_utils.py
+
+"""
+أدوات للتحكم في التزامن عند استخراج عدة صفحات في نفس الوقت.
+
+    HostLimiter:          حد ثابت للطلبات المتزامنة لكل مضيف.
+    AdaptiveHostLimiter:  حد يتكيف أثناء التشغيل حسب زمن الاستجابة وإشارات الازدحام (AIMD).
+    SingleFlight:         تنفيذ واحد مشترك للاستدعاءات المتزامنة لنفس المفتاح.
+"""
+
+import math
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from .session_utils import get_host
+
+logger = logging.getLogger(__name__)
+
+
+class HostLimiter:
+    """
+    محدد لعدد الطلبات المتزامنة لكل مضيف.
+
+    يحتفظ بإشارة (semaphore) مستقلة لكل مضيف بحيث لا يتجاوز عدد الطلبات
+    الجارية لنفس الشركة المصنعة الحد المسموح به مهما كان عدد العمال.
+    """
+
+    def __init__(self, per_host_limit: Optional[int] = None):
+        """
+        تهيئة المحدد.
+
+        المعاملات:
+            per_host_limit (Optional[int]): الحد الأقصى للطلبات المتزامنة لكل مضيف
+                (None يعني بدون حد).
+        """
+        if per_host_limit is not None and per_host_limit < 1:
+            raise ValueError("يجب أن يكون الحد الأقصى لكل مضيف 1 على الأقل")
+
+        self.per_host_limit = per_host_limit
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _get_semaphore(self, host: str) -> threading.BoundedSemaphore:
+        """إرجاع إشارة المضيف وإنشاؤها عند الحاجة."""
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.per_host_limit)
+                self._semaphores[host] = semaphore
+            return semaphore
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        """
+        حجز مكان لطلب على مضيف الرابط طوال مدة السياق.
+
+        المعاملات:
+            url (str): رابط الطلب.
+        """
+        if self.per_host_limit is None:
+            yield
+            return
+
+        semaphore = self._get_semaphore(get_host(url))
+        semaphore.acquire()
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+    def observe(self, result: Any) -> None:
+        """
+        استقبال نتيجة طلب (FetchResult) من fetch_page_raw.
+
+        لا يفعل شيئًا في المحدد الثابت، ويستخدمه AdaptiveHostLimiter لتعديل الحد.
+
+        المعاملات:
+            result (Any): نتيجة الطلب.
+        """
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        الحدود الحالية لكل مضيف.
+
+        العوائد:
+            Dict[str, Dict[str, Any]]: {المضيف: {"limit": ...}}.
+        """
+        with self._lock:
+            return {host: {"limit": self.per_host_limit} for host in self._semaphores}
+
+
+def sorted_percentile(ordered: List[float], percent: float) -> Optional[float]:
+    """
+    النسبة المئوية من قائمة قياسات مرتبة تصاعديًا (طريقة أقرب رتبة).
+
+    المعاملات:
+        ordered (List[float]): القياسات مرتبة.
+        percent (float): النسبة (0-100).
+
+    العوائد:
+        Optional[float]: القيمة أو None إذا كانت القائمة فارغة.
+    """
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, math.ceil(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class LatencyTracker:
+    """
+    نافذة منزلقة لأزمنة الاستجابة الأخيرة.
+
+    تحسب النسب المئوية (مثل p95) على آخر window قياس، وتحتفظ بخط أساس هو أقل
+    وسيط (p50) تمت ملاحظته، ليقارن به زمن الاستجابة عند عدم تحديد هدف ثابت.
+    """
+
+    def __init__(self, window: int = 100, min_samples: int = 10):
+        """
+        تهيئة المتتبع.
+
+        المعاملات:
+            window (int): عدد القياسات الأخيرة المحفوظة.
+            min_samples (int): أقل عدد قياسات قبل حساب خط الأساس.
+        """
+        self.min_samples = min_samples
+        self.baseline: Optional[float] = None
+        self._samples = deque(maxlen=window)
+        self._added = 0
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, seconds: float) -> None:
+        """
+        إضافة قياس.
+
+        المعاملات:
+            seconds (float): زمن الاستجابة بالثواني.
+        """
+        self._samples.append(seconds)
+        self._added += 1
+        # تحديث خط الأساس دوريًا بدلاً من كل قياس
+        if len(self._samples) >= self.min_samples and self._added % self.min_samples == 0:
+            median = self.percentile(50)
+            if self.baseline is None or median < self.baseline:
+                self.baseline = median
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        النسبة المئوية لأزمنة الاستجابة في النافذة.
+
+        المعاملات:
+            percent (float): النسبة (0-100).
+
+        العوائد:
+            Optional[float]: القيمة بالثواني أو None إذا لم توجد قياسات.
+        """
+        return sorted_percentile(sorted(self._samples), percent)
+
+
+class _AdaptiveHost:
+    """حالة مضيف واحد داخل AdaptiveHostLimiter."""
+
+    def __init__(self, limit: float, lock: threading.Lock, window: int):
+        self.limit = limit
+        self.in_flight = 0
+        self.condition = threading.Condition(lock)
+        self.latency = LatencyTracker(window)
+        self.outcomes = deque(maxlen=window)
+        self.last_decrease = float("-inf")
+        self.requests = 0
+        self.throttled = 0
+
+
+class AdaptiveHostLimiter(HostLimiter):
+    """
+    محدد للطلبات المتزامنة لكل مضيف يتكيف حده أثناء التشغيل (AIMD).
+
+    يزيد الحد بمقدار ثابت تقريبًا (طلب إضافي لكل دورة كاملة من الطلبات) طالما كان
+    الحد الحالي مستخدمًا بالكامل وزمن الاستجابة (p95) ونسبة الأخطاء ضمن الحدود، ويخفضه
+    بنسبة ثابتة عند 429 أو 503 أو انتهاء المهلة. لا تؤدي الاستجابات المزدحمة لطلبات
+    أرسلت قبل آخر تخفيض إلى تخفيض جديد، حتى لا ينهار الحد بسبب دفعة واحدة من الأخطاء.
+
+    يستقبل نتائج الطلبات عبر observe (يمرر إلى fetch_page_raw كـ observer)، ويعرض
+    الحدود الحالية عبر metrics.
+    """
+
+    def __init__(self,
+                 initial_limit: int = 2,
+                 min_limit: int = 1,
+                 max_limit: int = 32,
+                 decrease_factor: float = 0.5,
+                 latency_target: Optional[float] = None,
+                 latency_tolerance: float = 3.0,
+                 max_error_rate: float = 0.1,
+                 window: int = 100,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        تهيئة المحدد.
+
+        المعاملات:
+            initial_limit (int): الحد الابتدائي لكل مضيف جديد.
+            min_limit (int): أقل حد مسموح به.
+            max_limit (int): أعلى حد مسموح به (عادة حجم مجمع الاتصالات لكل مضيف).
+            decrease_factor (float): معامل التخفيض عند الازدحام (بين 0 و 1).
+            latency_target (Optional[float]): أعلى p95 مقبول بالثواني (الافتراضي: latency_tolerance
+                ضعف أقل وسيط تمت ملاحظته للمضيف).
+            latency_tolerance (float): مضاعف خط الأساس عند عدم تحديد latency_target.
+            max_error_rate (float): أعلى نسبة أخطاء مقبولة في النافذة قبل إيقاف الزيادة.
+            window (int): عدد الطلبات الأخيرة المستخدمة في الإحصاءات.
+            clock (Callable[[], float]): مصدر الوقت (للاختبارات).
+
+        الاستثناءات:
+            ValueError: إذا كانت الحدود أو معامل التخفيض غير صالحة.
+        """
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError("يجب أن يكون 1 <= min_limit <= max_limit")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("يجب أن يكون معامل التخفيض بين 0 و 1")
+
+        super().__init__(None)
+        self.initial_limit = min(max(initial_limit, min_limit), max_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.latency_target = latency_target
+        self.latency_tolerance = latency_tolerance
+        self.max_error_rate = max_error_rate
+        self.window = window
+        self._clock = clock
+        self._hosts: Dict[str, _AdaptiveHost] = {}
+
+    def _get_host_state(self, host: str) -> _AdaptiveHost:
+        """إرجاع حالة المضيف وإنشاؤها عند الحاجة (يجب استدعاؤها مع القفل)."""
+        state = self._hosts.get(host)
+        if state is None:
+            state = _AdaptiveHost(float(self.initial_limit), self._lock, self.window)
+            self._hosts[host] = state
+        return state
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        """
+        حجز مكان لطلب على مضيف الرابط ضمن الحد الحالي طوال مدة السياق.
+
+        المعاملات:
+            url (str): رابط الطلب.
+        """
+        with self._lock:
+            state = self._get_host_state(get_host(url))
+            while state.in_flight >= int(state.limit):
+                state.condition.wait()
+            state.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                state.in_flight -= 1
+                state.condition.notify()
+
+    def _is_healthy(self, state: _AdaptiveHost) -> bool:
+        """ما إذا كانت نسبة الأخطاء وزمن الاستجابة ضمن الحدود."""
+        if state.outcomes:
+            error_rate = state.outcomes.count(False) / len(state.outcomes)
+            if error_rate > self.max_error_rate:
+                return False
+
+        p95 = state.latency.percentile(95)
+        if p95 is None:
+            return True
+        target = self.latency_target
+        if target is None and state.latency.baseline is not None:
+            target = state.latency.baseline * self.latency_tolerance
+        return target is None or p95 <= target
+
+    def observe(self, result: Any) -> None:
+        """
+        تعديل حد مضيف الطلب حسب نتيجته.
+
+        المعاملات:
+            result (Any): نتيجة الطلب (FetchResult).
+        """
+        host = get_host(result.url)
+        now = self._clock()
+
+        with self._lock:
+            state = self._get_host_state(host)
+            state.requests += 1
+            state.outcomes.append(result.ok)
+
+            if result.throttled:
+                state.throttled += 1
+                # تخفيض واحد لكل دفعة: تجاهل الطلبات التي أرسلت قبل آخر تخفيض
+                if now - result.elapsed >= state.last_decrease:
+                    old_limit = state.limit
+                    state.limit = max(float(self.min_limit), state.limit * self.decrease_factor)
+                    state.last_decrease = now
+                    logger.warning(
+                        f"ازدحام على {host} (رمز الحالة: {result.status or result.error})، "
+                        f"تخفيض الطلبات المتزامنة من {int(old_limit)} إلى {int(state.limit)}"
+                    )
+                return
+
+            if not result.ok:
+                return
+            state.latency.add(result.elapsed)
+
+            # الزيادة فقط عندما يكون الحد الحالي مستخدمًا بالكامل
+            if state.in_flight < int(state.limit) or state.limit >= self.max_limit:
+                return
+            if not self._is_healthy(state):
+                return
+
+            old_limit = int(state.limit)
+            state.limit = min(float(self.max_limit), state.limit + 1.0 / state.limit)
+            if int(state.limit) > old_limit:
+                logger.info(f"زيادة الطلبات المتزامنة على {host} إلى {int(state.limit)}")
+                state.condition.notify_all()
+
+    def limit(self, url: str) -> int:
+        """
+        الحد الحالي لمضيف الرابط.
+
+        المعاملات:
+            url (str): الرابط.
+
+        العوائد:
+            int: عدد الطلبات المتزامنة المسموح بها.
+        """
+        with self._lock:
+            return int(self._get_host_state(get_host(url)).limit)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        الحالة الحالية لكل مضيف.
+
+        العوائد:
+            Dict[str, Dict[str, Any]]: {المضيف: {"limit", "in_flight", "requests", "throttled",
+            "error_rate", "p95"}}.
+        """
+        with self._lock:
+            return {
+                host: {
+                    "limit": int(state.limit),
+                    "in_flight": state.in_flight,
+                    "requests": state.requests,
+                    "throttled": state.throttled,
+                    "error_rate": state.outcomes.count(False) / len(state.outcomes) if state.outcomes else 0.0,
+                    "p95": state.latency.percentile(95),
+                }
+                for host, state in self._hosts.items()
+            }
+
+
+class SingleFlight:
+    """
+    دمج الاستدعاءات المتزامنة لنفس المفتاح في تنفيذ واحد.
+
+    أول مستدعٍ لمفتاح ينفذ الدالة، ومن يطلب نفس المفتاح أثناء التنفيذ ينتظر نتيجته
+    (أو استثناءه) بدلاً من تنفيذها مرة أخرى. لا يتم الاحتفاظ بالنتيجة بعد اكتمالها.
+    """
+
+    def __init__(self):
+        self.shared = 0
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        تنفيذ الدالة أو انتظار التنفيذ الجاري لنفس المفتاح.
+
+        المعاملات:
+            key (Hashable): مفتاح الاستدعاء (مثل الرابط الموحد).
+            function (Callable[[], Any]): الدالة المراد تنفيذها.
+
+        العوائد:
+            Tuple[Any, bool]: النتيجة، و True إذا كانت من تنفيذ مستدعٍ آخر.
+
+        الاستثناءات:
+            Exception: استثناء الدالة لجميع المنتظرين.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+            else:
+                self.shared += 1
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = function()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._calls[key]
@@ -10,6 +10,11 @@ from typing import Dict, Any, Optional, List, Union
 
 logger = logging.getLogger(__name__)
 
+# تعابير clean_text مترجمة مسبقًا لأنها تستدعى لكل خلية في كل صفحة
+_WHITESPACE_RE = re.compile(r'\s+')
+_CONTROL_CHARS_RE = re.compile(r'[\x00-\x1F\x7F]')
+_HTML_ENTITY_RE = re.compile(r'&[a-zA-Z]+;')
+
 def clean_text(text: str) -> str:
     """
     تنظيف النص المستخرج.
@@ -28,13 +33,13 @@ def clean_text(text: str) -> str:
         cleaned = text.strip()
         
         # استبدال المسافات المتعددة بمسافة واحدة
-        cleaned = re.sub(r'\s+', ' ', cleaned)
+        cleaned = _WHITESPACE_RE.sub(' ', cleaned)
         
         # إزالة أحرف التحكم
-        cleaned = re.sub(r'[\x00-\x1F\x7F]', '', cleaned)
+        cleaned = _CONTROL_CHARS_RE.sub('', cleaned)
         
         # إزالة رموز HTML المشفرة مثل &nbsp;
-        cleaned = re.sub(r'&[a-zA-Z]+;', ' ', cleaned)
+        cleaned = _HTML_ENTITY_RE.sub(' ', cleaned)
         
         return cleaned
     except Exception as e:
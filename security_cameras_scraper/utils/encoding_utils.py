@@ -0,0 +1,112 @@
+# الملف: security_cameras_scraper/utils/encoding_utils.py
+
+"""
+أدوات لتحديد ترميز صفحات HTML دون فك ترميز المحتوى بالكامل.
+"""
+
+import re
+import codecs
+import logging
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# الحد الأقصى لعدد البايتات التي يتم فحصها بحثًا عن وسم meta charset
+META_SNIFF_BYTES = 4096
+
+_HEADER_CHARSET_RE = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.IGNORECASE)
+_META_CHARSET_RE = re.compile(
+    rb"<meta[^>]+charset\s*=\s*[\"']?\s*([\w.:-]+)",
+    re.IGNORECASE
+)
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+
+
+def normalize_encoding(encoding: Optional[str]) -> Optional[str]:
+    """
+    توحيد اسم الترميز والتحقق من أن Python يدعمه.
+
+    المعاملات:
+        encoding (Optional[str]): اسم الترميز.
+
+    العوائد:
+        Optional[str]: الاسم الموحد للترميز أو None إذا كان غير معروف.
+    """
+    if not encoding:
+        return None
+
+    try:
+        return codecs.lookup(encoding.strip()).name
+    except LookupError:
+        logger.debug(f"ترميز غير معروف: {encoding}")
+        return None
+
+
+def charset_from_content_type(content_type: Optional[str]) -> Optional[str]:
+    """
+    استخراج الترميز المعلن صراحة في رأس Content-Type.
+
+    على عكس requests لا يتم افتراض ISO-8859-1 عند غياب charset.
+
+    المعاملات:
+        content_type (Optional[str]): قيمة رأس Content-Type.
+
+    العوائد:
+        Optional[str]: الترميز المعلن أو None.
+    """
+    if not content_type:
+        return None
+
+    match = _HEADER_CHARSET_RE.search(content_type)
+    return normalize_encoding(match.group(1)) if match else None
+
+
+def sniff_encoding(content: bytes, content_type: Optional[str] = None) -> Optional[str]:
+    """
+    تحديد ترميز صفحة HTML من الرأس أو علامة BOM أو وسم meta charset.
+
+    يتم فحص أول بضعة كيلوبايتات فقط، دون اللجوء إلى خوارزميات التخمين على كامل المحتوى.
+
+    المعاملات:
+        content (bytes): محتوى الصفحة الخام.
+        content_type (Optional[str]): قيمة رأس Content-Type (اختياري).
+
+    العوائد:
+        Optional[str]: الترميز المكتشف أو None إذا لم يعلن عنه.
+    """
+    encoding = charset_from_content_type(content_type)
+    if encoding:
+        return encoding
+
+    for bom, bom_encoding in _BOMS:
+        if content.startswith(bom):
+            return bom_encoding
+
+    match = _META_CHARSET_RE.search(content[:META_SNIFF_BYTES])
+    if match:
+        return normalize_encoding(match.group(1).decode("ascii", errors="ignore"))
+
+    return None
+
+
+def decode_content(content: Union[str, bytes], encoding: Optional[str] = None) -> str:
+    """
+    فك ترميز محتوى صفحة إلى نص.
+
+    المعاملات:
+        content (Union[str, bytes]): المحتوى (يعاد كما هو إذا كان نصًا).
+        encoding (Optional[str]): الترميز (الافتراضي: المكتشف من المحتوى أو UTF-8).
+
+    العوائد:
+        str: النص.
+    """
+    if isinstance(content, str):
+        return content
+
+    encoding = encoding or sniff_encoding(content) or "utf-8"
+    return content.decode(encoding, errors="replace")
@@ -0,0 +1,35 @@
+# الملف: security_cameras_scraper/utils/file_utils.py
+
+"""
+أدوات لكتابة الملفات بأمان في مجلدات تشترك فيها عدة عمليات وخيوط.
+"""
+
+import os
+import threading
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """
+    كتابة ملف بشكل ذري عبر ملف مؤقت فريد لكل عملية وخيط.
+
+    قد تشترك عدة عمليات (مثل عمال JobStore) في نفس المجلد، فلا يكتب اثنان في نفس الملف
+    المؤقت، ولا يبقى الملف المؤقت عند فشل الكتابة (مثل امتلاء القرص).
+
+    المعاملات:
+        path (str): مسار الملف النهائي.
+        data (bytes): المحتوى.
+
+    الاستثناءات:
+        OSError: إذا فشلت الكتابة أو الاستبدال.
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,312 @@
+# الملف: security_cameras_scraper/utils/hedge_utils.py
+
+"""
+أدوات للتحكم في زمن الاستجابة الطرفي (tail latency) عند استرجاع الصفحات.
+
+    Deadline:        مهلة إجمالية لدفعة روابط تحدد الميزانية المتبقية لكل طلب.
+    RequestHedger:   إرسال طلب احتياطي (hedged request) عندما يتجاوز الطلب p95 المضيف،
+                     واعتماد أول استجابة ناجحة وإلغاء الأخرى، مع تقرير بالوقت الذي تم توفيره.
+"""
+
+import time
+import random
+import logging
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+from .concurrency_utils import LatencyTracker, sorted_percentile
+from .session_utils import get_host
+
+logger = logging.getLogger(__name__)
+
+# نص الخطأ للروابط التي لم تكتمل قبل انتهاء مهلة الدفعة
+DEADLINE_EXCEEDED = "انتهت مهلة الدفعة قبل اكتمال الرابط"
+
+# المحاولة: دالة تستقبل حدث الإلغاء وتعيد الصفحة أو None في حالة الفشل
+FetchAttempt = Callable[[threading.Event], Any]
+
+
+class Deadline:
+    """
+    مهلة إجمالية تبدأ عند إنشائها.
+
+    تستخدم لتقييد دفعة كاملة من الروابط، بحيث لا تتجاوز مهلة أي طلب الوقت المتبقي.
+    """
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic):
+        """
+        تهيئة المهلة.
+
+        المعاملات:
+            seconds (float): مدة المهلة بالثواني.
+            clock (Callable[[], float]): مصدر الوقت (للاختبارات).
+        """
+        self.seconds = seconds
+        self._clock = clock
+        self._expires_at = clock() + seconds
+
+    def remaining(self) -> float:
+        """الوقت المتبقي بالثواني (0 بعد انتهاء المهلة)."""
+        return max(self._expires_at - self._clock(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        """ما إذا انتهت المهلة."""
+        return self.remaining() <= 0
+
+    def budget(self, timeout: float) -> float:
+        """
+        ميزانية طلب واحد: مهلته أو الوقت المتبقي أيهما أقل.
+
+        المعاملات:
+            timeout (float): مهلة الطلب المعتادة بالثواني.
+
+        العوائد:
+            float: المهلة الفعلية بالثواني.
+        """
+        return min(timeout, self.remaining())
+
+
+class RequestHedger:
+    """
+    منفذ طلبات مع طلب احتياطي للطلبات البطيئة.
+
+    يرسل الطلب الأساسي في خيط، وإذا لم يكتمل خلال p95 زمن الاستجابة المعروف لمضيفه
+    يرسل طلبًا ثانيًا مطابقًا، ويعتمد أول استجابة ناجحة ويلغي الأخرى (لا يرسل الطلب إذا
+    لم يبدأ، ويتوقف عن قراءة المحتوى إذا بدأ). لا يتجاوز عدد الطلبات الاحتياطية نسبة
+    budget من الطلبات حتى لا يضاعف الحمل على المواقع البطيئة أصلاً.
+
+    لقياس الفائدة يترك جزء صغير (measure_ratio) من الطلبات الأساسية الخاسرة حتى تكتمل،
+    ويستخدم الفرق بين زمنها وزمن الطلب الاحتياطي لتقدير الوقت الذي تم توفيره (report).
+    """
+
+    def __init__(self,
+                 budget: float = 0.1,
+                 min_samples: int = 20,
+                 percentile: float = 95,
+                 min_delay: float = 0.05,
+                 max_workers: int = 64,
+                 measure_ratio: float = 0.1,
+                 window: int = 200,
+                 report_window: int = 10000,
+                 rng: Optional[random.Random] = None):
+        """
+        تهيئة المنفذ.
+
+        المعاملات:
+            budget (float): أعلى نسبة من الطلبات يسمح بإرسال طلب احتياطي لها.
+            min_samples (int): عدد القياسات اللازمة لمضيف قبل إرسال طلبات احتياطية إليه.
+            percentile (float): النسبة المئوية لزمن الاستجابة التي يرسل بعدها الطلب الاحتياطي.
+            min_delay (float): أقل تأخير بالثواني قبل الطلب الاحتياطي.
+            max_workers (int): عدد خيوط تنفيذ الطلبات.
+            measure_ratio (float): نسبة الطلبات الأساسية الخاسرة التي تترك حتى تكتمل للقياس.
+            window (int): عدد القياسات الأخيرة لكل مضيف.
+            report_window (int): عدد الطلبات الأخيرة المستخدمة في التقرير.
+            rng (Optional[random.Random]): مولد أرقام عشوائية (للاختبارات).
+        """
+        if not 0 <= budget <= 1:
+            raise ValueError("يجب أن تكون نسبة الطلبات الاحتياطية بين 0 و 1")
+
+        self.budget = budget
+        self.min_samples = min_samples
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_workers = max_workers
+        self.measure_ratio = measure_ratio
+        self.window = window
+        self._rng = rng or random.Random()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._hosts: Dict[str, LatencyTracker] = {}
+        # أزمنة الطلبات الأخيرة للتقرير فقط (ترتب مرة واحدة عند طلب التقرير)
+        self._latencies = deque(maxlen=report_window)
+        self._saved = []
+        self._counts = {"requests": 0, "hedged": 0, "hedge_wins": 0, "cancelled": 0}
+        self._lock = threading.Lock()
+
+    def _submit(self, attempt: FetchAttempt, cancel: threading.Event) -> Future:
+        """تشغيل محاولة في خيط وإنشاء المنفذ عند أول استخدام."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="hedged-fetch")
+            executor = self._executor
+        return executor.submit(attempt, cancel)
+
+    def observe(self, result: Any) -> None:
+        """
+        تسجيل زمن طلب ناجح (FetchResult) لحساب p95 مضيفه.
+
+        المعاملات:
+            result (Any): نتيجة الطلب.
+        """
+        if not result.ok:
+            return
+        host = get_host(result.url)
+        with self._lock:
+            tracker = self._hosts.get(host)
+            if tracker is None:
+                tracker = LatencyTracker(self.window)
+                self._hosts[host] = tracker
+            tracker.add(result.elapsed)
+
+    def hedge_delay(self, url: str) -> Optional[float]:
+        """
+        التأخير قبل إرسال طلب احتياطي لرابط.
+
+        المعاملات:
+            url (str): الرابط.
+
+        العوائد:
+            Optional[float]: التأخير بالثواني أو None إذا لم تتوفر قياسات كافية لمضيفه.
+        """
+        with self._lock:
+            tracker = self._hosts.get(get_host(url))
+            if tracker is None or len(tracker) < self.min_samples:
+                return None
+            return max(tracker.percentile(self.percentile), self.min_delay)
+
+    def _take_budget(self) -> bool:
+        """حجز طلب احتياطي إذا سمحت الميزانية."""
+        with self._lock:
+            if self._counts["hedged"] + 1 > self.budget * self._counts["requests"]:
+                return False
+            self._counts["hedged"] += 1
+            return True
+
+    def fetch(self, url: str, attempt: FetchAttempt, timeout: float) -> Any:
+        """
+        تنفيذ طلب مع طلب احتياطي عند الحاجة.
+
+        المعاملات:
+            url (str): الرابط.
+            attempt (FetchAttempt): دالة تنفذ الطلب وتستقبل حدث إلغائه.
+            timeout (float): ميزانية الطلب الإجمالية بالثواني؛ تلغى المحاولات بعدها.
+
+        العوائد:
+            Any: نتيجة أول محاولة ناجحة، أو None إذا فشلت المحاولات أو انتهت الميزانية.
+        """
+        started = time.monotonic()
+        with self._lock:
+            self._counts["requests"] += 1
+
+        primary_cancel = threading.Event()
+        primary = self._submit(attempt, primary_cancel)
+        attempts = {primary: primary_cancel}
+        delay = self.hedge_delay(url)
+        if delay is not None and delay >= timeout:
+            # لن يبقى وقت للطلب الاحتياطي ضمن ميزانية الطلب
+            delay = None
+        hedge = None
+        winner = None
+        result = None
+
+        try:
+            while attempts:
+                now = time.monotonic()
+                if started + timeout <= now:
+                    logger.warning(f"تجاوز الطلب الميزانية المحددة ({timeout:.1f} ثانية): {url}")
+                    break
+                wait_for = started + timeout - now
+                if hedge is None and delay is not None:
+                    wait_for = min(wait_for, started + delay - now)
+
+                done, _ = wait(list(attempts), timeout=max(wait_for, 0), return_when=FIRST_COMPLETED)
+                for future in done:
+                    attempts.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error(f"خطأ أثناء استرجاع {url}: {str(e)}")
+                        result = None
+                    if result:
+                        winner = future
+                        break
+                if winner is not None:
+                    break
+
+                # إرسال الطلب الاحتياطي بعد تجاوز p95 المضيف
+                now = time.monotonic()
+                if (hedge is None and delay is not None and attempts
+                        and now - started >= delay and now - started < timeout):
+                    delay = None
+                    if self._take_budget():
+                        logger.info(f"إرسال طلب احتياطي بعد {time.monotonic() - started:.2f} ثانية: {url}")
+                        hedge_cancel = threading.Event()
+                        hedge = self._submit(attempt, hedge_cancel)
+                        attempts[hedge] = hedge_cancel
+        finally:
+            elapsed = time.monotonic() - started
+            measured = winner is not None and winner is hedge and primary in attempts and (
+                self._rng.random() < self.measure_ratio
+            )
+            if measured:
+                # ترك الطلب الأساسي يكتمل لقياس الوقت الذي وفره الطلب الاحتياطي
+                attempts.pop(primary)
+                primary.add_done_callback(lambda future: self._record_saved(future, started, elapsed))
+
+            # إلغاء المحاولات الخاسرة أو التي تجاوزت الميزانية
+            for future, cancel in attempts.items():
+                cancel.set()
+                future.cancel()
+
+            with self._lock:
+                self._latencies.append(elapsed)
+                if winner is not None and winner is hedge:
+                    self._counts["hedge_wins"] += 1
+                self._counts["cancelled"] += len(attempts)
+
+        return result
+
+    def _record_saved(self, future: Future, started: float, hedged_elapsed: float) -> None:
+        """تسجيل الفرق بين زمن الطلب الأساسي المكتمل وزمن الطلب الاحتياطي الفائز."""
+        try:
+            page = future.result()
+        except Exception:
+            return
+        if page:
+            with self._lock:
+                self._saved.append(time.monotonic() - started - hedged_elapsed)
+
+    def report(self) -> Dict[str, Any]:
+        """
+        تقرير الطلبات الاحتياطية وزمن الاستجابة.
+
+        saved_seconds تقدير لإجمالي الوقت الذي تم توفيره (متوسط الفرق المقاس مضروبًا في عدد
+        مرات فوز الطلب الاحتياطي)، و unhedged_p99 تقدير p99 دون طلبات احتياطية.
+
+        العوائد:
+            Dict[str, Any]: الأعداد والنسب المئوية لزمن الاستجابة بالثواني.
+        """
+        with self._lock:
+            report = dict(self._counts)
+            latencies = sorted(self._latencies)
+            saved = list(self._saved)
+
+        report["p50"] = sorted_percentile(latencies, 50)
+        report["p95"] = sorted_percentile(latencies, 95)
+        report["p99"] = sorted_percentile(latencies, 99)
+        report["max"] = latencies[-1] if latencies else None
+        report["measured_wins"] = len(saved)
+
+        mean_saved = sum(saved) / len(saved) if saved else None
+        report["saved_seconds"] = mean_saved * report["hedge_wins"] if mean_saved is not None else None
+
+        # أبطأ الطلبات هي المرشحة للفوز الاحتياطي، فيضاف إليها متوسط الوقت الموفر
+        unhedged_p99 = report["p99"]
+        if mean_saved is not None and latencies and report["hedge_wins"]:
+            # إضافة نفس القيمة لأكبر القياسات تبقي القائمة مرتبة
+            split = max(len(latencies) - report["hedge_wins"], 0)
+            estimate = latencies[:split] + [latency + mean_saved for latency in latencies[split:]]
+            unhedged_p99 = sorted_percentile(estimate, 99)
+        report["unhedged_p99"] = unhedged_p99
+
+        return report
+
+    def shutdown(self) -> None:
+        """إيقاف خيوط التنفيذ دون انتظار الطلبات الملغاة."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
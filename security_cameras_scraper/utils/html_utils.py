@@ -2,20 +2,152 @@
 
 """
 أدوات لتحليل ومعالجة HTML.
+
+تعمل الأدوات على عقد BeautifulSoup أو على عقد المحركات الأخرى في parser_backends
+(lxml و selectolax) لأنها توفر نفس الدوال (select_one و select و get_text و get و find_all).
 """
 
+import re
 import logging
-from typing import Optional, List, Any, Union
-from bs4 import BeautifulSoup, Tag, NavigableString
+from functools import lru_cache
+from typing import Optional, List, Any, Union, Pattern, TYPE_CHECKING
+import soupsieve
+from bs4 import BeautifulSoup, Tag, NavigableString, SoupStrainer
+
+try:
+    from bs4.filter import ElementFilter
+except ImportError:
+    # الإصدارات الأقدم من 4.13 لا تدعم مرشحات التحليل المخصصة
+    ElementFilter = None
+
+from .encoding_utils import sniff_encoding
+
+if TYPE_CHECKING:
+    from .parser_backends import Node
 
 logger = logging.getLogger(__name__)
 
-def extract_text(element: Union[Tag, NavigableString, None]) -> str:
+# عقدة من أي محرك تحليل
+NodeLike = Union[BeautifulSoup, Tag, "Node"]
+
+# الحد الأقصى لعدد المحددات المترجمة المحفوظة
+SELECTOR_CACHE_SIZE = 512
+
+@lru_cache(maxsize=SELECTOR_CACHE_SIZE)
+def compile_selector(selector: str) -> "soupsieve.SoupSieve":
+    """
+    ترجمة محدد CSS مرة واحدة وحفظه على مستوى العملية.
+    
+    تمرير النص مباشرة إلى select_one يجعل soupsieve يعيد تحليل نفس المحددات القليلة
+    لكل عنصر في كل صفحة، لذلك تستخدم جميع الأدوات والمستخرجات هذا السجل.
+    
+    المعاملات:
+        selector (str): محدد CSS.
+        
+    العوائد:
+        soupsieve.SoupSieve: المحدد المترجم.
+        
+    الاستثناءات:
+        soupsieve.SelectorSyntaxError: إذا كان المحدد غير صالح.
+    """
+    return soupsieve.compile(selector)
+
+def selector_cache_info():
+    """
+    إحصائيات سجل المحددات المترجمة.
+    
+    العوائد:
+        functools._CacheInfo: عدد مرات الإصابة (hits) والإخفاق (misses) والحجم الحالي والأقصى.
+    """
+    return compile_selector.cache_info()
+
+def clear_selector_cache() -> None:
+    """مسح سجل المحددات المترجمة وإحصائياته."""
+    compile_selector.cache_clear()
+
+def make_soup(html_content: Union[str, bytes], 
+              encoding: Optional[str] = None,
+              parse_only: Optional[Any] = None) -> BeautifulSoup:
+    """
+    بناء كائن BeautifulSoup من محتوى نصي أو خام.
+    
+    يمرر المحتوى الخام (bytes) مباشرة إلى lxml مع ترميزه المعلن، فلا حاجة لفك ترميزه
+    إلى نص ثم إعادة ترميزه، ولا لتخمين الترميز على كامل الصفحة.
+    
+    المعاملات:
+        html_content (Union[str, bytes]): محتوى HTML للصفحة.
+        encoding (Optional[str]): ترميز المحتوى الخام (الافتراضي: المكتشف من المحتوى أو UTF-8).
+        parse_only (Optional[Any]): مرشح SoupStrainer لبناء الأشجار الفرعية المطابقة فقط (اختياري).
+        
+    العوائد:
+        BeautifulSoup: كائن الصفحة المحللة.
+    """
+    if isinstance(html_content, bytes):
+        encoding = encoding or sniff_encoding(html_content) or "utf-8"
+        return BeautifulSoup(html_content, 'lxml', from_encoding=encoding, parse_only=parse_only)
+    
+    return BeautifulSoup(html_content, 'lxml', parse_only=parse_only)
+
+def class_pattern(*class_names: str) -> Pattern:
+    """
+    تعبير منتظم يطابق سمة class تحتوي على أحد الأصناف المحددة.
+    
+    تمرر سمة class إلى المرشح أثناء التحليل كنص واحد (مثل "el-row is-justify")
+    وليس كقائمة أصناف، لذلك لا يكفي تمرير اسم الصنف مباشرة إلى SoupStrainer.
+    
+    المعاملات:
+        *class_names (str): أسماء الأصناف.
+        
+    العوائد:
+        Pattern: التعبير المنتظم.
+    """
+    alternatives = "|".join(re.escape(name) for name in class_names)
+    return re.compile(rf"(?:^|\s)(?:{alternatives})(?:\s|$)")
+
+if ElementFilter is not None:
+    class _AnyOfStrainers(ElementFilter):
+        """مرشح تحليل يقبل العنصر إذا قبله أي من المرشحات المحددة."""
+        
+        def __init__(self, strainers):
+            super().__init__()
+            self.strainers = strainers
+        
+        @property
+        def includes_everything(self) -> bool:
+            return False
+        
+        def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+            return any(strainer.allow_tag_creation(nsprefix, name, attrs) for strainer in self.strainers)
+        
+        def allow_string_creation(self, string) -> bool:
+            return any(strainer.allow_string_creation(string) for strainer in self.strainers)
+        
+        def match(self, element, _known_rules: bool = False) -> bool:
+            return any(strainer.match(element) for strainer in self.strainers)
+
+def any_of_strainers(*strainers: SoupStrainer) -> Optional[Any]:
+    """
+    دمج عدة مرشحات SoupStrainer في مرشح واحد (أي منها يكفي).
+    
+    المعاملات:
+        *strainers (SoupStrainer): المرشحات.
+        
+    العوائد:
+        Optional[Any]: المرشح المدمج، أو None إذا كان إصدار BeautifulSoup لا يدعم ذلك
+            (أقدم من 4.13) فيتم تحليل الصفحة كاملة.
+    """
+    if len(strainers) == 1:
+        return strainers[0]
+    if ElementFilter is None:
+        return None
+    return _AnyOfStrainers(strainers)
+
+def extract_text(element: Union[NodeLike, NavigableString, None]) -> str:
     """
     استخراج النص من عنصر HTML بطريقة آمنة.
     
     المعاملات:
-        element (Union[Tag, NavigableString, None]): عنصر HTML.
+        element (Union[NodeLike, NavigableString, None]): عنصر HTML.
         
     العوائد:
         str: النص المستخرج أو سلسلة فارغة في حالة الفشل.
@@ -35,58 +167,64 @@ def extract_text(element: Union[Tag, NavigableString, None]) -> str:
         
         return ""
 
-def get_element_by_selector(soup: Union[BeautifulSoup, Tag], 
+def get_element_by_selector(soup: NodeLike, 
                           selector: str, 
-                          default: Any = None) -> Optional[Tag]:
+                          default: Any = None) -> Optional[NodeLike]:
     """
     استخراج عنصر HTML باستخدام CSS selector.
     
     المعاملات:
-        soup (Union[BeautifulSoup, Tag]): كائن BeautifulSoup أو Tag.
+        soup (NodeLike): كائن BeautifulSoup أو Tag أو عقدة من محرك آخر.
         selector (str): محدد CSS.
         default (Any): القيمة الافتراضية في حالة عدم وجود عنصر.
         
     العوائد:
-        Optional[Tag]: العنصر المستخرج أو القيمة الافتراضية.
+        Optional[NodeLike]: العنصر المستخرج أو القيمة الافتراضية.
     """
     if not soup or not selector:
         return default
     
     try:
-        element = soup.select_one(selector)
+        if isinstance(soup, Tag):
+            element = compile_selector(selector).select_one(soup)
+        else:
+            element = soup.select_one(selector)
         return element if element else default
     except Exception as e:
         logger.debug(f"خطأ أثناء استخراج العنصر بواسطة {selector}: {str(e)}")
         return default
 
-def get_elements_by_selector(soup: Union[BeautifulSoup, Tag], 
-                           selector: str) -> List[Tag]:
+def get_elements_by_selector(soup: NodeLike, 
+                           selector: str) -> List[NodeLike]:
     """
     استخراج قائمة عناصر HTML باستخدام CSS selector.
     
     المعاملات:
-        soup (Union[BeautifulSoup, Tag]): كائن BeautifulSoup أو Tag.
+        soup (NodeLike): كائن BeautifulSoup أو Tag أو عقدة من محرك آخر.
         selector (str): محدد CSS.
         
     العوائد:
-        List[Tag]: قائمة العناصر المستخرجة.
+        List[NodeLike]: قائمة العناصر المستخرجة.
     """
     if not soup or not selector:
         return []
     
     try:
-        elements = soup.select(selector)
+        if isinstance(soup, Tag):
+            elements = compile_selector(selector).select(soup)
+        else:
+            elements = soup.select(selector)
         return elements
     except Exception as e:
         logger.debug(f"خطأ أثناء استخراج العناصر بواسطة {selector}: {str(e)}")
         return []
 
-def get_element_attribute(element: Tag, attribute: str, default: str = "") -> str:
+def get_element_attribute(element: NodeLike, attribute: str, default: str = "") -> str:
     """
     استخراج قيمة سمة من عنصر HTML.
     
     المعاملات:
-        element (Tag): عنصر HTML.
+        element (NodeLike): عنصر HTML.
         attribute (str): اسم السمة.
         default (str): القيمة الافتراضية في حالة عدم وجود السمة.
         
@@ -103,12 +241,12 @@ def get_element_attribute(element: Tag, attribute: str, default: str = "") -> st
         logger.debug(f"خطأ أثناء استخراج السمة {attribute}: {str(e)}")
         return default
 
-def parse_table(table_element: Tag) -> List[List[str]]:
+def parse_table(table_element: NodeLike) -> List[List[str]]:
     """
     تحليل جدول HTML واستخراج محتواه كمصفوفة.
     
     المعاملات:
-        table_element (Tag): عنصر جدول HTML.
+        table_element (NodeLike): عنصر جدول HTML.
         
     العوائد:
         List[List[str]]: البيانات المستخرجة من الجدول.
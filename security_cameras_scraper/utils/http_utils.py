@@ -7,15 +7,53 @@
 import os
 import time
 import logging
-import requests
-from typing import Dict, Optional, Union, Any
+import threading
+from typing import Callable, Dict, NamedTuple, Optional, Union, Any, Tuple
+
+from .session_utils import SessionManager, get_default_session_manager
+from .cache_utils import HttpCache
+from .encoding_utils import sniff_encoding, decode_content
+from .rate_limit_utils import HostRateLimiter, parse_retry_after
+from .retry_utils import RetryPolicy
 
 logger = logging.getLogger(__name__)
 
+# رموز الحالة التي تعني أن الخادم يطلب تخفيف الطلبات
+THROTTLE_STATUSES = (429, 503)
+
+
+class FetchResult(NamedTuple):
+    """نتيجة طلب شبكة واحد كما يراها المراقب (observer) مثل AdaptiveHostLimiter."""
+    url: str
+    # رمز الحالة أو None إذا فشل الطلب قبل الاستجابة
+    status: Optional[int]
+    # زمن الطلب بالثواني (دون انتظار محدد المعدل)
+    elapsed: float
+    # None عند النجاح، وإلا "http" أو "timeout" أو "connection" أو "request"
+    error: Optional[str] = None
+    retry_after: Optional[float] = None
+
+    @property
+    def ok(self) -> bool:
+        """ما إذا نجح الطلب (200 أو 304)."""
+        return self.error is None
+
+    @property
+    def throttled(self) -> bool:
+        """ما إذا كانت النتيجة إشارة ازدحام (429 أو 503 أو انتهاء المهلة)."""
+        return self.status in THROTTLE_STATUSES or self.error == "timeout"
+
+
+FetchObserver = Callable[[FetchResult], None]
+
 def fetch_page(url: str, 
                headers: Optional[Dict[str, str]] = None,
                timeout: int = 30,
-               verify_ssl: bool = True) -> Optional[str]:
+               verify_ssl: bool = True,
+               session_manager: Optional[SessionManager] = None,
+               cache: Optional[HttpCache] = None,
+               rate_limiter: Optional[HostRateLimiter] = None,
+               observer: Optional[FetchObserver] = None) -> Optional[str]:
     """
     استرجاع محتوى صفحة ويب.
     
@@ -24,10 +62,60 @@ def fetch_page(url: str,
         headers (Optional[Dict[str, str]]): رؤوس HTTP (اختياري).
         timeout (int): مهلة الاتصال بالثواني.
         verify_ssl (bool): التحقق من شهادة SSL.
+        session_manager (Optional[SessionManager]): مدير جلسات لإعادة استخدام الاتصالات
+            (اختياري، يستخدم المدير المشترك للعملية عند عدم تحديده).
+        cache (Optional[HttpCache]): ذاكرة تخزين مؤقت على القرص (اختياري). تقدم منها الصفحات
+            الحديثة مباشرة، ويعاد التحقق من غيرها بطلب شرطي.
+        rate_limiter (Optional[HostRateLimiter]): محدد معدل الطلبات لكل مضيف (اختياري).
+        observer (Optional[FetchObserver]): دالة تستقبل FetchResult لكل طلب شبكة (اختياري).
         
     العوائد:
         Optional[str]: محتوى الصفحة أو None في حالة الفشل.
     """
+    result = fetch_page_raw(url, headers, timeout, verify_ssl, session_manager=session_manager, cache=cache,
+                            rate_limiter=rate_limiter, observer=observer)
+    
+    if result is None:
+        return None
+    
+    content, encoding = result
+    return decode_content(content, encoding)
+
+def fetch_page_raw(url: str, 
+                   headers: Optional[Dict[str, str]] = None,
+                   timeout: int = 30,
+                   verify_ssl: bool = True,
+                   session_manager: Optional[SessionManager] = None,
+                   cache: Optional[HttpCache] = None,
+                   rate_limiter: Optional[HostRateLimiter] = None,
+                   observer: Optional[FetchObserver] = None,
+                   cancel_event: Optional[threading.Event] = None) -> Optional[Tuple[bytes, Optional[str]]]:
+    """
+    استرجاع المحتوى الخام لصفحة ويب مع ترميزها المعلن.
+    
+    يعاد المحتوى كـ bytes دون فك ترميزه، مع الترميز المعلن في رأس Content-Type أو في
+    وسم meta charset، بحيث يمكن تمريره مباشرة إلى المحلل دون تخمين الترميز أو نسخ الصفحة.
+    
+    المعاملات:
+        url (str): رابط الصفحة المراد استرجاعها.
+        headers (Optional[Dict[str, str]]): رؤوس HTTP (اختياري).
+        timeout (int): مهلة الاتصال بالثواني.
+        verify_ssl (bool): التحقق من شهادة SSL.
+        session_manager (Optional[SessionManager]): مدير جلسات لإعادة استخدام الاتصالات (اختياري).
+        cache (Optional[HttpCache]): ذاكرة تخزين مؤقت على القرص (اختياري).
+        rate_limiter (Optional[HostRateLimiter]): محدد معدل الطلبات لكل مضيف (اختياري). ينتظر
+            الطلب موعده على المضيف، ويتم إيقاف المضيف عند استجابة 429/503 مع Retry-After.
+            الصفحات المقدمة من ذاكرة التخزين المؤقت لا تستهلك من المعدل.
+        observer (Optional[FetchObserver]): دالة تستقبل FetchResult (الحالة والزمن ونوع الخطأ)
+            لكل طلب شبكة، مثل AdaptiveHostLimiter.observe (اختياري).
+        cancel_event (Optional[threading.Event]): حدث إلغاء الطلب (اختياري). عند تحديده يقرأ
+            المحتوى على أجزاء، ويتم التوقف وإغلاق الاتصال فور تعيين الحدث (مثل الطلب الخاسر
+            في RequestHedger). لا يبلغ المراقب عن الطلبات الملغاة.
+        
+    العوائد:
+        Optional[Tuple[bytes, Optional[str]]]: المحتوى الخام والترميز (None إذا لم يعلن عنه)،
+            أو None في حالة الفشل.
+    """
     default_headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
@@ -37,65 +125,183 @@ def fetch_page(url: str,
     # استخدام الرؤوس المخصصة أو الافتراضية
     request_headers = headers or default_headers
     
+    # تقديم الصفحة من ذاكرة التخزين المؤقت أو إضافة رؤوس إعادة التحقق الشرطية
+    cached = cache.get(url) if cache else None
+    if cached is not None:
+        if cache.is_fresh(cached):
+            logger.info(f"تم تقديم الصفحة من ذاكرة التخزين المؤقت: {url}")
+            return cached.body, cached.encoding
+        request_headers = dict(request_headers, **cache.conditional_headers(cached))
+    
+    # استيراد requests عند أول طلب شبكة فقط لتسريع استيراد الحزمة
+    import requests
+    
+    # انتظار موعد الطلب على المضيف
+    if rate_limiter is not None:
+        rate_limiter.wait(url)
+    
+    if cancel_event is not None and cancel_event.is_set():
+        return None
+    
+    started = time.monotonic()
+    
+    def notify(status: Optional[int], error: Optional[str] = None, retry_after: Optional[float] = None) -> None:
+        if observer is not None:
+            observer(FetchResult(url, status, time.monotonic() - started, error, retry_after))
+    
     try:
         logger.info(f"جاري استرجاع الصفحة: {url}")
-        response = requests.get(
+        # استخدام جلسة المضيف المشتركة لإعادة استخدام الاتصال
+        manager = session_manager or get_default_session_manager()
+        response = manager.get(
             url, 
             headers=request_headers, 
             timeout=timeout,
-            verify=verify_ssl
+            verify=verify_ssl,
+            stream=cancel_event is not None
         )
         
+        if cancel_event is not None and (cancel_event.is_set() or response.status_code != 200):
+            # إغلاق الاتصال المقروء على أجزاء إذا لم تتم قراءة محتواه
+            response.close()
+            if cancel_event.is_set():
+                logger.info(f"تم إلغاء الطلب: {url}")
+                return None
+        
+        if response.status_code == 304 and cached is not None:
+            notify(304)
+            logger.info(f"لم تتغير الصفحة منذ آخر استرجاع، تم تقديمها من ذاكرة التخزين المؤقت: {url}")
+            cache.touch(url, etag=response.headers.get("ETag"), last_modified=response.headers.get("Last-Modified"))
+            return cached.body, cached.encoding
+        
         if response.status_code != 200:
             logger.error(f"فشل في استرجاع الصفحة. رمز الحالة: {response.status_code}")
+            retry_after = None
+            if response.status_code in THROTTLE_STATUSES:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                # إيقاف المضيف المدة التي يطلبها الخادم عند تجاوز الحد
+                if rate_limiter is not None and retry_after is not None:
+                    rate_limiter.defer(url, retry_after)
+            notify(response.status_code, "http", retry_after)
             return None
-            
+        
+        if cancel_event is None:
+            content = response.content
+        else:
+            content = _read_cancellable(response, cancel_event)
+            if content is None:
+                logger.info(f"تم إلغاء الطلب أثناء قراءة المحتوى: {url}")
+                return None
+        notify(response.status_code)
+        
         # التحقق من وجود محتوى
-        if not response.text or len(response.text) < 100:
-            logger.warning(f"محتوى الصفحة فارغ أو قصير جداً (الحجم: {len(response.text)} حرف)")
+        if not content or len(content) < 100:
+            logger.warning(f"محتوى الصفحة فارغ أو قصير جداً (الحجم: {len(content)} بايت)")
+        
+        # الترميز المعلن فقط، دون تخمين على كامل المحتوى
+        encoding = sniff_encoding(content, response.headers.get("Content-Type"))
         
-        return response.text
+        if cache is not None:
+            cache.store(
+                url,
+                content,
+                encoding=encoding,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified")
+            )
+        
+        return content, encoding
         
     except requests.exceptions.Timeout:
         logger.error(f"انتهت مهلة الاتصال للرابط: {url}")
+        notify(None, "timeout")
         return None
     except requests.exceptions.ConnectionError:
         logger.error(f"خطأ في الاتصال بالرابط: {url}")
+        notify(None, "connection")
         return None
     except requests.exceptions.RequestException as e:
         logger.error(f"خطأ عام في طلب HTTP: {str(e)}")
+        notify(None, "request")
         return None
 
+def _read_cancellable(response: Any, cancel_event: threading.Event, chunk_size: int = 65536) -> Optional[bytes]:
+    """
+    قراءة محتوى استجابة على أجزاء مع التوقف عند تعيين حدث الإلغاء.
+    
+    المعاملات:
+        response (Any): استجابة requests مفتوحة بـ stream=True.
+        cancel_event (threading.Event): حدث الإلغاء.
+        chunk_size (int): حجم الجزء بالبايت.
+        
+    العوائد:
+        Optional[bytes]: المحتوى أو None إذا تم الإلغاء.
+    """
+    chunks = []
+    try:
+        for chunk in response.iter_content(chunk_size):
+            if cancel_event.is_set():
+                return None
+            chunks.append(chunk)
+    finally:
+        response.close()
+    return b"".join(chunks)
+
 def fetch_with_retry(url: str, 
                     headers: Optional[Dict[str, str]] = None, 
                     max_retries: int = 3, 
                     timeout: int = 30,
-                    retry_delay: int = 2) -> Optional[str]:
+                    retry_delay: int = 2,
+                    session_manager: Optional[SessionManager] = None,
+                    cache: Optional[HttpCache] = None,
+                    rate_limiter: Optional[HostRateLimiter] = None,
+                    observer: Optional[FetchObserver] = None) -> Optional[str]:
     """
     استرجاع محتوى صفحة ويب مع إعادة المحاولة عند الفشل.
     
+    يعاد طلب الأخطاء المؤقتة فقط (انتهاء المهلة، أخطاء الاتصال، 429، 5xx)، مع تأخير
+    عشوائي بين صفر والتأخير الأسي (full jitter) ولا يقل عن Retry-After. تنتظر هذه الدالة
+    بين المحاولات، لذلك تستخدم عمليات الاستخراج المتعددة في CameraScraper طابورًا مؤقتًا بدلاً منها.
+    
     المعاملات:
         url (str): رابط الصفحة المراد استرجاعها.
         headers (Optional[Dict[str, str]]): رؤوس HTTP (اختياري).
-        max_retries (int): الحد الأقصى لعدد مرات إعادة المحاولة.
+        max_retries (int): الحد الأقصى لعدد المحاولات.
         timeout (int): مهلة الاتصال بالثواني.
-        retry_delay (int): التأخير بالثواني بين المحاولات.
+        retry_delay (int): التأخير الأساسي بالثواني (يتضاعف مع كل محاولة).
+        session_manager (Optional[SessionManager]): مدير جلسات لإعادة استخدام الاتصالات (اختياري).
+        cache (Optional[HttpCache]): ذاكرة تخزين مؤقت على القرص (اختياري).
+        rate_limiter (Optional[HostRateLimiter]): محدد معدل الطلبات لكل مضيف (اختياري).
+        observer (Optional[FetchObserver]): دالة تستقبل FetchResult لكل محاولة (اختياري).
         
     العوائد:
         Optional[str]: محتوى الصفحة أو None في حالة الفشل.
     """
+    policy = RetryPolicy(max(max_retries - 1, 0), base_delay=retry_delay)
+    
     for attempt in range(max_retries):
         logger.info(f"محاولة استرجاع {url} (محاولة {attempt+1}/{max_retries})")
         
-        result = fetch_page(url, headers, timeout)
+        observed = []
+        
+        def observe(fetch_result: FetchResult) -> None:
+            observed.append(fetch_result)
+            if observer is not None:
+                observer(fetch_result)
+        
+        result = fetch_page(url, headers, timeout, session_manager=session_manager, cache=cache,
+                            rate_limiter=rate_limiter, observer=observe)
         
         if result:
             return result
-            
-        if attempt < max_retries - 1:
-            wait_time = retry_delay * (2 ** attempt)  # تأخير متزايد
-            logger.info(f"الانتظار {wait_time} ثانية قبل المحاولة التالية")
-            time.sleep(wait_time)
+        
+        # الأخطاء الدائمة (مثل 404) لا يعاد طلبها
+        if not observed or not policy.should_retry(observed[-1], attempt):
+            break
+        
+        wait_time = policy.delay(attempt, observed[-1].retry_after)
+        logger.info(f"الانتظار {wait_time:.1f} ثانية قبل المحاولة التالية")
+        time.sleep(wait_time)
     
     logger.error(f"فشلت جميع المحاولات لاسترجاع {url}")
     return None
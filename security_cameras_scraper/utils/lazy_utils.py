@@ -0,0 +1,41 @@
+# الملف: security_cameras_scraper/utils/lazy_utils.py
+
+"""
+استيراد كائنات الحزم عند أول وصول إليها فقط (PEP 562).
+"""
+
+import importlib
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_attributes(namespace: Dict[str, Any],
+                    attributes: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    بناء دالتي __getattr__ و __dir__ لحزمة تستورد كائناتها عند أول وصول.
+
+    مثال:
+        __getattr__, __dir__ = lazy_attributes(globals(), _LAZY_ATTRIBUTES)
+
+    المعاملات:
+        namespace (Dict[str, Any]): globals() الخاصة بملف __init__ للحزمة.
+        attributes (Dict[str, str]): اسم الكائن -> الوحدة النسبية التي تعرفه.
+
+    العوائد:
+        Tuple[Callable[[str], Any], Callable[[], List[str]]]: الدالتان __getattr__ و __dir__.
+    """
+    package = namespace["__name__"]
+
+    def __getattr__(name: str) -> Any:
+        module_name = attributes.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+        value = getattr(importlib.import_module(module_name, package), name)
+        # الوصول التالي لا يمر عبر __getattr__
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(namespace.get("__all__", ())))
+
+    return __getattr__, __dir__
@@ -0,0 +1,115 @@
+# الملف: security_cameras_scraper/utils/lxml_utils.py
+
+"""
+أدوات تحليل HTML مباشرة عبر lxml دون المرور بـ BeautifulSoup.
+
+تعيد هذه الأدوات نفس نتائج أدوات html_utils (مثل get_text(strip=True)) بحيث يمكن
+للمستخرجات استخدام محرك lxml للحصول على مخرجات مطابقة بسرعة أكبر.
+"""
+
+from typing import Iterator, Optional, Union
+
+from lxml import etree
+from lxml import html as lxml_html
+
+from .encoding_utils import sniff_encoding, decode_content
+
+# وسوم لا يدخل نصها في get_text الخاصة بـ BeautifulSoup
+NON_TEXT_TAGS = frozenset(("script", "style", "template"))
+
+
+def parse_html(html_content: Union[str, bytes], encoding: Optional[str] = None) -> etree._Element:
+    """
+    تحليل محتوى HTML إلى شجرة lxml.
+
+    يفك ترميز المحتوى الخام بنفس منطق make_soup (الترميز المعلن ثم المكتشف ثم UTF-8).
+
+    المعاملات:
+        html_content (Union[str, bytes]): محتوى HTML للصفحة.
+        encoding (Optional[str]): ترميز المحتوى الخام (اختياري).
+
+    العوائد:
+        etree._Element: العنصر الجذر للصفحة.
+    """
+    if isinstance(html_content, bytes):
+        encoding = encoding or sniff_encoding(html_content) or "utf-8"
+        html_content = decode_content(html_content, encoding)
+
+    try:
+        return lxml_html.document_fromstring(html_content)
+    except etree.ParserError:
+        # محتوى فارغ: شجرة فارغة كما تعيدها BeautifulSoup
+        return lxml_html.document_fromstring("<html></html>")
+    except ValueError:
+        # lxml يرفض النصوص التي تبدأ بتصريح ترميز XML، فنمررها كـ UTF-8
+        parser = lxml_html.HTMLParser(encoding="utf-8")
+        return lxml_html.document_fromstring(html_content.encode("utf-8"), parser=parser)
+
+
+def class_xpath(class_name: str) -> str:
+    """
+    شرط XPath يطابق عنصرًا يحمل الصنف المحدد (مثل .class_name في CSS).
+
+    المعاملات:
+        class_name (str): اسم الصنف.
+
+    العوائد:
+        str: الشرط بين قوسين مربعين.
+    """
+    return f"[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+
+def has_class(element: etree._Element, class_name: str) -> bool:
+    """
+    التحقق مما إذا كان العنصر يحمل الصنف المحدد.
+
+    المعاملات:
+        element (etree._Element): العنصر.
+        class_name (str): اسم الصنف.
+
+    العوائد:
+        bool: True إذا كان الصنف ضمن أصناف العنصر.
+    """
+    classes = element.get("class")
+    return bool(classes) and class_name in classes.split()
+
+
+def iter_strings(element: etree._Element) -> Iterator[str]:
+    """
+    المرور على النصوص داخل العنصر بترتيب المستند.
+
+    يتجاهل التعليقات ونصوص script و style كما تفعل BeautifulSoup.
+
+    المعاملات:
+        element (etree._Element): العنصر.
+
+    العوائد:
+        Iterator[str]: النصوص.
+    """
+    if not isinstance(element.tag, str) or element.tag in NON_TEXT_TAGS:
+        return
+
+    if element.text:
+        yield element.text
+
+    for child in element:
+        yield from iter_strings(child)
+        if child.tail:
+            yield child.tail
+
+
+def get_text(element: Optional[etree._Element]) -> str:
+    """
+    استخراج نص العنصر مطابقًا لـ get_text(strip=True) في BeautifulSoup.
+
+    المعاملات:
+        element (Optional[etree._Element]): العنصر.
+
+    العوائد:
+        str: النص بعد إزالة المسافات من أطراف كل جزء ودمج الأجزاء.
+    """
+    if element is None:
+        return ""
+
+    parts = (text.strip() for text in iter_strings(element))
+    return "".join(part for part in parts if part)
@@ -0,0 +1,230 @@
+# الملف: security_cameras_scraper/utils/model_utils.py
+
+"""
+أدوات للتعرف على طراز المنتج من رابطه وتوحيد نسخ الصفحة نفسها بلغات مختلفة.
+
+تضع مواقع الشركات رمز اللغة في المسار (مثل /es/products/... و /en/products/...)، فيظهر نفس
+الطراز تحت عشرات الروابط. يجمع ModelIndex هذه الروابط تحت (الشركة، الطراز) ويختار رابطًا
+واحدًا بلغة مفضلة للطلب، ويسجل بقية الروابط كأسماء بديلة (aliases).
+"""
+
+import re
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from .url_utils import canonicalize_url
+
+# النطاقات التي تحتوي روابط منتجاتها على الطراز في آخر المسار
+PRODUCT_DOMAINS = {
+    "hikvision.com": "hikvision",
+    "dahuasecurity.com": "dahua",
+    "dahuatech.com": "dahua",
+}
+
+# رمز اللغة في أول المسار مثل en و es و pt-br و es-la
+_LOCALE_PATTERN = re.compile(r"^[a-z]{2}(?:[-_][a-z]{2,4})?$", re.IGNORECASE)
+
+# رمز الطراز: يبدأ بحرف ويحتوي على رقم (يستبعد صفحات الفئات مثل AcuSense-Series و 1080P)
+_MODEL_PATTERN = re.compile(r"^[A-Za-z][A-Za-z0-9]*(?:[-_=+.][A-Za-z0-9]+)*$")
+_PAGE_EXTENSION = re.compile(r"\.(?:html?|aspx|php)$", re.IGNORECASE)
+
+
+class ProductRef(NamedTuple):
+    """طراز منتج كما يظهر في رابط صفحته."""
+    manufacturer: str
+    # الطراز بصيغة موحدة (أحرف كبيرة، و _ بدلاً من =)
+    model: str
+    # رمز اللغة في المسار أو None
+    locale: Optional[str]
+    url: str
+
+
+def parse_product_url(url: str) -> Optional[ProductRef]:
+    """
+    استخراج الشركة والطراز واللغة من رابط صفحة منتج.
+
+    المعاملات:
+        url (str): الرابط.
+
+    العوائد:
+        Optional[ProductRef]: الطراز أو None إذا لم يكن الرابط صفحة منتج معروفة.
+    """
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return None
+
+    host = (parts.hostname or "").lower()
+    manufacturer = None
+    for domain, name in PRODUCT_DOMAINS.items():
+        if host == domain or host.endswith("." + domain):
+            manufacturer = name
+            break
+    if manufacturer is None:
+        return None
+
+    segments = [unquote(segment) for segment in parts.path.split("/") if segment]
+    if len(segments) < 2 or "products" not in (segment.lower() for segment in segments[:-1]):
+        return None
+
+    model = _PAGE_EXTENSION.sub("", segments[-1])
+    if not _MODEL_PATTERN.match(model) or not any(char.isdigit() for char in model):
+        return None
+
+    locale = segments[0].lower() if _LOCALE_PATTERN.match(segments[0]) else None
+    return ProductRef(manufacturer, model.upper().replace("=", "_"), locale, url)
+
+
+class ModelIndex:
+    """
+    فهرس روابط المنتجات حسب (الشركة، الطراز) عبر اللغات.
+
+    يختار لكل طراز رابطًا واحدًا للطلب حسب ترتيب preferred_locales (ثم أول رابط ظهر)،
+    ويحتفظ ببقية الروابط كأسماء بديلة. تطلب لغة أخرى بشكل منفصل فقط عند تحديدها صراحة
+    في locales. الروابط التي لا يتعرف على طرازها تجمع حسب صيغتها الموحدة فقط.
+    """
+
+    def __init__(self, preferred_locales: Iterable[str] = ("en",)):
+        """
+        تهيئة الفهرس.
+
+        المعاملات:
+            preferred_locales (Iterable[str]): اللغات المفضلة بالترتيب.
+        """
+        self.preferred_locales = [locale.lower() for locale in preferred_locales]
+        self._urls: Dict[Tuple[str, str], List[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._urls)
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        with self._lock:
+            return key in self._urls
+
+    def add(self, url: str) -> Optional[ProductRef]:
+        """
+        تسجيل رابط تحت طرازه.
+
+        المعاملات:
+            url (str): الرابط.
+
+        العوائد:
+            Optional[ProductRef]: الطراز أو None إذا لم يتم التعرف عليه.
+        """
+        ref = parse_product_url(url)
+        if ref is not None:
+            with self._lock:
+                urls = self._urls.setdefault((ref.manufacturer, ref.model), [])
+                if url not in urls:
+                    urls.append(url)
+        return ref
+
+    def rank(self, url: str) -> int:
+        """
+        ترتيب تفضيل رابط حسب لغته (الأقل أفضل).
+
+        المعاملات:
+            url (str): الرابط.
+
+        العوائد:
+            int: موقع لغته في preferred_locales أو عدد اللغات المفضلة لغيرها.
+        """
+        return self._rank(parse_product_url(url))
+
+    def _rank(self, ref: Optional[ProductRef]) -> int:
+        if ref is not None and ref.locale in self.preferred_locales:
+            return self.preferred_locales.index(ref.locale)
+        return len(self.preferred_locales)
+
+    def key(self, url: str, locales: Iterable[str] = ()) -> str:
+        """
+        مفتاح التجميع لرابط.
+
+        المعاملات:
+            url (str): الرابط.
+            locales (Iterable[str]): لغات مطلوبة صراحة فيكون لها مفتاح مستقل.
+
+        العوائد:
+            str: "الشركة:الطراز" (مع "@اللغة" للغات المطلوبة صراحة) أو الرابط الموحد.
+        """
+        return self._key(url, parse_product_url(url), {locale.lower() for locale in locales})
+
+    @staticmethod
+    def _key(url: str, ref: Optional[ProductRef], locales: set) -> str:
+        if ref is None:
+            return canonicalize_url(url)
+        if ref.locale is not None and ref.locale in locales:
+            return f"{ref.manufacturer}:{ref.model}@{ref.locale}"
+        return f"{ref.manufacturer}:{ref.model}"
+
+    def preferred_url(self, manufacturer: str, model: str) -> Optional[str]:
+        """
+        الرابط المفضل لطراز من الروابط المسجلة.
+
+        المعاملات:
+            manufacturer (str): اسم الشركة.
+            model (str): الطراز.
+
+        العوائد:
+            Optional[str]: الرابط أو None إذا لم يسجل الطراز.
+        """
+        urls = self.urls(manufacturer, model)
+        return min(urls, key=self.rank) if urls else None
+
+    def urls(self, manufacturer: str, model: str) -> List[str]:
+        """
+        جميع الروابط المسجلة لطراز بترتيب ظهورها.
+
+        المعاملات:
+            manufacturer (str): اسم الشركة.
+            model (str): الطراز (بأي صيغة، مثل = أو _).
+
+        العوائد:
+            List[str]: الروابط.
+        """
+        with self._lock:
+            return list(self._urls.get((manufacturer.lower(), model.upper().replace("=", "_")), []))
+
+    def aliases(self, manufacturer: str, model: str) -> List[str]:
+        """
+        الروابط البديلة لطراز (كل الروابط عدا المفضل).
+
+        المعاملات:
+            manufacturer (str): اسم الشركة.
+            model (str): الطراز.
+
+        العوائد:
+            List[str]: الروابط.
+        """
+        preferred = self.preferred_url(manufacturer, model)
+        return [url for url in self.urls(manufacturer, model) if url != preferred]
+
+    def plan(self, urls: Iterable[str], locales: Iterable[str] = (), record: bool = False) -> List[List[str]]:
+        """
+        تجميع روابط للطلب: رابط واحد لكل طراز والبقية أسماء بديلة له.
+
+        لا يحتفظ الفهرس بالروابط إلا عند طلب ذلك، حتى لا يكبر مع كل دفعة في مستخرج طويل العمر.
+
+        المعاملات:
+            urls (Iterable[str]): الروابط.
+            locales (Iterable[str]): لغات تطلب صفحاتها بشكل منفصل.
+            record (bool): تسجيل الروابط في الفهرس (انظر aliases و preferred_url).
+
+        العوائد:
+            List[List[str]]: مجموعات الروابط الأصلية المختلفة بترتيب أول ظهور، وأول رابط في
+            كل مجموعة هو الرابط المفضل الذي يتم طلبه.
+        """
+        locales = {locale.lower() for locale in locales}
+        groups: Dict[str, List[str]] = {}
+        ranks: Dict[str, int] = {}
+        for url in urls:
+            ref = self.add(url) if record else parse_product_url(url)
+            members = groups.setdefault(self._key(url, ref, locales), [])
+            if url not in ranks:
+                ranks[url] = self._rank(ref)
+                members.append(url)
+
+        return [sorted(members, key=ranks.__getitem__) for members in groups.values()]
@@ -0,0 +1,186 @@
+# الملف: security_cameras_scraper/utils/parse_pool.py
+
+"""
+مجمع عمليات (processes) لتحليل الصفحات بمعزل عن استرجاعها من الشبكة.
+
+تحليل HTML عملية تستهلك المعالج وتحجز قفل المفسر (GIL)، لذلك لا يتجاوز التحليل
+في الخيوط (threads) نواة واحدة تقريبًا. ينقل هذا المجمع المحتوى الخام للصفحات إلى
+عمليات مستقلة تحمل كل منها نسخة من مستخرجات الشركات، ويعيد إنشاء العمليات بعد عدد
+محدد من الصفحات للحد من تضخم ذاكرة lxml.
+"""
+
+import os
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, Optional, Union, TYPE_CHECKING
+
+from .encoding_utils import decode_content
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# مستخرجات الشركات داخل عملية التحليل الحالية (يتم تهيئتها عند بدء العملية)
+_WORKER_SCRAPERS = None
+
+
+def extract_page(scraper: Any,
+                 url: str,
+                 content: Union[str, bytes],
+                 encoding: Optional[str] = None) -> Dict[str, Any]:
+    """
+    تشغيل مستخرج على محتوى صفحة.
+
+    يمرر المحتوى الخام مباشرة إلى المستخرجات التي تدعم ذلك (accepts_bytes)، ويفك
+    ترميزه إلى نص للمستخرجات المخصصة الأخرى.
+
+    المعاملات:
+        scraper (Any): كائن المستخرج.
+        url (str): رابط صفحة المنتج.
+        content (Union[str, bytes]): محتوى HTML للصفحة.
+        encoding (Optional[str]): ترميز المحتوى الخام (اختياري).
+
+    العوائد:
+        Dict[str, Any]: البيانات كما أعادها المستخرج.
+    """
+    if getattr(scraper, 'accepts_bytes', False):
+        return scraper.extract(content, url, encoding=encoding)
+    return scraper.extract(decode_content(content, encoding), url)
+
+
+def _init_worker(entries: Dict[str, Any]) -> None:
+    """تهيئة عملية التحليل بمستخرجات الشركات."""
+    global _WORKER_SCRAPERS
+    from ..scrapers.registry import ScraperMapping
+    _WORKER_SCRAPERS = ScraperMapping.from_snapshot(entries)
+
+
+def _parse_task(manufacturer: str,
+                url: str,
+                content: Union[str, bytes],
+                encoding: Optional[str]) -> Dict[str, Any]:
+    """تحليل صفحة واحدة داخل عملية التحليل."""
+    return extract_page(_WORKER_SCRAPERS[manufacturer], url, content, encoding)
+
+
+class ParseWorkerPool:
+    """
+    مجمع عمليات لتحليل الصفحات مع إعادة تدوير العمليات.
+
+    يتم توزيع الصفحات على جيل من العمليات، وبعد أن يستقبل الجيل
+    (عدد العمال × max_pages_per_worker) صفحة يتم إنشاء جيل جديد وإغلاق القديم
+    بعد انتهائه مما لديه. لا يضمن ProcessPoolExecutor توزيعًا متساويًا على العمليات،
+    لذلك يكون الحد لكل عملية تقريبيًا.
+
+    مثال:
+        with ParseWorkerPool(scraper.scrapers.snapshot(), workers=4) as pool:
+            data = pool.submit("hikvision", url, content, "utf-8").result()
+    """
+
+    def __init__(self,
+                 scrapers: Dict[str, Any],
+                 workers: Optional[int] = None,
+                 max_pages_per_worker: Optional[int] = None,
+                 mp_context: Any = None):
+        """
+        تهيئة المجمع.
+
+        المعاملات:
+            scrapers (Dict[str, Any]): مستخرجات الشركات كما تعيدها ScraperMapping.snapshot().
+            workers (Optional[int]): عدد عمليات التحليل (الافتراضي: عدد أنوية المعالج).
+            max_pages_per_worker (Optional[int]): عدد الصفحات التقريبي لكل عملية قبل
+                إعادة إنشائها (None يعني دون إعادة تدوير).
+            mp_context (Any): سياق multiprocessing لإنشاء العمليات (اختياري).
+
+        الاستثناءات:
+            ValueError: إذا كان عدد العمال أو حد الصفحات أقل من 1.
+        """
+        if workers is not None and workers < 1:
+            raise ValueError("يجب أن يكون عدد عمليات التحليل 1 على الأقل")
+        if max_pages_per_worker is not None and max_pages_per_worker < 1:
+            raise ValueError("يجب أن يكون عدد الصفحات لكل عملية 1 على الأقل")
+
+        self.scrapers = scrapers
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pages_per_worker = max_pages_per_worker
+        self.mp_context = mp_context
+        # عدد أجيال العمليات التي تم إنشاؤها
+        self.generations = 0
+        self._executor = None
+        self._submitted = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _current_executor(self) -> "ProcessPoolExecutor":
+        """إرجاع منفذ الجيل الحالي وإنشاء جيل جديد عند الحاجة."""
+        # يؤجل استيراد multiprocessing حتى أول صفحة
+        from concurrent.futures import ProcessPoolExecutor
+
+        limit = self.max_pages_per_worker and self.max_pages_per_worker * self.workers
+
+        if self._executor is not None and limit and self._submitted >= limit:
+            # يكمل الجيل القديم الصفحات التي استقبلها ثم تنتهي عملياته
+            logger.debug(f"إعادة تدوير عمليات التحليل بعد {self._submitted} صفحة")
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=self.mp_context,
+                initializer=_init_worker,
+                initargs=(self.scrapers,)
+            )
+            self._submitted = 0
+            self.generations += 1
+
+        return self._executor
+
+    def submit(self,
+               manufacturer: str,
+               url: str,
+               content: Union[str, bytes],
+               encoding: Optional[str] = None) -> "Future[Dict[str, Any]]":
+        """
+        إرسال صفحة للتحليل.
+
+        المعاملات:
+            manufacturer (str): اسم الشركة المصنعة.
+            url (str): رابط صفحة المنتج.
+            content (Union[str, bytes]): محتوى HTML للصفحة.
+            encoding (Optional[str]): ترميز المحتوى الخام (اختياري).
+
+        العوائد:
+            Future[Dict[str, Any]]: نتيجة المستخرج (قبل إضافة المعلومات المرجعية).
+
+        الاستثناءات:
+            RuntimeError: إذا كان المجمع مغلقًا.
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("مجمع عمليات التحليل مغلق")
+            executor = self._current_executor()
+            self._submitted += 1
+            return executor.submit(_parse_task, manufacturer, url, content, encoding)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        إغلاق المجمع وعملياته.
+
+        المعاملات:
+            wait (bool): انتظار انتهاء الصفحات المرسلة قبل العودة.
+        """
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def __enter__(self) -> "ParseWorkerPool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.shutdown()
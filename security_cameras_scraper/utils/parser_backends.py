@@ -0,0 +1,352 @@
+# الملف: security_cameras_scraper/utils/parser_backends.py
+
+"""
+محركات تحليل HTML قابلة للتبديل خلف واجهة عقد (node) موحدة.
+
+تتعامل أدوات html_utils والمستخرجات مع العقد عبر نفس الدوال التي توفرها BeautifulSoup
+(select_one و select و get_text و get و has_attr و find_all و find_parent و attrs
+و descendants)، لذلك يكفي تغليف عقد المحركات الأخرى بهذه الدوال لتشغيل نفس منطق الاستخراج عليها:
+
+    bs4:        BeautifulSoup مع محلل lxml (الافتراضي، دون تغليف).
+    html5lib:   BeautifulSoup مع محلل html5lib (مطابق للمتصفحات، أبطأ).
+    lxml:       شجرة lxml مباشرة مع محددات cssselect.
+    selectolax: محلل lexbor المكتوب بلغة C عبر selectolax.
+
+ملاحظات:
+    - تطابق محددات CSS في lxml و selectolax داخل الشجرة الفرعية للعقدة فقط،
+      بينما تسمح BeautifulSoup بأن يقع أول جزء من المحدد المركب خارجها.
+    - مع html5lib تدخل نصوص script في get_text (سلوك BeautifulSoup مع هذا المحلل).
+"""
+
+import abc
+import logging
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from .encoding_utils import sniff_encoding, decode_content
+from . import lxml_utils
+
+try:
+    from lxml.cssselect import CSSSelector
+except ImportError:
+    CSSSelector = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+logger = logging.getLogger(__name__)
+
+# المحرك الافتراضي
+DEFAULT_BACKEND = "bs4"
+
+
+def _matches_name(tag: str, name: Optional[Union[str, List[str]]]) -> bool:
+    """التحقق من تطابق اسم الوسم مع اسم أو قائمة أسماء."""
+    if name is None:
+        return True
+    if isinstance(name, str):
+        return tag == name
+    return tag in name
+
+
+def _join_text(strings: Iterator[str], separator: str, strip: bool) -> str:
+    """دمج النصوص بنفس طريقة get_text في BeautifulSoup."""
+    if strip:
+        strings = (text.strip() for text in strings)
+        return separator.join(text for text in strings if text)
+    return separator.join(strings)
+
+
+class Node(abc.ABC):
+    """
+    الواجهة المشتركة لعقد المحركات غير المعتمدة على BeautifulSoup.
+
+    يحتفظ كل غلاف بالعقدة الأصلية في native للوصول إلى دوال المحرك مباشرة عند الحاجة.
+    """
+
+    __slots__ = ("native",)
+
+    def __init__(self, native: Any):
+        self.native = native
+
+    # العقد موجودة دائمًا (مثل Tag في BeautifulSoup)
+    def __bool__(self) -> bool:
+        return True
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Node) and self._identity() == other._identity()
+
+    def __hash__(self) -> int:
+        return hash(self._identity())
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.name}>"
+
+    def _identity(self) -> Any:
+        return self.native
+
+    @property
+    @abc.abstractmethod
+    def name(self) -> str:
+        """اسم الوسم."""
+
+    @property
+    @abc.abstractmethod
+    def attrs(self) -> Dict[str, Any]:
+        """سمات العقدة (class كقائمة كما في BeautifulSoup)."""
+
+    @property
+    @abc.abstractmethod
+    def parent(self) -> Optional["Node"]:
+        """العقدة الأب أو None."""
+
+    @property
+    @abc.abstractmethod
+    def descendants(self) -> Iterator["Node"]:
+        """جميع العناصر داخل العقدة بترتيب المستند."""
+
+    @abc.abstractmethod
+    def select(self, selector: str) -> List["Node"]:
+        """العناصر التي تطابق محدد CSS."""
+
+    @abc.abstractmethod
+    def _strings(self) -> Iterator[str]:
+        """نصوص العقدة التي تدخل في get_text."""
+
+    def select_one(self, selector: str) -> Optional["Node"]:
+        """أول عنصر يطابق محدد CSS أو None."""
+        matches = self.select(selector)
+        return matches[0] if matches else None
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        """نص العقدة بنفس دلالات get_text في BeautifulSoup."""
+        return _join_text(self._strings(), separator, strip)
+
+    def get(self, attribute: str, default: Any = None) -> Any:
+        """قيمة سمة (class تعاد كقائمة كما في BeautifulSoup)."""
+        return self.attrs.get(attribute, default)
+
+    def has_attr(self, attribute: str) -> bool:
+        """ما إذا كانت العقدة تحمل السمة."""
+        return attribute in self.attrs
+
+    def find_all(self, name: Optional[Union[str, List[str]]] = None) -> List["Node"]:
+        """جميع العناصر الأحفاد بالاسم المحدد (أو قائمة أسماء) بترتيب المستند."""
+        return [node for node in self.descendants if _matches_name(node.name, name)]
+
+    def find_parent(self, name: Optional[str] = None, class_: Optional[str] = None) -> Optional["Node"]:
+        """أقرب سلف بالاسم والصنف المحددين."""
+        node = self.parent
+        while node is not None:
+            if _matches_name(node.name, name) and (class_ is None or class_ in node.attrs.get("class", [])):
+                return node
+            node = node.parent
+        return None
+
+
+def _split_class(attrs: Dict[str, Any]) -> Dict[str, Any]:
+    """تحويل سمة class إلى قائمة كما تفعل BeautifulSoup."""
+    if "class" in attrs:
+        attrs["class"] = (attrs["class"] or "").split()
+    return attrs
+
+
+@lru_cache(maxsize=256)
+def _css_selector(selector: str) -> Any:
+    """ترجمة محدد CSS إلى XPath لمحرك lxml (مرة واحدة لكل محدد)."""
+    return CSSSelector(selector, translator="html")
+
+
+class LxmlNode(Node):
+    """غلاف لعنصر lxml."""
+
+    __slots__ = ()
+
+    @property
+    def name(self) -> str:
+        return self.native.tag
+
+    @property
+    def attrs(self) -> Dict[str, Any]:
+        return _split_class(dict(self.native.attrib))
+
+    @property
+    def parent(self) -> Optional["LxmlNode"]:
+        parent = self.native.getparent()
+        return LxmlNode(parent) if parent is not None else None
+
+    @property
+    def descendants(self) -> Iterator["LxmlNode"]:
+        for element in self.native.iterdescendants():
+            if isinstance(element.tag, str):
+                yield LxmlNode(element)
+
+    def select(self, selector: str) -> List["LxmlNode"]:
+        native = self.native
+        return [LxmlNode(element) for element in _css_selector(selector)(native) if element is not native]
+
+    def get(self, attribute: str, default: Any = None) -> Any:
+        if attribute == "class":
+            return self.attrs.get(attribute, default)
+        return self.native.get(attribute, default)
+
+    def has_attr(self, attribute: str) -> bool:
+        return attribute in self.native.attrib
+
+    def _strings(self) -> Iterator[str]:
+        return lxml_utils.iter_strings(self.native)
+
+
+class SelectolaxNode(Node):
+    """غلاف لعقدة selectolax (lexbor)."""
+
+    __slots__ = ()
+
+    def _identity(self) -> Any:
+        return self.native.mem_id
+
+    @property
+    def name(self) -> str:
+        return self.native.tag
+
+    @property
+    def attrs(self) -> Dict[str, Any]:
+        return _split_class(dict(self.native.attributes))
+
+    @property
+    def parent(self) -> Optional["SelectolaxNode"]:
+        parent = self.native.parent
+        if parent is None or not parent.tag or parent.tag.startswith("-"):
+            return None
+        return SelectolaxNode(parent)
+
+    @property
+    def descendants(self) -> Iterator["SelectolaxNode"]:
+        for node in self.native.traverse():
+            if node.tag.startswith("-") or node.tag.startswith("_"):
+                continue
+            if node.mem_id != self.native.mem_id:
+                yield SelectolaxNode(node)
+
+    def select(self, selector: str) -> List["SelectolaxNode"]:
+        own_id = self.native.mem_id
+        return [SelectolaxNode(node) for node in self.native.css(selector) if node.mem_id != own_id]
+
+    def has_attr(self, attribute: str) -> bool:
+        return attribute in self.native.attributes
+
+    def _strings(self) -> Iterator[str]:
+        return self._iter_strings(self.native)
+
+    @classmethod
+    def _iter_strings(cls, node: Any) -> Iterator[str]:
+        """النصوص داخل العقدة دون التعليقات ونصوص script و style."""
+        if node.tag in lxml_utils.NON_TEXT_TAGS:
+            return
+        for child in node.iter(include_text=True):
+            tag = child.tag
+            if tag == "-text":
+                yield child.text_content
+            elif not tag.startswith("-") and not tag.startswith("_"):
+                yield from cls._iter_strings(child)
+
+
+def _to_text(html_content: Union[str, bytes], encoding: Optional[str]) -> str:
+    """فك ترميز المحتوى الخام بنفس منطق make_soup."""
+    if isinstance(html_content, bytes):
+        encoding = encoding or sniff_encoding(html_content) or "utf-8"
+        return decode_content(html_content, encoding)
+    return html_content
+
+
+def _parse_bs4(html_content: Union[str, bytes], encoding: Optional[str], parse_only: Any = None) -> Any:
+    from .html_utils import make_soup
+    return make_soup(html_content, encoding, parse_only=parse_only)
+
+
+def _parse_html5lib(html_content: Union[str, bytes], encoding: Optional[str], parse_only: Any = None) -> Any:
+    from bs4 import BeautifulSoup
+    try:
+        import html5lib  # noqa: F401
+    except ImportError:
+        raise ImportError("مكتبة html5lib غير متوفرة. يرجى تثبيتها باستخدام: pip install html5lib")
+    return BeautifulSoup(_to_text(html_content, encoding), "html5lib")
+
+
+def _parse_lxml(html_content: Union[str, bytes], encoding: Optional[str], parse_only: Any = None) -> LxmlNode:
+    if CSSSelector is None:
+        raise ImportError("مكتبة cssselect غير متوفرة. يرجى تثبيتها باستخدام: pip install cssselect")
+    return LxmlNode(lxml_utils.parse_html(html_content, encoding))
+
+
+def _parse_selectolax(html_content: Union[str, bytes], encoding: Optional[str], parse_only: Any = None) -> SelectolaxNode:
+    if LexborHTMLParser is None:
+        raise ImportError("مكتبة selectolax غير متوفرة. يرجى تثبيتها باستخدام: pip install selectolax")
+    return SelectolaxNode(LexborHTMLParser(_to_text(html_content, encoding)).root)
+
+
+# اسم المحرك -> دالة التحليل (المحتوى، الترميز، مرشح التحليل الجزئي)
+BACKENDS: Dict[str, Callable[..., Any]] = {
+    "bs4": _parse_bs4,
+    "html5lib": _parse_html5lib,
+    "lxml": _parse_lxml,
+    "selectolax": _parse_selectolax,
+}
+
+
+def register_backend(name: str, parser: Callable[..., Any]) -> None:
+    """
+    تسجيل محرك تحليل إضافي.
+
+    المعاملات:
+        name (str): اسم المحرك.
+        parser (Callable[..., Any]): دالة (المحتوى، الترميز، parse_only) تعيد عقدة جذر
+            تدعم واجهة Node.
+    """
+    BACKENDS[name] = parser
+
+
+def available_backends() -> List[str]:
+    """
+    أسماء المحركات المسجلة التي تتوفر مكتباتها.
+
+    العوائد:
+        List[str]: أسماء المحركات.
+    """
+    names = []
+    for name in BACKENDS:
+        try:
+            BACKENDS[name]("<html></html>", None)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def parse_document(html_content: Union[str, bytes],
+                   encoding: Optional[str] = None,
+                   backend: str = DEFAULT_BACKEND,
+                   parse_only: Any = None) -> Any:
+    """
+    تحليل صفحة HTML بالمحرك المحدد.
+
+    المعاملات:
+        html_content (Union[str, bytes]): محتوى HTML للصفحة.
+        encoding (Optional[str]): ترميز المحتوى الخام (اختياري).
+        backend (str): اسم المحرك ('bs4' أو 'html5lib' أو 'lxml' أو 'selectolax').
+        parse_only (Any): مرشح SoupStrainer للتحليل الجزئي (محرك bs4 فقط، يتجاهله الباقي).
+
+    العوائد:
+        Any: عقدة الجذر (BeautifulSoup لمحركي bs4 و html5lib، أو Node لغيرهما).
+
+    الاستثناءات:
+        ValueError: إذا كان المحرك غير معروف.
+        ImportError: إذا كانت مكتبة المحرك غير مثبتة.
+    """
+    parser = BACKENDS.get(backend)
+    if parser is None:
+        raise ValueError(f"محرك تحليل غير معروف: {backend}")
+
+    return parser(html_content, encoding, parse_only)
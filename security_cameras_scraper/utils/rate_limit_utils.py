@@ -0,0 +1,432 @@
+# الملف: security_cameras_scraper/utils/rate_limit_utils.py
+
+"""
+أدوات لتقييد معدل الطلبات لكل مضيف (politeness) دون إبطاء المضيفين الآخرين.
+
+    TokenBucket:       دلو رموز (معدل + دفعة) يحجز موعد الطلب التالي.
+    HostRateLimiter:   دلو مستقل لكل مضيف مع احترام Retry-After و Crawl-delay.
+    interleave_hosts:  إعادة ترتيب الروابط بالتناوب بين المضيفين حتى لا ينتظر العمال مضيفًا واحدًا.
+"""
+
+import re
+import time
+import logging
+import threading
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from .session_utils import get_host
+
+logger = logging.getLogger(__name__)
+
+# الحد الأقصى الافتراضي لمدة الإيقاف المطلوبة عبر Retry-After بالثواني
+DEFAULT_MAX_RETRY_AFTER = 300.0
+
+# عدد الروابط التي تتم قراءتها مسبقًا من المصدر لإعادة ترتيبها بين المضيفين
+DEFAULT_LOOKAHEAD = 256
+
+_REQUEST_RATE_RE = re.compile(r"^\s*(\d+)\s*/\s*(\d+(?:\.\d+)?)\s*([smh]?)", re.IGNORECASE)
+_TIME_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600}
+
+
+class TokenBucket:
+    """
+    دلو رموز بمعدل ثابت وسعة دفعة (burst).
+
+    يحفظ الدلو "الموعد النظري" للطلب التالي بدلاً من عدد الرموز (خوارزمية GCRA المكافئة)،
+    بحيث يمكن حجز موعد في المستقبل مباشرة: تعيد reserve مدة الانتظار اللازمة قبل إرسال
+    الطلب، وتحتسب الرمز فورًا حتى لا يحصل عاملان على نفس الموعد.
+
+    الدلو غير آمن للخيوط بمفرده، ويحميه HostRateLimiter بقفله.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        تهيئة الدلو.
+
+        المعاملات:
+            rate (float): عدد الطلبات المسموح بها في الثانية.
+            burst (int): عدد الطلبات المسموح بإرسالها دفعة واحدة بعد فترة خمول.
+
+        الاستثناءات:
+            ValueError: إذا كان المعدل أو الدفعة غير موجبين.
+        """
+        if rate <= 0:
+            raise ValueError("يجب أن يكون معدل الطلبات أكبر من صفر")
+        if burst < 1:
+            raise ValueError("يجب أن تكون الدفعة 1 على الأقل")
+
+        self.rate = rate
+        self.burst = burst
+        self._interval = 1.0 / rate
+        self._tolerance = (burst - 1) * self._interval
+        self._next_time: Optional[float] = None
+
+    def delay(self, now: float, not_before: float = 0.0) -> float:
+        """
+        مدة الانتظار قبل توفر رمز دون حجزه.
+
+        المعاملات:
+            now (float): الوقت الحالي.
+            not_before (float): أقرب وقت مسموح به للطلب (مثل نهاية مدة Retry-After).
+
+        العوائد:
+            float: مدة الانتظار بالثواني.
+        """
+        start = max(now, not_before)
+        if self._next_time is not None:
+            start = max(start, self._next_time - self._tolerance)
+        return start - now
+
+    def reserve(self, now: float, not_before: float = 0.0) -> float:
+        """
+        حجز رمز وإرجاع مدة الانتظار قبل استخدامه.
+
+        المعاملات:
+            now (float): الوقت الحالي.
+            not_before (float): أقرب وقت مسموح به للطلب.
+
+        العوائد:
+            float: مدة الانتظار بالثواني.
+        """
+        wait = self.delay(now, not_before)
+        start = now + wait
+        self._next_time = max(self._next_time if self._next_time is not None else start, start) + self._interval
+        return wait
+
+
+class _HostState:
+    """حالة مضيف واحد داخل HostRateLimiter."""
+
+    def __init__(self, bucket: Optional[TokenBucket], loaded: bool):
+        self.bucket = bucket
+        self.blocked_until = 0.0
+        self.loaded = loaded
+        self.load_lock = threading.Lock()
+
+
+class HostRateLimiter:
+    """
+    محدد معدل الطلبات لكل مضيف.
+
+    لكل مضيف دلو رموز مستقل، فلا يؤخر مضيف بطيء أو محظور الطلبات إلى مضيف آخر. يتم
+    إيقاف المضيف مؤقتًا عند استجابة 429/503 مع Retry-After، ويمكن تحميل Crawl-delay من
+    robots.txt عند أول طلب لكل مضيف عبر crawl_delay_loader، فيستخدم الأبطأ بينه وبين
+    المعدل المحدد.
+
+    يعمل مع الخيوط (wait) ومع asyncio (reserve ثم asyncio.sleep).
+    """
+
+    def __init__(self,
+                 rate: Optional[float] = None,
+                 burst: int = 1,
+                 host_rates: Optional[Dict[str, Tuple[float, int]]] = None,
+                 max_retry_after: float = DEFAULT_MAX_RETRY_AFTER,
+                 crawl_delay_loader: Optional[Callable[[str], Optional[float]]] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        تهيئة المحدد.
+
+        المعاملات:
+            rate (Optional[float]): عدد الطلبات في الثانية لكل مضيف (None يعني بدون حد).
+            burst (int): عدد الطلبات المسموح بها دفعة واحدة لكل مضيف.
+            host_rates (Optional[Dict[str, Tuple[float, int]]]): معدلات خاصة لمضيفين محددين
+                بالشكل {المضيف: (المعدل، الدفعة)} (اختياري).
+            max_retry_after (float): الحد الأقصى لمدة الإيقاف المقبولة من Retry-After بالثواني.
+            crawl_delay_loader (Optional[Callable[[str], Optional[float]]]): دالة تستقبل أول رابط
+                لكل مضيف وتعيد Crawl-delay بالثواني أو None (اختياري).
+            clock (Callable[[], float]): مصدر الوقت (للاختبارات).
+            sleep (Callable[[float], None]): دالة الانتظار (للاختبارات).
+        """
+        if burst < 1:
+            raise ValueError("يجب أن تكون الدفعة 1 على الأقل")
+
+        self.rate = rate
+        self.burst = burst
+        self.max_retry_after = max_retry_after
+        self.crawl_delay_loader = crawl_delay_loader
+        self._host_rates: Dict[str, Tuple[float, int]] = {
+            host.lower(): (host_rate, host_burst) for host, (host_rate, host_burst) in (host_rates or {}).items()
+        }
+        self._clock = clock
+        self._sleep = sleep
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def has_limits(self) -> bool:
+        """ما إذا كان هناك أي حد للمعدل (عام أو لمضيف محدد أو من robots.txt)."""
+        return self.rate is not None or bool(self._host_rates) or self.crawl_delay_loader is not None
+
+    def _new_bucket(self, host: str) -> Optional[TokenBucket]:
+        """إنشاء دلو المضيف حسب المعدل الخاص به أو المعدل العام."""
+        rate, burst = self._host_rates.get(host, (self.rate, self.burst))
+        return TokenBucket(rate, burst) if rate else None
+
+    def _get_state(self, url: str) -> _HostState:
+        """إرجاع حالة مضيف الرابط وتحميل Crawl-delay عند أول طلب له."""
+        host = get_host(url)
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = _HostState(self._new_bucket(host), loaded=self.crawl_delay_loader is None)
+                self._hosts[host] = state
+
+        if not state.loaded:
+            # يحمل أول خيط robots.txt وتنتظر بقية خيوط نفس المضيف فقط
+            with state.load_lock:
+                if not state.loaded:
+                    try:
+                        delay = self.crawl_delay_loader(url)
+                    except Exception as e:
+                        logger.warning(f"تعذر تحميل Crawl-delay للمضيف {host}: {str(e)}")
+                        delay = None
+                    if delay:
+                        self.set_crawl_delay(host, delay)
+                    state.loaded = True
+
+        return state
+
+    def set_rate(self, host: str, rate: Optional[float], burst: Optional[int] = None) -> None:
+        """
+        تحديد معدل خاص لمضيف.
+
+        المعاملات:
+            host (str): اسم المضيف (مثل "www.hikvision.com").
+            rate (Optional[float]): عدد الطلبات في الثانية (None يعني بدون حد).
+            burst (Optional[int]): الدفعة (الافتراضي: الدفعة العامة).
+        """
+        host = host.lower()
+        with self._lock:
+            self._host_rates[host] = (rate, burst or self.burst)
+            state = self._hosts.get(host)
+            if state is not None:
+                state.bucket = self._new_bucket(host)
+
+    def set_crawl_delay(self, host: str, delay: float) -> None:
+        """
+        تطبيق Crawl-delay على مضيف (يستخدم الأبطأ بينه وبين المعدل الحالي).
+
+        المعاملات:
+            host (str): اسم المضيف.
+            delay (float): المدة الدنيا بين طلبين بالثواني.
+        """
+        host = host.lower()
+        rate = 1.0 / delay
+        current, _ = self._host_rates.get(host, (self.rate, self.burst))
+        if current is None or rate < current:
+            logger.info(f"تطبيق Crawl-delay للمضيف {host}: {delay} ثانية بين الطلبات")
+            # Crawl-delay يعني طلبًا واحدًا في كل مدة دون دفعات
+            self.set_rate(host, rate, 1)
+
+    def reserve(self, url: str) -> float:
+        """
+        حجز موعد لطلب إلى مضيف الرابط وإرجاع مدة الانتظار قبل إرساله.
+
+        المعاملات:
+            url (str): رابط الطلب.
+
+        العوائد:
+            float: مدة الانتظار بالثواني (0 إذا كان يمكن الإرسال فورًا).
+        """
+        state = self._get_state(url)
+        with self._lock:
+            now = self._clock()
+            if state.bucket is None:
+                return max(state.blocked_until - now, 0.0)
+            return state.bucket.reserve(now, state.blocked_until)
+
+    def wait(self, url: str) -> float:
+        """
+        الانتظار حتى يحين موعد الطلب التالي لمضيف الرابط.
+
+        المعاملات:
+            url (str): رابط الطلب.
+
+        العوائد:
+            float: المدة التي تم انتظارها بالثواني.
+        """
+        delay = self.reserve(url)
+        if delay > 0:
+            self._sleep(delay)
+        return delay
+
+    def next_available(self, url: str) -> float:
+        """
+        مدة الانتظار المتوقعة لطلب إلى مضيف الرابط دون حجز.
+
+        المعاملات:
+            url (str): الرابط.
+
+        العوائد:
+            float: مدة الانتظار بالثواني.
+        """
+        with self._lock:
+            state = self._hosts.get(get_host(url))
+            if state is None:
+                return 0.0
+            now = self._clock()
+            if state.bucket is None:
+                return max(state.blocked_until - now, 0.0)
+            return state.bucket.delay(now, state.blocked_until)
+
+    def defer(self, url: str, seconds: float) -> None:
+        """
+        إيقاف الطلبات إلى مضيف الرابط لمدة محددة (مثل قيمة Retry-After).
+
+        المعاملات:
+            url (str): الرابط.
+            seconds (float): مدة الإيقاف بالثواني (يتم تقييدها بـ max_retry_after).
+        """
+        seconds = min(max(seconds, 0.0), self.max_retry_after)
+        state = self._get_state(url)
+        with self._lock:
+            state.blocked_until = max(state.blocked_until, self._clock() + seconds)
+        logger.warning(f"تم إيقاف الطلبات إلى {get_host(url)} لمدة {seconds:.1f} ثانية بطلب من الخادم")
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    تحليل رأس Retry-After (عدد ثوانٍ أو تاريخ HTTP).
+
+    المعاملات:
+        value (Optional[str]): قيمة الرأس.
+        now (Optional[float]): الوقت الحالي بتوقيت Unix (الافتراضي: time.time()).
+
+    العوائد:
+        Optional[float]: مدة الانتظار بالثواني أو None إذا كانت القيمة غير صالحة.
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at is None:
+        return None
+
+    return max(retry_at.timestamp() - (now if now is not None else time.time()), 0.0)
+
+
+def parse_crawl_delay(robots_txt: str, user_agent: str = "*") -> Optional[float]:
+    """
+    استخراج Crawl-delay (أو Request-rate) الخاص بوكيل المستخدم من محتوى robots.txt.
+
+    تستخدم مجموعة القواعد التي يظهر اسمها داخل وكيل المستخدم، وإلا مجموعة "*". تقبل
+    القيم العشرية (مثل 0.5) بخلاف urllib.robotparser.
+
+    المعاملات:
+        robots_txt (str): محتوى robots.txt.
+        user_agent (str): وكيل المستخدم المرسل في الطلبات.
+
+    العوائد:
+        Optional[float]: المدة الدنيا بين طلبين بالثواني أو None إذا لم تحدد.
+    """
+    agent = user_agent.lower()
+    groups = []
+    current = None
+
+    for raw_line in robots_txt.splitlines():
+        line = raw_line.split("#", 1)[0].strip()
+        if ":" not in line:
+            continue
+        field, value = (part.strip() for part in line.split(":", 1))
+        field = field.lower()
+
+        if field == "user-agent":
+            # أسطر user-agent المتتالية تشترك في نفس مجموعة القواعد
+            if current is None or current["rules"]:
+                current = {"agents": [], "rules": False, "delay": None}
+                groups.append(current)
+            current["agents"].append(value.lower())
+            continue
+
+        if current is None:
+            continue
+        current["rules"] = True
+
+        if field == "crawl-delay":
+            try:
+                current["delay"] = max(float(value), 0.0)
+            except ValueError:
+                pass
+        elif field == "request-rate" and current["delay"] is None:
+            match = _REQUEST_RATE_RE.match(value)
+            if match and int(match.group(1)) > 0:
+                seconds = float(match.group(2)) * _TIME_UNITS[match.group(3).lower()]
+                current["delay"] = seconds / int(match.group(1))
+
+    default_delay = None
+    for group in groups:
+        for name in group["agents"]:
+            if name == "*":
+                if default_delay is None:
+                    default_delay = group["delay"]
+            elif name and name in agent:
+                return group["delay"]
+
+    return default_delay
+
+
+def interleave_hosts(urls: Iterable[str],
+                     limiter: Optional[HostRateLimiter] = None,
+                     lookahead: int = DEFAULT_LOOKAHEAD) -> Iterator[str]:
+    """
+    إعادة ترتيب الروابط بالتناوب بين المضيفين.
+
+    تقرأ حتى lookahead رابطًا مسبقًا وتوزعها على طوابير لكل مضيف، ثم تعيد في كل مرة
+    رابطًا من المضيف الذي يحين موعد طلبه أولاً حسب المحدد (وبالتناوب عند التساوي). بذلك
+    تتوزع الطلبات على الشركات المصنعة ولا تنتظر كل العمال دلو مضيف واحد بينما المضيفون
+    الآخرون متاحون.
+
+    المعاملات:
+        urls (Iterable[str]): الروابط.
+        limiter (Optional[HostRateLimiter]): محدد المعدل لمعرفة أقرب مضيف متاح (اختياري،
+            بدونه يكون التناوب دوريًا).
+        lookahead (int): عدد الروابط التي تتم قراءتها مسبقًا.
+
+    العوائد:
+        Iterator[str]: الروابط بالترتيب الجديد.
+    """
+    source = iter(urls)
+    # المضيف -> روابطه المنتظرة؛ ترتيب القاموس هو ترتيب التناوب
+    queues: Dict[str, deque] = {}
+    buffered = 0
+    exhausted = False
+    lookahead = max(lookahead, 1)
+
+    while True:
+        while not exhausted and buffered < lookahead:
+            try:
+                url = next(source)
+            except StopIteration:
+                exhausted = True
+                break
+            queues.setdefault(get_host(url), deque()).append(url)
+            buffered += 1
+
+        if not queues:
+            return
+
+        if limiter is None:
+            host = next(iter(queues))
+        else:
+            host = min(queues, key=lambda name: limiter.next_available(queues[name][0]))
+
+        pending = queues.pop(host)
+        url = pending.popleft()
+        buffered -= 1
+        if pending:
+            # نقل المضيف إلى نهاية الدور
+            queues[host] = pending
+
+        yield url
@@ -0,0 +1,330 @@
+# الملف: security_cameras_scraper/utils/retry_utils.py
+
+"""
+أدوات إعادة المحاولة دون إيقاف العمال.
+
+    RetryPolicy:     تصنيف الأخطاء القابلة لإعادة المحاولة وحساب التأخير مع تشويش كامل (full jitter).
+    RetryScheduler:  طابور مؤقت (timer queue) للمحاولات المؤجلة حتى ينتقل العامل إلى روابط أخرى.
+    CircuitBreaker:  قاطع دائرة لكل مضيف يوقف الطلبات إلى موقع متعطل ثم يختبره بطلب واحد.
+
+تعمل الأدوات على نتائج الطلبات (FetchResult) التي يرسلها fetch_page_raw إلى المراقب (observer).
+"""
+
+import heapq
+import random
+import time
+import logging
+import threading
+from itertools import count
+from typing import Any, Callable, Dict, List, Optional
+
+from .session_utils import get_host
+
+logger = logging.getLogger(__name__)
+
+# رموز الحالة المؤقتة التي يعاد طلبها
+RETRYABLE_STATUSES = (408, 425, 429, 500, 502, 503, 504)
+
+# أنواع الأخطاء (FetchResult.error) المؤقتة التي يعاد طلبها
+RETRYABLE_ERRORS = ("timeout", "connection", "circuit_open")
+
+# حالات قاطع الدائرة
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class RetryPolicy:
+    """
+    سياسة إعادة المحاولة.
+
+    يعاد طلب الأخطاء المؤقتة فقط (انتهاء المهلة، أخطاء الاتصال، 429، 5xx)، أما الأخطاء
+    الدائمة مثل 404 فتعاد نتيجتها مباشرة. يختار التأخير عشوائيًا بين صفر والتأخير
+    الأسي (full jitter) حتى لا يعيد العمال المتوازيون طلباتهم في نفس اللحظة، ولا يقل عن
+    Retry-After إذا طلبه الخادم.
+    """
+
+    def __init__(self,
+                 max_retries: int = 2,
+                 base_delay: float = 1.0,
+                 max_delay: float = 30.0,
+                 rng: Optional[random.Random] = None):
+        """
+        تهيئة السياسة.
+
+        المعاملات:
+            max_retries (int): عدد مرات إعادة المحاولة بعد المحاولة الأولى (0 لتعطيلها).
+            base_delay (float): التأخير الأساسي بالثواني (يتضاعف مع كل محاولة).
+            max_delay (float): الحد الأقصى للتأخير الأسي بالثواني.
+            rng (Optional[random.Random]): مولد أرقام عشوائية (للاختبارات).
+        """
+        if max_retries < 0:
+            raise ValueError("يجب ألا يكون عدد مرات إعادة المحاولة سالبًا")
+
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = rng or random.Random()
+
+    def is_retryable(self, result: Any) -> bool:
+        """
+        ما إذا كان الخطأ مؤقتًا ويستحق إعادة المحاولة.
+
+        المعاملات:
+            result (Any): نتيجة الطلب (FetchResult).
+
+        العوائد:
+            bool: True للأخطاء المؤقتة، False للنجاح والأخطاء الدائمة (مثل 404).
+        """
+        if result.error is None:
+            return False
+        return result.status in RETRYABLE_STATUSES or result.error in RETRYABLE_ERRORS
+
+    def should_retry(self, result: Any, attempt: int) -> bool:
+        """
+        ما إذا كان يجب إعادة المحاولة بعد المحاولة رقم attempt (تبدأ من 0).
+
+        المعاملات:
+            result (Any): نتيجة المحاولة (FetchResult).
+            attempt (int): رقم المحاولة.
+
+        العوائد:
+            bool: True إذا كان الخطأ مؤقتًا ولم تستنفد المحاولات.
+        """
+        return attempt < self.max_retries and self.is_retryable(result)
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        التأخير قبل المحاولة التالية.
+
+        المعاملات:
+            attempt (int): رقم المحاولة التي فشلت (تبدأ من 0).
+            retry_after (Optional[float]): المدة التي طلبها الخادم بالثواني (اختياري).
+
+        العوائد:
+            float: التأخير بالثواني.
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        delay = self._rng.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
+class RetryScheduler:
+    """
+    طابور مؤقت للمحاولات المؤجلة مرتب حسب موعدها.
+
+    يضع العامل الرابط الفاشل في الطابور وينتقل إلى رابط آخر بدلاً من الانتظار، ويعيد
+    الموزع إرسال الروابط التي حان موعدها. آمن للاستخدام من عدة خيوط.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        """
+        تهيئة الطابور.
+
+        المعاملات:
+            clock (Callable[[], float]): مصدر الوقت (للاختبارات).
+        """
+        self._clock = clock
+        self._heap: List[Any] = []
+        self._counter = count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._heap)
+
+    def schedule(self, item: Any, delay: float) -> None:
+        """
+        جدولة عنصر بعد مدة.
+
+        المعاملات:
+            item (Any): العنصر (مثل (الرابط، رقم المحاولة)).
+            delay (float): المدة بالثواني.
+        """
+        with self._lock:
+            heapq.heappush(self._heap, (self._clock() + max(delay, 0.0), next(self._counter), item))
+
+    def pop_due(self) -> Optional[Any]:
+        """
+        إخراج أقدم عنصر حان موعده.
+
+        العوائد:
+            Optional[Any]: العنصر أو None إذا لم يحن موعد أي عنصر.
+        """
+        with self._lock:
+            if self._heap and self._heap[0][0] <= self._clock():
+                return heapq.heappop(self._heap)[2]
+            return None
+
+    def pop_all_due(self) -> List[Any]:
+        """
+        إخراج جميع العناصر التي حان موعدها.
+
+        العوائد:
+            List[Any]: العناصر بترتيب مواعيدها.
+        """
+        items = []
+        with self._lock:
+            now = self._clock()
+            while self._heap and self._heap[0][0] <= now:
+                items.append(heapq.heappop(self._heap)[2])
+        return items
+
+    def drain(self) -> List[Any]:
+        """
+        إخراج جميع العناصر دون انتظار مواعيدها (مثل انتهاء مهلة الدفعة).
+
+        العوائد:
+            List[Any]: العناصر بترتيب مواعيدها.
+        """
+        with self._lock:
+            items = [heapq.heappop(self._heap)[2] for _ in range(len(self._heap))]
+        return items
+
+    def next_delay(self) -> Optional[float]:
+        """
+        المدة حتى موعد أقرب عنصر.
+
+        العوائد:
+            Optional[float]: المدة بالثواني (0 إذا حان موعده) أو None إذا كان الطابور فارغًا.
+        """
+        with self._lock:
+            if not self._heap:
+                return None
+            return max(self._heap[0][0] - self._clock(), 0.0)
+
+
+class _Circuit:
+    """حالة دائرة مضيف واحد."""
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+
+class CircuitBreaker:
+    """
+    قاطع دائرة لكل مضيف.
+
+    بعد failure_threshold خطأ متتالي يدل على تعطل الموقع (انتهاء المهلة، خطأ اتصال،
+    5xx) تفتح دائرة المضيف فلا ترسل إليه طلبات لمدة recovery_time، ثم يسمح بطلب اختبار
+    واحد: نجاحه يغلق الدائرة وفشله يعيد فتحها. لا تعد الأخطاء الدائمة مثل 404 تعطلاً
+    (الموقع يستجيب)، ولا 429 التي يعالجها محدد المعدل.
+    """
+
+    def __init__(self,
+                 failure_threshold: int = 5,
+                 recovery_time: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        تهيئة القاطع.
+
+        المعاملات:
+            failure_threshold (int): عدد الأخطاء المتتالية قبل فتح الدائرة.
+            recovery_time (float): مدة فتح الدائرة بالثواني قبل طلب الاختبار.
+            clock (Callable[[], float]): مصدر الوقت (للاختبارات).
+        """
+        if failure_threshold < 1:
+            raise ValueError("يجب أن يكون حد الأخطاء 1 على الأقل")
+
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self._clock = clock
+        self._circuits: Dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def _get_circuit(self, host: str) -> _Circuit:
+        """إرجاع دائرة المضيف وإنشاؤها عند الحاجة (يجب استدعاؤها مع القفل)."""
+        circuit = self._circuits.get(host)
+        if circuit is None:
+            circuit = _Circuit()
+            self._circuits[host] = circuit
+        return circuit
+
+    def before_request(self, url: str) -> Optional[float]:
+        """
+        التحقق من إمكانية إرسال طلب إلى مضيف الرابط.
+
+        عند انتهاء مدة الفتح يسمح بطلب اختبار واحد، وتبقى بقية الطلبات موقوفة حتى
+        تصل نتيجته أو تنتهي مدة فتح جديدة.
+
+        المعاملات:
+            url (str): رابط الطلب.
+
+        العوائد:
+            Optional[float]: None إذا كان يمكن الإرسال، وإلا المدة المتبقية بالثواني.
+        """
+        host = get_host(url)
+        with self._lock:
+            circuit = self._get_circuit(host)
+            if circuit.state == CLOSED:
+                return None
+
+            remaining = circuit.opened_at + self.recovery_time - self._clock()
+            if remaining > 0:
+                return remaining
+
+            # طلب اختبار واحد ثم إيقاف البقية لمدة جديدة
+            circuit.state = HALF_OPEN
+            circuit.opened_at = self._clock()
+            logger.info(f"إرسال طلب اختبار إلى {host} بعد فتح الدائرة")
+            return None
+
+    def record(self, result: Any) -> None:
+        """
+        تسجيل نتيجة طلب (FetchResult).
+
+        المعاملات:
+            result (Any): نتيجة الطلب.
+        """
+        host = get_host(result.url)
+        failed = result.error in ("timeout", "connection") or (result.status or 0) >= 500
+        throttled = result.status == 429
+
+        with self._lock:
+            circuit = self._get_circuit(host)
+            if throttled:
+                return
+
+            if not failed:
+                if circuit.state != CLOSED:
+                    logger.info(f"تم إغلاق الدائرة للمضيف {host} بعد نجاح طلب الاختبار")
+                circuit.state = CLOSED
+                circuit.failures = 0
+                return
+
+            circuit.failures += 1
+            if circuit.state == HALF_OPEN or circuit.failures >= self.failure_threshold:
+                if circuit.state != OPEN:
+                    logger.warning(
+                        f"تم فتح الدائرة للمضيف {host} بعد {circuit.failures} خطأ متتالي، "
+                        f"إيقاف الطلبات لمدة {self.recovery_time} ثانية"
+                    )
+                circuit.state = OPEN
+                circuit.opened_at = self._clock()
+
+    def state(self, url: str) -> str:
+        """
+        حالة دائرة مضيف الرابط.
+
+        المعاملات:
+            url (str): الرابط.
+
+        العوائد:
+            str: "closed" أو "open" أو "half_open".
+        """
+        with self._lock:
+            return self._get_circuit(get_host(url)).state
+
+    def states(self) -> Dict[str, str]:
+        """
+        حالات جميع الدوائر.
+
+        العوائد:
+            Dict[str, str]: {المضيف: الحالة}.
+        """
+        with self._lock:
+            return {host: circuit.state for host, circuit in self._circuits.items()}
@@ -0,0 +1,172 @@
+# الملف: security_cameras_scraper/utils/session_utils.py
+
+"""
+أدوات لإدارة جلسات HTTP المشتركة وإعادة استخدام الاتصالات.
+"""
+
+import atexit
+import logging
+import threading
+from typing import Dict, Optional, TYPE_CHECKING
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    import requests
+
+logger = logging.getLogger(__name__)
+
+
+def get_host(url: str) -> str:
+    """
+    استخراج اسم المضيف من الرابط.
+
+    المعاملات:
+        url (str): الرابط.
+
+    العوائد:
+        str: اسم المضيف بأحرف صغيرة أو سلسلة فارغة إذا تعذر تحليله.
+    """
+    try:
+        return (urlsplit(url).hostname or "").lower()
+    except ValueError:
+        return ""
+
+
+class SessionManager:
+    """
+    مدير جلسات HTTP يحتفظ بجلسة requests.Session واحدة لكل مضيف.
+
+    تعيد كل جلسة استخدام اتصالات TCP/TLS المفتوحة (keep-alive) بدلاً من فتح
+    اتصال جديد لكل صفحة، ويمكن استخدام المدير كمدير سياق (with) لإغلاق الجلسات تلقائيًا.
+    """
+
+    def __init__(self, pool_size: int = 10, headers: Optional[Dict[str, str]] = None):
+        """
+        تهيئة مدير الجلسات.
+
+        المعاملات:
+            pool_size (int): الحد الأقصى لعدد الاتصالات المفتوحة لكل مضيف.
+            headers (Optional[Dict[str, str]]): رؤوس HTTP تضاف لكل جلسة جديدة (اختياري).
+        """
+        if pool_size < 1:
+            raise ValueError("يجب أن يكون حجم مجمع الاتصالات 1 على الأقل")
+
+        self.pool_size = pool_size
+        self.headers = dict(headers or {})
+        self._sessions: Dict[str, "requests.Session"] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def get_session(self, url: str) -> "requests.Session":
+        """
+        إرجاع الجلسة الخاصة بمضيف الرابط، وإنشاؤها عند أول استخدام.
+
+        المعاملات:
+            url (str): الرابط المطلوب.
+
+        العوائد:
+            requests.Session: الجلسة المشتركة للمضيف.
+
+        الاستثناءات:
+            RuntimeError: إذا كان المدير مغلقًا.
+        """
+        host = get_host(url)
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("مدير الجلسات مغلق")
+
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._create_session()
+                self._sessions[host] = session
+                logger.debug(f"تم إنشاء جلسة جديدة للمضيف: {host}")
+
+            return session
+
+    def _create_session(self) -> "requests.Session":
+        """
+        إنشاء جلسة جديدة بمجمع اتصالات بالحجم المحدد.
+
+        العوائد:
+            requests.Session: الجلسة الجديدة.
+        """
+        # استيراد requests عند إنشاء أول جلسة فقط لتسريع استيراد الحزمة
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        if self.headers:
+            session.headers.update(self.headers)
+
+        return session
+
+    def get(self, url: str, **kwargs) -> "requests.Response":
+        """
+        تنفيذ طلب GET عبر جلسة المضيف.
+
+        المعاملات:
+            url (str): الرابط المطلوب.
+            **kwargs: معاملات إضافية تمرر إلى requests.Session.get.
+
+        العوائد:
+            requests.Response: استجابة الخادم.
+        """
+        return self.get_session(url).get(url, **kwargs)
+
+    @property
+    def closed(self) -> bool:
+        """ما إذا كان المدير مغلقًا."""
+        return self._closed
+
+    @property
+    def hosts(self) -> list:
+        """قائمة المضيفين الذين لديهم جلسات مفتوحة."""
+        with self._lock:
+            return list(self._sessions.keys())
+
+    def close(self) -> None:
+        """إغلاق جميع الجلسات وتحرير الاتصالات المفتوحة."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            self._closed = True
+
+        for session in sessions:
+            try:
+                session.close()
+            except Exception as e:
+                logger.debug(f"خطأ أثناء إغلاق الجلسة: {str(e)}")
+
+    def __enter__(self) -> "SessionManager":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+_default_manager: Optional[SessionManager] = None
+_default_manager_lock = threading.Lock()
+
+
+def get_default_session_manager() -> SessionManager:
+    """
+    إرجاع مدير الجلسات المشترك على مستوى العملية.
+
+    يستخدم عند استدعاء fetch_page دون تمرير مدير جلسات، بحيث تعيد الاستدعاءات
+    المتتالية استخدام نفس الاتصالات. يغلق تلقائيًا عند انتهاء البرنامج.
+
+    العوائد:
+        SessionManager: مدير الجلسات الافتراضي.
+    """
+    global _default_manager
+
+    with _default_manager_lock:
+        if _default_manager is None or _default_manager.closed:
+            _default_manager = SessionManager()
+            atexit.register(_default_manager.close)
+        return _default_manager
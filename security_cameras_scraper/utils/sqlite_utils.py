@@ -0,0 +1,39 @@
+# الملف: security_cameras_scraper/utils/sqlite_utils.py
+
+"""
+أدوات مشتركة لمخازن SQLite التي تكتب إليها عدة خيوط وعمليات (JobStore و RecrawlState).
+"""
+
+import sqlite3
+import threading
+from typing import Any, Callable
+
+
+def write_transaction(conn: sqlite3.Connection, lock: threading.Lock,
+                      statements: Callable[[sqlite3.Connection], Any]) -> Any:
+    """
+    تنفيذ دالة كتابة داخل معاملة BEGIN IMMEDIATE.
+
+    يحجز BEGIN IMMEDIATE قفل الكتابة من بداية المعاملة، فلا تقرأ عمليتان نفس الصفوف ثم تكتبان
+    فوق بعضهما. يجب أن يكون الاتصال مفتوحًا بـ isolation_level=None (إدارة المعاملات يدويًا).
+
+    المعاملات:
+        conn (sqlite3.Connection): الاتصال.
+        lock (threading.Lock): قفل الاتصال بين خيوط نفس العملية.
+        statements (Callable[[sqlite3.Connection], Any]): دالة تنفذ عبارات الكتابة.
+
+    العوائد:
+        Any: ما تعيده statements.
+
+    الاستثناءات:
+        BaseException: أي استثناء من statements بعد التراجع عن المعاملة.
+    """
+    with lock:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = statements(conn)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return result
@@ -0,0 +1,91 @@
+# الملف: security_cameras_scraper/utils/url_utils.py
+
+"""
+أدوات لتوحيد روابط المنتجات حتى يتم التعرف على نسخ الرابط نفسه.
+"""
+
+import re
+from typing import Dict, Iterable, List
+from urllib.parse import parse_qsl, quote, unquote, urlencode, urlsplit, urlunsplit
+
+# معاملات التتبع التي لا تغير محتوى الصفحة
+TRACKING_PARAMETERS = frozenset({
+    "gclid", "dclid", "fbclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "_ga", "_gl", "ref", "referrer", "spm",
+})
+TRACKING_PREFIXES = ("utm_",)
+
+# أحرف متكافئة في مسارات المنتجات لكل نطاق (مثل HAC-HFW1200TH-I8-A=S6 و HAC-HFW1200TH-I8-A_S6)
+SLUG_EQUIVALENTS = {
+    "dahuasecurity.com": (("=", "_"),),
+    "dahuatech.com": (("=", "_"),),
+}
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# الأحرف التي تبقى دون ترميز في المسار بعد توحيد ترميز النسبة المئوية
+_PATH_SAFE = "/-._~!$&'()*+,;=:@"
+_REPEATED_SLASHES = re.compile(r"/{2,}")
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    الصيغة الموحدة لرابط منتج لاستخدامها كمفتاح لاكتشاف النسخ المكررة.
+
+    توحد حالة الأحرف في المضيف والمسار، وتزيل المنفذ الافتراضي والشرطة المائلة في نهاية
+    المسار والجزء بعد # ومعاملات التتبع (utm_* وغيرها)، وترتب بقية المعاملات وتوحد ترميز
+    النسبة المئوية والأحرف المتكافئة في مسار النطاق (SLUG_EQUIVALENTS).
+
+    الصيغة الموحدة مفتاح فقط وقد لا تكون رابطًا صالحًا للطلب (مثل المسار بأحرف صغيرة)،
+    لذلك يتم طلب أحد الروابط الأصلية لكل مجموعة.
+
+    المعاملات:
+        url (str): الرابط.
+
+    العوائد:
+        str: الرابط الموحد، أو الرابط كما هو إذا تعذر تحليله.
+    """
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if port is not None and DEFAULT_PORTS.get(scheme) != port:
+        host = f"{host}:{port}"
+
+    path = quote(unquote(parts.path), safe=_PATH_SAFE)
+    path = _REPEATED_SLASHES.sub("/", path).rstrip("/").lower() or "/"
+    for domain, equivalents in SLUG_EQUIVALENTS.items():
+        if host == domain or host.endswith("." + domain):
+            for variant, canonical in equivalents:
+                path = path.replace(variant, canonical)
+
+    query = urlencode(sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name.lower() not in TRACKING_PARAMETERS and not name.lower().startswith(TRACKING_PREFIXES)
+    ))
+
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def group_urls(urls: Iterable[str]) -> Dict[str, List[str]]:
+    """
+    تجميع الروابط حسب صيغتها الموحدة.
+
+    المعاملات:
+        urls (Iterable[str]): الروابط.
+
+    العوائد:
+        Dict[str, List[str]]: {الرابط الموحد: الروابط الأصلية المختلفة بترتيب ظهورها}،
+        والمجموعات بترتيب أول ظهور لها.
+    """
+    groups: Dict[str, List[str]] = {}
+    for url in urls:
+        members = groups.setdefault(canonicalize_url(url), [])
+        if url not in members:
+            members.append(url)
+    return groups
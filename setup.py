@@ -7,7 +7,7 @@ setup(
     author_email="your.email@example.com",
     description="مكتبة Python لاستخراج بيانات منتجات كاميرات المراقبة من مواقع الشركات المصنعة",
     packages=find_packages(),  # هذا سيجد المجلد الفرعي security_cameras_scraper
-    python_requires=">=3.6",
+    python_requires=">=3.7",
     install_requires=[
         "requests>=2.25.0",
         "beautifulsoup4>=4.9.3",
@@ -15,4 +15,11 @@ setup(
         "pandas>=1.2.0",
         "openpyxl>=3.0.0",
     ],
+    extras_require={
+        "async": ["aiohttp>=3.8.0"],
+        "zstd": ["zstandard>=0.15.0"],
+        "html5lib": ["html5lib>=1.1"],
+        "selectolax": ["selectolax>=0.3.17"],
+        "lxml-css": ["cssselect>=1.1.0"],
+    },
 )
\ No newline at end of file
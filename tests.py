@@ -7,12 +7,123 @@
 
 import os
 import unittest
+import contextlib
 import tempfile
 import json
-from security_cameras_scraper import CameraScraper
+import gzip
+import threading
+import time
+import asyncio
+import sys
+import subprocess
+import functools
+from unittest import mock
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from socketserver import ThreadingMixIn
+from security_cameras_scraper import CameraScraper, AsyncCameraScraper
 from security_cameras_scraper.scrapers.hikvision_scraper import HikvisionScraper
 from security_cameras_scraper.scrapers.dahua_scraper import DahuaScraper
 from security_cameras_scraper.utils.http_utils import fetch_page
+from security_cameras_scraper.utils.session_utils import SessionManager
+from security_cameras_scraper.utils import async_http_utils
+from security_cameras_scraper.utils.cache_utils import HttpCache
+from security_cameras_scraper.utils.archive_utils import HtmlArchive
+from security_cameras_scraper.utils.encoding_utils import sniff_encoding
+from security_cameras_scraper.utils.http_utils import fetch_page_raw, FetchResult
+from security_cameras_scraper.utils.concurrency_utils import AdaptiveHostLimiter, SingleFlight
+from security_cameras_scraper.utils.url_utils import canonicalize_url, group_urls
+from security_cameras_scraper.utils import model_utils
+from security_cameras_scraper.utils.model_utils import ModelIndex, parse_product_url
+from security_cameras_scraper.utils.retry_utils import CircuitBreaker, RetryPolicy
+from security_cameras_scraper.utils.hedge_utils import DEADLINE_EXCEEDED, Deadline, RequestHedger
+from security_cameras_scraper.utils.rate_limit_utils import (
+    HostRateLimiter, interleave_hosts, parse_crawl_delay, parse_retry_after
+)
+from security_cameras_scraper.scrapers import registry as registry_module
+from security_cameras_scraper.scrapers.registry import ManufacturerRegistry
+from security_cameras_scraper.utils.parser_backends import parse_document, available_backends
+from security_cameras_scraper.utils.html_utils import clear_selector_cache, selector_cache_info
+from security_cameras_scraper.export.json_exporter import JsonStreamWriter
+from security_cameras_scraper.discovery import (
+    BloomFilter, CatalogCrawler, Frontier, HashedSet, IncrementalRecrawler, RecrawlState, parse_sitemap
+)
+from security_cameras_scraper.jobs import JobStore, MemoryLeaseQueue, merge_shards, run_jobs, run_worker
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class LocalSite:
+    """خادم HTTP محلي يقدم صفحات محفوظة مسبقًا للاختبارات دون الحاجة للشبكة."""
+    
+    def __init__(self, pages):
+        """
+        المعاملات:
+            pages (dict): خريطة من المسار إلى محتوى الصفحة (str) أو دالة تعيد (status, headers, body).
+        """
+        self.pages = pages
+        self.requests = []
+        self.client_ports = set()
+        site = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def do_GET(self):
+                site.requests.append((self.path, dict(self.headers)))
+                site.client_ports.add(self.client_address[1])
+                page = site.pages.get(self.path)
+                if page is None:
+                    status, headers, body = 404, {}, b"not found"
+                elif callable(page):
+                    status, headers, body = page(self)
+                else:
+                    status, headers, body = 200, {"Content-Type": "text/html; charset=utf-8"}, page
+                if isinstance(body, str):
+                    body = body.encode("utf-8")
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, *args):
+                pass
+        
+        self.server = _ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+    
+    def url(self, path):
+        return self.base_url + path
+    
+    def __enter__(self):
+        self.thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def echo_page(handler, delay=0):
+    """صفحة اختبار تبدأ بمسار الطلب بعد <html><body> (يقرؤه _BodyScraper)."""
+    if delay:
+        time.sleep(delay)
+    return 200, {"Content-Type": "text/html"}, f"<html><body>{handler.path}{'.' * 100}</body></html>"
+
+
+class _BodyScraper:
+    """مستخرج اختبار يعيد بداية محتوى الصفحة بعد <html><body> حتى slice_end."""
+    
+    def __init__(self, slice_end):
+        self.slice_end = slice_end
+    
+    def extract(self, html, url):
+        return {"Page": {"Body": html[12:self.slice_end]}}
+
 
 class TestCameraScraper(unittest.TestCase):
     """اختبارات للمكتبة الرئيسية."""
@@ -29,6 +140,9 @@ class TestCameraScraper(unittest.TestCase):
         self.assertEqual(self.scraper.detect_manufacturer(self.hikvision_url), "hikvision")
         self.assertEqual(self.scraper.detect_manufacturer(self.dahua_url), "dahua")
         self.assertIsNone(self.scraper.detect_manufacturer("https://example.com/product123"))
+        # اسم الشركة في نص الاستعلام فقط لا يكفي للتعرف عليها
+        self.assertIsNone(self.scraper.detect_manufacturer("https://example.com/p?ref=dahua"))
+        self.assertEqual(self.scraper.detect_manufacturer("https://us.hikvision.com/en/x"), "hikvision")
     
     def test_add_manufacturer_scraper(self):
         """اختبار وظيفة إضافة مستخرج جديد."""
@@ -40,6 +154,18 @@ class TestCameraScraper(unittest.TestCase):
         
         # التحقق من إضافة المستخرج
         self.assertIn("mock", self.scraper.scrapers)
+        self.assertEqual(self.scraper.detect_manufacturer("https://www.mock-cams.com/p/1"), "mock")
+    
+    def test_registry_domains_and_path_prefixes(self):
+        """اختبار التعرف بلاحقة النطاق وبادئة المسار."""
+        mock_scraper = type("MockScraper", (), {"extract": lambda s, h, u: {}})()
+        self.scraper.add_manufacturer_scraper("acme", mock_scraper, domains=["acme.example"], path_prefixes=["/cameras/"])
+        self.scraper.add_manufacturer_scraper("acme_nvr", mock_scraper, domains=["acme.example"], path_prefixes=["/cameras/nvr/"])
+        
+        self.assertEqual(self.scraper.detect_manufacturer("https://shop.acme.example/cameras/x"), "acme")
+        self.assertEqual(self.scraper.detect_manufacturer("https://acme.example/Cameras/NVR/x"), "acme_nvr")
+        self.assertIsNone(self.scraper.detect_manufacturer("https://acme.example/blog/x"))
+        self.assertIsNone(self.scraper.detect_manufacturer("https://notacme.example/cameras/x"))
     
     def test_export_formats(self):
         """اختبار وظائف التصدير."""
@@ -137,6 +263,71 @@ class TestHikvisionScraper(unittest.TestCase):
         self.assertIn("Camera", data)
         self.assertIn("Type", data["Camera"])
         self.assertEqual(data["Camera"]["Type"], "1/2.8\" Progressive Scan CMOS")
+    
+    def test_selectors_are_compiled_once(self):
+        """اختبار ترجمة محددات CSS مرة واحدة عبر الصفحات."""
+        page = """
+        <html><body><ul class="tech-specs-items-description" data-target="Camera">
+            <li class="tech-specs-items-description-list">
+                <span class="tech-specs-items-description__title">Type</span>
+                <span class="tech-specs-items-description__title-details">CMOS</span>
+            </li>
+        </ul></body></html>
+        """
+        clear_selector_cache()
+        self.scraper.extract(page, self.url)
+        misses = selector_cache_info().misses
+        
+        for _ in range(3):
+            self.scraper.extract(page, self.url)
+        
+        info = selector_cache_info()
+        self.assertEqual(info.misses, misses)
+        self.assertGreaterEqual(info.hits, 3 * misses)
+    
+    def test_lxml_engine_matches_bs4(self):
+        """اختبار تطابق مخرجات محرك lxml مع محرك BeautifulSoup."""
+        sample_html = """
+        <html><body>
+            <div class="product_description_title_tag_container">
+                <div class="product_description_title"><h2> DS-2CD <b>2043</b><!-- x --> &nbsp;</h2></div>
+            </div>
+            <ul class="tech-specs-items-description" data-target="Camera">
+                <li class="tech-specs-items-description-list">
+                    <span class="tech-specs-items-description__title">Image   Sensor</span>
+                    <span class="tech-specs-items-description__title-details">1/3" <i>CMOS</i><script>x()</script></span>
+                </li>
+                <li class="tech-specs-items-description-list">
+                    <span class="tech-specs-items-description__title--heading">Lens</span>
+                </li>
+                <li class="extra tech-specs-items-description-list">
+                    <span class="x tech-specs-items-description__title-details">2.8 mm</span>
+                    <span class="tech-specs-items-description__title">Focal Length</span>
+                </li>
+                <li class="tech-specs-items-description-list">
+                    <span class="tech-specs-items-description__title">Orphan</span>
+                </li>
+            </ul>
+            <ul class="tech-specs-items-description" data-target="Empty"></ul>
+            <ul class="tech-specs-items-description" data-target="Network">
+                <li class="tech-specs-items-description-list">
+                    <span class="tech-specs-items-description__title">Protocols</span>
+                    <span class="tech-specs-items-description__title-details">TCP/IP, ICMP, HTTP</span>
+                </li>
+            </ul>
+        </body></html>
+        """
+        lxml_scraper = HikvisionScraper(engine="lxml")
+        
+        for content in (sample_html, sample_html.encode("utf-8")):
+            self.assertEqual(lxml_scraper.extract(content, self.url), self.scraper.extract(content, self.url))
+        
+        # صفحة دون أقسام تنتقل إلى الطريقة البديلة
+        no_sections = sample_html.replace('data-target="', 'data-x="')
+        self.assertEqual(lxml_scraper.extract(no_sections, self.url), self.scraper.extract(no_sections, self.url))
+        
+        with self.assertRaises(ValueError):
+            HikvisionScraper(engine="regex")
 
 class TestDahuaScraper(unittest.TestCase):
     """اختبارات لمستخرج Dahua."""
@@ -182,6 +373,1552 @@ class TestDahuaScraper(unittest.TestCase):
         
         # لاحظ: هذا الاختبار قد يفشل اعتمادًا على طريقة معالجة الجداول في مستخرج Dahua
         # يمكن تعديل هذا الاختبار بناءً على السلوك الفعلي للمستخرج
+    
+    def test_dori_tables_and_lxml_engine(self):
+        """اختبار جداول DORI (rowspan/colspan) وتطابق محرك lxml مع BeautifulSoup."""
+        sample_html = """
+        <html><body>
+            <div class="el-row"><h3 class="title">HAC-HFW1200TH</h3><p class="text">HDCVI  Camera</p></div>
+            <table>
+                <tr><td>Lens</td></tr>
+                <tr><td>Focal   Length</td><td> 2.8 mm <b>fixed</b></td></tr>
+                <tr><td>DORI Distance (EN-62676-4): the ability to distinguish people...</td></tr>
+                <tr><td rowspan="3">DORI Distance</td><td>Detect</td><td>Observe</td><td>DORI note</td></tr>
+                <tr><td colspan="1">40 m</td><td colspan="1">16 m</td><td colspan="1">8 m</td></tr>
+                <tr><td colspan="1">DORI ignored</td><td colspan="1">12 m</td></tr>
+                <tr><td>Unused</td><td>three</td><td>cells</td></tr>
+            </table>
+            <table><tr><td>Empty Section</td></tr></table>
+        </body></html>
+        """
+        data = self.scraper.extract(sample_html, self.url)
+        
+        self.assertEqual(data["General information"], {"Product Title": "HAC-HFW1200TH", "Product Type": "HDCVI  Camera"})
+        self.assertEqual(data["Lens"]["Focal Length"], "2.8 mmfixed")
+        self.assertEqual(data["Lens"]["DORI Distance"], [
+            {"Detect": "40 m", "Observe": "16 m", "column_2": "8 m"},
+            {"Detect": "12 m"},
+        ])
+        self.assertNotIn("Empty Section", data)
+        
+        lxml_scraper = DahuaScraper(engine="lxml")
+        self.assertEqual(lxml_scraper.extract(sample_html.encode("utf-8"), self.url), data)
+
+class TestSessionManager(unittest.TestCase):
+    """اختبارات لإدارة جلسات HTTP المشتركة."""
+    
+    def test_connections_are_reused_per_host(self):
+        """اختبار إعادة استخدام نفس الاتصال للطلبات المتتالية لنفس المضيف."""
+        page = "<html><body>" + "x" * 200 + "</body></html>"
+        with LocalSite({"/a": page, "/b": page}) as site:
+            with SessionManager(pool_size=2) as manager:
+                for path in ["/a", "/b", "/a", "/b"]:
+                    self.assertEqual(fetch_page(site.url(path), session_manager=manager), page)
+                
+                self.assertEqual(manager.hosts, ["127.0.0.1"])
+            
+            self.assertEqual(len(site.requests), 4)
+            self.assertEqual(len(site.client_ports), 1)
+    
+    def test_closed_manager_rejects_requests(self):
+        """اختبار إغلاق الجلسات عبر مدير السياق في CameraScraper."""
+        with CameraScraper(pool_size=4) as scraper:
+            self.assertEqual(scraper.session_manager.pool_size, 4)
+        
+        self.assertTrue(scraper.session_manager.closed)
+        with self.assertRaises(RuntimeError):
+            scraper.session_manager.get_session("https://www.hikvision.com/")
+
+class TestConcurrentScraping(unittest.TestCase):
+    """اختبارات للاستخراج المتوازي من عدة روابط."""
+    
+    def setUp(self):
+        """إعداد موقع محلي يسجل أقصى عدد من الطلبات المتزامنة."""
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        
+        def slow_page(handler):
+            with self.lock:
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            time.sleep(0.05)
+            with self.lock:
+                self.in_flight -= 1
+            return echo_page(handler)
+        
+        self.pages = {f"/mock/{i}": slow_page for i in range(8)}
+        self.scraper = CameraScraper()
+        mock_scraper = _BodyScraper(19)
+        self.scraper.add_manufacturer_scraper("mock", mock_scraper, domains=["127.0.0.1"])
+    
+    def tearDown(self):
+        self.scraper.close()
+    
+    def test_per_host_limit_and_result_mapping(self):
+        """اختبار احترام الحد لكل مضيف مع الحفاظ على شكل النتائج."""
+        with LocalSite(self.pages) as site:
+            urls = [site.url(path) for path in self.pages] + [site.url("/mock/missing"), "https://example.com/x"]
+            results = self.scraper.scrape_multiple(urls, max_workers=8, per_host_limit=2)
+        
+        self.assertEqual(list(results.keys()), urls)
+        self.assertLessEqual(self.max_in_flight, 2)
+        self.assertGreater(self.max_in_flight, 1)
+        self.assertEqual(results[urls[0]]["Page"]["Body"], "/mock/0")
+        self.assertEqual(results[urls[0]]["General information"]["Manufacturer"], "Mock")
+        self.assertEqual(results[urls[-2]], {})
+        self.assertIn("error", results[urls[-1]])
+    
+    def test_iter_scrape_backpressure_and_streaming_json(self):
+        """اختبار قراءة الروابط تدريجيًا حسب استهلاك النتائج وكتابتها إلى ملف JSON فور وصولها."""
+        consumed = []
+        
+        with LocalSite(self.pages) as site:
+            def source():
+                for path in self.pages:
+                    consumed.append(path)
+                    yield site.url(path)
+            
+            stream = self.scraper.iter_scrape(source(), max_workers=2, max_in_flight=3)
+            first_url, first = next(stream)
+            # لا يقرأ المستخرج من المصدر إلا ما يكفي لملء العمل الجاري
+            self.assertLessEqual(len(consumed), 4)
+            
+            file_path = os.path.join(tempfile.mkdtemp(), "stream.json")
+            with JsonStreamWriter(file_path) as writer:
+                writer.write(first_url, first)
+                for url, data in stream:
+                    writer.write(url, data)
+        
+        self.assertEqual(len(consumed), len(self.pages))
+        self.assertLessEqual(self.max_in_flight, 2)
+        
+        with open(file_path, encoding="utf-8") as f:
+            written = json.load(f)
+        self.assertEqual(set(written), {site.url(path) for path in self.pages})
+        self.assertEqual(written[site.url("/mock/3")]["Page"]["Body"], "/mock/3")
+
+class _PidScraper:
+    """مستخرج بسيط قابل للتسلسل يسجل رقم العملية التي حللت الصفحة."""
+    
+    def extract(self, html, url):
+        return {"Page": {"Body": html[12:19], "Pid": os.getpid()}}
+
+
+class TestPipelinedScraping(unittest.TestCase):
+    """اختبارات لمرحلة التحليل في مجمع العمليات."""
+    
+    def test_parse_stage_runs_in_recycled_processes(self):
+        """اختبار التحليل في عمليات منفصلة مع إعادة تدويرها وإعادة النتائج بترتيب اكتمالها."""
+        pages = {f"/mock/{i}": f"<html><body>/mock/{i}{'.' * 100}</body></html>" for i in range(8)}
+        
+        with LocalSite(pages) as site, CameraScraper() as scraper:
+            scraper.add_manufacturer_scraper("mock", _PidScraper(), domains=["127.0.0.1"])
+            urls = [site.url(path) for path in pages] + [site.url("/mock/missing"), "https://example.com/x"]
+            results = dict(scraper.scrape_pipelined(
+                urls + urls[:2], fetch_workers=3, parse_workers=2, queue_size=2, max_pages_per_worker=1
+            ))
+            
+            # التوقف المبكر عن القراءة يغلق الخيوط والعمليات دون انتظار باقي الروابط
+            stream = scraper.scrape_pipelined(urls, parse_workers=1)
+            self.assertIn(next(stream)[0], urls)
+            stream.close()
+        
+        self.assertEqual(set(results), set(urls))
+        self.assertEqual(results[urls[0]]["Page"]["Body"], "/mock/0")
+        self.assertEqual(results[urls[0]]["General information"]["Manufacturer"], "Mock")
+        self.assertEqual(results[urls[-2]], {})
+        self.assertIn("error", results[urls[-1]])
+        
+        pids = {results[url]["Page"]["Pid"] for url in urls[:8]}
+        self.assertNotIn(os.getpid(), pids)
+        self.assertGreater(len(pids), 2)
+
+
+@unittest.skipIf(async_http_utils.aiohttp is None, "مكتبة aiohttp غير مثبتة")
+class TestAsyncCameraScraper(unittest.TestCase):
+    """اختبارات للمستخرج غير المتزامن."""
+    
+    def test_scrape_many_against_local_site(self):
+        """اختبار الاستخراج غير المتزامن مع تقييد الطلبات لكل مضيف."""
+        lock = threading.Lock()
+        state = {"in_flight": 0, "max": 0}
+        
+        def slow_page(handler):
+            with lock:
+                state["in_flight"] += 1
+                state["max"] = max(state["max"], state["in_flight"])
+            time.sleep(0.05)
+            with lock:
+                state["in_flight"] -= 1
+            return 200, {"Content-Type": "text/html"}, f"<html><body><h1>{handler.path}</h1>{'.' * 100}</body></html>"
+        
+        pages = {f"/mock/{i}": slow_page for i in range(6)}
+        
+        async def run(urls):
+            async with AsyncCameraScraper(per_host_limit=3) as scraper:
+                mock_scraper = type("MockScraper", (), {"extract": lambda s, h, u: {"Page": {"Length": len(h)}}})()
+                scraper.add_manufacturer_scraper("mock", mock_scraper, domains=["127.0.0.1"])
+                results = await scraper.scrape_many(urls)
+                # الاسترجاع عبر aiohttp فقط دون إنشاء جلسات requests
+                self.assertIsNone(scraper._scraper._session_manager)
+                return results
+        
+        with LocalSite(pages) as site:
+            urls = [site.url(path) for path in pages] + ["https://example.com/x"]
+            results = asyncio.run(run(urls))
+        
+        self.assertEqual(list(results.keys()), urls)
+        self.assertLessEqual(state["max"], 3)
+        self.assertEqual(results[urls[0]]["General information"]["Source URL"], urls[0])
+        self.assertIn("error", results[urls[-1]])
+    
+    def test_iter_scrape_yields_as_pages_complete(self):
+        """اختبار المكرر غير المتزامن مع مصدر روابط غير متزامن وحد للعمل الجاري."""
+        pages = {
+            "/mock/slow": lambda handler: (time.sleep(0.3) or 200, {}, "<html><body>slow" + "." * 100 + "</body></html>"),
+            "/mock/fast": "<html><body>fast" + "." * 100 + "</body></html>",
+        }
+        
+        async def run(urls):
+            async def source():
+                for url in urls:
+                    yield url
+            
+            async with AsyncCameraScraper() as scraper:
+                mock_scraper = _BodyScraper(16)
+                scraper.add_manufacturer_scraper("mock", mock_scraper, domains=["127.0.0.1"])
+                return [item async for item in scraper.iter_scrape(source(), max_in_flight=2)]
+        
+        with LocalSite(pages) as site:
+            urls = [site.url("/mock/slow"), site.url("/mock/fast"), "https://example.com/x"]
+            results = asyncio.run(run(urls))
+        
+        self.assertEqual([url for url, _ in results], [urls[1], urls[2], urls[0]])
+        self.assertEqual(dict(results)[urls[0]]["Page"]["Body"], "slow")
+        self.assertIn("error", dict(results)[urls[2]])
+
+    def test_equivalent_urls_share_one_request(self):
+        """اختبار مشاركة الروابط المكافئة المتزامنة في طلب واحد."""
+        pages = {"/mock/p": lambda handler: (time.sleep(0.2) or 200, {}, "<html><body>page" + "." * 100 + "</body></html>")}
+
+        async def run(urls):
+            async with AsyncCameraScraper() as scraper:
+                mock_scraper = _BodyScraper(16)
+                scraper.add_manufacturer_scraper("mock", mock_scraper, domains=["127.0.0.1"])
+                return await scraper.scrape_many(urls)
+
+        with LocalSite(pages) as site:
+            urls = [site.url("/mock/p"), site.url("/mock/p/"), site.url("/mock/p?utm_source=x")]
+            results = asyncio.run(run(urls))
+
+        self.assertEqual(len(site.requests), 1)
+        self.assertEqual([results[url]["General information"]["Source URL"] for url in urls], urls)
+
+class TestHttpCache(unittest.TestCase):
+    """اختبارات لذاكرة التخزين المؤقت لصفحات HTTP."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_conditional_revalidation(self):
+        """اختبار إرسال If-None-Match وتقديم استجابة 304 من القرص."""
+        body = "<html><body>" + "spec " * 50 + "</body></html>"
+        
+        def page(handler):
+            if handler.headers.get("If-None-Match") == '"v1"':
+                return 304, {"ETag": '"v1"'}, b""
+            return 200, {"Content-Type": "text/html; charset=utf-8", "ETag": '"v1"'}, body
+        
+        with LocalSite({"/p": page}) as site:
+            cache = HttpCache(self.temp_dir, ttl=0)
+            self.assertEqual(fetch_page(site.url("/p"), cache=cache), body)
+            self.assertEqual(fetch_page(site.url("/p"), cache=cache), body)
+            
+            self.assertEqual(len(site.requests), 2)
+            self.assertNotIn("If-None-Match", site.requests[0][1])
+            self.assertEqual(site.requests[1][1].get("If-None-Match"), '"v1"')
+            
+            # صفحة حديثة ضمن مدة الصلاحية لا تحتاج أي طلب
+            fresh_cache = HttpCache(self.temp_dir, ttl=3600)
+            self.assertEqual(fetch_page(site.url("/p"), cache=fresh_cache), body)
+            self.assertEqual(len(site.requests), 2)
+    
+    def test_not_modified_updates_validators(self):
+        """اختبار حفظ ETag و Last-Modified الجديدة المرسلة مع استجابة 304."""
+        body = "<html><body>" + "spec " * 50 + "</body></html>"
+        
+        def page(handler):
+            if handler.headers.get("If-None-Match") in ('"v1"', '"v2"'):
+                return 304, {"ETag": '"v2"', "Last-Modified": "Sat, 01 Mar 2025 00:00:00 GMT"}, b""
+            return 200, {"Content-Type": "text/html; charset=utf-8", "ETag": '"v1"'}, body
+        
+        with LocalSite({"/p": page}) as site:
+            cache = HttpCache(self.temp_dir, ttl=0)
+            for _ in range(3):
+                self.assertEqual(fetch_page(site.url("/p"), cache=cache), body)
+        
+        self.assertEqual([headers.get("If-None-Match") for _, headers in site.requests], [None, '"v1"', '"v2"'])
+        self.assertEqual(site.requests[2][1].get("If-Modified-Since"), "Sat, 01 Mar 2025 00:00:00 GMT")
+        entry = HttpCache(self.temp_dir).get(site.url("/p"))
+        self.assertEqual((entry.etag, entry.last_modified), ('"v2"', "Sat, 01 Mar 2025 00:00:00 GMT"))
+    
+    def test_lru_eviction(self):
+        """اختبار حذف الأقل استخدامًا مؤخرًا عند تجاوز الحجم الأقصى."""
+        cache = HttpCache(self.temp_dir, max_size=250)
+        cache.store("https://a/1", b"a" * 100)
+        cache.store("https://a/2", b"b" * 100)
+        self.assertIsNotNone(cache.get("https://a/1"))
+        cache.store("https://a/3", b"c" * 100)
+        
+        self.assertIsNotNone(cache.get("https://a/1"))
+        self.assertIsNone(cache.get("https://a/2"))
+        self.assertIsNotNone(cache.get("https://a/3"))
+        self.assertEqual(cache.size, 200)
+        self.assertEqual(len(HttpCache(self.temp_dir)), 2)
+    
+    def test_concurrent_writers_use_separate_temp_files(self):
+        """اختبار تخزين نفس الرابط من عدة خيوط ونسخ دون تعارض الملفات المؤقتة."""
+        caches = [HttpCache(self.temp_dir) for _ in range(4)]
+        
+        def writer(cache, index):
+            for i in range(25):
+                cache.store("https://a/1", f"{index}-{i}".encode() * 50, etag=str(i))
+        
+        with mock.patch("security_cameras_scraper.utils.cache_utils.logger") as logger:
+            threads = [threading.Thread(target=writer, args=(cache, i)) for i, cache in enumerate(caches * 2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        
+        logger.error.assert_not_called()
+        self.assertEqual([name for name in os.listdir(self.temp_dir) if name.endswith(".tmp")], [])
+        self.assertIsNotNone(HttpCache(self.temp_dir).get("https://a/1"))
+    
+    def test_hit_does_not_rewrite_metadata(self):
+        """اختبار أن القراءة لا تعيد كتابة البيانات الوصفية وأن ترتيب الاستخدام يبقى بعد إعادة التحميل."""
+        cache = HttpCache(self.temp_dir, max_size=250)
+        cache.store("https://a/1", b"a" * 100)
+        cache.store("https://a/2", b"b" * 100)
+        meta_path = cache._paths(cache._key("https://a/1"))[1]
+        # وقت تعديل قديم حتى يظهر أثر القراءة
+        os.utime(meta_path, (time.time() - 60, time.time() - 60))
+        with open(meta_path, "rb") as f:
+            before = f.read()
+        
+        with mock.patch.object(HttpCache, "_write_json", side_effect=OSError("read-only")):
+            self.assertIsNotNone(cache.get("https://a/1"))
+        with open(meta_path, "rb") as f:
+            self.assertEqual(f.read(), before)
+        
+        # الرابط الأول أصبح الأحدث استخدامًا بعد إعادة التحميل
+        reloaded = HttpCache(self.temp_dir, max_size=250)
+        reloaded.store("https://a/3", b"c" * 100)
+        self.assertIsNotNone(reloaded.get("https://a/1"))
+        self.assertIsNone(reloaded.get("https://a/2"))
+
+class TestHtmlArchive(unittest.TestCase):
+    """اختبارات لأرشيف الصفحات الخام ووضع الإعادة."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_content_is_deduplicated(self):
+        """اختبار تخزين المحتوى المتكرر مرة واحدة مع الاحتفاظ بسجل لكل استرجاع."""
+        with HtmlArchive(self.temp_dir) as archive:
+            first = archive.store("https://a/1", "<html>same</html>", fetched_at=1)
+            second = archive.store("https://a/2", "<html>same</html>", fetched_at=2)
+            archive.store("https://a/1", "<html>new</html>", fetched_at=3)
+            
+            self.assertEqual(first, second)
+            self.assertEqual(archive.urls(), ["https://a/1", "https://a/2"])
+            self.assertEqual(len(archive.history("https://a/1")), 2)
+            self.assertEqual(archive.read_text("https://a/1"), "<html>new</html>")
+            self.assertEqual(archive.read_text("https://a/1", before=2), "<html>same</html>")
+        
+        objects = [name for _, _, files in os.walk(os.path.join(self.temp_dir, "objects")) for name in files]
+        self.assertEqual(len(objects), 2)
+    
+    def test_failed_archive_write_keeps_page(self):
+        """اختبار أن فشل كتابة الأرشيف لا يترك ملفات مؤقتة ولا يلغي الصفحة المسترجعة."""
+        page = "<html><body><h1>Archived</h1>" + "." * 100 + "</body></html>"
+        mock_scraper = type("MockScraper", (), {"extract": lambda s, h, u: {"Page": {"Title": h[16:24]}}})()
+        
+        with LocalSite({"/mock/1": page}) as site, CameraScraper(archive_dir=self.temp_dir) as scraper:
+            scraper.add_manufacturer_scraper("mock", mock_scraper, domains=["127.0.0.1"])
+            with mock.patch("security_cameras_scraper.utils.file_utils.os.replace", side_effect=OSError("No space left")):
+                data = scraper.scrape(site.url("/mock/1"))
+            self.assertEqual(scraper.archive.urls(), [])
+        
+        self.assertEqual(data["Page"]["Title"], "Archived")
+        leftovers = [name for _, _, files in os.walk(self.temp_dir) for name in files if name.endswith(".tmp")]
+        self.assertEqual(leftovers, [])
+    
+    def test_replay_without_network(self):
+        """اختبار إعادة الاستخراج من الأرشيف دون أي طلب شبكة."""
+        page = "<html><body><h1>Archived</h1>" + "." * 100 + "</body></html>"
+        mock_scraper = type("MockScraper", (), {"extract": lambda s, h, u: {"Page": {"Title": h[16:24]}}})()
+        
+        with LocalSite({"/mock/1": page}) as site:
+            url = site.url("/mock/1")
+            with CameraScraper(archive_dir=self.temp_dir) as scraper:
+                scraper.add_manufacturer_scraper("mock", mock_scraper, domains=["127.0.0.1"])
+                scraper.scrape(url)
+        
+        self.assertEqual(len(site.requests), 1)
+        
+        with CameraScraper(archive_dir=self.temp_dir, replay=True) as scraper:
+            scraper.add_manufacturer_scraper("mock", mock_scraper, domains=["127.0.0.1"])
+            results = scraper.scrape_multiple(scraper.archive.urls() + [url + "x"])
+        
+        self.assertEqual(results[url]["Page"]["Title"], "Archived")
+        self.assertEqual(results[url + "x"], {})
+        self.assertEqual(len(site.requests), 1)
+
+class TestBytesParsing(unittest.TestCase):
+    """اختبارات لتمرير المحتوى الخام مع ترميزه إلى المستخرجات."""
+    
+    page = (
+        '<html><head><meta charset="windows-1252"></head><body>'
+        '<div class="el-row"><h3 class="title">Caméra Dahua</h3><p class="text">Réseau</p></div>'
+        '</body></html>'
+    )
+    
+    def test_sniff_encoding(self):
+        """اختبار تحديد الترميز من الرأس ثم من وسم meta."""
+        content = self.page.encode("cp1252")
+        self.assertEqual(sniff_encoding(content, "text/html; charset=UTF-8"), "utf-8")
+        self.assertEqual(sniff_encoding(content, "text/html"), "cp1252")
+        self.assertIsNone(sniff_encoding(b"<html></html>", "text/html"))
+    
+    def test_extract_accepts_bytes(self):
+        """اختبار تطابق نتيجة الاستخراج من المحتوى الخام ومن النص."""
+        scraper = DahuaScraper()
+        url = "https://www.dahuasecurity.com/es/products/x"
+        from_text = scraper.extract(self.page, url)
+        from_bytes = scraper.extract(self.page.encode("cp1252"), url)
+        
+        self.assertEqual(from_bytes, from_text)
+        self.assertEqual(from_bytes["General information"]["Product Title"], "Caméra Dahua")
+    
+    def test_fetch_page_raw_keeps_bytes(self):
+        """اختبار إرجاع المحتوى الخام مع الترميز المعلن في وسم meta."""
+        content = self.page.encode("cp1252")
+        with LocalSite({"/p": lambda h: (200, {"Content-Type": "text/html"}, content)}) as site:
+            self.assertEqual(fetch_page_raw(site.url("/p")), (content, "cp1252"))
+            self.assertEqual(fetch_page(site.url("/p")), self.page)
+
+
+class TestPartialParsing(unittest.TestCase):
+    """اختبارات التحليل الجزئي للصفحات."""
+    
+    NAVIGATION = "<nav><ul>" + "".join(f"<li><a href='/p{i}'>Item {i}</a></li>" for i in range(50)) + "</ul></nav><script>var x = 1;</script>"
+    
+    def test_hikvision_partial_parse_matches_full(self):
+        """اختبار تطابق نتيجة التحليل الجزئي مع التحليل الكامل لصفحة Hikvision."""
+        page = f"""
+        <html><body>{self.NAVIGATION}
+            <div class="product_description_title_tag_container"><div class="product_description_title"><h2>DS-2CD</h2></div></div>
+            <div><div class="product-description-container"><div><h1>Network Camera</h1></div></div></div>
+            <ul class="tech-specs-items-description" data-target="Camera">
+                <li class="tech-specs-items-description-list"><span class="tech-specs-items-description__title--heading">Sensor</span></li>
+                <li class="tech-specs-items-description-list">
+                    <span class="tech-specs-items-description__title">Type</span>
+                    <span class="tech-specs-items-description__title-details">CMOS</span>
+                </li>
+            </ul>
+        {self.NAVIGATION}</body></html>
+        """
+        url = "https://www.hikvision.com/en/p"
+        full = HikvisionScraper().extract(page, url)
+        self.assertEqual(HikvisionScraper(partial_parse=True).extract(page.encode("utf-8"), url), full)
+        self.assertEqual(full["General information"]["Product Type"], "Network Camera")
+    
+    def test_hikvision_partial_parse_ignored_by_other_backends(self):
+        """اختبار أن المحركات التي لا تدعم التحليل الجزئي تستخدم محددات الصفحة الكاملة."""
+        page = f"""
+        <html><body>
+            <div class="product-description-container"><div><h1>Banner</h1></div></div>
+            <div><div class="product-description-container"><div><h1>Network Camera</h1></div></div></div>
+        {self.NAVIGATION}</body></html>
+        """
+        url = "https://www.hikvision.com/en/p"
+        for backend in available_backends():
+            if backend == "bs4":
+                continue
+            with self.subTest(backend=backend):
+                data = HikvisionScraper(partial_parse=True, backend=backend).extract(page, url)
+                self.assertEqual(data["General information"]["Product Type"], "Network Camera")
+    
+    def test_dahua_partial_parse_matches_full(self):
+        """اختبار تطابق نتيجة التحليل الجزئي مع التحليل الكامل لصفحة Dahua."""
+        page = f"""
+        <html><body>{self.NAVIGATION}
+            <div class="el-row is-justify-center"><h3 class="title">HAC-HFW1200TH</h3><p class="text">HDCVI Camera</p></div>
+            <table><tr><td>Camera</td></tr><tr><td>Image Sensor</td><td>2MP CMOS</td></tr></table>
+        {self.NAVIGATION}</body></html>
+        """
+        url = "https://www.dahuasecurity.com/p"
+        full = DahuaScraper().extract(page, url)
+        self.assertEqual(DahuaScraper(partial_parse=True).extract(page, url), full)
+        self.assertEqual(full["Camera"]["Image Sensor"], "2MP CMOS")
+
+class TestParserBackends(unittest.TestCase):
+    """اختبارات محركات التحليل القابلة للتبديل."""
+    
+    def test_node_interface(self):
+        """اختبار تطابق واجهة العقد بين المحركات."""
+        html = ('<html><body><ul class="specs x" data-target="Cam"><li class="item">A <b>1</b><!-- c --></li>'
+                '<li class="item">B</li></ul></body></html>')
+        
+        for backend in available_backends():
+            with self.subTest(backend=backend):
+                root = parse_document(html.encode("utf-8"), "utf-8", backend=backend)
+                ul = root.select_one("ul.specs")
+                self.assertEqual(ul.get("data-target"), "Cam")
+                self.assertEqual(ul.get("class"), ["specs", "x"])
+                self.assertTrue(ul.has_attr("data-target"))
+                items = ul.select("li.item")
+                self.assertEqual([item.get_text(strip=True) for item in items], ["A1", "B"])
+                self.assertEqual(len(ul.find_all("li")), 2)
+                self.assertEqual(items[0].find_parent("ul", class_="specs").get("data-target"), "Cam")
+        
+        with self.assertRaises(ValueError):
+            parse_document(html, backend="regex")
+    
+    def test_scrapers_match_across_backends(self):
+        """اختبار تطابق مخرجات المستخرجات على جميع المحركات."""
+        dahua_page = """
+        <html><body>
+            <div class="el-row"><h3 class="title">HAC-HFW1200TH</h3><p class="text">HDCVI Camera</p></div>
+            <table>
+                <tr><td>Lens</td></tr>
+                <tr><td>Focal Length</td><td>2.8 mm</td></tr>
+                <tr><td rowspan="2">DORI Distance</td><td>Detect</td><td>Observe</td></tr>
+                <tr><td colspan="1">40 m</td><td colspan="1">16 m</td></tr>
+            </table>
+        </body></html>
+        """
+        hikvision_page = """
+        <html><body>
+            <div class="product_description_title_tag_container"><div class="product_description_title"><h2>DS-2CD</h2></div></div>
+            <ul class="tech-specs-items-description" data-target="Camera">
+                <li class="tech-specs-items-description-list"><span class="tech-specs-items-description__title--heading">Sensor</span></li>
+                <li class="tech-specs-items-description-list">
+                    <span class="tech-specs-items-description__title">Type</span>
+                    <span class="tech-specs-items-description__title-details">CMOS</span>
+                </li>
+            </ul>
+        </body></html>
+        """
+        cases = [
+            (DahuaScraper, dahua_page, "https://www.dahuasecurity.com/p"),
+            (HikvisionScraper, hikvision_page, "https://www.hikvision.com/p"),
+        ]
+        
+        for scraper_class, page, url in cases:
+            expected = scraper_class().extract(page, url)
+            for backend in available_backends():
+                with self.subTest(scraper=scraper_class.__name__, backend=backend):
+                    self.assertEqual(scraper_class(backend=backend).extract(page, url), expected)
+
+class TestJobStore(unittest.TestCase):
+    """اختبارات لمخزن المهام القابل للاستئناف."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "jobs.sqlite")
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_lease_complete_and_retry(self):
+        """اختبار الحجز بعقود منتهية الصلاحية وتسجيل النجاح والفشل."""
+        with JobStore(self.db_path, lease_seconds=60, max_attempts=2) as store:
+            self.assertEqual(store.add(["u1", "u2", "u3"]), 3)
+            self.assertEqual(store.add(["u1", "u4"]), 1)
+            
+            self.assertEqual(store.lease("a", limit=2), ["u1", "u2"])
+            self.assertEqual(store.lease("b", limit=1), ["u3"])
+            self.assertEqual(store.lease("c", limit=5, lease_seconds=-1), ["u4"])
+            # عقد العامل c منتهٍ فيمكن لعامل آخر حجز الرابط، ولا تقبل نتيجة c بعدها
+            self.assertEqual(store.lease("b", limit=5), ["u4"])
+            self.assertFalse(store.complete("u4", "hash", worker_id="c"))
+            
+            self.assertTrue(store.complete("u1", "hash-1", worker_id="a"))
+            self.assertTrue(store.fail("u2", "timeout", worker_id="a"))
+            self.assertEqual(store.get("u2").state, "pending")
+            self.assertEqual(store.lease("a"), ["u2"])
+            self.assertTrue(store.fail("u2", "timeout again", worker_id="a"))
+            
+            record = store.get("u2")
+            self.assertEqual((record.state, record.attempts, record.last_error), ("failed", 2, "timeout again"))
+            self.assertEqual(store.get("u1").content_hash, "hash-1")
+            self.assertEqual(store.release("b"), 2)
+            self.assertEqual(store.counts(), {"pending": 2, "in_flight": 0, "done": 1, "failed": 1})
+            self.assertEqual(store.retry_failed(), 1)
+            self.assertEqual(store.get("u2").attempts, 0)
+    
+    def test_poison_url_fails_after_max_attempts(self):
+        """اختبار أن الرابط الذي يوقف عامله أو يعلقه في كل محاولة يصبح failed بعد max_attempts."""
+        with JobStore(self.db_path, max_attempts=2) as store:
+            store.add(["poison", "ok"])
+            # عقود تنتهي دون نتيجة (عامل معلق)
+            self.assertEqual(store.lease("a", limit=1, lease_seconds=-1), ["poison"])
+            self.assertEqual(store.lease("b", limit=1, lease_seconds=-1), ["poison"])
+            self.assertEqual(store.lease("c", limit=5), ["ok"])
+            record = store.get("poison")
+            self.assertEqual((record.state, record.attempts), ("failed", 2))
+            self.assertTrue(record.last_error)
+            
+            store.add(["crash"])
+        
+        # عملية تتوقف أثناء معالجة الرابط في كل مرة
+        code = (
+            "import sys, os; from security_cameras_scraper.jobs import JobStore, default_worker_id\n"
+            "store = JobStore(sys.argv[1], max_attempts=2)\n"
+            "print(store.lease(default_worker_id(), limit=1), flush=True); os._exit(0)\n"
+        )
+        for expected in ("pending", "failed"):
+            subprocess.run([sys.executable, "-c", code, self.db_path], cwd=os.path.dirname(os.path.abspath(__file__)),
+                           stdout=subprocess.DEVNULL, check=True, timeout=60)
+            with JobStore(self.db_path, max_attempts=2) as store:
+                self.assertEqual(store.recover(), 1)
+                self.assertEqual(store.get("crash").state, expected)
+        with JobStore(self.db_path, max_attempts=2) as store:
+            self.assertEqual(store.lease("d", limit=5), [])
+            self.assertEqual(store.counts(), {"pending": 0, "in_flight": 1, "done": 0, "failed": 2})
+    
+    def test_concurrent_processes_lease_each_url_once(self):
+        """اختبار حجز كل رابط لعملية واحدة فقط واستعادة روابط العمليات المتوقفة."""
+        with JobStore(self.db_path) as store:
+            store.add(f"https://a/{i}" for i in range(300))
+        
+        code = (
+            "import sys, os; from security_cameras_scraper.jobs import JobStore, default_worker_id\n"
+            "store = JobStore(sys.argv[1]); worker = default_worker_id(); leased = []\n"
+            "while True:\n"
+            "    urls = store.lease(worker, limit=3)\n"
+            "    if not urls: break\n"
+            "    leased.extend(urls)\n"
+            "    if sys.argv[2] == 'crash' and len(leased) >= 6: print('\\n'.join(leased), flush=True); os._exit(0)\n"
+            "    for url in urls: store.complete(url, worker_id=worker)\n"
+            "print('\\n'.join(leased))\n"
+        )
+        
+        def start(mode):
+            return subprocess.Popen([sys.executable, "-c", code, self.db_path, mode],
+                                    cwd=os.path.dirname(os.path.abspath(__file__)),
+                                    stdout=subprocess.PIPE, universal_newlines=True)
+        
+        # عملية تتوقف بعد إكمال 3 روابط وهي تحجز 3 أخرى، ثم ثلاث عمليات متزامنة على الباقي
+        outputs = [start("crash").communicate(timeout=60)[0].split()]
+        workers = [start("run") for _ in range(3)]
+        outputs.extend(worker.communicate(timeout=60)[0].split() for worker in workers)
+        
+        leased = [url for output in outputs for url in output]
+        self.assertEqual(len(leased), len(set(leased)))
+        self.assertEqual(len(leased), 300)
+        self.assertEqual(len(outputs[0]), 6)
+        
+        with JobStore(self.db_path) as store:
+            self.assertEqual(store.counts()["in_flight"], 3)
+            self.assertEqual(store.recover(), 3)
+            self.assertEqual(store.counts(), {"pending": 3, "in_flight": 0, "done": 297, "failed": 0})
+    
+    def test_run_jobs_resumes_after_interruption(self):
+        """اختبار استئناف التشغيل دون إعادة استرجاع الروابط المكتملة."""
+        pages = {f"/mock/{i}": f"<html><body>/mock/{i}{'.' * 100}</body></html>" for i in range(10)}
+        seen = []
+        
+        def stop_after_three(url, data):
+            if len(seen) == 3:
+                raise KeyboardInterrupt
+            seen.append(url)
+        
+        with LocalSite(pages) as site, CameraScraper() as scraper:
+            mock_scraper = _BodyScraper(19)
+            scraper.add_manufacturer_scraper("mock", mock_scraper, domains=["127.0.0.1"])
+            urls = [site.url(path) for path in pages] + ["https://example.com/x"]
+            
+            with JobStore(self.db_path, max_attempts=1) as store:
+                store.add(urls)
+                with self.assertRaises(KeyboardInterrupt):
+                    run_jobs(scraper, store, on_result=stop_after_three, max_workers=2)
+                self.assertEqual(store.counts()["done"], 3)
+                self.assertEqual(store.counts()["in_flight"], 0)
+            
+            with JobStore(self.db_path, max_attempts=1) as store:
+                summary = run_jobs(scraper, store, on_result=lambda url, data: seen.append(url), max_workers=2)
+                self.assertEqual(summary, {"done": 7, "failed": 1})
+                self.assertEqual(store.get(urls[-1]).state, "failed")
+                self.assertEqual(len(store.get(urls[0]).content_hash), 64)
+        
+        self.assertEqual(sorted(seen), sorted(urls[:-1]))
+        for url in seen[:3]:
+            path = url[len(site.base_url):]
+            self.assertEqual(sum(1 for requested, _ in site.requests if requested == path), 1)
+
+
+class TestDistributedWorkers(unittest.TestCase):
+    """اختبارات لتوزيع الروابط على عدة عمال عبر طابور مشترك."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_workers_share_queue_and_merge_shards(self):
+        """اختبار عمال متعددين بعقود قصيرة مع التجديد الدوري ودمج ملفات نتائجهم."""
+        # الصفحة البطيئة تحجز أولاً ويستمر الحجز للباقي بعد انتهاء عقدها الأصلي
+        pages = {"/mock/slow": functools.partial(echo_page, delay=0.6)}
+        pages.update((f"/mock/{i}", functools.partial(echo_page, delay=0.1)) for i in range(30))
+        queues = {
+            "memory": lambda: MemoryLeaseQueue(),
+            "sqlite": lambda: JobStore(os.path.join(self.temp_dir, "queue.sqlite")),
+        }
+        
+        for name, make_queue in queues.items():
+            with self.subTest(queue=name), LocalSite(pages) as site:
+                queue = make_queue()
+                urls = [site.url(path) for path in pages]
+                queue.add(urls)
+                shard_dir = os.path.join(self.temp_dir, f"shards-{name}")
+                summaries = []
+                
+                def node(index):
+                    with CameraScraper() as scraper:
+                        mock_scraper = _BodyScraper(19)
+                        scraper.add_manufacturer_scraper("mock", mock_scraper, domains=["127.0.0.1"])
+                        summaries.append(run_worker(
+                            scraper, queue, shard_dir, worker_id=f"node-{index}",
+                            lease_seconds=0.3, heartbeat_interval=0.05, max_workers=2, per_host_limit=2
+                        ))
+                
+                nodes = [threading.Thread(target=node, args=(i,)) for i in range(3)]
+                for thread in nodes:
+                    thread.start()
+                for thread in nodes:
+                    thread.join()
+                
+                # سطر غير مكتمل من عامل توقف أثناء الكتابة
+                with open(os.path.join(shard_dir, "node-crashed.jsonl"), "w", encoding="utf-8") as f:
+                    f.write('{"url": "https://a/1", "data": {')
+                
+                output_path = os.path.join(self.temp_dir, f"merged-{name}.json")
+                self.assertEqual(merge_shards(shard_dir, output_path), len(urls))
+                with open(output_path, encoding="utf-8") as f:
+                    merged = json.load(f)
+                
+                self.assertEqual(set(merged), set(urls))
+                self.assertEqual(len(summaries), 3)
+                self.assertEqual(sum(summary["done"] for summary in summaries), len(urls))
+                self.assertTrue(queue.is_finished())
+                # التجديد الدوري يمنع إعادة حجز الصفحة البطيئة رغم أن العقد أقصر من زمنها
+                self.assertEqual(sorted(path for path, _ in site.requests), sorted(pages))
+                
+                if hasattr(queue, "close"):
+                    queue.close()
+
+    
+    def test_memory_queue_fails_url_after_expired_leases(self):
+        """اختبار أن الطابور في الذاكرة لا يعيد حجز رابط انتهى عقده max_attempts مرة."""
+        queue = MemoryLeaseQueue(max_attempts=2)
+        queue.add(["poison", "ok"])
+        
+        self.assertEqual(queue.lease("a", limit=1, lease_seconds=-1), ["poison"])
+        self.assertEqual(queue.lease("b", limit=1, lease_seconds=-1), ["poison"])
+        self.assertEqual(queue.lease("c", limit=5), ["ok"])
+        self.assertEqual(queue.lease("d", limit=5), [])
+        self.assertEqual(queue.counts(), {"pending": 0, "in_flight": 1, "done": 0, "failed": 1})
+
+class TestRateLimiting(unittest.TestCase):
+    """اختبارات تقييد معدل الطلبات لكل مضيف."""
+    
+    def test_token_bucket_per_host_and_retry_after(self):
+        """اختبار الدفعة والمعدل لكل مضيف على حدة وإيقاف المضيف حسب Retry-After."""
+        now = [100.0]
+        limiter = HostRateLimiter(rate=2, burst=2, clock=lambda: now[0])
+        a, b = "https://a.example/1", "https://b.example/1"
+        
+        self.assertEqual([limiter.reserve(a) for _ in range(4)], [0, 0, 0.5, 1.0])
+        # مضيف آخر لا يتأثر بدلو المضيف الأول
+        self.assertEqual(limiter.reserve(b), 0)
+        
+        now[0] += 10
+        limiter.defer(b, 3)
+        self.assertEqual(limiter.next_available(b), 3)
+        self.assertEqual(limiter.reserve(b), 3)
+        self.assertEqual(limiter.reserve(a), 0)
+        
+        self.assertEqual(parse_retry_after("120"), 120)
+        self.assertAlmostEqual(parse_retry_after("Thu, 01 Jan 1970 00:01:40 GMT", now=40), 60)
+        self.assertIsNone(parse_retry_after("soon"))
+    
+    def test_crawl_delay_parsing(self):
+        """اختبار اختيار مجموعة قواعد وكيل المستخدم مع قبول القيم العشرية."""
+        robots = (
+            "User-agent: *\nDisallow: /private\nCrawl-delay: 2\n\n"
+            "User-agent: BadBot\nUser-agent: Mozilla\nRequest-rate: 1/5s\n"
+        )
+        self.assertEqual(parse_crawl_delay(robots, "Mozilla/5.0 (X11)"), 5)
+        self.assertEqual(parse_crawl_delay(robots, "curl/8"), 2)
+        self.assertEqual(parse_crawl_delay("User-agent: *\nCrawl-delay: 0.5"), 0.5)
+        self.assertIsNone(parse_crawl_delay("User-agent: *\nDisallow:"))
+    
+    def test_interleave_hosts(self):
+        """اختبار التناوب بين المضيفين مع تقديم المضيف المتاح أولاً."""
+        urls = ["https://a/1", "https://a/2", "https://a/3", "https://b/1", "https://b/2", "https://c/1"]
+        self.assertEqual(
+            list(interleave_hosts(urls)),
+            ["https://a/1", "https://b/1", "https://c/1", "https://a/2", "https://b/2", "https://a/3"]
+        )
+        
+        limiter = HostRateLimiter(rate=1)
+        limiter.defer("https://a/", 60)
+        self.assertEqual(list(interleave_hosts(urls[:4], limiter))[0], "https://b/1")
+    
+    def test_scraper_honors_crawl_delay_and_retry_after(self):
+        """اختبار المسافة بين الطلبات حسب Crawl-delay وانتظار Retry-After قبل الطلب التالي."""
+        times = []
+        throttled = []
+        
+        def page(handler):
+            times.append(time.monotonic())
+            return echo_page(handler)
+        
+        def limited(handler):
+            if not throttled:
+                throttled.append(time.monotonic())
+                return 429, {"Retry-After": "1"}, b"slow down"
+            return page(handler)
+        
+        pages = {f"/mock/{i}": page for i in range(5)}
+        pages["/robots.txt"] = lambda handler: (200, {}, "User-agent: *\nCrawl-delay: 0.1\n")
+        pages["/limited"] = limited
+        
+        with LocalSite(pages) as site, CameraScraper(rate_limit=100, respect_crawl_delay=True) as scraper:
+            mock_scraper = _BodyScraper(19)
+            scraper.add_manufacturer_scraper("mock", mock_scraper, domains=["127.0.0.1"])
+            
+            results = scraper.scrape_multiple([site.url(f"/mock/{i}") for i in range(5)], max_workers=4)
+            self.assertEqual(results[site.url("/mock/4")]["Page"]["Body"], "/mock/4")
+            self.assertEqual(sum(path == "/robots.txt" for path, _ in site.requests), 1)
+            gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+            self.assertGreaterEqual(min(gaps), 0.08)
+            
+            self.assertIsNone(fetch_page_raw(site.url("/limited"), rate_limiter=scraper.rate_limiter))
+            self.assertIsNotNone(fetch_page_raw(site.url("/limited"), rate_limiter=scraper.rate_limiter))
+            self.assertGreaterEqual(times[-1] - throttled[0], 0.9)
+
+
+class TestAdaptiveConcurrency(unittest.TestCase):
+    """اختبارات تكيف عدد الطلبات المتزامنة لكل مضيف (AIMD)."""
+    
+    def _round(self, limiter, url, elapsed=0.01, status=200):
+        """تنفيذ دورة كاملة بعدد طلبات يساوي الحد الحالي."""
+        count = limiter.limit(url)
+        with contextlib.ExitStack() as stack:
+            for _ in range(count):
+                stack.enter_context(limiter.slot(url))
+            for _ in range(count):
+                error = None if status == 200 else "http"
+                limiter.observe(FetchResult(url, status, elapsed, error))
+    
+    def test_additive_increase_multiplicative_decrease(self):
+        """اختبار الزيادة التدريجية والتخفيض مرة واحدة لكل دفعة ازدحام."""
+        now = [100.0]
+        limiter = AdaptiveHostLimiter(initial_limit=2, max_limit=8, clock=lambda: now[0])
+        url = "https://a.example/p"
+        
+        limits = []
+        for _ in range(12):
+            self._round(limiter, url)
+            limits.append(limiter.limit(url))
+        self.assertEqual(limits, sorted(limits))
+        self.assertEqual(limits[-1], 8)
+        # الحد لا يزيد إذا لم يكن مستخدمًا بالكامل
+        limiter.observe(FetchResult(url, 200, 0.01))
+        self.assertEqual(limiter.limit(url), 8)
+        
+        now[0] += 1
+        limiter.observe(FetchResult(url, 429, 0.2, "http"))
+        self.assertEqual(limiter.limit(url), 4)
+        # استجابة مزدحمة لطلب أرسل قبل التخفيض لا تخفض الحد مرة أخرى
+        limiter.observe(FetchResult(url, None, 0.5, "timeout"))
+        self.assertEqual(limiter.limit(url), 4)
+        now[0] += 1
+        limiter.observe(FetchResult(url, 503, 0.2, "http"))
+        self.assertEqual(limiter.limit(url), 2)
+        
+        metrics = limiter.metrics()["a.example"]
+        self.assertEqual(metrics["limit"], 2)
+        self.assertEqual(metrics["throttled"], 3)
+    
+    def test_no_increase_when_latency_degrades(self):
+        """اختبار إيقاف الزيادة عندما يتجاوز p95 الهدف."""
+        limiter = AdaptiveHostLimiter(initial_limit=2, latency_target=0.5)
+        url = "https://b.example/p"
+        for _ in range(10):
+            self._round(limiter, url, elapsed=1.0)
+        self.assertEqual(limiter.limit(url), 2)
+        self.assertEqual(limiter.metrics()["b.example"]["p95"], 1.0)
+    
+    def test_scraper_backs_off_when_server_throttles(self):
+        """اختبار تخفيض الحد عند 429 من خادم يقبل طلبين متزامنين فقط."""
+        lock = threading.Lock()
+        state = {"in_flight": 0}
+        
+        def page(handler):
+            with lock:
+                state["in_flight"] += 1
+                busy = state["in_flight"] > 2
+            try:
+                if busy:
+                    return 429, {}, b"busy"
+                time.sleep(0.02)
+                return echo_page(handler)
+            finally:
+                with lock:
+                    state["in_flight"] -= 1
+        
+        pages = {f"/mock/{i}": page for i in range(40)}
+        with LocalSite(pages) as site, CameraScraper(pool_size=8, adaptive_concurrency=True,
+                                                     retry_delay=0.05, max_retries=5) as scraper:
+            mock_scraper = _BodyScraper(19)
+            scraper.add_manufacturer_scraper("mock", mock_scraper, domains=["127.0.0.1"])
+            results = scraper.scrape_multiple([site.url(path) for path in pages], max_workers=8)
+            metrics = scraper.concurrency_metrics()["127.0.0.1"]
+        
+        self.assertGreater(metrics["throttled"], 0)
+        self.assertEqual(metrics["requests"], 40 + metrics["throttled"])
+        self.assertLessEqual(metrics["limit"], 4)
+        # الطلبات المرفوضة بـ 429 يعاد طلبها لاحقًا
+        self.assertTrue(all(results.values()))
+
+
+class TestRetries(unittest.TestCase):
+    """اختبارات إعادة المحاولة المؤجلة وقاطع الدائرة."""
+    
+    mock_scraper = _BodyScraper(19)
+    page = functools.partial(echo_page, delay=0.1)
+    
+    def test_retry_policy_classification_and_jitter(self):
+        """اختبار عدم إعادة الأخطاء الدائمة وحدود التأخير العشوائي."""
+        import random
+        policy = RetryPolicy(max_retries=2, base_delay=1.0, max_delay=3.0, rng=random.Random(1))
+        url = "https://a.example/p"
+        
+        self.assertFalse(policy.is_retryable(FetchResult(url, 404, 0.1, "http")))
+        self.assertFalse(policy.is_retryable(FetchResult(url, 200, 0.1)))
+        self.assertTrue(policy.is_retryable(FetchResult(url, 503, 0.1, "http")))
+        self.assertTrue(policy.is_retryable(FetchResult(url, None, 30, "timeout")))
+        self.assertFalse(policy.should_retry(FetchResult(url, 503, 0.1, "http"), 2))
+        
+        delays = [policy.delay(attempt) for attempt in (0, 1, 5) for _ in range(50)]
+        self.assertTrue(all(0 <= delay <= 1 for delay in delays[:50]))
+        self.assertTrue(all(0 <= delay <= 3 for delay in delays[100:]))
+        self.assertGreater(len(set(delays)), 100)
+        self.assertGreaterEqual(policy.delay(0, retry_after=10), 10)
+    
+    def test_circuit_breaker_states(self):
+        """اختبار فتح الدائرة بعد الأخطاء المتتالية وطلب اختبار واحد بعد مدة الإيقاف."""
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=3, recovery_time=10, clock=lambda: now[0])
+        url = "https://down.example/p"
+        
+        breaker.record(FetchResult(url, 404, 0.1, "http"))
+        breaker.record(FetchResult(url, 429, 0.1, "http"))
+        for _ in range(3):
+            self.assertIsNone(breaker.before_request(url))
+            breaker.record(FetchResult(url, None, 0.1, "connection"))
+        self.assertEqual(breaker.state(url), "open")
+        self.assertEqual(breaker.before_request(url), 10)
+        self.assertIsNone(breaker.before_request("https://up.example/p"))
+        
+        now[0] = 10
+        self.assertIsNone(breaker.before_request(url))
+        self.assertEqual(breaker.state(url), "half_open")
+        self.assertEqual(breaker.before_request(url), 10)
+        breaker.record(FetchResult(url, 502, 0.1, "http"))
+        self.assertEqual(breaker.state(url), "open")
+        
+        now[0] = 20
+        self.assertIsNone(breaker.before_request(url))
+        breaker.record(FetchResult(url, 200, 0.1))
+        self.assertEqual(breaker.state(url), "closed")
+    
+    def test_retries_do_not_block_other_urls(self):
+        """اختبار استمرار العمل على الروابط الأخرى أثناء انتظار إعادة المحاولة وعدم إعادة 404."""
+        calls = []
+        
+        def flaky(handler):
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                return 503, {"Retry-After": "1"}, b"maintenance"
+            return self.page(handler)
+        
+        pages = {"/flaky": flaky, "/a": self.page, "/b": self.page, "/c": self.page}
+        with LocalSite(pages) as site, CameraScraper(retry_delay=0.01) as scraper:
+            scraper.add_manufacturer_scraper("mock", self.mock_scraper, domains=["127.0.0.1", "localhost"])
+            # Retry-After يوقف مضيف الرابط فقط، لذلك يطلب الرابط المتعثر عبر اسم مضيف آخر
+            flaky_url = site.url("/flaky").replace("127.0.0.1", "localhost")
+            urls = [flaky_url] + [site.url(path) for path in ("/missing", "/a", "/b", "/c")]
+            started = time.monotonic()
+            order = [url for url, data in scraper.iter_scrape(urls)]
+            elapsed = time.monotonic() - started
+        
+        self.assertEqual(order, urls[1:] + urls[:1])
+        self.assertEqual(len(calls), 2)
+        self.assertGreaterEqual(calls[1] - calls[0], 1.0)
+        # الروابط الأخرى عولجت أثناء الانتظار بدلاً من بعده
+        self.assertLess(elapsed, 1.35)
+        self.assertEqual(sum(path == "/missing" for path, _ in site.requests), 1)
+    
+    def test_circuit_breaker_stops_requests_to_down_host(self):
+        """اختبار إيقاف الطلبات إلى مضيف متعطل بعد عدد الأخطاء المحدد."""
+        pages = {f"/p{i}": (lambda handler: (500, {}, b"down")) for i in range(6)}
+        with LocalSite(pages) as site, CameraScraper(max_retries=0, breaker_threshold=2) as scraper:
+            scraper.add_manufacturer_scraper("mock", self.mock_scraper, domains=["127.0.0.1"])
+            results = scraper.scrape_multiple([site.url(path) for path in pages])
+            self.assertEqual(scraper.circuit_breaker.state(site.url("/")), "open")
+        
+        self.assertEqual(len(site.requests), 2)
+        self.assertEqual(list(results.values()), [{}] * 6)
+
+
+class TestHedgedRequests(unittest.TestCase):
+    """اختبارات الطلبات الاحتياطية ومهلة الدفعة."""
+    
+    mock_scraper = _BodyScraper(19)
+    page = staticmethod(echo_page)
+    
+    def test_deadline_budget(self):
+        """اختبار تقليص مهلة الطلب إلى الوقت المتبقي من الدفعة."""
+        now = [0.0]
+        deadline = Deadline(10, clock=lambda: now[0])
+        self.assertEqual(deadline.budget(30), 10)
+        now[0] = 8
+        self.assertEqual(deadline.budget(30), 2)
+        self.assertEqual(deadline.budget(1), 1)
+        self.assertFalse(deadline.expired)
+        now[0] = 12
+        self.assertEqual(deadline.remaining(), 0)
+        self.assertTrue(deadline.expired)
+    
+    def test_hedge_wins_and_cancels_primary(self):
+        """اختبار إرسال طلب احتياطي بعد p95 المضيف واعتماده وإلغاء الطلب الأساسي."""
+        url = "https://slow.example/p"
+        hedger = RequestHedger(budget=1.0, min_samples=5, measure_ratio=0)
+        self.assertIsNone(hedger.hedge_delay(url))
+        for _ in range(10):
+            hedger.observe(FetchResult(url, 200, 0.05))
+        self.assertAlmostEqual(hedger.hedge_delay(url), 0.05)
+        
+        events = []
+        
+        def attempt(cancel_event):
+            events.append(cancel_event)
+            if len(events) == 1:
+                # الطلب الأساسي معلق حتى إلغائه
+                cancel_event.wait(5)
+                return None
+            return b"page"
+        
+        started = time.monotonic()
+        self.assertEqual(hedger.fetch(url, attempt, timeout=5), b"page")
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(len(events), 2)
+        self.assertTrue(events[0].is_set())
+        
+        report = hedger.report()
+        self.assertEqual((report["requests"], report["hedged"], report["hedge_wins"], report["cancelled"]), (1, 1, 1, 1))
+        hedger.shutdown()
+    
+    def test_timeout_shorter_than_hedge_delay(self):
+        """اختبار التوقف عند انتهاء ميزانية الطلب دون انتظار p95 أو إرسال طلب احتياطي."""
+        url = "https://slow.example/p"
+        hedger = RequestHedger(budget=1.0, min_samples=5, measure_ratio=0)
+        for _ in range(10):
+            hedger.observe(FetchResult(url, 200, 1.0))
+        events = []
+        
+        def attempt(cancel_event):
+            events.append(cancel_event)
+            cancel_event.wait(5)
+            return None
+        
+        started = time.monotonic()
+        cpu_started = time.process_time()
+        self.assertIsNone(hedger.fetch(url, attempt, timeout=0.2))
+        self.assertLess(time.monotonic() - started, 0.6)
+        self.assertLess(time.process_time() - cpu_started, 0.15)
+        self.assertEqual(len(events), 1)
+        self.assertTrue(events[0].is_set())
+        self.assertEqual(hedger.report()["hedged"], 0)
+        hedger.shutdown()
+    
+    def test_report_percentiles_over_full_window(self):
+        """اختبار حساب النسب المئوية للتقرير من نافذة الطلبات الأخيرة فقط."""
+        hedger = RequestHedger(report_window=2000)
+        for _ in range(2500):
+            hedger.fetch("https://a.example/p", lambda cancel_event: b"page", timeout=5)
+        # نافذة معروفة القيم: 1..2000 ميلي ثانية
+        hedger._latencies.extend(i / 1000 for i in range(1, 2001))
+        hedger._counts["hedge_wins"] = 30
+        hedger._saved = [1.0]
+        
+        started = time.monotonic()
+        report = hedger.report()
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual((report["p50"], report["p95"], report["p99"], report["max"]), (1.0, 1.9, 1.98, 2.0))
+        self.assertEqual(report["saved_seconds"], 30.0)
+        # أبطأ 30 طلبًا كانت ستستغرق ثانية إضافية دون الطلبات الاحتياطية
+        self.assertAlmostEqual(report["unhedged_p99"], 2.98)
+        hedger.shutdown()
+    
+    def test_hedged_scrape_removes_slow_response(self):
+        """اختبار أن الطلب الاحتياطي يتجاوز استجابة معلقة لمضيف معروف زمن استجابته."""
+        calls = []
+        
+        def sometimes_hangs(handler):
+            calls.append(handler.path)
+            if len(calls) == 1:
+                time.sleep(2)
+            return self.page(handler)
+        
+        pages = {f"/p{i}": self.page for i in range(25)}
+        pages["/slow"] = sometimes_hangs
+        with LocalSite(pages) as site, CameraScraper(hedge_requests=True, hedge_budget=0.5) as scraper:
+            scraper.add_manufacturer_scraper("mock", self.mock_scraper, domains=["127.0.0.1"])
+            scraper.scrape_multiple([site.url(f"/p{i}") for i in range(25)])
+            
+            started = time.monotonic()
+            data = scraper.scrape(site.url("/slow"))
+            elapsed = time.monotonic() - started
+            report = scraper.hedge_report()
+        
+        self.assertIn("Page", data)
+        self.assertLess(elapsed, 1.5)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(report["hedge_wins"], 1)
+        self.assertEqual(report["requests"], 26)
+    
+    def test_deadline_stops_batch(self):
+        """اختبار إنهاء الدفعة عند انتهاء مهلتها مع طلب معلق وروابط لم تبدأ."""
+        def slow(handler):
+            time.sleep(0.3)
+            return self.page(handler)
+        
+        pages = {f"/p{i}": slow for i in range(10)}
+        pages["/hang"] = lambda handler: (time.sleep(3), self.page(handler))[1]
+        urls = ["/hang"] + [f"/p{i}" for i in range(10)]
+        with LocalSite(pages) as site, CameraScraper() as scraper:
+            scraper.add_manufacturer_scraper("mock", self.mock_scraper, domains=["127.0.0.1"])
+            started = time.monotonic()
+            results = scraper.scrape_multiple([site.url(path) for path in urls], max_workers=2, deadline=0.8)
+            elapsed = time.monotonic() - started
+        
+        self.assertLess(elapsed, 1.6)
+        self.assertEqual(len(results), 11)
+        self.assertEqual(results[site.url("/hang")], {"error": DEADLINE_EXCEEDED})
+        completed = [data for data in results.values() if "Page" in data]
+        self.assertGreaterEqual(len(completed), 1)
+        self.assertLess(len(completed), 10)
+        self.assertLess(len(site.requests), 11)
+
+
+class TestUrlCoalescing(unittest.TestCase):
+    """اختبارات توحيد الروابط ومشاركة طلب واحد بين الروابط المكافئة."""
+    
+    mock_scraper = _BodyScraper(16)
+    page = functools.partial(echo_page, delay=0.2)
+    
+    def test_canonicalize_url(self):
+        """اختبار توحيد اختلافات الشرطة المائلة والتتبع وحالة الأحرف و = في مسارات Dahua."""
+        hikvision = "https://www.hikvision.com/en/products/DVR/iDS-7208HUHI-M1-S/"
+        self.assertEqual(canonicalize_url(hikvision), "https://www.hikvision.com/en/products/dvr/ids-7208huhi-m1-s")
+        for variant in (
+            "https://WWW.Hikvision.com:443/en/products/DVR/iDS-7208HUHI-M1-S",
+            "https://www.hikvision.com/en/products/DVR/iDS-7208HUHI-M1-S/?utm_source=mail&gclid=1#specs",
+            "https://www.hikvision.com/en//products/DVR/iDS-7208HUHI-M1-S",
+        ):
+            self.assertEqual(canonicalize_url(variant), canonicalize_url(hikvision))
+        
+        dahua = "https://www.dahuasecurity.com/es/products/Lite/HAC-HFW1200TH-I8-A=S6"
+        self.assertEqual(canonicalize_url(dahua), canonicalize_url(dahua.replace("=", "_")))
+        self.assertEqual(canonicalize_url(dahua), canonicalize_url(dahua.replace("=", "%3D")))
+        # = تبقى مختلفة عن _ في النطاقات الأخرى، ولا تحذف المعاملات غير التتبعية
+        self.assertNotEqual(canonicalize_url("https://a.example/x=1"), canonicalize_url("https://a.example/x_1"))
+        self.assertEqual(canonicalize_url("https://a.example/p?b=2&a=1&utm_medium=x"), "https://a.example/p?a=1&b=2")
+        self.assertNotEqual(canonicalize_url("https://a.example/p?id=1"), canonicalize_url("https://a.example/p?id=2"))
+        
+        groups = group_urls([hikvision, dahua, hikvision + "?utm_source=x", hikvision])
+        self.assertEqual(list(groups.values()), [[hikvision, hikvision + "?utm_source=x"], [dahua]])
+    
+    def test_single_flight_shares_result(self):
+        """اختبار تنفيذ دالة واحدة للاستدعاءات المتزامنة لنفس المفتاح."""
+        flight = SingleFlight()
+        calls = []
+        results = []
+        
+        def work():
+            calls.append(1)
+            time.sleep(0.2)
+            return "page"
+        
+        threads = [threading.Thread(target=lambda: results.append(flight.do("k", work))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(results), [("page", False)] + [("page", True)] * 4)
+        self.assertEqual(flight.shared, 4)
+        # لا يتم الاحتفاظ بالنتيجة بعد اكتمال التنفيذ
+        self.assertEqual(flight.do("k", work), ("page", False))
+        
+        with self.assertRaises(ValueError):
+            flight.do("error", lambda: int("x"))
+    
+    def test_scrape_multiple_fans_out_duplicates(self):
+        """اختبار طلب كل منتج مرة واحدة ونسخ نتيجته لكل رابط أصلي."""
+        pages = {"/p1": self.page, "/p2": self.page}
+        with LocalSite(pages) as site, CameraScraper() as scraper:
+            scraper.add_manufacturer_scraper("mock", self.mock_scraper, domains=["127.0.0.1"])
+            urls = [site.url("/p1"), site.url("/p1/"), site.url("/p2"), site.url("/p1?utm_source=x"), site.url("/P2")]
+            results = scraper.scrape_multiple(urls, max_workers=4)
+        
+        self.assertEqual(sorted(path for path, _ in site.requests), ["/p1", "/p2"])
+        self.assertEqual(list(results), urls)
+        for url in urls:
+            self.assertEqual(results[url]["General information"]["Source URL"], url)
+        self.assertEqual(results[urls[1]]["Page"], results[urls[0]]["Page"])
+        self.assertIsNot(results[urls[1]]["Page"], results[urls[0]]["Page"])
+    
+    def test_in_flight_duplicates_share_one_fetch(self):
+        """اختبار مشاركة الطلب الجاري بين iter_scrape واستدعاءات scrape المتزامنة."""
+        pages = {"/p1": self.page, "/p2": self.page}
+        with LocalSite(pages) as site, CameraScraper() as scraper:
+            scraper.add_manufacturer_scraper("mock", self.mock_scraper, domains=["127.0.0.1"])
+            urls = [site.url("/p1"), site.url("/p2"), site.url("/p1/"), site.url("/p1#top")]
+            results = list(scraper.iter_scrape(urls, max_workers=4))
+            self.assertEqual(sorted(url for url, _ in results), sorted(urls))
+            self.assertEqual(len(site.requests), 2)
+            
+            threaded = []
+            threads = [threading.Thread(target=lambda url=url: threaded.append(scraper.scrape(url)))
+                       for url in (site.url("/p2"), site.url("/p2/"), site.url("/p2?utm_campaign=x"))]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        
+        self.assertEqual(len(site.requests), 3)
+        self.assertEqual(sorted(data["General information"]["Source URL"] for data in threaded),
+                         sorted([site.url("/p2"), site.url("/p2/"), site.url("/p2?utm_campaign=x")]))
+
+
+class TestModelIndex(unittest.TestCase):
+    """اختبارات توحيد صفحات نفس الطراز بين اللغات."""
+    
+    mock_scraper = _BodyScraper(15)
+    page = functools.partial(echo_page, delay=0.1)
+    
+    def test_parse_product_url(self):
+        """اختبار استخراج الشركة والطراز واللغة واستبعاد صفحات الفئات."""
+        ref = parse_product_url("https://www.hikvision.com/es-la/products/IP-Products/Network-Cameras/DS-2CD1043G2-I/")
+        self.assertEqual((ref.manufacturer, ref.model, ref.locale), ("hikvision", "DS-2CD1043G2-I", "es-la"))
+        
+        dahua = parse_product_url("https://www.dahuasecurity.com/products/All-Products/HDCVI-Cameras/HAC-HFW1200TH-I8-A=S6")
+        self.assertEqual((dahua.manufacturer, dahua.model, dahua.locale), ("dahua", "HAC-HFW1200TH-I8-A_S6", None))
+        self.assertEqual(parse_product_url("https://www.dahuatech.com/pt/products/x/hac-hfw1200th-i8-a_s6.html").model,
+                         dahua.model)
+        
+        for url in ("https://www.hikvision.com/en/products/IP-Products/AcuSense-Series/",
+                    "https://www.hikvision.com/en/support/DS-2CD1043G2-I",
+                    "https://example.com/en/products/DS-2CD1043G2-I"):
+            self.assertIsNone(parse_product_url(url))
+    
+    def test_plan_prefers_locale_and_records_aliases(self):
+        """اختبار اختيار رابط اللغة المفضلة لكل طراز وطلب اللغات المحددة صراحة فقط."""
+        base = "https://www.hikvision.com/{}/products/IP-Products/DS-2CD1043G2-I"
+        urls = [base.format("es"), base.format("en"), base.format("fr"),
+                "https://www.hikvision.com/en/products/IP-Products/AcuSense-Series/", base.format("en") + "/"]
+        index = ModelIndex(("en", "fr"))
+        
+        groups = index.plan(urls)
+        # التجميع وحده لا يحتفظ بالروابط في الفهرس
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.plan(urls, record=True), groups)
+        self.assertEqual(groups[0][0], base.format("en"))
+        self.assertEqual(sorted(groups[0]), sorted(urls[:3] + urls[4:]))
+        self.assertEqual(groups[1], [urls[3]])
+        self.assertEqual(index.preferred_url("hikvision", "ds-2cd1043g2-i"), base.format("en"))
+        self.assertEqual(index.aliases("hikvision", "DS-2CD1043G2-I"),
+                         [base.format("es"), base.format("fr"), base.format("en") + "/"])
+        
+        explicit = index.plan(urls, locales=["es"])
+        self.assertIn([base.format("es")], explicit)
+        self.assertEqual(explicit[1][0], base.format("en"))
+    
+    def test_scrape_multiple_fetches_one_locale_per_model(self):
+        """اختبار طلب صفحة واحدة لكل طراز مع نسخ نتيجتها لروابط اللغات الأخرى."""
+        pages = {f"/{locale}/products/cams/{model}": self.page
+                 for locale in ("es", "en", "de") for model in ("DS-1", "DS-2")}
+        with mock.patch.dict(model_utils.PRODUCT_DOMAINS, {"127.0.0.1": "mock"}), LocalSite(pages) as site:
+            urls = [site.url(path) for path in pages]
+            with CameraScraper() as scraper:
+                scraper.add_manufacturer_scraper("mock", self.mock_scraper, domains=["127.0.0.1"])
+                results = scraper.scrape_multiple(urls, max_workers=4)
+                fetched = sorted(path for path, _ in site.requests)
+                # الدفعات لا تكبر الفهرس إلا عند طلب تسجيل الأسماء البديلة
+                self.assertEqual(len(scraper.model_index), 0)
+                scraper.scrape_multiple(urls, max_workers=4, record_aliases=True)
+                self.assertEqual(scraper.model_index.aliases("mock", "DS-1"),
+                                 [site.url("/es/products/cams/DS-1"), site.url("/de/products/cams/DS-1")])
+                
+                streamed = list(scraper.iter_scrape(urls, max_workers=6))
+            
+            del site.requests[:]
+            with CameraScraper(fetch_locales=["de"]) as scraper:
+                scraper.add_manufacturer_scraper("mock", self.mock_scraper, domains=["127.0.0.1"])
+                scraper.scrape_multiple(urls, max_workers=4)
+            explicit = sorted(path for path, _ in site.requests)
+            
+            # البث لا يحتفظ بالروابط في الفهرس بعد اكتمالها
+            with CameraScraper() as scraper:
+                scraper.add_manufacturer_scraper("mock", self.mock_scraper, domains=["127.0.0.1"])
+                self.assertEqual(len(list(scraper.iter_scrape(urls, max_workers=6))), len(urls))
+                self.assertEqual(scraper.model_index.urls("mock", "DS-1"), [])
+        
+        self.assertEqual(fetched, ["/en/products/cams/DS-1", "/en/products/cams/DS-2"])
+        self.assertEqual(list(results), urls)
+        alias = site.url("/es/products/cams/DS-1")
+        self.assertEqual(results[alias]["Page"], {"Body": "/en"})
+        # يبقى رابط المصدر هو الصفحة التي تم طلبها فعلاً
+        self.assertEqual(results[alias]["General information"]["Source URL"], site.url("/en/products/cams/DS-1"))
+        self.assertEqual(sorted(url for url, _ in streamed), sorted(urls))
+        self.assertEqual(explicit, ["/de/products/cams/DS-1", "/de/products/cams/DS-2",
+                                    "/en/products/cams/DS-1", "/en/products/cams/DS-2"])
+
+
+class TestCatalogDiscovery(unittest.TestCase):
+    """اختبارات اكتشاف روابط المنتجات من ملفات sitemap وصفحات الفئات."""
+    
+    SITEMAP = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<{root} xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{items}</{root}>'
+    )
+    
+    def _sitemap(self, tag, urls, root="urlset"):
+        items = "".join(f"<{tag}><loc>{url}</loc><lastmod>2025-03-01</lastmod></{tag}>" for url in urls)
+        return self.SITEMAP.format(root=root, items=items)
+    
+    @staticmethod
+    def _listing(*paths):
+        links = "".join(f'<li><a href="{path}">{path}</a></li>' for path in paths)
+        return f"<html><body><ul>{links}</ul></body></html>"
+    
+    def test_seen_sets_and_frontier_order(self):
+        """اختبار عدم نسيان أي رابط في مرشح Bloom وحدود أخطائه، وترتيب الطابور وحدود العمق."""
+        bloom = BloomFilter(capacity=5000, false_positive_rate=0.01)
+        keys = [f"https://a.example/p/{i}" for i in range(5000)]
+        self.assertTrue(all(bloom.add(key) or key in bloom for key in keys))
+        self.assertTrue(all(key in bloom for key in keys))
+        false_positives = sum(f"https://b.example/q/{i}" in bloom for i in range(5000))
+        self.assertLess(false_positives, 5000 * 0.03)
+        self.assertLess(bloom.memory_bytes, 8000)
+        
+        hashed = HashedSet()
+        self.assertTrue(hashed.add("x"))
+        self.assertFalse(hashed.add("x"))
+        self.assertEqual(len(hashed), 1)
+        
+        frontier = Frontier(max_depth=1, seen=HashedSet())
+        self.assertTrue(frontier.add("https://a.example/products/b", "listing", 1))
+        self.assertTrue(frontier.add("https://a.example/products/a", "listing", 0))
+        self.assertTrue(frontier.add("https://a.example/sitemap.xml", "sitemap", 0, priority=-1))
+        self.assertFalse(frontier.add("https://a.example/products/a/?utm_source=x", "listing", 0))
+        self.assertFalse(frontier.add("https://a.example/products/c", "listing", 2))
+        self.assertEqual([frontier.pop().url for _ in range(3)],
+                         ["https://a.example/sitemap.xml", "https://a.example/products/a", "https://a.example/products/b"])
+        self.assertIsNone(frontier.pop())
+        self.assertEqual(frontier.stats, {"queued": 3, "duplicates": 1, "too_deep": 1})
+    
+    def test_parse_gzipped_sitemap_index(self):
+        """اختبار قراءة فهرس sitemap مضغوط وقائمة روابط مع lastmod."""
+        index = gzip.compress(self._sitemap("sitemap", ["https://a.example/s1.xml"], root="sitemapindex").encode())
+        self.assertEqual(parse_sitemap(index), (True, [("https://a.example/s1.xml", "2025-03-01")]))
+        is_index, entries = parse_sitemap(self._sitemap("url", [" https://a.example/p/1 "]).encode())
+        self.assertFalse(is_index)
+        self.assertEqual(entries[0].url, "https://a.example/p/1")
+        with self.assertRaises(ValueError):
+            parse_sitemap(b"<urlset><url>")
+    
+    def test_crawl_local_catalog(self):
+        """اختبار اكتشاف المنتجات من sitemap مضغوط وصفحات فئات وتمريرها إلى المستخرج مرة واحدة."""
+        mock_scraper = type("MockScraper", (), {"extract": lambda s, h, u: {"Page": {"Title": u.rsplit("/", 1)[-1]}}})()
+        product = "<html><body>product</body></html>"
+        with mock.patch.dict(model_utils.PRODUCT_DOMAINS, {"127.0.0.1": "mock"}), LocalSite({}) as site:
+            gzipped = gzip.compress(self._sitemap("url", [
+                site.url("/en/products/cams/DS-1"),
+                site.url("/es/products/cams/DS-1"),
+                site.url("/en/products/cams/"),
+            ]).encode())
+            site.pages.update({
+                "/sitemap_index.xml": self._sitemap("sitemap", [site.url("/sitemap-products.xml.gz")], root="sitemapindex"),
+                "/sitemap-products.xml.gz": lambda handler: (200, {"Content-Type": "application/x-gzip"}, gzipped),
+                "/en/products/cams/": self._listing("DS-1", "/en/products/cams/DS-2#specs", "series-a/",
+                                                    "/about", "https://example.com/en/products/cams/X-9"),
+                "/en/products/cams/series-a/": self._listing("/en/products/cams/DS-3", "deep/"),
+                "/en/products/cams/series-a/deep/": self._listing("/en/products/cams/DS-4"),
+                "/en/products/cams/DS-1": product,
+                "/en/products/cams/DS-2": product,
+                "/en/products/cams/DS-3": product,
+            })
+            
+            with CameraScraper() as scraper:
+                scraper.add_manufacturer_scraper("mock", mock_scraper, domains=["127.0.0.1"])
+                crawler = CatalogCrawler(scraper, max_depth=1, max_workers=4)
+                seeds = [site.url("/sitemap_index.xml"), site.url("/en/products/cams/")]
+                results = dict(crawler.crawl(seeds, max_workers=4))
+        
+        self.assertEqual(sorted(data["Page"]["Title"] for data in results.values()), ["DS-1", "DS-2", "DS-3"])
+        requested = [path for path, _ in site.requests]
+        self.assertEqual(len(requested), len(set(requested)))
+        self.assertNotIn("/en/products/cams/series-a/deep/", requested)
+        self.assertNotIn("/about", requested)
+        self.assertNotIn("/es/products/cams/DS-1", requested)
+        report = crawler.report()
+        self.assertEqual((report["sitemaps"], report["listings"], report["products"], report["failed"]), (2, 2, 3, 0))
+        self.assertEqual(report["too_deep"], 1)
+        # الزاحف يحتفظ ببصمات الطرازات في الطابور فقط وليس بالروابط الكاملة
+        self.assertEqual(scraper.model_index.urls("mock", "DS-1"), [])
+    
+    def test_incremental_recrawl_fetches_only_changed_pages(self):
+        """اختبار طلب الصفحات الجديدة أو المتغيرة lastmod فقط، وإعادة الروابط دون lastmod بعد ttl."""
+        mock_scraper = _BodyScraper(20)
+        bodies = {f"/en/products/cams/DS-{i}": "version1" for i in range(1, 5)}
+        lastmods = {"DS-1": "2025-03-01", "DS-2": "2025-03-01"}
+        
+        def page(handler):
+            return 200, {"Content-Type": "text/html"}, f"<html><body>{bodies[handler.path]}</body></html>"
+        
+        def urlset(models, dated):
+            items = "".join(
+                f"<url><loc>{site.url('/en/products/cams/' + model)}</loc>"
+                + (f"<lastmod>{lastmods[model]}</lastmod>" if dated else "") + "</url>"
+                for model in models
+            )
+            return self.SITEMAP.format(root="urlset", items=items)
+        
+        def index(handler):
+            items = (f"<sitemap><loc>{site.url('/dated.xml.gz')}</loc><lastmod>{max(lastmods.values())}</lastmod></sitemap>"
+                     f"<sitemap><loc>{site.url('/undated.xml')}</loc></sitemap>")
+            return 200, {}, gzip.compress(self.SITEMAP.format(root="sitemapindex", items=items).encode())
+        
+        with mock.patch.dict(model_utils.PRODUCT_DOMAINS, {"127.0.0.1": "mock"}), \
+                LocalSite({path: page for path in bodies}) as site, tempfile.TemporaryDirectory() as tmp:
+            site.pages.update({
+                "/index.xml.gz": index,
+                "/dated.xml.gz": lambda handler: (200, {}, gzip.compress(urlset(["DS-1", "DS-2"], True).encode())),
+                "/undated.xml": lambda handler: (200, {}, urlset(["DS-3", "DS-4"], False)),
+            })
+            
+            def run(ttl=3600):
+                del site.requests[:]
+                with CameraScraper() as scraper, RecrawlState(os.path.join(tmp, "state.sqlite")) as state:
+                    scraper.add_manufacturer_scraper("mock", mock_scraper, domains=["127.0.0.1"])
+                    recrawler = IncrementalRecrawler(scraper, state, ttl=ttl)
+                    changed = dict(recrawler.run([site.url("/index.xml.gz")], max_workers=4))
+                return sorted(url.rsplit("/", 1)[-1] for url in changed), recrawler.report(), \
+                    sorted(path for path, _ in site.requests)
+            
+            changed, report, requested = run()
+            self.assertEqual(changed, ["DS-1", "DS-2", "DS-3", "DS-4"])
+            self.assertEqual((report["new"], report["sitemaps"]), (4, 3))
+            
+            # لا تغيير: يعاد تحميل الفهرس والملف دون lastmod فقط، ولا تطلب أي صفحة منتج
+            changed, report, requested = run()
+            self.assertEqual(changed, [])
+            self.assertEqual(requested, ["/index.xml.gz", "/undated.xml"])
+            self.assertEqual((report["sitemaps_skipped"], report["listed"], report["due"]), (1, 4, 0))
+            
+            # تغير lastmod لمنتج واحد
+            lastmods["DS-2"] = "2025-04-01"
+            bodies["/en/products/cams/DS-2"] = "version2"
+            changed, report, requested = run()
+            self.assertEqual(changed, ["DS-2"])
+            self.assertEqual([path for path in requested if "/products/" in path], ["/en/products/cams/DS-2"])
+            
+            # انتهاء ttl للروابط دون lastmod: تطلب من جديد ولا تعاد إلا إذا تغيرت بياناتها
+            bodies["/en/products/cams/DS-4"] = "version2"
+            changed, report, requested = run(ttl=0)
+            self.assertEqual(changed, ["DS-4"])
+            self.assertEqual((report["due"], report["changed"], report["unchanged"]), (2, 1, 1))
+
+
+class TestLazyLoading(unittest.TestCase):
+    """اختبارات التحميل الكسول للمستخرجات والإضافات."""
+    
+    def test_package_import_is_lightweight(self):
+        """اختبار أن استيراد الحزمة وإنشاء المستخرج لا يحملان المكتبات الثقيلة."""
+        code = (
+            "import sys, security_cameras_scraper as s; "
+            "s.CameraScraper().detect_manufacturer('https://www.hikvision.com/en/x'); "
+            "print(','.join(m for m in ('bs4', 'lxml', 'pandas', 'requests', 'aiohttp') if m in sys.modules))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            universal_newlines=True,
+            check=True
+        ).stdout
+        self.assertEqual(output.strip(), "")
+    
+    def test_builtin_scrapers_load_on_first_use(self):
+        """اختبار إنشاء المستخرج المضمن عند أول وصول إليه فقط."""
+        registry = ManufacturerRegistry(builtins=True)
+        self.assertFalse(registry.scrapers.is_loaded("dahua"))
+        self.assertEqual(registry.lookup("https://www.dahuatech.com/p"), "dahua")
+        self.assertFalse(registry.scrapers.is_loaded("dahua"))
+        self.assertIsInstance(registry["dahua"], DahuaScraper)
+        self.assertTrue(registry.scrapers.is_loaded("dahua"))
+    
+    def test_entry_point_plugins(self):
+        """اختبار اكتشاف مستخرجات الإضافات عبر نقاط الدخول عند أول رابط غير معروف."""
+        mock_scraper = type("AcmeScraper", (), {"extract": lambda s, h, u: {}})
+        entry_point = mock.Mock()
+        entry_point.name = "acmecam"
+        entry_point.load.return_value = mock_scraper
+        
+        with mock.patch.object(registry_module, "iter_entry_points", return_value=[entry_point]) as discover:
+            registry = ManufacturerRegistry(builtins=True, plugins=True)
+            self.assertEqual(registry.lookup("https://www.hikvision.com/x"), "hikvision")
+            discover.assert_not_called()
+            
+            self.assertEqual(registry.lookup("https://shop.acmecam.com/x"), "acmecam")
+            self.assertIsNone(registry.lookup("https://example.com/x"))
+            self.assertEqual(discover.call_count, 1)
+        
+        entry_point.load.assert_not_called()
+        self.assertIsInstance(registry["acmecam"], mock_scraper)
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file